@@ -0,0 +1,201 @@
+"""field ids
+
+Revision ID: 7c1e9a4b2f03
+Revises: 0ad38024d191
+Create Date: 2026-10-19 12:16:41.402917
+
+Records, archived ones included, are rewritten keyed by the ids of their
+fields with enum values as codes, see `tracker.core.field_codec`, and so are
+the fields and values of the statistics tables.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c1e9a4b2f03"
+down_revision: Union[str, Sequence[str], None] = "0ad38024d191"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# the trackers of the rows with the structure of their fields
+_STRUCTURES = """
+    SELECT t.id AS tracker_id, s.data AS structure
+    FROM trackers t JOIN tracker_structure s ON s.id = t.structure_id
+"""
+
+_FUNCTIONS = (
+    """
+CREATE FUNCTION pg_temp.field_id(index int) RETURNS text
+LANGUAGE plpgsql IMMUTABLE AS $$
+DECLARE
+    digits text := '';
+BEGIN
+    LOOP
+        digits := substr(
+            '0123456789abcdefghijklmnopqrstuvwxyz', index % 36 + 1, 1
+        ) || digits;
+        index := index / 36;
+        EXIT WHEN index = 0;
+    END LOOP;
+    RETURN digits;
+END $$
+""",
+    """
+CREATE FUNCTION pg_temp.enum_values(props jsonb) RETURNS text[]
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT ARRAY(SELECT jsonb_array_elements_text(
+        coalesce(props -> 'values', '[]')
+    ))
+$$
+""",
+    """
+CREATE FUNCTION pg_temp.encode_value(props jsonb, value text) RETURNS text
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT CASE WHEN props ->> 'type' = 'enum' THEN coalesce(
+        (array_position(pg_temp.enum_values(props), value) - 1)::text, value
+    ) ELSE value END
+$$
+""",
+    """
+CREATE FUNCTION pg_temp.decode_value(props jsonb, value text) RETURNS text
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT CASE WHEN props ->> 'type' = 'enum' AND value ~ '^[0-9]+$'
+        THEN coalesce((pg_temp.enum_values(props))[value::int + 1], value)
+        ELSE value END
+$$
+""",
+    """
+CREATE FUNCTION pg_temp.encode_record(data jsonb, structure jsonb)
+RETURNS jsonb LANGUAGE sql IMMUTABLE AS $$
+    SELECT coalesce(jsonb_object_agg(
+        coalesce(structure -> f.key ->> 'id', f.key),
+        CASE WHEN structure -> f.key ->> 'type' = 'enum'
+            AND jsonb_typeof(f.value) = 'string'
+            THEN coalesce(to_jsonb(array_position(
+                pg_temp.enum_values(structure -> f.key), f.value #>> '{}'
+            ) - 1), f.value)
+            ELSE f.value END
+    ), '{}')
+    FROM jsonb_each(data) f
+$$
+""",
+    """
+CREATE FUNCTION pg_temp.decode_record(data jsonb, structure jsonb)
+RETURNS jsonb LANGUAGE sql IMMUTABLE AS $$
+    SELECT coalesce(jsonb_object_agg(
+        coalesce(s.key, f.key),
+        CASE WHEN s.value ->> 'type' = 'enum'
+            AND jsonb_typeof(f.value) = 'number'
+            THEN coalesce(to_jsonb(
+                (pg_temp.enum_values(s.value))[(f.value #>> '{}')::int + 1]
+            ), f.value)
+            ELSE f.value END
+    ), '{}')
+    FROM jsonb_each(data) f
+    LEFT JOIN jsonb_each(structure) s ON s.value ->> 'id' = f.key
+$$
+""",
+    """
+CREATE FUNCTION pg_temp.field_key(structure jsonb, field text) RETURNS text
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT coalesce(structure -> field ->> 'id', field)
+$$
+""",
+    """
+CREATE FUNCTION pg_temp.field_name(structure jsonb, field text) RETURNS text
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT coalesce(
+        (SELECT key FROM jsonb_each(structure) WHERE value ->> 'id' = field),
+        field
+    )
+$$
+""",
+)
+
+
+def _rewrite(codec: str, field: str, props: str) -> None:
+    """Rewrites the records, archived ones included, and the statistics.
+
+    Args:
+        codec (str): `encode` or `decode`, the functions to rewrite with.
+        field (str): `key` or `name`, what the fields become.
+        props (str): Expression of the props of the field `c.field` of a
+            value count in the structure `s.structure`.
+    """
+    op.execute(f"""
+        UPDATE tracker_data d
+        SET data = pg_temp.{codec}_record(d.data, s.structure)
+        FROM ({_STRUCTURES}) s
+        WHERE s.tracker_id = d.tracker_id
+        """)
+    op.execute(f"""
+        UPDATE tracker_data_archive a
+        SET records = (
+            SELECT jsonb_agg(
+                jsonb_set(
+                    r.value,
+                    '{{data}}',
+                    pg_temp.{codec}_record(r.value -> 'data', s.structure)
+                )
+                ORDER BY r.ordinality
+            )
+            FROM jsonb_array_elements(a.records) WITH ORDINALITY r
+        )
+        FROM ({_STRUCTURES}) s
+        WHERE s.tracker_id = a.tracker_id
+        """)
+    for table in ("tracker_field_stats", "tracker_data_rollups"):
+        op.execute(f"""
+            UPDATE {table} t
+            SET field = pg_temp.field_{field}(s.structure, t.field)
+            FROM ({_STRUCTURES}) s
+            WHERE s.tracker_id = t.tracker_id
+            """)
+    op.execute(f"""
+        UPDATE tracker_value_counts c
+        SET field = pg_temp.field_{field}(s.structure, c.field),
+            value = pg_temp.{codec}_value({props}, c.value)
+        FROM ({_STRUCTURES}) s
+        WHERE s.tracker_id = c.tracker_id
+        """)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for function in _FUNCTIONS:
+        op.execute(function)
+    op.execute("""
+        UPDATE tracker_structure s
+        SET data = (
+            SELECT jsonb_object_agg(
+                f.key,
+                f.value || jsonb_build_object(
+                    'id', pg_temp.field_id(f.ordinality::int - 1)
+                )
+            )
+            FROM jsonb_each(s.data) WITH ORDINALITY f
+        )
+        WHERE s.data <> '{}'
+        """)
+    _rewrite("encode", "key", "s.structure -> c.field")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for function in _FUNCTIONS:
+        op.execute(function)
+    _rewrite(
+        "decode",
+        "name",
+        "s.structure -> pg_temp.field_name(s.structure, c.field)",
+    )
+    op.execute("""
+        UPDATE tracker_structure s
+        SET data = (
+            SELECT jsonb_object_agg(f.key, f.value - 'id')
+            FROM jsonb_each(s.data) f
+        )
+        WHERE s.data <> '{}'
+        """)
@@ -0,0 +1,79 @@
+"""Cost of packing and unpacking field callbacks, named vs compact.
+
+Usage: python benchmarks/callback_codec.py [--number N]
+"""
+
+import argparse
+import timeit
+
+from aiogram.filters.callback_data import CallbackData
+from tracker.core.dynamic_json.types import FieldDataType
+from tracker.presentation.callback_codec import StructureRef, get_structure_ref
+
+STRUCTURE = {
+    "weight": {"type": "float"},
+    "steps": {"type": "int"},
+    "note": {"type": "string"},
+    "mood": {"type": "enum", "values": ["good", "ok", "bad"]},
+    "sleep quality": {"type": "enum", "values": ["deep", "light", "none"]},
+}
+
+
+# callback data with names, as used before the compact codec
+class FieldCallback(CallbackData, prefix="field"):
+    name: str
+    type: FieldDataType
+
+
+class EnumValuesCallback(CallbackData, prefix="enum"):
+    value: str
+
+
+def bench(name: str, stmt, number: int) -> None:
+    seconds = min(timeit.repeat(stmt, number=number, repeat=5))
+    print(f"{name:<36} {seconds / number * 1e6:8.2f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20000)
+    number = parser.parse_args().number
+
+    field, value = "sleep quality", "light"
+    named_field = FieldCallback(name=field, type="enum").pack()
+    named_value = EnumValuesCallback(value=value).pack()
+    ref = StructureRef(STRUCTURE)  # type: ignore
+    compact_field = ref.pack_field(field)
+    compact_value = ref.pack_enum_value(field, value)
+
+    print(f"field data: {named_field!r} -> {compact_field!r}")
+    print(f"enum data:  {named_value!r} -> {compact_value!r}")
+    bench(
+        "named field pack",
+        lambda: FieldCallback(name=field, type="enum").pack(),
+        number,
+    )
+    bench("named field unpack", lambda: FieldCallback.unpack(named_field), number)
+    bench("named enum pack", lambda: EnumValuesCallback(value=value).pack(), number)
+    bench("named enum unpack", lambda: EnumValuesCallback.unpack(named_value), number)
+    # a keyboard packs all its buttons with one StructureRef, a callback is
+    # resolved with the one cached for the structure id from the FSM state
+    bench("compact field pack", lambda: ref.pack_field(field), number)
+    bench("compact enum pack", lambda: ref.pack_enum_value(field, value), number)
+    bench(
+        "compact field unpack (cached ref)",
+        lambda: get_structure_ref("id", STRUCTURE).unpack_field(compact_field),  # type: ignore
+        number,
+    )
+    bench(
+        "compact enum unpack (cached ref)",
+        lambda: get_structure_ref("id", STRUCTURE).unpack_enum_value(compact_value),  # type: ignore
+        number,
+    )
+    bench("StructureRef creation", lambda: StructureRef(STRUCTURE), number)  # type: ignore
+    bench("compact field unpack", lambda: ref.unpack_field(compact_field), number)
+    bench("compact enum unpack", lambda: ref.unpack_enum_value(compact_value), number)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Time to plot a long series: conversion, downsampling and rendering.
+
+Usage: python benchmarks/charts.py [--points N]
+"""
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+from tracker.core.charts import ChartRenderer, lttb
+
+
+def timed(name: str, start: float) -> float:
+    now = time.perf_counter()
+    print(f"{name:<36} {(now - start) * 1e3:8.1f} ms")
+    return now
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--points", type=int, default=1_000_000)
+    points = parser.parse_args().points
+
+    rng = np.random.default_rng(0)
+    # lists, as returned by the database driver
+    timestamps = (1.7e9 + np.arange(points) * 60.0).tolist()
+    values = np.cumsum(rng.normal(size=points)).tolist()
+
+    renderer = ChartRenderer()
+    await renderer.start()
+    try:
+        start = time.perf_counter()
+        x = np.asarray(timestamps, dtype=np.float64)
+        y = np.asarray(values, dtype=np.float64)
+        start = timed("lists to arrays", start)
+        lttb(x, y, renderer.max_points)
+        start = timed(f"lttb to {renderer.max_points} points", start)
+        await renderer.render(x, y, "benchmark")
+        timed("render in the pool (with lttb)", start)
+    finally:
+        renderer.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
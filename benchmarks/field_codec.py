@@ -0,0 +1,172 @@
+"""Size and speed of records keyed by field ids vs by field names.
+
+Usage: python benchmarks/field_codec.py [--records N] [--db-url ...]
+
+Creates a tracker with long field names, which stores its records keyed by
+field ids, and one with the same structure without ids, which stores them as
+they are, adds the same records to both and compares their stored size, the
+time to add them and the time to read them back. Everything created is
+deleted at the end. Runs against the configured database by default.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import timeit
+from uuid import UUID
+
+from sqlalchemy import delete, text, update
+from tracker.core.field_codec import FieldCodec, assign_field_ids
+from tracker.database import create_sessionmaker, get_engine
+from tracker.models import TrackerFieldStatsOrm, TrackerStructureOrm
+from tracker.schemas import TrackerCreate, TrackerDataCreate, TrackerStructureCreate
+from tracker.services.database import DataService, TrackerService
+
+USER_ID = "benchmark-field-codec"
+
+STRUCTURE = {
+    "body weight in kilograms": {"type": "float"},
+    "hours of sleep last night": {"type": "float"},
+    "steps walked during the day": {"type": "int"},
+    "overall mood of the day": {
+        "type": "enum",
+        "values": ["terrible", "bad", "neutral", "good", "excellent"],
+    },
+    "what I ate for dinner": {"type": "string"},
+}
+
+
+def record() -> dict:
+    return {
+        "body weight in kilograms": round(random.uniform(60, 90), 1),
+        "hours of sleep last night": round(random.uniform(4, 10), 2),
+        "steps walked during the day": random.randint(0, 20000),
+        "overall mood of the day": random.choice(
+            STRUCTURE["overall mood of the day"]["values"]
+        ),
+        "what I ate for dinner": random.choice(["pasta", "salad", "soup"]),
+    }
+
+
+def timed(name: str, start: float) -> float:
+    now = time.perf_counter()
+    print(f"{name:<40} {(now - start) * 1e3:10.1f} ms")
+    return now
+
+
+async def create_tracker(
+    tracker_service: TrackerService,
+    data_service: DataService,
+    name: str,
+    with_ids: bool,
+) -> UUID:
+    tracker = await tracker_service.create(
+        TrackerCreate(
+            name=name,
+            user_id=USER_ID,
+            structure=TrackerStructureCreate(data=STRUCTURE),
+        )
+    )
+    if not with_ids:
+        # a structure from before the ids, its records are stored as they are
+        async with tracker_service.session() as session:
+            await session.execute(
+                update(TrackerStructureOrm)
+                .where(TrackerStructureOrm.id == tracker.structure_id)
+                .values(data=STRUCTURE)
+            )
+            await session.execute(
+                delete(TrackerFieldStatsOrm).where(
+                    TrackerFieldStatsOrm.tracker_id == tracker.id
+                )
+            )
+            await session.commit()
+        # the statistics of the numeric fields keyed by their names
+        await data_service.rebuild_field_stats(tracker.id)
+    return tracker.id
+
+
+async def cleanup(engine) -> None:
+    async with engine.begin() as conn:
+        structures = await conn.execute(
+            text(
+                "DELETE FROM trackers WHERE user_id = :user_id "
+                "RETURNING structure_id"
+            ),
+            {"user_id": USER_ID},
+        )
+        await conn.execute(
+            text("DELETE FROM tracker_structure WHERE id = ANY(:ids)"),
+            {"ids": list(structures.scalars())},
+        )
+        await conn.execute(text("DELETE FROM users WHERE id = :id"), {"id": USER_ID})
+
+
+async def stored_size(engine, tracker_id: UUID) -> float:
+    async with engine.connect() as conn:
+        return (
+            await conn.execute(
+                text(
+                    "SELECT avg(pg_column_size(data)) FROM tracker_data "
+                    "WHERE tracker_id = :id"
+                ),
+                {"id": tracker_id},
+            )
+        ).scalar_one()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--db-url", default=None, help="defaults to configured DB")
+    args = parser.parse_args()
+
+    codec = FieldCodec(assign_field_ids(STRUCTURE))
+    sample = record()
+    encoded = codec.encode(sample)
+    number = 100_000
+    for name, fn in (
+        ("encode", lambda: codec.encode(sample)),
+        ("decode", lambda: codec.decode(encoded)),
+    ):
+        per_record = timeit.timeit(fn, number=number) / number
+        print(f"{name + ', per record':<40} {per_record * 1e6:10.2f} us")
+
+    engine = get_engine(args.db_url)
+    sessionmaker = create_sessionmaker(engine)
+    tracker_service = TrackerService(sessionmaker)
+    data_service = DataService(sessionmaker)
+    records = [record() for _ in range(args.records)]
+    try:
+        for label, with_ids in (("names", False), ("ids", True)):
+            tracker_id = await create_tracker(
+                tracker_service, data_service, f"{USER_ID} {label}", with_ids
+            )
+            start = time.perf_counter()
+            for i in records:
+                await tracker_service.add_data(
+                    TrackerDataCreate(tracker_id=tracker_id, data=i)
+                )
+            start = timed(f"{label}: add {args.records} records", start)
+            for _ in range(10):
+                await data_service.get_all_data(tracker_id)
+            start = timed(f"{label}: read all records, 10 times", start)
+            for _ in range(10):
+                await data_service.get_statistics(
+                    tracker_id,
+                    ["body weight in kilograms", "hours of sleep last night"],
+                    ["overall mood of the day"],
+                )
+            timed(f"{label}: statistics, 10 times", start)
+            print(
+                f"{label + ': stored record size':<40} "
+                f"{await stored_size(engine, tracker_id):10.1f} B"
+            )
+    finally:
+        await cleanup(engine)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,145 @@
+"""Claiming due reminders from a large table by concurrent workers.
+
+Usage: python benchmarks/reminders.py [--reminders N] [--workers N]
+    [--batch-size N] [--db-url postgresql+asyncpg://...]
+
+Creates a user with N trackers, each with a reminder, spread evenly over a
+day, and claims those due within the first hour. Everything created is
+deleted at the end. Runs against the configured database by default.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from sqlalchemy import text
+from tracker.database import create_sessionmaker, get_engine
+from tracker.services.database import ScheduleService
+
+USER_ID = "benchmark-reminders"
+
+
+def timed(name: str, start: float) -> float:
+    now = time.perf_counter()
+    print(f"{name:<40} {(now - start) * 1e3:10.1f} ms")
+    return now
+
+
+async def seed(engine, reminders: int, start: datetime) -> None:
+    structure_id = uuid4()
+    async with engine.begin() as conn:
+        await conn.execute(text("INSERT INTO users (id) VALUES (:id)"), {"id": USER_ID})
+        await conn.execute(
+            text("INSERT INTO tracker_structure (id, data) VALUES (:id, '{}')"),
+            {"id": structure_id},
+        )
+        await conn.execute(
+            text(
+                "INSERT INTO trackers (id, name, user_id, structure_id) "
+                "SELECT gen_random_uuid(), :user_id || ' ' || i, :user_id, "
+                ":structure_id FROM generate_series(1, :n) AS i"
+            ),
+            {"user_id": USER_ID, "structure_id": structure_id, "n": reminders},
+        )
+        await conn.execute(
+            text(
+                "INSERT INTO reminders (tracker_id, period_days, next_fire_at) "
+                "SELECT id, 1, CAST(:start AS timestamptz) "
+                "+ random() * interval '1 day' FROM trackers WHERE user_id = :user_id"
+            ),
+            {"user_id": USER_ID, "start": start},
+        )
+    async with engine.connect() as conn:
+        await conn.execute(text("ANALYZE reminders"))
+
+
+async def cleanup(engine) -> None:
+    async with engine.begin() as conn:
+        # reminders go with the trackers, the structure is shared by them
+        structures = await conn.execute(
+            text(
+                "DELETE FROM trackers WHERE user_id = :user_id "
+                "RETURNING structure_id"
+            ),
+            {"user_id": USER_ID},
+        )
+        await conn.execute(
+            text("DELETE FROM tracker_structure WHERE id = ANY(:ids)"),
+            {"ids": list(set(structures.scalars()))},
+        )
+        await conn.execute(text("DELETE FROM users WHERE id = :id"), {"id": USER_ID})
+
+
+async def worker(
+    service: ScheduleService, now: datetime, batch_size: int, latencies: list[float]
+) -> list:
+    claimed = []
+    while True:
+        start = time.perf_counter()
+        batch = await service.claim_due_reminders(now, limit=batch_size)
+        latencies.append(time.perf_counter() - start)
+        claimed += batch
+        if len(batch) < batch_size:
+            return claimed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reminders", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--db-url", default=None, help="defaults to configured DB")
+    args = parser.parse_args()
+
+    engine = get_engine(args.db_url)
+    service = ScheduleService(create_sessionmaker(engine))
+    day_start = datetime.now(timezone.utc) + timedelta(days=1)
+    now = day_start + timedelta(hours=1)
+    try:
+        start = time.perf_counter()
+        await seed(engine, args.reminders, day_start)
+        start = timed(f"create {args.reminders} reminders", start)
+
+        for _ in range(100):
+            await service.get_next_fire_at()
+        start = timed("next fire, 100 times", start)
+
+        async with engine.connect() as conn:
+            due = (
+                await conn.execute(
+                    text("SELECT count(*) FROM reminders WHERE next_fire_at <= :now"),
+                    {"now": now},
+                )
+            ).scalar_one()
+
+        latencies: list[float] = []
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(
+                worker(service, now, args.batch_size, latencies)
+                for _ in range(args.workers)
+            )
+        )
+        timed(f"claim {due} due by {args.workers} workers", start)
+        claimed = [i.tracker_id for res in results for i in res]
+        print(
+            f"claims: {len(latencies)}, "
+            f"median {statistics.median(latencies) * 1e3:.1f} ms, "
+            f"max {max(latencies) * 1e3:.1f} ms"
+        )
+        print(
+            f"claimed: {len(claimed)}, distinct: {len(set(claimed))}, "
+            f"per worker: {[len(i) for i in results]}"
+        )
+    finally:
+        start = time.perf_counter()
+        await cleanup(engine)
+        timed("delete the benchmark data", start)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -20,8 +20,72 @@ class Config(BaseSettings):
     DB_USER: str
     DB_PASS: str
 
+    # create tables from models instead of checking the alembic revision
+    DB_CREATE_TABLES: bool = False
+    ALEMBIC_CONFIG: str = "alembic.ini"
+
+    # one session and transaction per update shared by all services
+    DB_UNIT_OF_WORK: bool = True
+
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_PRE_PING: bool = False
+    DB_POOL_RECYCLE: int = -1  # seconds, -1 disables recycling
+    DB_POOL_WARM_UP: bool = True  # open DB_POOL_SIZE connections on startup
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100  # per connection, 0 disables
+    DB_STATEMENT_TIMEOUT: int | None = None  # milliseconds
+    DB_WORK_MEM: str | None = None  # e.g. "16MB"
+
     BOT_TOKEN: str
 
+    KEYBOARD_CACHE_SIZE: int = 1024  # keyboards built from tracker structures
+    MAIN_MESSAGE_EDIT_WINDOW: float = 0.3  # seconds between edits of one chat
+
+    # pacing of outgoing requests, see tracker.presentation.outbound
+    OUTBOUND_GLOBAL_RATE: float = 30  # messages per second for the whole bot
+    OUTBOUND_CHAT_RATE: float = 1  # messages per second for one chat
+    OUTBOUND_CHAT_BURST: float = 3
+    OUTBOUND_MAX_RETRIES: int = 3  # retries of a request after 429
+
+    TABLE_PAGE_SIZE: int = 10  # records on a page of the table view
+    TRACKERS_PAGE_SIZE: int = 8  # trackers on a page of /my_trackers
+
+    STATISTICS_CACHE_SIZE: int = 256  # statistics results, 0 disables the cache
+    STATISTICS_DATE_GRANULARITY: int = 60  # seconds the period start is rounded to
+
+    DASHBOARD_MAX_TRACKERS: int = 20  # most recently active trackers on /dashboard
+    DASHBOARD_CACHE_SIZE: int = 256  # users, 0 disables the cache
+    DASHBOARD_CACHE_TTL: int = 300  # seconds a dashboard is reused at most
+
+    DIGEST_LOOKAHEAD: int = 600  # seconds of due digest schedules loaded at once
+    DIGEST_BATCH_SIZE: int = 1000  # schedules loaded and users collected at once
+
+    REMINDER_BATCH_SIZE: int = 1000  # reminders claimed at once
+    REMINDER_POLL_INTERVAL: int = 60  # seconds between claims at most
+
+    RETENTION_INTERVAL: int = 3600  # seconds between archivings of old records
+    RETENTION_BATCH_SIZE: int = 10000  # records archived per transaction
+    RETENTION_MIN_RAW_DAYS: int = 30  # days a policy keeps raw at least
+
+    FILTER_INDEX_MIN_USES: int = 20  # filters by a field before it is indexed
+    FILTER_INDEX_BATCH_SIZE: int = 10  # fields indexed per run at most
+    FILTER_INDEX_INTERVAL: int = 3600  # seconds between runs of the index job
+    FILTER_INDEX_MAX_INDEXES: int = 100  # filter indexes on tracker_data at most
+
+    INLINE_RESULTS_LIMIT: int = 20  # trackers in the results of an inline query
+    INLINE_CACHE_TIME: int = 5  # seconds Telegram reuses inline query results
+
+    DELETION_BATCH_SIZE: int = 1000  # rows of deleted trackers removed at once
+    DELETION_PAUSE: float = 0.1  # seconds between batches of removed rows
+    DELETION_INTERVAL: int = 600  # seconds between checks for deleted trackers
+
+    CHART_WORKERS: int = 1  # processes rendering charts
+    CHART_MAX_POINTS: int = 1000  # longer series are downsampled
+
+    # recording of incoming updates for replay, disabled if not set
+    UPDATE_LOG_PATH: str | None = None
+    UPDATE_LOG_SALT: str | None = None  # random per process if not set
+
     @property
     def DB_URL(self) -> str:
         return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASS}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
@@ -0,0 +1,131 @@
+"""Vectorized analytics of numeric series.
+
+Series are NumPy arrays of UNIX timestamps in seconds, sorted, and of
+float64 values. Missing values are NaN, `dropna` removes them from a field
+before it is analyzed.
+"""
+
+import numpy as np
+
+DAY = 86400
+
+# decay^block stays far from underflow within an EWMA block
+_EWMA_MIN_WEIGHT = 1e-150
+
+
+def dropna(x: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Drops the points without a value."""
+    present = ~np.isnan(y)
+    return x[present], y[present]
+
+
+def moving_average(y: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean of the last `window` values, of fewer at the start."""
+    sums = np.concatenate(([0.0], np.cumsum(y)))
+    ends = np.arange(1, len(y) + 1)
+    starts = np.maximum(ends - window, 0)
+    return (sums[ends] - sums[starts]) / (ends - starts)
+
+
+def ewma(y: np.ndarray, alpha: float) -> np.ndarray:
+    """Exponentially weighted moving average, started at the first value.
+
+    `s[i] = alpha * y[i] + (1 - alpha) * s[i - 1]` in closed form: within a
+    block `s = w * (s0 + alpha * cumsum(y / w))` with `w = decay ** k`. Blocks
+    are short enough for `w` not to underflow.
+    """
+    out = np.empty(len(y), dtype=np.float64)
+    if not len(y):
+        return out
+    decay = 1.0 - alpha
+    if decay <= 0:
+        out[:] = y
+        return out
+    if decay >= 1:
+        out[:] = y[0]
+        return out
+    block = max(1, int(np.log(_EWMA_MIN_WEIGHT) / np.log(decay)))
+    previous = y[0]
+    for start in range(0, len(y), block):
+        chunk = y[start : start + block]
+        weights = decay ** np.arange(1, len(chunk) + 1)
+        out[start : start + len(chunk)] = weights * (
+            previous + alpha * np.cumsum(chunk / weights)
+        )
+        previous = out[start + len(chunk) - 1]
+    return out
+
+
+def resample(
+    x: np.ndarray, y: np.ndarray, seconds: float, how: str = "mean"
+) -> tuple[np.ndarray, np.ndarray]:
+    """Aggregates the values into buckets of `seconds`, empty ones are skipped.
+
+    Args:
+        x (np.ndarray): Sorted timestamps.
+        y (np.ndarray): Values without NaN.
+        seconds (float): Bucket size, buckets start at multiples of it.
+        how (str): One of "mean", "sum", "min", "max", "last", "count".
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Bucket starts and aggregated values.
+    """
+    if not len(x):
+        return x, y
+    buckets = np.floor(x / seconds)
+    starts = np.flatnonzero(np.diff(buckets, prepend=buckets[0] - 1))
+    counts = np.diff(np.append(starts, len(x)))
+    match how:
+        case "mean":
+            values = np.add.reduceat(y, starts) / counts
+        case "sum":
+            values = np.add.reduceat(y, starts)
+        case "min":
+            values = np.minimum.reduceat(y, starts)
+        case "max":
+            values = np.maximum.reduceat(y, starts)
+        case "last":
+            values = y[starts + counts - 1]
+        case "count":
+            values = counts.astype(np.float64)
+        case _:
+            raise ValueError(f"Unknown aggregate {how}")
+    return buckets[starts] * seconds, values
+
+
+def pct_change(y: np.ndarray, periods: int = 1) -> np.ndarray:
+    """Change to the value `periods` before in percent, NaN where undefined."""
+    out = np.full(len(y), np.nan)
+    if periods >= len(y):
+        return out
+    before, after = y[:-periods], y[periods:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = (after - before) / np.abs(before) * 100
+    out[periods:] = np.where(before == 0, np.nan, change)
+    return out
+
+
+def runs(mask: np.ndarray) -> np.ndarray:
+    """Length of the run of True values ending at every position."""
+    index = np.arange(len(mask))
+    last_false = np.maximum.accumulate(np.where(mask, -1, index))
+    return index - last_false
+
+
+def day_streaks(x: np.ndarray) -> tuple[int, int]:
+    """Returns the current and the longest streak of consecutive days with
+    values, the current one ending on the last day with a value."""
+    if not len(x):
+        return 0, 0
+    days = np.floor(x / DAY).astype(np.int64)
+    active = np.zeros(days[-1] - days[0] + 1, dtype=bool)
+    active[days - days[0]] = True
+    lengths = runs(active)
+    return int(lengths[-1]), int(lengths.max())
+
+
+def zscore(y: np.ndarray) -> np.ndarray:
+    """Standard scores of the values, zeros if all values are the same."""
+    if not len(y) or (std := y.std()) == 0:
+        return np.zeros(len(y))
+    return (y - y.mean()) / std
@@ -0,0 +1,165 @@
+"""Line charts of tracker fields.
+
+Series are downsampled with Largest-Triangle-Three-Buckets, which keeps the
+visual shape (peaks and dips) of the series, and rendered with matplotlib in
+a process pool, so neither blocks the event loop.
+"""
+
+import asyncio
+import io
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# more points than pixels only slow down rendering
+DEFAULT_MAX_POINTS = 1000
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> tuple[np.ndarray, np.ndarray]:
+    """Downsamples the series with Largest-Triangle-Three-Buckets.
+
+    The first and the last points are kept, the rest are split into
+    `threshold - 2` buckets, and from every bucket the point forming the
+    largest triangle with the point chosen from the previous bucket and the
+    average of the next bucket is kept.
+
+    Args:
+        x (np.ndarray): Sorted x values.
+        y (np.ndarray): Y values.
+        threshold (int): Number of points to keep.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Downsampled x and y values, the input
+            arrays if the series is already short enough.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return x, y
+
+    every = (n - 2) / (threshold - 2)
+    starts = (np.arange(threshold - 2) * every).astype(np.int64) + 1
+    ends = np.append(starts[1:], n - 1)
+    counts = ends - starts
+
+    # average of every bucket, then shifted: the next bucket of the last
+    # bucket is the last point
+    avg_x = np.add.reduceat(x[: n - 1], starts) / counts
+    avg_y = np.add.reduceat(y[: n - 1], starts) / counts
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = starts[i], ends[i]
+        ax, ay = x[a], y[a]
+        area = np.abs(
+            (ax - next_x[i]) * (y[start:end] - ay)
+            - (ax - x[start:end]) * (next_y[i] - ay)
+        )
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return x[selected], y[selected]
+
+
+def render_line_chart(
+    timestamps: np.ndarray,
+    values: np.ndarray,
+    title: str,
+    max_points: int = DEFAULT_MAX_POINTS,
+) -> bytes:
+    """Downsamples the series and renders it to PNG.
+
+    Args:
+        timestamps (np.ndarray): Sorted UNIX timestamps in seconds.
+        values (np.ndarray): Values at the timestamps.
+        title (str): Title of the chart.
+        max_points (int): Number of points to plot at most.
+
+    Returns:
+        bytes: PNG image.
+    """
+    # imported here, only the worker processes need matplotlib
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from matplotlib.figure import Figure
+
+    x, y = lttb(timestamps, values, max_points)
+    dates = (x * 1000).astype("datetime64[ms]")
+
+    fig = Figure(figsize=(8, 4.5), dpi=100)
+    ax = fig.add_subplot()
+    ax.plot(dates, y, marker="o" if len(y) <= 50 else None, linewidth=1.2)
+    ax.set_title(title)
+    ax.set_xlabel("UTC")
+    ax.grid(alpha=0.3)
+    fig.autofmt_xdate()
+    fig.tight_layout()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    return buffer.getvalue()
+
+
+def _warm_up() -> None:
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.figure  # noqa: F401
+
+
+class ChartRenderer:
+    """Renders charts in worker processes.
+
+    The pool is created on first use or by `start`, which also imports
+    matplotlib in the workers ahead of the first chart.
+    """
+
+    def __init__(
+        self, max_workers: int = 1, max_points: int = DEFAULT_MAX_POINTS
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_points = max_points
+        self._pool: ProcessPoolExecutor | None = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # not forked, the parent runs an event loop and other threads
+            self._pool = ProcessPoolExecutor(
+                self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        await asyncio.gather(
+            *(loop.run_in_executor(pool, _warm_up) for _ in range(self.max_workers))
+        )
+
+    async def render(
+        self, timestamps: np.ndarray, values: np.ndarray, title: str
+    ) -> bytes:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_pool(),
+            render_line_chart,
+            timestamps,
+            values,
+            title,
+            self.max_points,
+        )
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+
+chart_renderer = ChartRenderer()
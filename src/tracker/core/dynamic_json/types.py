@@ -1,7 +1,7 @@
 from typing import Literal, NotRequired, TypedDict
 
 # properties of fields in json structure
-props = Literal["type", "values"]
+props = Literal["type", "values", "id"]
 
 """
 Example:
@@ -9,6 +9,7 @@ Example:
     "field_name": {
         "type": str,
         "values": str | None, # only for enum type
+        "id": str, # key of the field in stored records
     }
 }
 """
@@ -21,6 +22,7 @@ field_types_list: list[FieldDataType] = ["int", "float", "string", "enum"]
 class FieldDefinition(TypedDict):
     type: FieldDataType
     values: NotRequired[list[str] | None]  # only for enum type
+    id: NotRequired[str]  # key in the stored records, see `FieldCodec`
 
 
 FieldType = dict[str, FieldDefinition]
@@ -0,0 +1,88 @@
+"""Compact encoding of the records of a tracker.
+
+Records are stored with short field ids as keys instead of the field names
+and with enum values as their indices in the values of the field, e.g.
+`{"0": 72.5, "1": 2}` for `{"weight": 72.5, "mood": "good"}`. The ids are
+assigned once, when the tracker is created, and kept in the structure next
+to the type of each field. Structures without ids store records as they
+are.
+"""
+
+from typing import Any
+
+from .dynamic_json.types import FieldType
+
+_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def field_id(index: int) -> str:
+    """Base-36 id of the field at a position of a structure."""
+    digits = ""
+    while True:
+        index, digit = divmod(index, len(_DIGITS))
+        digits = _DIGITS[digit] + digits
+        if not index:
+            return digits
+
+
+def assign_field_ids(structure: FieldType) -> FieldType:
+    """Returns a copy of the structure with the id of every field set."""
+    return {
+        name: {**props, "id": field_id(i)}  # type: ignore[typeddict-item]
+        for i, (name, props) in enumerate(structure.items())
+    }
+
+
+class FieldCodec:
+    """Encodes the records of a structure for storage and decodes them."""
+
+    def __init__(self, structure: FieldType) -> None:
+        self.structure = structure
+        self._keys = {name: props.get("id", name) for name, props in structure.items()}
+        self._names = {key: name for name, key in self._keys.items()}
+        self._values = {
+            name: props.get("values") or []
+            for name, props in structure.items()
+            if props["type"] == "enum" and "id" in props
+        }
+        self._codes = {
+            name: {value: code for code, value in enumerate(values)}
+            for name, values in self._values.items()
+        }
+
+    def key(self, name: str) -> str:
+        """Key of a field in the stored records."""
+        return self._keys.get(name, name)
+
+    def name(self, key: str) -> str:
+        """Name of a field by its key in the stored records."""
+        return self._names.get(key, key)
+
+    def encode(self, record: dict[str, Any]) -> dict[str, Any]:
+        """Encodes a record keyed by the field names."""
+        return {
+            self.key(name): (
+                self._codes[name].get(value, value) if name in self._codes else value
+            )
+            for name, value in record.items()
+        }
+
+    def decode(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Decodes a stored record, fields in the order of the structure."""
+        record = {}
+        for name, key in self._keys.items():
+            if key in data:
+                record[name] = self.decode_value(name, data[key])
+        return record
+
+    def decode_value(self, name: str, value: Any) -> Any:
+        """Decodes a stored value of a field, enum codes may come as text."""
+        values = self._values.get(name)
+        if values is None or value is None:
+            return value
+        try:
+            code = int(value)
+        except ValueError:
+            # not a code, e.g. stored before the codes
+            return value
+        return values[code] if 0 <= code < len(values) else value
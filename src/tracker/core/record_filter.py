@@ -0,0 +1,207 @@
+"""Filters of records by the values of their fields.
+
+A filter is a list of conditions `field op value` joined by AND and OR, AND
+binding tighter, with parentheses for grouping, e.g.
+
+    mood = bad and (sleep < 6 or steps >= 10000)
+
+Names and values may have spaces, quotes keep those with operators, keywords
+or parentheses in them: `"note" = "tea and cake"`. The operators are `=`,
+`!=`, `<`, `<=`, `>`, `>=`, only numeric fields can be compared by order.
+Filters are parsed and checked against the structure of a tracker by
+`parse_filter` and compiled to SQL by the services.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Iterator, Literal, cast
+
+from .dynamic_json.types import FieldType
+
+Operator = Literal["=", "!=", "<", "<=", ">", ">="]
+
+EQUALITY_OPERATORS = ("=", "!=")
+NUMERIC_TYPES = ("int", "float")
+MAX_CONDITIONS = 16
+
+_AND = {"and", "и"}
+_OR = {"or", "или"}
+_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<quoted>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+        |(?P<op><=|>=|!=|=|<|>)
+        |(?P<paren>[()])
+        |(?P<word>[^\s()<>=!"']+)
+    )""",
+    re.VERBOSE,
+)
+
+
+class FilterException(Exception):
+    """Raised when a filter cannot be parsed or does not fit the structure."""
+
+
+class FilterSyntaxException(FilterException):
+    pass
+
+
+class UnknownFieldException(FilterException):
+    def __init__(self, field: str) -> None:
+        super().__init__(f"Unknown field: {field}")
+        self.field = field
+
+
+class FilterValueException(FilterException):
+    """Raised for values of the wrong type or not among the enum values."""
+
+
+class FilterOperatorException(FilterException):
+    """Raised for order comparisons of non-numeric fields."""
+
+
+# frozen, so filters are hashable and can be parts of cache keys
+@dataclass(frozen=True)
+class Condition:
+    field: str
+    op: Operator
+    value: float | str
+
+
+@dataclass(frozen=True)
+class AllOf:
+    items: tuple["RecordFilter", ...]
+
+
+@dataclass(frozen=True)
+class AnyOf:
+    items: tuple["RecordFilter", ...]
+
+
+RecordFilter = Condition | AllOf | AnyOf
+
+
+def conditions(node: RecordFilter) -> Iterator[Condition]:
+    """Yields the conditions of a filter."""
+    if isinstance(node, Condition):
+        yield node
+        return
+    for i in node.items:
+        yield from conditions(i)
+
+
+def parse_filter(text: str, structure: FieldType) -> RecordFilter:
+    """Parses a filter and checks its conditions against the structure.
+
+    Numeric values are converted to floats, a decimal comma is accepted.
+
+    Raises:
+        FilterSyntaxException: The text is not a filter.
+        UnknownFieldException: A condition names a field not in the structure.
+        FilterValueException: A value does not fit its field.
+        FilterOperatorException: A non-numeric field is compared by order.
+    """
+    node = _Parser(text).parse()
+    if sum(1 for _ in conditions(node)) > MAX_CONDITIONS:
+        raise FilterSyntaxException(f"More than {MAX_CONDITIONS} conditions")
+    return _check(node, structure)
+
+
+def _check(node: RecordFilter, structure: FieldType) -> RecordFilter:
+    if not isinstance(node, Condition):
+        return type(node)(tuple(_check(i, structure) for i in node.items))
+    props = structure.get(node.field)
+    if props is None:
+        raise UnknownFieldException(node.field)
+    value = node.value
+    if props["type"] in NUMERIC_TYPES:
+        try:
+            return Condition(node.field, node.op, float(str(value).replace(",", ".")))
+        except ValueError:
+            raise FilterValueException(f"Not a number: {value}") from None
+    if node.op not in EQUALITY_OPERATORS:
+        raise FilterOperatorException(f"Cannot compare {node.field} by order")
+    if props["type"] == "enum" and value not in (props.get("values") or []):
+        raise FilterValueException(f"Not a value of {node.field}: {value}")
+    return node
+
+
+class _Parser:
+    """Recursive descent parser of the grammar
+
+    filter    := all_of (OR all_of)*
+    all_of    := atom (AND atom)*
+    atom      := "(" filter ")" | phrase operator phrase
+    phrase    := quoted | word+
+    """
+
+    def __init__(self, text: str) -> None:
+        self.tokens: list[tuple[str, str]] = []
+        position, text = 0, text.strip()
+        while position < len(text):
+            match = _TOKEN.match(text, position)
+            if match is None or match.end() == position:
+                raise FilterSyntaxException(f"Unexpected character at {position}")
+            kind = cast(str, match.lastgroup)
+            value = match.group(kind)
+            if kind == "quoted":
+                value = re.sub(r"\\(.)", r"\1", value[1:-1])
+            elif kind == "word" and value.lower() in _AND | _OR:
+                kind = "and" if value.lower() in _AND else "or"
+            self.tokens.append((kind, value))
+            position = match.end()
+        self.position = 0
+
+    def parse(self) -> RecordFilter:
+        if not self.tokens:
+            raise FilterSyntaxException("Empty filter")
+        node = self._filter()
+        if self._peek() is not None:
+            raise FilterSyntaxException(f"Unexpected {self.tokens[self.position][1]}")
+        return node
+
+    def _peek(self) -> str | None:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position][0]
+        return None
+
+    def _next(self, kind: str) -> str:
+        if self._peek() != kind:
+            raise FilterSyntaxException(f"Expected {kind}")
+        self.position += 1
+        return self.tokens[self.position - 1][1]
+
+    def _filter(self) -> RecordFilter:
+        items = [self._all_of()]
+        while self._peek() == "or":
+            self.position += 1
+            items.append(self._all_of())
+        return items[0] if len(items) == 1 else AnyOf(tuple(items))
+
+    def _all_of(self) -> RecordFilter:
+        items = [self._atom()]
+        while self._peek() == "and":
+            self.position += 1
+            items.append(self._atom())
+        return items[0] if len(items) == 1 else AllOf(tuple(items))
+
+    def _atom(self) -> RecordFilter:
+        if self._peek() == "paren" and self.tokens[self.position][1] == "(":
+            self.position += 1
+            node = self._filter()
+            if self.tokens[self.position : self.position + 1] != [("paren", ")")]:
+                raise FilterSyntaxException("Expected )")
+            self.position += 1
+            return node
+        field = self._phrase()
+        op = cast(Operator, self._next("op"))
+        return Condition(field, op, self._phrase())
+
+    def _phrase(self) -> str:
+        if self._peek() == "quoted":
+            return self._next("quoted")
+        words = []
+        while self._peek() == "word":
+            words.append(self._next("word"))
+        if not words:
+            raise FilterSyntaxException("Expected a name or a value")
+        return " ".join(words)
@@ -1,6 +1,17 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import asyncio
+import os
+
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from tracker.config import config
 from tracker.models import Base
+from tracker.services.database.warm_up import warm_up_pool
 
 
 async def create_tables(engine):
@@ -8,21 +19,86 @@ async def create_tables(engine):
         await conn.run_sync(Base.metadata.create_all)
 
 
-async def get_sessionmaker():
-    engine = create_async_engine(
-        config.DB_URL,
+def get_alembic_heads() -> set[str] | None:
+    """Returns head revisions of the migration scripts, None if they are not available."""
+    if not os.path.exists(config.ALEMBIC_CONFIG):
+        return None
+    from alembic.config import Config as AlembicConfig
+    from alembic.script import ScriptDirectory
+
+    script = ScriptDirectory.from_config(AlembicConfig(config.ALEMBIC_CONFIG))
+    return set(script.get_heads())
+
+
+async def get_database_revisions(engine: AsyncEngine) -> set[str]:
+    async with engine.connect() as conn:
+        try:
+            res = await conn.execute(text("SELECT version_num FROM alembic_version"))
+        except ProgrammingError:
+            return set()
+        return set(res.scalars().all())
+
+
+async def check_schema_revision(engine: AsyncEngine) -> None:
+    """Checks that the database is migrated to the head revision.
+
+    Raises:
+        RuntimeError: If the database revision differs from the migration scripts.
+    """
+    heads, current = await asyncio.gather(
+        asyncio.to_thread(get_alembic_heads), get_database_revisions(engine)
+    )
+    if heads is None:
+        return
+    if current != heads:
+        raise RuntimeError(
+            f"Database revision {sorted(current) or 'none'} does not match "
+            f"migrations head {sorted(heads)}, run 'alembic upgrade head'"
+        )
+
+
+async def prepare_schema(engine: AsyncEngine) -> None:
+    if config.DB_CREATE_TABLES:
+        await create_tables(engine)
+    else:
+        await check_schema_revision(engine)
+
+
+def get_engine(db_url: str | None = None) -> AsyncEngine:
+    # applied by the server when a connection is opened, no extra roundtrip
+    server_settings = {}
+    if config.DB_STATEMENT_TIMEOUT is not None:
+        server_settings["statement_timeout"] = str(config.DB_STATEMENT_TIMEOUT)
+    if config.DB_WORK_MEM:
+        server_settings["work_mem"] = config.DB_WORK_MEM
+
+    return create_async_engine(
+        db_url or config.DB_URL,
         echo=False,
-        pool_size=10,
-        max_overflow=20,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        connect_args={
+            "prepared_statement_cache_size": config.DB_PREPARED_STATEMENT_CACHE_SIZE,
+            "server_settings": server_settings,
+        },
         future=True,
     )
 
-    AsyncSessionLocal = async_sessionmaker(
+
+def create_sessionmaker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
         bind=engine,
         class_=AsyncSession,
         expire_on_commit=False,
         autoflush=False,
     )
 
-    await create_tables(engine)
-    return AsyncSessionLocal
+
+async def get_sessionmaker(db_url: str | None = None):
+    engine = get_engine(db_url)
+    await prepare_schema(engine)
+    if config.DB_POOL_WARM_UP:
+        await warm_up_pool(engine, config.DB_POOL_SIZE)
+    return create_sessionmaker(engine)
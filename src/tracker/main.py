@@ -1,36 +1,139 @@
 import asyncio
+import importlib
 import logging
+import secrets
 import sys
+from typing import get_args
 
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
-from aiogram.filters.exception import ExceptionTypeFilter
 from aiogram.methods.delete_webhook import DeleteWebhook
 from aiogram.types import BotCommand
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from tracker.config import config
-from tracker.core.dynamic_json.exceptions import DynamicJsonException
-from tracker.database import get_sessionmaker
-from tracker.exceptions import ServiceExceptions
-from tracker.exceptions_handler import (
-    dynamic_json_exceptions_handler,
-    service_exceptions_handler,
-)
-from tracker.presentation.middleware import (
-    CallbackMessageMiddleware,
-    DBMiddleware,
-    LanguageMiddleware,
-)
-from tracker.presentation.routers import (
-    create_tracker_router,
-    data_router,
-    general_router,
-    tracker_control_router,
+from tracker.database import (
+    create_sessionmaker,
+    get_engine,
+    prepare_schema,
 )
+from tracker.presentation.outbound import CommitBeforeRequest, OutboundScheduler
+from tracker.services.database.warm_up import warm_up_pool
+from tracker.startup import StartupPipeline
 
+# routers pull in use cases, keyboards and handlers, they are imported
+# in a thread while the startup API calls are in flight
+ROUTERS_MODULE = "tracker.presentation.routers"
 
-async def main() -> None:
-    dp = Dispatcher()
+COMMANDS = [
+    BotCommand(command="/start", description="Запустить бота"),
+    BotCommand(command="/help", description="Помощь"),
+    BotCommand(command="/add_tracker", description="Добавить трекер"),
+    BotCommand(command="/my_trackers", description="Просмотр списка трекеров"),
+    BotCommand(command="/dashboard", description="Сводка по трекерам"),
+    BotCommand(command="/digest", description="Регулярная сводка"),
+    BotCommand(command="/remind", description="Напоминание о трекере"),
+    BotCommand(command="/retention", description="Архивация старых записей"),
+    BotCommand(command="/delete_tracker", description="Удалить трекер"),
+    BotCommand(command="/track", description="Добавить данные в трекер"),
+]
+
+
+def create_dispatcher(sessionmaker, record_updates: bool = True) -> Dispatcher:
+    from aiogram.filters.exception import ExceptionTypeFilter
+    from tracker.core.charts import chart_renderer
+    from tracker.core.dynamic_json.exceptions import DynamicJsonException
+    from tracker.exceptions import ServiceExceptions
+    from tracker.exceptions_handler import (
+        dynamic_json_exceptions_handler,
+        service_exceptions_handler,
+    )
+    from tracker.presentation.middleware import (
+        CallbackMessageMiddleware,
+        DBMiddleware,
+        LanguageMiddleware,
+        UpdateRecorderMiddleware,
+    )
+    from tracker.presentation.constants.text import Language
+    from tracker.presentation.deletion import DeletionReaper
+    from tracker.presentation.digests import DigestScheduler
+    from tracker.presentation.filter_indexes import FilterIndexJob
+    from tracker.presentation.reminders import ReminderWorker
+    from tracker.presentation.retention import RetentionJob
+    from tracker.presentation.routers import (
+        create_tracker_router,
+        data_router,
+        general_router,
+        tracker_control_router,
+    )
+    from tracker.presentation.utils import KeyboardCache
+    from tracker.presentation.utils.update_message import main_message_renders
+    from tracker.services.database import (
+        DataService,
+        DeletionService,
+        FilterIndexService,
+        RetentionService,
+        ScheduleService,
+        TrackerService,
+    )
+    from tracker.tools.update_log import UpdateAnonymizer, UpdateLogWriter
+    from tracker.use_cases import (
+        CollectDigestsUseCase,
+        DashboardCache,
+        StatisticsCache,
+    )
+
+    schedule_service = ScheduleService(sessionmaker)
+    digest_scheduler = DigestScheduler(
+        schedule_service,
+        CollectDigestsUseCase(
+            schedule_service, TrackerService(sessionmaker), DataService(sessionmaker)
+        ),
+        lookahead=config.DIGEST_LOOKAHEAD,
+        batch_size=config.DIGEST_BATCH_SIZE,
+        max_trackers=config.DASHBOARD_MAX_TRACKERS,
+    )
+    reminder_worker = ReminderWorker(
+        schedule_service,
+        batch_size=config.REMINDER_BATCH_SIZE,
+        poll_interval=config.REMINDER_POLL_INTERVAL,
+    )
+    retention_job = RetentionJob(
+        RetentionService(sessionmaker),
+        batch_size=config.RETENTION_BATCH_SIZE,
+        interval=config.RETENTION_INTERVAL,
+    )
+    filter_index_job = FilterIndexJob(
+        FilterIndexService(sessionmaker),
+        min_uses=config.FILTER_INDEX_MIN_USES,
+        batch_size=config.FILTER_INDEX_BATCH_SIZE,
+        interval=config.FILTER_INDEX_INTERVAL,
+        max_indexes=config.FILTER_INDEX_MAX_INDEXES,
+    )
+    deletion_reaper = DeletionReaper(
+        DeletionService(sessionmaker),
+        batch_size=config.DELETION_BATCH_SIZE,
+        pause=config.DELETION_PAUSE,
+        interval=config.DELETION_INTERVAL,
+    )
+
+    dp = Dispatcher(
+        table_page_size=config.TABLE_PAGE_SIZE,
+        trackers_page_size=config.TRACKERS_PAGE_SIZE,
+        statistics_cache=StatisticsCache(
+            config.STATISTICS_CACHE_SIZE, config.STATISTICS_DATE_GRANULARITY
+        ),
+        dashboard_max_trackers=config.DASHBOARD_MAX_TRACKERS,
+        dashboard_cache=DashboardCache(
+            config.DASHBOARD_CACHE_SIZE, config.DASHBOARD_CACHE_TTL
+        ),
+        digest_scheduler=digest_scheduler,
+        reminder_worker=reminder_worker,
+        retention_min_days=config.RETENTION_MIN_RAW_DAYS,
+        inline_results_limit=config.INLINE_RESULTS_LIMIT,
+        inline_cache_time=config.INLINE_CACHE_TIME,
+        deletion_reaper=deletion_reaper,
+    )
 
     dp.errors.register(
         dynamic_json_exceptions_handler, ExceptionTypeFilter(DynamicJsonException)
@@ -41,28 +144,85 @@ async def main() -> None:
 
     dp.callback_query.middleware(CallbackMessageMiddleware())
 
-    bot = Bot(
-        token=config.BOT_TOKEN,
-        default=DefaultBotProperties(parse_mode=ParseMode.HTML),
-    )
-
-    commands = [
-        BotCommand(command="/start", description="Запустить бота"),
-        BotCommand(command="/help", description="Помощь"),
-        BotCommand(command="/add_tracker", description="Добавить трекер"),
-        BotCommand(command="/my_trackers", description="Просмотр списка трекеров"),
-        BotCommand(command="/track", description="Добавить данные в трекер"),
-    ]  # TODO: move it
-    await bot.set_my_commands(commands)
-
-    await bot(DeleteWebhook(drop_pending_updates=True))
     dp.include_router(create_tracker_router)
     dp.include_router(tracker_control_router)
     dp.include_router(general_router)
     dp.include_router(data_router)
 
+    if record_updates and config.UPDATE_LOG_PATH:
+        writer = UpdateLogWriter(config.UPDATE_LOG_PATH)
+        anonymizer = UpdateAnonymizer(config.UPDATE_LOG_SALT or secrets.token_hex(16))
+        dp.update.outer_middleware(UpdateRecorderMiddleware(writer, anonymizer))
+        dp.shutdown.register(writer.close)
+
+    main_message_renders.window = config.MAIN_MESSAGE_EDIT_WINDOW
+
+    chart_renderer.max_workers = config.CHART_WORKERS
+    chart_renderer.max_points = config.CHART_MAX_POINTS
+    dp.startup.register(chart_renderer.start)
+    dp.shutdown.register(chart_renderer.close)
+    dp.startup.register(digest_scheduler.start)
+    dp.shutdown.register(digest_scheduler.close)
+    dp.startup.register(reminder_worker.start)
+    dp.shutdown.register(reminder_worker.close)
+    dp.startup.register(retention_job.start)
+    dp.shutdown.register(retention_job.close)
+    dp.startup.register(filter_index_job.start)
+    dp.shutdown.register(filter_index_job.close)
+    dp.startup.register(deletion_reaper.start)
+    dp.shutdown.register(deletion_reaper.close)
+
+    keyboard_cache = KeyboardCache(config.KEYBOARD_CACHE_SIZE)
+    keyboard_cache.warm_up(get_args(Language))
+
     dp.update.middleware(LanguageMiddleware())
-    dp.update.middleware(DBMiddleware(await get_sessionmaker()))
+    dp.update.middleware(
+        DBMiddleware(sessionmaker, config.DB_UNIT_OF_WORK, keyboard_cache)
+    )
+    return dp
+
+
+async def init_database(
+    pipeline: StartupPipeline,
+) -> async_sessionmaker[AsyncSession]:
+    engine = get_engine()
+    await pipeline.step("db_schema", prepare_schema(engine))
+    if config.DB_POOL_WARM_UP:
+        await pipeline.step(
+            "db_pool_warm_up", warm_up_pool(engine, config.DB_POOL_SIZE)
+        )
+    return create_sessionmaker(engine)
+
+
+async def main() -> None:
+    pipeline = StartupPipeline()
+    bot = Bot(
+        token=config.BOT_TOKEN,
+        default=DefaultBotProperties(parse_mode=ParseMode.HTML),
+    )
+    outbound = OutboundScheduler(
+        global_rate=config.OUTBOUND_GLOBAL_RATE,
+        chat_rate=config.OUTBOUND_CHAT_RATE,
+        chat_burst=config.OUTBOUND_CHAT_BURST,
+        max_retries=config.OUTBOUND_MAX_RETRIES,
+    )
+    # outer first, so the unit of work is committed before pacing
+    bot.session.middleware(CommitBeforeRequest())
+    bot.session.middleware(outbound)
+
+    # independent steps, the slowest one defines the startup time
+    sessionmaker, *_ = await asyncio.gather(
+        init_database(pipeline),
+        pipeline.step("set_commands", bot.set_my_commands(COMMANDS)),
+        pipeline.step("delete_webhook", bot(DeleteWebhook(drop_pending_updates=True))),
+        pipeline.step_in_thread(
+            "import_routers", importlib.import_module, ROUTERS_MODULE
+        ),
+    )
+
+    dp = pipeline.step_sync("dispatcher", create_dispatcher, sessionmaker)
+    dp.shutdown.register(outbound.log_metrics)
+    pipeline.log()
     await dp.start_polling(bot)
 
 
@@ -1,8 +1,17 @@
 import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import DateTime, ForeignKey, text
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import (
+    BigInteger,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    text,
+)
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION, JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -13,6 +22,11 @@ class Base(DeclarativeBase):
 class UserOrm(Base):
     __tablename__ = "users"
     id: Mapped[str] = mapped_column(primary_key=True)
+    # set when the user is deleted, the row is removed by the deletion reaper
+    # once all its trackers are, see `DeletionService`
+    deleted_at: Mapped[datetime.datetime | None] = mapped_column(
+        DateTime(timezone=True)
+    )
 
     trackers: Mapped[list["TrackerOrm"]] = relationship(
         back_populates="user",
@@ -36,18 +50,53 @@ class TrackerStructureOrm(Base):
 
 class TrackerOrm(Base):
     __tablename__ = "trackers"
+    __table_args__ = (
+        # lists of a user's trackers, most recently active first
+        Index(
+            "ix_trackers_user_id_last_activity_at_id",
+            "user_id",
+            "last_activity_at",
+            "id",
+        ),
+        # names are unique per user regardless of case, deleted trackers give
+        # their names up at once; serves lookups and searches by name, which
+        # are always scoped to a user
+        Index(
+            "ix_trackers_user_id_lower_name",
+            "user_id",
+            text("lower(name)"),
+            unique=True,
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        # the few trackers waiting for the deletion reaper
+        Index(
+            "ix_trackers_deleted_at",
+            "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+        ),
+    )
 
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
-    name: Mapped[str] = mapped_column(unique=True)
-    user_id: Mapped[str] = mapped_column(
-        ForeignKey(UserOrm.id, ondelete="CASCADE"), index=True
-    )
+    name: Mapped[str]
+    user_id: Mapped[str] = mapped_column(ForeignKey(UserOrm.id, ondelete="CASCADE"))
     structure_id: Mapped[UUID] = mapped_column(
         ForeignKey(TrackerStructureOrm.id, ondelete="RESTRICT")
     )
     created_at: Mapped[datetime.datetime] = mapped_column(
         DateTime(timezone=True), server_default=text("TIMEZONE('utc', now())")
     )
+    # creation or the last added record
+    last_activity_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), server_default=text("TIMEZONE('utc', now())")
+    )
+    # bumped whenever the records or the statistics derived from them change,
+    # results computed from the records are cached under it
+    data_version: Mapped[int] = mapped_column(BigInteger, server_default="0")
+    # deleted trackers are hidden at once, their records are removed in
+    # batches by the deletion reaper, see `DeletionService`
+    deleted_at: Mapped[datetime.datetime | None] = mapped_column(
+        DateTime(timezone=True)
+    )
     user: Mapped["UserOrm"] = relationship(back_populates="trackers", lazy="selectin")
     structure: Mapped["TrackerStructureOrm"] = relationship(lazy="joined")
     data: Mapped[list["TrackerDataOrm"]] = relationship(
@@ -64,10 +113,16 @@ class TrackerOrm(Base):
 
 class TrackerDataOrm(Base):
     __tablename__ = "tracker_data"
+    __table_args__ = (
+        # serves filtering by tracker as well as ordered and keyset reads
+        Index(
+            "ix_tracker_data_tracker_id_created_at_id", "tracker_id", "created_at", "id"
+        ),
+    )
 
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
     tracker_id: Mapped[UUID] = mapped_column(
-        ForeignKey(TrackerOrm.id, ondelete="CASCADE"), index=True
+        ForeignKey(TrackerOrm.id, ondelete="CASCADE")
     )
     data: Mapped[dict] = mapped_column(JSONB)
     created_at: Mapped[datetime.datetime] = mapped_column(
@@ -78,3 +133,166 @@ class TrackerDataOrm(Base):
     def __init__(self, tracker_id: UUID, data: dict):
         self.tracker_id = tracker_id
         self.data = data
+
+
+class TrackerFieldStatsOrm(Base):
+    """Running statistics of a numeric field over all records of a tracker.
+
+    Created with the tracker and updated with every added record, `m2` is the
+    sum of squared deviations from the mean (Welford), so the variance is
+    `m2 / count`.
+    """
+
+    __tablename__ = "tracker_field_stats"
+
+    tracker_id: Mapped[UUID] = mapped_column(
+        ForeignKey(TrackerOrm.id, ondelete="CASCADE"), primary_key=True
+    )
+    field: Mapped[str] = mapped_column(primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, server_default="0")
+    mean: Mapped[float] = mapped_column(DOUBLE_PRECISION, server_default="0")
+    m2: Mapped[float] = mapped_column(DOUBLE_PRECISION, server_default="0")
+    sum: Mapped[float] = mapped_column(DOUBLE_PRECISION, server_default="0")
+    min: Mapped[float | None] = mapped_column(DOUBLE_PRECISION)
+    max: Mapped[float | None] = mapped_column(DOUBLE_PRECISION)
+
+
+class TrackerValueCountOrm(Base):
+    """Daily count of a value of a categorical field of a tracker.
+
+    Enum values are counted exactly. A day of a string field keeps a bounded
+    number of values, a value that replaced another one inherited its count
+    as `error`, see `tracker.services.database.value_counts`.
+    """
+
+    __tablename__ = "tracker_value_counts"
+
+    tracker_id: Mapped[UUID] = mapped_column(
+        ForeignKey(TrackerOrm.id, ondelete="CASCADE"), primary_key=True
+    )
+    field: Mapped[str] = mapped_column(primary_key=True)
+    # UTC day of the records
+    day: Mapped[datetime.date] = mapped_column(Date, primary_key=True)
+    value: Mapped[str] = mapped_column(primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger)
+    error: Mapped[int] = mapped_column(BigInteger, server_default="0")
+
+
+class TrackerFilterUsageOrm(Base):
+    """Number of filters of the records of a tracker by a field.
+
+    `field` is the key of the field in the records. Fields filtered often get
+    a partial expression index on `tracker_data`, see
+    `tracker.services.database.filter_index_service`.
+    """
+
+    __tablename__ = "tracker_filter_usage"
+
+    tracker_id: Mapped[UUID] = mapped_column(
+        ForeignKey(TrackerOrm.id, ondelete="CASCADE"), primary_key=True
+    )
+    field: Mapped[str] = mapped_column(primary_key=True)
+    uses: Mapped[int] = mapped_column(BigInteger, server_default="1")
+    indexed: Mapped[bool] = mapped_column(server_default=text("false"))
+
+
+class TrackerRetentionOrm(Base):
+    """Retention policy of the records of a tracker.
+
+    Records older than `raw_days` days, counted in whole UTC days, are moved
+    into `TrackerDataArchiveOrm` and their numeric fields are rolled up into
+    `TrackerDataRollupOrm`, see `tracker.services.database.archive`.
+    """
+
+    __tablename__ = "tracker_retention"
+
+    tracker_id: Mapped[UUID] = mapped_column(
+        ForeignKey(TrackerOrm.id, ondelete="CASCADE"), primary_key=True
+    )
+    raw_days: Mapped[int] = mapped_column(Integer)
+
+
+class TrackerDataArchiveOrm(Base):
+    """Archived records of a tracker of one UTC day.
+
+    `records` is an array of `{"id", "created_at", "data"}` objects, one
+    value per day instead of a row per record, so it is compressed by TOAST.
+    The table is created with a low `toast_tuple_target`, which compresses
+    days with few records too.
+    """
+
+    __tablename__ = "tracker_data_archive"
+
+    tracker_id: Mapped[UUID] = mapped_column(
+        ForeignKey(TrackerOrm.id, ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[datetime.date] = mapped_column(Date, primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger)
+    records: Mapped[list] = mapped_column(JSONB)
+
+
+class TrackerDataRollupOrm(Base):
+    """Statistics of a numeric field over the archived records of a UTC day.
+
+    Shaped like `TrackerFieldStatsOrm`, so days are merged like the running
+    statistics.
+    """
+
+    __tablename__ = "tracker_data_rollups"
+
+    tracker_id: Mapped[UUID] = mapped_column(
+        ForeignKey(TrackerOrm.id, ondelete="CASCADE"), primary_key=True
+    )
+    field: Mapped[str] = mapped_column(primary_key=True)
+    day: Mapped[datetime.date] = mapped_column(Date, primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger)
+    mean: Mapped[float] = mapped_column(DOUBLE_PRECISION)
+    m2: Mapped[float] = mapped_column(DOUBLE_PRECISION)
+    sum: Mapped[float] = mapped_column(DOUBLE_PRECISION)
+    min: Mapped[float] = mapped_column(DOUBLE_PRECISION)
+    max: Mapped[float] = mapped_column(DOUBLE_PRECISION)
+
+
+class DigestScheduleOrm(Base):
+    """Schedule of the digest messages of a user.
+
+    A digest is sent every `period_days` days at the time of `next_run_at`,
+    which is moved to the next run when the digest is claimed for sending.
+    """
+
+    __tablename__ = "digest_schedules"
+    __table_args__ = (
+        # due schedules are read in order of their next run
+        Index("ix_digest_schedules_next_run_at_user_id", "next_run_at", "user_id"),
+    )
+
+    user_id: Mapped[str] = mapped_column(
+        ForeignKey(UserOrm.id, ondelete="CASCADE"), primary_key=True
+    )
+    period_days: Mapped[int] = mapped_column(SmallInteger)
+    next_run_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True))
+    # language of the digest texts, that of the user when scheduled
+    language: Mapped[str] = mapped_column(server_default="ru")
+
+
+class ReminderOrm(Base):
+    """Reminder to fill a tracker, one per tracker.
+
+    It fires every `period_days` days at the time of `next_fire_at`, which is
+    moved to the next fire after the current time when the reminder is claimed
+    for sending.
+    """
+
+    __tablename__ = "reminders"
+    __table_args__ = (
+        # due reminders are claimed in order of their next fire
+        Index("ix_reminders_next_fire_at_tracker_id", "next_fire_at", "tracker_id"),
+    )
+
+    tracker_id: Mapped[UUID] = mapped_column(
+        ForeignKey(TrackerOrm.id, ondelete="CASCADE"), primary_key=True
+    )
+    period_days: Mapped[int] = mapped_column(SmallInteger)
+    next_fire_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True))
+    # language of the reminder texts, that of the user when set
+    language: Mapped[str] = mapped_column(server_default="ru")
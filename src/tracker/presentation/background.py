@@ -0,0 +1,80 @@
+import asyncio
+import logging
+from contextlib import suppress
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, ClassVar
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+logger = logging.getLogger(__name__)
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class BackgroundJob:
+    """Base of the jobs the bot runs next to the polling.
+
+    `start` runs `tick` in a task until `close`. After a tick the job waits
+    the seconds the tick returned, `interval` if it returned None, or until
+    `notify` wakes it up. A tick that raises is logged and retried after
+    `retry_delay`. The `counters` of the job are logged on `close`.
+    """
+
+    counters: ClassVar[tuple[str, ...]] = ()
+
+    def __init__(
+        self,
+        interval: float,
+        retry_delay: float | None = None,
+        bot: "Bot | None" = None,
+    ) -> None:
+        self.interval = interval
+        self.retry_delay = interval if retry_delay is None else retry_delay
+        self._bot = bot
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    async def start(self, bot: "Bot") -> None:
+        self._bot = bot
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        logger.info(
+            "%s: %s",
+            type(self).__name__,
+            ", ".join(f"{i} {getattr(self, i)}" for i in self.counters),
+        )
+
+    def notify(self) -> None:
+        """Wakes the job up, the next tick runs at once."""
+        self._wake.set()
+
+    async def tick(self) -> float | None:
+        """Does one round of the job.
+
+        Returns:
+            float | None: Seconds until the next round, None for `interval`.
+        """
+        raise NotImplementedError
+
+    async def _run(self) -> None:
+        while True:
+            # a wake-up during the tick is not lost
+            self._wake.clear()
+            try:
+                delay = await self.tick()
+            except Exception:
+                logger.exception("%s failed", type(self).__name__)
+                delay = self.retry_delay
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    self._wake.wait(), self.interval if delay is None else delay
+                )
@@ -0,0 +1,185 @@
+"""Compact callback data for tracker fields and enum values.
+
+Instead of the field name or enum value, the callback data holds indices into
+the tracker structure and a 16-bit tag of the structure, so it always fits into
+the 64 bytes allowed by Telegram. The data is `<prefix>:<base64url(payload)>`:
+
+- field: `f:` + tag, field index
+- enum value: `e:` + tag, field index, value index
+
+Fields are indexed in sorted order, enum values in their order in the structure.
+Callbacks are resolved by filters against the tracker stored in the FSM state,
+handlers receive plain `FieldRef` and `EnumValueRef` tuples.
+"""
+
+import base64
+import binascii
+import json
+import struct
+import zlib
+from typing import Any, NamedTuple
+
+from aiogram.filters import Filter
+from aiogram.fsm.context import FSMContext
+from aiogram.types import CallbackQuery
+from tracker.core.dynamic_json.types import FieldDataType, FieldType
+from tracker.core.lru import LRUCache
+
+FIELD_PREFIX = "f"
+ENUM_VALUE_PREFIX = "e"
+
+_FIELD = struct.Struct(">HH")
+_ENUM_VALUE = struct.Struct(">HHH")
+
+
+class FieldRef(NamedTuple):
+    name: str
+    type: FieldDataType
+
+
+class EnumValueRef(NamedTuple):
+    field_name: str
+    value: str
+
+
+def _encode(prefix: str, payload: bytes) -> str:
+    return f"{prefix}:{base64.urlsafe_b64encode(payload).rstrip(b'=').decode()}"
+
+
+def _decode(prefix: str, data: str, size: int) -> bytes | None:
+    head, _, body = data.partition(":")
+    if head != prefix:
+        return None
+    try:
+        payload = base64.urlsafe_b64decode(body + "=" * (-len(body) % 4))
+    except (binascii.Error, ValueError):
+        return None
+    return payload if len(payload) == size else None
+
+
+def structure_tag(structure: FieldType) -> int:
+    """Returns a 16-bit tag of the structure, independent of the key order."""
+    canonical = json.dumps(
+        structure, sort_keys=True, ensure_ascii=False, separators=(",", ":")
+    )
+    return zlib.crc32(canonical.encode()) & 0xFFFF
+
+
+class StructureRef:
+    """Packs and resolves compact callbacks for one tracker structure."""
+
+    __slots__ = ("structure", "tag", "names", "_positions")
+
+    def __init__(self, structure: FieldType) -> None:
+        self.structure = structure
+        self.tag = structure_tag(structure)
+        self.names = sorted(structure)
+        self._positions = {name: i for i, name in enumerate(self.names)}
+
+    def pack_field(self, name: str) -> str:
+        return _encode(FIELD_PREFIX, _FIELD.pack(self.tag, self._positions[name]))
+
+    def pack_enum_value(self, field_name: str, value: str) -> str:
+        values: list[str] = self.structure[field_name]["values"]  # type: ignore
+        return _encode(
+            ENUM_VALUE_PREFIX,
+            _ENUM_VALUE.pack(
+                self.tag, self._positions[field_name], values.index(value)
+            ),
+        )
+
+    def _field_name(self, tag: int, index: int) -> str | None:
+        if tag != self.tag or index >= len(self.names):
+            return None
+        return self.names[index]
+
+    def resolve_field(self, data: str) -> str | None:
+        """Returns the field name, None if the data belongs to another structure."""
+        payload = _decode(FIELD_PREFIX, data, _FIELD.size)
+        if payload is None:
+            return None
+        return self._field_name(*_FIELD.unpack(payload))
+
+    def resolve_enum_value(self, data: str) -> tuple[str, str] | None:
+        """Returns the field name and the value, None if the data belongs to another structure."""
+        payload = _decode(ENUM_VALUE_PREFIX, data, _ENUM_VALUE.size)
+        if payload is None:
+            return None
+        tag, field_index, value_index = _ENUM_VALUE.unpack(payload)
+        name = self._field_name(tag, field_index)
+        if name is None:
+            return None
+        values = self.structure[name].get("values") or []
+        if value_index >= len(values):
+            return None
+        return name, values[value_index]
+
+    def unpack_field(self, data: str) -> FieldRef | None:
+        name = self.resolve_field(data)
+        if name is None:
+            return None
+        return FieldRef(name, self.structure[name]["type"])
+
+    def unpack_enum_value(self, data: str) -> EnumValueRef | None:
+        resolved = self.resolve_enum_value(data)
+        if resolved is None:
+            return None
+        return EnumValueRef(*resolved)
+
+
+# structures never change, so a structure id identifies its index
+_refs: LRUCache[str, StructureRef] = LRUCache(maxsize=1024)
+
+
+def get_structure_ref(structure_id: Any, structure: FieldType) -> StructureRef:
+    """Returns the cached `StructureRef` of the structure."""
+    key = str(structure_id)
+    ref = _refs.get(key)
+    if ref is None or ref.structure != structure:
+        ref = StructureRef(structure)
+        _refs.put(key, ref)
+    return ref
+
+
+async def get_state_structure_ref(state: FSMContext) -> StructureRef | None:
+    """Returns the `StructureRef` of the tracker stored in the FSM state."""
+    tracker = (await state.get_data()).get("tracker")
+    if not tracker:
+        return None
+    return get_structure_ref(tracker["structure"]["id"], tracker["structure"]["data"])
+
+
+class FieldRefFilter(Filter):
+    """Matches compact field callbacks of the tracker in the FSM state.
+
+    Passes the resolved `FieldRef` to the handler as `callback_data`.
+    """
+
+    async def __call__(  # type: ignore
+        self, callback: CallbackQuery, state: FSMContext
+    ) -> bool | dict[str, Any]:
+        if not callback.data or not callback.data.startswith(FIELD_PREFIX + ":"):
+            return False
+        ref = await get_state_structure_ref(state)
+        if ref is None:
+            return False
+        callback_data = ref.unpack_field(callback.data)
+        return {"callback_data": callback_data} if callback_data else False
+
+
+class EnumValueRefFilter(Filter):
+    """Matches compact enum value callbacks of the tracker in the FSM state.
+
+    Passes the resolved `EnumValueRef` to the handler as `callback_data`.
+    """
+
+    async def __call__(  # type: ignore
+        self, callback: CallbackQuery, state: FSMContext
+    ) -> bool | dict[str, Any]:
+        if not callback.data or not callback.data.startswith(ENUM_VALUE_PREFIX + ":"):
+            return False
+        ref = await get_state_structure_ref(state)
+        if ref is None:
+            return False
+        callback_data = ref.unpack_enum_value(callback.data)
+        return {"callback_data": callback_data} if callback_data else False
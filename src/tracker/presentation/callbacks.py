@@ -29,22 +29,21 @@ class ConfirmCallback(CallbackData, prefix="confirm"):
     pass
 
 
-class FieldCallback(CallbackData, prefix="field"):
-    name: str
-    type: FieldDataType
-
-
 class TrackerActionsCallback(CallbackData, prefix="tracker_action"):
     action: Literal["get_options"]
 
 
 class TrackerDataActionsCallback(CallbackData, prefix="tracker_data_action"):
-    action: Literal["csv", "graph", "table", "statistics"]
+    action: Literal["csv", "graph", "table", "statistics", "analytics", "filter"]
 
 
-class PeriodCallback(CallbackData, prefix="period"):
-    period: Literal["years", "months", "weeks", "days", "hours", "minutes"]
+class TablePageCallback(CallbackData, prefix="table_page"):
+    direction: Literal["older", "newer"]
 
 
-class EnumValuesCallback(CallbackData, prefix="enum"):
-    value: str
+class TrackersPageCallback(CallbackData, prefix="trackers_page"):
+    direction: Literal["older", "newer"]
+
+
+class PeriodCallback(CallbackData, prefix="period"):
+    period: Literal["years", "months", "weeks", "days", "hours", "minutes", "all"]
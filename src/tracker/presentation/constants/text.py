@@ -19,12 +19,18 @@ class MsgKey(str, Enum):
     KBR_PLOT_GRAPH = "kbr_plot_graph"
     KBR_GET_STATISTICS = "kbr_get_statistics"
     KBR_GET_TABLE = "kbr_get_table"
+    KBR_GET_ANALYTICS = "kbr_get_analytics"
+    KBR_FILTER = "kbr_filter"
+    KBR_SEARCH_TRACKERS = "kbr_search_trackers"
     KBR_DATE_YEARS = "kbr_date_years"
     KBR_DATE_MONTHS = "kbr_date_months"
     KBR_DATE_WEEKS = "kbr_date_weeks"
     KBR_DATE_DAYS = "kbr_date_days"
     KBR_DATE_HOURS = "kbr_date_hours"
     KBR_DATE_MINUTES = "kbr_date_minutes"
+    KBR_DATE_ALL = "kbr_date_all"
+    KBR_NEWER_PAGE = "kbr_newer_page"
+    KBR_OLDER_PAGE = "kbr_older_page"
 
     CANCEL = "cancel"
     BACK = "back"
@@ -55,16 +61,50 @@ class MsgKey(str, Enum):
     DT_NO_RECORDS = "dt_no_records"
     DT_SELECT_FIELDS = "dt_select_fields"
     DT_SELECTED_FIELDS = "dt_selected_fields"
+    DT_SELECT_GRAPH_FIELD = "dt_select_graph_field"
+    DT_NO_NUMERIC_FIELDS = "dt_no_numeric_fields"
+    DT_TABLE_PAGE = "dt_table_page"
+    DT_ENTER_FILTER = "dt_enter_filter"
+    DT_FILTER_SET = "dt_filter_set"
+    DT_FILTER_CLEARED = "dt_filter_cleared"
+    DT_FILTER_WRONG_SYNTAX = "dt_filter_wrong_syntax"
+    DT_FILTER_UNKNOWN_FIELD = "dt_filter_unknown_field"
+    DT_FILTER_WRONG_VALUE = "dt_filter_wrong_value"
+    DT_FILTER_WRONG_OPERATOR = "dt_filter_wrong_operator"
 
     TR_NO_TRACKERS = "tr_no_trackers"
     TR_TRACKERS = "tr_trackers"
+    TR_DASHBOARD = "tr_dashboard"
     TR_TRACKER_NOT_FOUND = "tr_tracker_not_found"
     TR_TRACKER_NOT_ENTERED = "tr_tracker_not_entered"
     TR_TRACKER_NAME_NOT_FOUND = "tr_tracker_name_not_found"
+    TR_CHOOSE_TRACKER = "tr_choose_tracker"
     TR_ENTER_FIELD_VALUE = "tr_enter_field_value"
     TR_DATA_SAVED = "tr_data_saved"
     TR_ADDING_DATA_CANCELED = "tr_adding_data_canceled"
 
+    DG_USAGE = "dg_usage"
+    DG_SCHEDULED = "dg_scheduled"
+    DG_OFF = "dg_off"
+    DG_DAILY = "dg_daily"
+    DG_WEEKLY = "dg_weekly"
+
+    RM_USAGE = "rm_usage"
+    RM_SET = "rm_set"
+    RM_OFF = "rm_off"
+    RM_FIRE = "rm_fire"
+
+    RT_USAGE = "rt_usage"
+    RT_SET = "rt_set"
+    RT_OFF = "rt_off"
+    RT_TOO_FEW_DAYS = "rt_too_few_days"
+
+    DL_TRACKER_USAGE = "dl_tracker_usage"
+    DL_TRACKER_DELETED = "dl_tracker_deleted"
+    DL_ACCOUNT_USAGE = "dl_account_usage"
+    DL_ACCOUNT_DELETED = "dl_account_deleted"
+    DL_ACCOUNT_NOT_FOUND = "dl_account_not_found"
+
 
 TRANSLATIONS: dict[Language, dict[MsgKey, str]] = {
     "ru": {
@@ -80,12 +120,18 @@ TRANSLATIONS: dict[Language, dict[MsgKey, str]] = {
         MsgKey.KBR_PLOT_GRAPH: "Построить график",
         MsgKey.KBR_GET_STATISTICS: "Статистика",
         MsgKey.KBR_GET_TABLE: "Таблица",
+        MsgKey.KBR_GET_ANALYTICS: "Аналитика",
+        MsgKey.KBR_FILTER: "Фильтр",
+        MsgKey.KBR_SEARCH_TRACKERS: "Найти трекер",
         MsgKey.KBR_DATE_YEARS: "Года",
         MsgKey.KBR_DATE_MONTHS: "Месяцы",
         MsgKey.KBR_DATE_WEEKS: "Недели",
         MsgKey.KBR_DATE_DAYS: "Дни",
         MsgKey.KBR_DATE_HOURS: "Часы",
         MsgKey.KBR_DATE_MINUTES: "Минуты",
+        MsgKey.KBR_DATE_ALL: "За всё время",
+        MsgKey.KBR_NEWER_PAGE: "⬅️",
+        MsgKey.KBR_OLDER_PAGE: "➡️",
         MsgKey.CANCEL: "Отмена",
         MsgKey.BACK: "Назад",
         MsgKey.CONFIRM: "Готово",
@@ -112,14 +158,44 @@ TRANSLATIONS: dict[Language, dict[MsgKey, str]] = {
         MsgKey.DT_NO_RECORDS: "В трекере нет записей",
         MsgKey.DT_SELECT_FIELDS: "Выберите поля",
         MsgKey.DT_SELECTED_FIELDS: "Выбранные поля:\n {selected_fields}",
+        MsgKey.DT_SELECT_GRAPH_FIELD: "Выберите поле для графика",
+        MsgKey.DT_NO_NUMERIC_FIELDS: "В трекере нет числовых полей",
+        MsgKey.DT_TABLE_PAGE: "Страница {page}",
+        MsgKey.DT_ENTER_FILTER: "Введите фильтр записей для CSV, графиков и статистики, например:\n<code>настроение = плохо и (сон &lt; 6 или шаги &gt;= 10000)</code>\nОтправьте «-», чтобы убрать фильтр",
+        MsgKey.DT_FILTER_SET: "Фильтр: {filter}",
+        MsgKey.DT_FILTER_CLEARED: "Фильтр убран",
+        MsgKey.DT_FILTER_WRONG_SYNTAX: "Не удалось разобрать фильтр",
+        MsgKey.DT_FILTER_UNKNOWN_FIELD: "В трекере нет такого поля",
+        MsgKey.DT_FILTER_WRONG_VALUE: "Значение не подходит к полю",
+        MsgKey.DT_FILTER_WRONG_OPERATOR: "Текстовые поля сравниваются только через = и !=",
         MsgKey.TR_NO_TRACKERS: "У вас пока нет трекеров",
         MsgKey.TR_TRACKERS: "Трекеры:",
+        MsgKey.TR_DASHBOARD: "Сводка по трекерам:",
         MsgKey.TR_TRACKER_NOT_FOUND: "Трекер не найден",
         MsgKey.TR_TRACKER_NOT_ENTERED: "Ошибка: Не указан трекер!",
         MsgKey.TR_TRACKER_NAME_NOT_FOUND: "Трекер '{tracker_name}' не найден",
+        MsgKey.TR_CHOOSE_TRACKER: "Введите <code>/track &lt;название трекера&gt;</code> или найдите трекер по части названия",
         MsgKey.TR_ENTER_FIELD_VALUE: "Введите значение поля {field_name}",
         MsgKey.TR_DATA_SAVED: "Все данные сохранены!",
         MsgKey.TR_ADDING_DATA_CANCELED: "Добавление данных отменено",
+        MsgKey.DG_USAGE: "Использование: /digest daily|weekly [ЧЧ:ММ] (время UTC) или /digest off",
+        MsgKey.DG_SCHEDULED: "Сводка запланирована, следующая: {next_run_at} UTC",
+        MsgKey.DG_OFF: "Сводки отключены",
+        MsgKey.DG_DAILY: "Сводка за день:",
+        MsgKey.DG_WEEKLY: "Сводка за неделю:",
+        MsgKey.RM_USAGE: "Использование: /remind <трекер> ЧЧ:ММ [daily|weekly] (время UTC) или /remind <трекер> off",
+        MsgKey.RM_SET: "Напоминание установлено, следующее: {next_fire_at} UTC",
+        MsgKey.RM_OFF: "Напоминание отключено",
+        MsgKey.RM_FIRE: "Пора заполнить трекер '{tracker_name}': /track {tracker_name}",
+        MsgKey.RT_USAGE: "Использование: /retention <трекер> <дней> или /retention <трекер> off",
+        MsgKey.RT_SET: "Записи старше {days} дней будут перенесены в архив, статистика и графики их учитывают",
+        MsgKey.RT_OFF: "Хранение в архиве отключено, уже перенесённые записи остаются в архиве",
+        MsgKey.RT_TOO_FEW_DAYS: "Записи хранятся без архивации минимум {days} дней",
+        MsgKey.DL_TRACKER_USAGE: "Использование: /delete_tracker <трекер>",
+        MsgKey.DL_TRACKER_DELETED: "Трекер удалён, его записи будут удалены в фоне",
+        MsgKey.DL_ACCOUNT_USAGE: "Все трекеры и записи будут удалены без возможности восстановления. Для подтверждения отправьте /delete_account confirm",
+        MsgKey.DL_ACCOUNT_DELETED: "Аккаунт удалён, трекеры и записи будут удалены в фоне",
+        MsgKey.DL_ACCOUNT_NOT_FOUND: "Аккаунт не найден",
     },
     "en": {
         MsgKey.DATE_YEARS: "years",
@@ -134,12 +210,18 @@ TRANSLATIONS: dict[Language, dict[MsgKey, str]] = {
         MsgKey.KBR_PLOT_GRAPH: "Plot the graph",
         MsgKey.KBR_GET_STATISTICS: "Get statistics",
         MsgKey.KBR_GET_TABLE: "Get table",
+        MsgKey.KBR_GET_ANALYTICS: "Get analytics",
+        MsgKey.KBR_FILTER: "Filter",
+        MsgKey.KBR_SEARCH_TRACKERS: "Find a tracker",
         MsgKey.KBR_DATE_YEARS: "years",
         MsgKey.KBR_DATE_MONTHS: "months",
         MsgKey.KBR_DATE_WEEKS: "weeks",
         MsgKey.KBR_DATE_DAYS: "days",
         MsgKey.KBR_DATE_HOURS: "hours",
         MsgKey.KBR_DATE_MINUTES: "minutes",
+        MsgKey.KBR_DATE_ALL: "all time",
+        MsgKey.KBR_NEWER_PAGE: "⬅️",
+        MsgKey.KBR_OLDER_PAGE: "➡️",
         MsgKey.CANCEL: "Cancel",
         MsgKey.BACK: "Back",
         MsgKey.CONFIRM: "Done",
@@ -166,13 +248,43 @@ TRANSLATIONS: dict[Language, dict[MsgKey, str]] = {
         MsgKey.DT_NO_RECORDS: "No records in the tracker",
         MsgKey.DT_SELECT_FIELDS: "Select fields",
         MsgKey.DT_SELECTED_FIELDS: "Selected fields:\n {selected_fields}",
+        MsgKey.DT_SELECT_GRAPH_FIELD: "Select a field to plot",
+        MsgKey.DT_NO_NUMERIC_FIELDS: "The tracker has no numeric fields",
+        MsgKey.DT_TABLE_PAGE: "Page {page}",
+        MsgKey.DT_ENTER_FILTER: 'Enter a filter of the records for CSV, graphs and statistics, e.g.\n<code>mood = bad and (sleep &lt; 6 or steps &gt;= 10000)</code>\nSend "-" to remove the filter',
+        MsgKey.DT_FILTER_SET: "Filter: {filter}",
+        MsgKey.DT_FILTER_CLEARED: "Filter removed",
+        MsgKey.DT_FILTER_WRONG_SYNTAX: "The filter cannot be parsed",
+        MsgKey.DT_FILTER_UNKNOWN_FIELD: "The tracker has no such field",
+        MsgKey.DT_FILTER_WRONG_VALUE: "The value does not fit the field",
+        MsgKey.DT_FILTER_WRONG_OPERATOR: "Text fields are compared with = and != only",
         MsgKey.TR_NO_TRACKERS: "You don’t have any trackers yet",
         MsgKey.TR_TRACKERS: "Trackers:",
+        MsgKey.TR_DASHBOARD: "Trackers overview:",
         MsgKey.TR_TRACKER_NOT_FOUND: "Tracker not found",
         MsgKey.TR_TRACKER_NOT_ENTERED: "Error: Tracker not specified!",
         MsgKey.TR_TRACKER_NAME_NOT_FOUND: "Tracker '{tracker_name}' not found",
+        MsgKey.TR_CHOOSE_TRACKER: "Enter <code>/track &lt;tracker name&gt;</code> or find a tracker by a part of its name",
         MsgKey.TR_ENTER_FIELD_VALUE: "Enter a value for field {field_name}",
         MsgKey.TR_DATA_SAVED: "All data has been saved!",
         MsgKey.TR_ADDING_DATA_CANCELED: "Data entry canceled",
+        MsgKey.DG_USAGE: "Usage: /digest daily|weekly [HH:MM] (UTC time) or /digest off",
+        MsgKey.DG_SCHEDULED: "Digest scheduled, the next one: {next_run_at} UTC",
+        MsgKey.DG_OFF: "Digests are turned off",
+        MsgKey.DG_DAILY: "Daily digest:",
+        MsgKey.DG_WEEKLY: "Weekly digest:",
+        MsgKey.RM_USAGE: "Usage: /remind <tracker> HH:MM [daily|weekly] (UTC time) or /remind <tracker> off",
+        MsgKey.RM_SET: "Reminder set, the next one: {next_fire_at} UTC",
+        MsgKey.RM_OFF: "Reminder turned off",
+        MsgKey.RM_FIRE: "Time to fill tracker '{tracker_name}': /track {tracker_name}",
+        MsgKey.RT_USAGE: "Usage: /retention <tracker> <days> or /retention <tracker> off",
+        MsgKey.RT_SET: "Records older than {days} days will be archived, statistics and charts still include them",
+        MsgKey.RT_OFF: "Archiving is turned off, already archived records stay archived",
+        MsgKey.RT_TOO_FEW_DAYS: "Records are kept unarchived for at least {days} days",
+        MsgKey.DL_TRACKER_USAGE: "Usage: /delete_tracker <tracker>",
+        MsgKey.DL_TRACKER_DELETED: "Tracker deleted, its records will be removed in the background",
+        MsgKey.DL_ACCOUNT_USAGE: "All trackers and records will be deleted permanently. To confirm, send /delete_account confirm",
+        MsgKey.DL_ACCOUNT_DELETED: "Account deleted, trackers and records will be removed in the background",
+        MsgKey.DL_ACCOUNT_NOT_FOUND: "Account not found",
     },
 }
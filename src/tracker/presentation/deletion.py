@@ -0,0 +1,67 @@
+import asyncio
+import logging
+from uuid import UUID
+
+from tracker.presentation.background import BackgroundJob
+from tracker.services.database import DeletionService
+
+logger = logging.getLogger(__name__)
+
+
+class DeletionReaper(BackgroundJob):
+    """Removes the deleted trackers and users.
+
+    The rows of each deleted tracker are deleted in batches of `batch_size`,
+    each in its own short transaction followed by a pause of `pause` seconds,
+    so adding records is never blocked for long and the deletion takes a
+    bounded share of the database. The progress is logged every
+    `log_every` batches. Once nothing is left of a tracker it is deleted
+    itself, and so are the deleted users without trackers.
+
+    The reaper looks for deleted trackers every `interval` seconds, deletions
+    through this process wake it up at once. Batches skip the rows locked by
+    other processes, so any number of bot processes can run a reaper.
+    """
+
+    counters = ("deleted_rows", "deleted_trackers", "deleted_users")
+
+    def __init__(
+        self,
+        deletion_service: DeletionService,
+        batch_size: int = 1000,
+        pause: float = 0.1,
+        interval: float = 600,
+        log_every: int = 100,
+    ) -> None:
+        super().__init__(interval)
+        self.deletion_service = deletion_service
+        self.batch_size = batch_size
+        self.pause = pause
+        self.log_every = log_every
+        self.deleted_rows = 0
+        self.deleted_trackers = 0
+        self.deleted_users = 0
+
+    async def tick(self) -> None:
+        """Removes the deleted trackers and users."""
+        while tracker_ids := await self.deletion_service.get_deleted_trackers(
+            limit=self.batch_size
+        ):
+            for tracker_id in tracker_ids:
+                await self._reap(tracker_id)
+        self.deleted_users += await self.deletion_service.purge_users()
+
+    async def _reap(self, tracker_id: UUID) -> None:
+        rows = batches = 0
+        while deleted := await self.deletion_service.purge_records(
+            tracker_id, limit=self.batch_size
+        ):
+            rows += deleted
+            self.deleted_rows += deleted
+            batches += 1
+            if batches % self.log_every == 0:
+                logger.info("Deleting tracker %s: %s rows deleted", tracker_id, rows)
+            await asyncio.sleep(self.pause)
+        if await self.deletion_service.purge_tracker(tracker_id):
+            self.deleted_trackers += 1
+            logger.info("Deleted tracker %s with %s rows", tracker_id, rows)
@@ -0,0 +1,135 @@
+import asyncio
+import heapq
+import logging
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Callable, cast
+
+from aiogram import html
+from aiogram.exceptions import TelegramAPIError
+from tracker.presentation.background import BackgroundJob, utcnow
+from tracker.presentation.constants.text import Language, MsgKey
+from tracker.presentation.outbound import Lane, outbound_lane
+from tracker.presentation.utils import _t, split_blocks
+from tracker.schemas import DashboardTrackerData, DigestSchedule
+from tracker.services.database import ScheduleService
+from tracker.use_cases import CollectDigestsUseCase
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+logger = logging.getLogger(__name__)
+
+_HEADERS = {1: MsgKey.DG_DAILY, 7: MsgKey.DG_WEEKLY}
+
+
+class DigestScheduler(BackgroundJob):
+    """Sends the scheduled digests.
+
+    Schedules stay in the database. Only those due within `lookahead` seconds
+    are loaded, at most `batch_size` of them, into a min-heap ordered by their
+    next run, and the loop sleeps until the first of them is due or the
+    loaded period ends. Digests due at the same time are collected in batches
+    of `batch_size` users, each with a fixed number of queries, and sent
+    through the bulk lane of the outbound scheduler.
+
+    A schedule is claimed in the database before it is sent, so a digest is
+    sent at most once even if its schedule was loaded twice or changed after
+    loading.
+    """
+
+    counters = ("sent", "failed")
+
+    def __init__(
+        self,
+        schedule_service: ScheduleService,
+        collect: CollectDigestsUseCase,
+        lookahead: float = 600,
+        batch_size: int = 1000,
+        max_trackers: int = 20,
+        retry_delay: float = 60,
+        clock: Callable[[], datetime] = utcnow,
+        bot: "Bot | None" = None,
+    ) -> None:
+        super().__init__(lookahead, retry_delay, bot)
+        self.schedule_service = schedule_service
+        self.collect = collect
+        self.lookahead = timedelta(seconds=lookahead)
+        self.batch_size = batch_size
+        self.max_trackers = max_trackers
+        self.clock = clock
+        self.sent = 0
+        self.failed = 0
+        self._heap: list[tuple[datetime, str]] = []
+        # the heap holds every schedule due up to this time
+        self._loaded_until: datetime | None = None
+
+    def notify(self, schedule: DigestSchedule) -> None:  # type: ignore[override]
+        """Adds a set schedule to the loaded ones if it is due before the
+        next load, later ones are loaded when their time comes."""
+        if (
+            self._loaded_until is not None
+            and schedule.next_run_at <= self._loaded_until
+        ):
+            heapq.heappush(self._heap, schedule.key)
+            super().notify()
+
+    async def tick(self) -> float:
+        """Sends the due digests.
+
+        Returns:
+            float: Seconds until the next digest is due or the loaded
+                schedules run out.
+        """
+        now = self.clock()
+        if self._loaded_until is None or now >= self._loaded_until:
+            self._loaded_until = await self._load(now)
+        loaded_until = self._loaded_until
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap)[1])
+        for start in range(0, len(due), self.batch_size):
+            await self._send(due[start : start + self.batch_size], now)
+
+        next_at = min(self._heap[0][0], loaded_until) if self._heap else loaded_until
+        return max((next_at - self.clock()).total_seconds(), 0)
+
+    async def _load(self, now: datetime) -> datetime:
+        """Loads the schedules due soon, returns until when all are loaded."""
+        until = now + self.lookahead
+        schedules = await self.schedule_service.get_due_digests(
+            until=until, limit=self.batch_size
+        )
+        # sorted by the key, so already a heap
+        self._heap = [i.key for i in schedules]
+        if len(schedules) < self.batch_size:
+            return until
+        # a full batch may have left out schedules due at its last run
+        return schedules[-1].next_run_at
+
+    async def _send(self, user_ids: list[str], now: datetime) -> None:
+        digests = await self.collect.execute(
+            user_ids=user_ids, now=now, max_trackers=self.max_trackers
+        )
+        await asyncio.gather(
+            *(self._deliver(schedule, summaries) for schedule, summaries in digests)
+        )
+
+    async def _deliver(
+        self, schedule: DigestSchedule, summaries: list[DashboardTrackerData]
+    ) -> None:
+        if self._bot is None:
+            return
+        header = _t(
+            lang=cast(Language, schedule.language), key=_HEADERS[schedule.period_days]
+        )
+        blocks = [header, *(html.quote(i.formatted) for i in summaries)]
+        try:
+            with outbound_lane(Lane.BULK):
+                for text in split_blocks(blocks):
+                    await self._bot.send_message(chat_id=schedule.user_id, text=text)
+        except TelegramAPIError as e:
+            # e.g. the user blocked the bot, the next digest is still tried
+            self.failed += 1
+            logger.warning("Failed to send the digest to %s: %s", schedule.user_id, e)
+            return
+        self.sent += 1
@@ -0,0 +1,64 @@
+import logging
+
+from tracker.presentation.background import BackgroundJob
+from tracker.services.database import FilterIndexService
+
+logger = logging.getLogger(__name__)
+
+
+class FilterIndexJob(BackgroundJob):
+    """Indexes the fields of trackers whose records are filtered often.
+
+    Every `interval` seconds the indexes of deleted trackers are dropped and
+    up to `batch_size` fields filtered at least `min_uses` times get an
+    index, one at a time. Indexes are built concurrently, so adding records
+    is not blocked while they are. Every index slows down all inserts of
+    records, so there are at most `max_indexes` of them: the fields that
+    fall out of the most filtered ones lose their indexes first.
+    """
+
+    counters = ("created", "dropped")
+
+    def __init__(
+        self,
+        filter_index_service: FilterIndexService,
+        min_uses: int = 20,
+        batch_size: int = 10,
+        interval: float = 3600,
+        max_indexes: int = 100,
+    ) -> None:
+        super().__init__(interval)
+        self.filter_index_service = filter_index_service
+        self.min_uses = min_uses
+        self.batch_size = batch_size
+        self.max_indexes = max_indexes
+        self.created = 0
+        self.dropped = 0
+
+    async def tick(self) -> None:
+        """Drops the orphaned and the least used indexes and indexes the
+        fields filtered often, within `max_indexes`.
+
+        A field that fails to be indexed is logged and skipped, it is tried
+        again on the next tick.
+        """
+        self.dropped += await self.filter_index_service.drop_orphaned_indexes()
+        self.dropped += await self.filter_index_service.drop_least_used_indexes(
+            min_uses=self.min_uses, max_indexes=self.max_indexes
+        )
+        free = self.max_indexes - len(await self.filter_index_service.get_indexes())
+        if free <= 0:
+            return
+        fields = await self.filter_index_service.get_unindexed_fields(
+            min_uses=self.min_uses,
+            limit=min(self.batch_size, free),
+            max_indexes=self.max_indexes,
+        )
+        for tracker_id, field in fields:
+            try:
+                name = await self.filter_index_service.create_index(tracker_id, field)
+            except Exception:
+                logger.exception("Failed to index field %s of %s", field, tracker_id)
+                continue
+            if name is not None:
+                self.created += 1
@@ -1,20 +1,48 @@
 from typing import Any, Awaitable, Callable, Dict
 
 from aiogram import BaseMiddleware, Bot
+from aiogram.fsm.context import FSMContext
 from aiogram.types import (
     CallbackQuery,
     InaccessibleMessage,
     Message,
     TelegramObject,
+    Update,
 )
-from tracker.presentation.utils import KeyboardBuilder, _t
-from tracker.services.database import DataService, TrackerService, UserService
+from tracker.presentation.callback_codec import get_state_structure_ref
+from tracker.presentation.utils import KeyboardBuilder, KeyboardCache, _t
+from tracker.services.database import (
+    DataService,
+    DeletionService,
+    FilterIndexService,
+    RetentionService,
+    ScheduleService,
+    TrackerService,
+    UnitOfWork,
+    UserService,
+)
+from tracker.tools.update_log import UpdateAnonymizer, UpdateLogWriter
 
 
 class DBMiddleware(BaseMiddleware):
-    def __init__(self, sessionmaker):
+    def __init__(
+        self,
+        sessionmaker,
+        unit_of_work: bool = True,
+        keyboard_cache: KeyboardCache | None = None,
+    ):
         super().__init__()
         self.sessionmaker = sessionmaker
+        self.unit_of_work = unit_of_work
+        self.keyboard_cache = keyboard_cache
+        # services are stateless, sessions come from the factory or the unit of work
+        self.data_service = DataService(session_factory=sessionmaker)
+        self.tracker_service = TrackerService(session_factory=sessionmaker)
+        self.user_service = UserService(session_factory=sessionmaker)
+        self.schedule_service = ScheduleService(session_factory=sessionmaker)
+        self.retention_service = RetentionService(session_factory=sessionmaker)
+        self.deletion_service = DeletionService(session_factory=sessionmaker)
+        self.filter_index_service = FilterIndexService(session_factory=sessionmaker)
 
     async def __call__(
         self,
@@ -23,14 +51,25 @@ class DBMiddleware(BaseMiddleware):
         data: Dict[str, Any],
     ) -> Any:
         data["sessionmaker"] = self.sessionmaker
-        data["data_service"] = DataService(session_factory=self.sessionmaker)
-        data["tracker_service"] = TrackerService(session_factory=self.sessionmaker)
-        data["user_service"] = UserService(session_factory=self.sessionmaker)
+        data["data_service"] = self.data_service
+        data["tracker_service"] = self.tracker_service
+        data["user_service"] = self.user_service
+        data["schedule_service"] = self.schedule_service
+        data["retention_service"] = self.retention_service
+        data["deletion_service"] = self.deletion_service
+        data["filter_index_service"] = self.filter_index_service
         t = data.get("t")
         if not t:
             raise RuntimeError("Error getting 't' func from middleware data")
-        data["kbr_builder"] = KeyboardBuilder(t=t)
-        return await handler(event, data)
+        # builders accumulate buttons, so they are not shared between updates
+        data["kbr_builder"] = KeyboardBuilder(
+            t=t, lang=data.get("lang"), cache=self.keyboard_cache
+        )
+
+        if not self.unit_of_work:
+            return await handler(event, data)
+        async with UnitOfWork(self.sessionmaker):
+            return await handler(event, data)
 
 
 class LanguageMiddleware(BaseMiddleware):
@@ -50,6 +89,8 @@ class LanguageMiddleware(BaseMiddleware):
             user_obj = event.from_user
         elif hasattr(event, "message") and isinstance(event.message, Message):
             user_obj = event.message.from_user
+        elif getattr(event, "inline_query", None) is not None:
+            user_obj = event.inline_query.from_user  # type: ignore
 
         lang = getattr(user_obj, "language_code", None) or self.default_lang
         lang = "ru" if lang.startswith("ru") else "en"
@@ -80,3 +121,31 @@ class CallbackMessageMiddleware(BaseMiddleware):
             return
 
         return await handler(event, data)
+
+
+class UpdateRecorderMiddleware(BaseMiddleware):
+    """Writes anonymized incoming updates to a log for later replay."""
+
+    def __init__(self, writer: UpdateLogWriter, anonymizer: UpdateAnonymizer):
+        self.writer = writer
+        self.anonymizer = anonymizer
+
+    async def __call__(  # type: ignore
+        self,
+        handler: Callable[[Update, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any],
+    ) -> Any:
+        record = self.anonymizer.anonymize(event)
+        query = event.callback_query
+        state: FSMContext | None = data.get("state")
+        if query and query.data and state is not None:
+            ref = await get_state_structure_ref(state)
+            if ref is not None:
+                record["callback_query"]["data"] = (
+                    self.anonymizer.anonymize_structure_callback(
+                        query.data, ref.structure
+                    )
+                )
+        self.writer.write(record)
+        return await handler(event, data)
@@ -0,0 +1,237 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import TYPE_CHECKING, Iterator
+
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+from tracker.core.lru import LRUCache
+from tracker.services.database import commit_unit_of_work
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+logger = logging.getLogger(__name__)
+
+# methods that post to a chat, the ones Telegram rate limits
+_LIMITED_PREFIXES = ("send", "edit", "copy", "forward")
+_BULK_METHODS = {"sendDocument", "sendPhoto", "sendMediaGroup"}
+
+
+class Lane(IntEnum):
+    """Priority of an outgoing request, lower goes first."""
+
+    INTERACTIVE = 0
+    BULK = 1
+
+
+_lane: ContextVar[Lane | None] = ContextVar("outbound_lane", default=None)
+
+
+@contextmanager
+def outbound_lane(lane: Lane) -> Iterator[None]:
+    """Sends the requests made inside the block through the given lane.
+
+    Example:
+        with outbound_lane(Lane.BULK):
+            await bot.send_message(chat_id, digest)
+    """
+    token = _lane.set(lane)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Returns how long to wait until a token is available."""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float) -> None:
+        self._refill(now)
+        self.tokens -= 1
+
+    def reserve(self, now: float) -> float:
+        """Takes a token in advance and returns how long to wait for it."""
+        self.take(now)
+        return max(0.0, -self.tokens / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Empties the bucket so that the next token is available in `seconds`."""
+        self._refill(time.monotonic())
+        self.tokens = min(self.tokens, 1 - seconds * self.rate)
+
+
+@dataclass
+class OutboundMetrics:
+    # waiting for a global token, per lane
+    queued: dict[str, int] = field(default_factory=dict)
+    max_queued: int = 0
+    # waiting for a token of their chat
+    chat_delayed: int = 0
+    sent: int = 0
+    retries: int = 0
+    failed_retries: int = 0
+
+
+class OutboundScheduler(BaseRequestMiddleware):
+    """Session middleware that paces requests to Telegram.
+
+    Requests posting to a chat wait for a token of their chat's bucket and then
+    of the global bucket. Waiters for a global token are served by lane and in
+    order of arrival, so interactive replies overtake queued bulk deliveries.
+    Other methods (polling, callback answers, deletions) are not delayed.
+
+    On 429 the request is retried after `retry_after`; the chat (or the whole
+    bot for requests without a chat) is paused for that time.
+    """
+
+    def __init__(
+        self,
+        global_rate: float = 30,
+        chat_rate: float = 1,
+        chat_burst: float = 3,
+        max_retries: int = 3,
+        max_chats: int = 10000,
+    ) -> None:
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_retries = max_retries
+        self._global = TokenBucket(global_rate, global_rate)
+        self._chats: LRUCache[int | str, TokenBucket] = LRUCache(max_chats)
+        self._queue: list[tuple[Lane, int, asyncio.Future[None]]] = []
+        self._seq = itertools.count()
+        self._dispatcher: asyncio.Task | None = None
+        self._metrics = OutboundMetrics()
+
+    def metrics(self) -> OutboundMetrics:
+        """Returns a snapshot of the queue depth per lane and the counters."""
+        queued = {lane.name.lower(): 0 for lane in Lane}
+        for lane, _, waiter in self._queue:
+            if not waiter.done():
+                queued[lane.name.lower()] += 1
+        return OutboundMetrics(
+            queued=queued,
+            max_queued=self._metrics.max_queued,
+            chat_delayed=self._metrics.chat_delayed,
+            sent=self._metrics.sent,
+            retries=self._metrics.retries,
+            failed_retries=self._metrics.failed_retries,
+        )
+
+    def log_metrics(self) -> None:
+        logger.info("Outbound requests: %s", self.metrics())
+
+    def _chat_bucket(self, chat_id: int | str) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            bucket = TokenBucket(self.chat_rate, self.chat_burst)
+            self._chats.put(chat_id, bucket)
+        return bucket
+
+    async def _dispatch(self) -> None:
+        while self._queue:
+            wait = self._global.delay(time.monotonic())
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            _, _, waiter = heapq.heappop(self._queue)
+            if waiter.done():  # cancelled while waiting
+                continue
+            self._global.take(time.monotonic())
+            waiter.set_result(None)
+        self._dispatcher = None
+
+    async def _acquire(self, lane: Lane, chat_id: int | str | None) -> None:
+        if chat_id is not None:
+            delay = self._chat_bucket(chat_id).reserve(time.monotonic())
+            if delay > 0:
+                self._metrics.chat_delayed += 1
+                try:
+                    await asyncio.sleep(delay)
+                finally:
+                    self._metrics.chat_delayed -= 1
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (lane, next(self._seq), waiter))
+        self._metrics.max_queued = max(self._metrics.max_queued, len(self._queue))
+        if self._dispatcher is None:
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        await waiter
+
+    def _lane(self, method: TelegramMethod) -> Lane:
+        lane = _lane.get()
+        if lane is not None:
+            return lane
+        return Lane.BULK if method.__api_method__ in _BULK_METHODS else Lane.INTERACTIVE
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: "Bot",
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        if not method.__api_method__.startswith(_LIMITED_PREFIXES):
+            return await make_request(bot, method)
+
+        chat_id = getattr(method, "chat_id", None)
+        lane = self._lane(method)
+        attempt = 0
+        while True:
+            await self._acquire(lane, chat_id)
+            try:
+                response = await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                if attempt >= self.max_retries:
+                    self._metrics.failed_retries += 1
+                    raise
+                attempt += 1
+                self._metrics.retries += 1
+                if chat_id is not None:
+                    self._chat_bucket(chat_id).pause(e.retry_after)
+                else:
+                    self._global.pause(e.retry_after)
+                continue
+            self._metrics.sent += 1
+            return response
+
+
+class CommitBeforeRequest(BaseRequestMiddleware):
+    """Session middleware that commits the current unit of work first.
+
+    Replies are sent after the changes they report are committed, and the
+    handler's connection is not held while a request waits for its turn or
+    for Telegram. Registered before `OutboundScheduler` so it runs first.
+    """
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: "Bot",
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        await commit_unit_of_work()
+        return await make_request(bot, method)
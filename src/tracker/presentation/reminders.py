@@ -0,0 +1,99 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, cast
+
+from aiogram import html
+from aiogram.exceptions import TelegramAPIError
+from tracker.presentation.background import BackgroundJob, utcnow
+from tracker.presentation.constants.text import Language, MsgKey
+from tracker.presentation.outbound import Lane, outbound_lane
+from tracker.presentation.utils import _t
+from tracker.schemas import FiredReminder, Reminder
+from tracker.services.database import ScheduleService
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+logger = logging.getLogger(__name__)
+
+
+class ReminderWorker(BackgroundJob):
+    """Sends the reminders to fill trackers.
+
+    Due reminders are claimed in the database in batches of `batch_size`,
+    which moves them to their next fire, and then sent through the bulk lane
+    of the outbound scheduler. Claims skip the reminders locked by other
+    workers, so any number of bot processes can run a worker and each
+    reminder is sent once.
+
+    Between claims the worker sleeps until the soonest reminder fires, but
+    at most `poll_interval` seconds, as reminders set through other
+    processes are only seen by the next claim. Reminders set through this
+    process wake it up if they fire sooner.
+    """
+
+    counters = ("sent", "failed")
+
+    def __init__(
+        self,
+        schedule_service: ScheduleService,
+        batch_size: int = 1000,
+        poll_interval: float = 60,
+        retry_delay: float = 60,
+        clock: Callable[[], datetime] = utcnow,
+        bot: "Bot | None" = None,
+    ) -> None:
+        super().__init__(poll_interval, retry_delay, bot)
+        self.schedule_service = schedule_service
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.clock = clock
+        self.sent = 0
+        self.failed = 0
+        self._next_fire_at: datetime | None = None
+
+    def notify(self, reminder: Reminder) -> None:  # type: ignore[override]
+        """Wakes the worker up if a set reminder fires before it would."""
+        if self._next_fire_at is None or reminder.next_fire_at < self._next_fire_at:
+            self._next_fire_at = reminder.next_fire_at
+            super().notify()
+
+    async def tick(self) -> float:
+        """Sends the due reminders.
+
+        Returns:
+            float: Seconds until the soonest reminder fires or the next poll.
+        """
+        now = self.clock()
+        while True:
+            claimed = await self.schedule_service.claim_due_reminders(
+                now, limit=self.batch_size
+            )
+            await asyncio.gather(*(self._deliver(i) for i in claimed))
+            if len(claimed) < self.batch_size:
+                break
+
+        self._next_fire_at = await self.schedule_service.get_next_fire_at()
+        if self._next_fire_at is None:
+            return self.poll_interval
+        delay = (self._next_fire_at - self.clock()).total_seconds()
+        return min(max(delay, 0), self.poll_interval)
+
+    async def _deliver(self, reminder: FiredReminder) -> None:
+        if self._bot is None:
+            return
+        text = _t(
+            lang=cast(Language, reminder.language),
+            key=MsgKey.RM_FIRE,
+            tracker_name=html.quote(reminder.tracker_name),
+        )
+        try:
+            with outbound_lane(Lane.BULK):
+                await self._bot.send_message(chat_id=reminder.user_id, text=text)
+        except TelegramAPIError as e:
+            # e.g. the user blocked the bot, the next reminder is still tried
+            self.failed += 1
+            logger.warning("Failed to send the reminder to %s: %s", reminder.user_id, e)
+            return
+        self.sent += 1
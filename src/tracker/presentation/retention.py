@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+from typing import Callable
+
+from tracker.presentation.background import BackgroundJob, utcnow
+from tracker.services.database import RetentionService
+from tracker.services.database.archive import day_start
+
+
+class RetentionJob(BackgroundJob):
+    """Archives the records older than the retention policies of trackers.
+
+    Every `interval` seconds the records of each tracker with a policy that
+    are older than its whole UTC days are moved into the archive in batches
+    of `batch_size`, each batch in its own short transaction, so adding
+    records is never blocked for long. Batches skip the records locked by
+    other processes, so any number of bot processes can run the job.
+    """
+
+    counters = ("archived",)
+
+    def __init__(
+        self,
+        retention_service: RetentionService,
+        batch_size: int = 10000,
+        interval: float = 3600,
+        clock: Callable[[], datetime] = utcnow,
+    ) -> None:
+        super().__init__(interval)
+        self.retention_service = retention_service
+        self.batch_size = batch_size
+        self.clock = clock
+        self.archived = 0
+
+    async def tick(self) -> None:
+        """Archives the records older than the policies."""
+        now = self.clock()
+        for policy in await self.retention_service.get_policies():
+            before = day_start(now - timedelta(days=policy.raw_days))
+            while True:
+                count = await self.retention_service.archive_records(
+                    policy.tracker_id, before, limit=self.batch_size
+                )
+                self.archived += count
+                if count < self.batch_size:
+                    break
@@ -24,7 +24,7 @@ from tracker.presentation.utils import (
     update_main_message,
 )
 from tracker.schemas import TrackerCreate
-from tracker.services.database import TrackerService, UserService
+from tracker.services.database import TrackerService
 from tracker.use_cases import (
     CreateTrackerDraftUseCase,
     FinishTrackerCreation,
@@ -232,12 +232,11 @@ async def process_next_action_finish(
     callback: CallbackQueryWithMessage,
     state: FSMContext,
     tracker_service: TrackerService,
-    user_service: UserService,
     t: TFunction,
 ):
     data = await DataModelTracker.load(state)
 
-    uc = FinishTrackerCreation(tracker_service, user_service)
+    uc = FinishTrackerCreation(tracker_service)
     tracker, err = await uc.execute(tracker=data.tracker)
     if err:
         match err:
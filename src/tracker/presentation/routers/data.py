@@ -1,39 +1,54 @@
 from io import BytesIO
 from typing import Literal, cast
 
-from aiogram import F, Router
+from aiogram import F, Router, html
+from aiogram.filters.callback_data import CallbackData
 from aiogram.fsm.context import FSMContext
-from aiogram.types import Message
+from aiogram.types import MaybeInaccessibleMessageUnion, Message
 from aiogram.types.input_file import BufferedInputFile
 
+from tracker.core.record_filter import RecordFilter, parse_filter
+from tracker.presentation.callback_codec import FieldRef, FieldRefFilter
 from tracker.presentation.callbacks import (
     BackCallback,
     CancelCallback,
     ConfirmCallback,
-    FieldCallback,
     PeriodCallback,
+    TablePageCallback,
     TrackerActionsCallback,
     TrackerDataActionsCallback,
 )
 from tracker.presentation.constants import PERIOD_TYPES
 from tracker.presentation.constants.text import MsgKey
+from tracker.presentation.outbound import Lane, outbound_lane
 from tracker.presentation.states import DataState
 from tracker.presentation.utils import (
+    MESSAGE_LIMIT,
     CallbackQueryWithMessage,
     KeyboardBuilder,
+    PageCursor,
     TFunction,
     convert_date,
+    format_table,
+    split_blocks,
     update_main_message,
 )
 from tracker.presentation.utils.state import StateModel
+from tracker.schemas import DataRowResult, Page
 from tracker.schemas.tracker import TrackerResponse
 from tracker.services.database.data_service import DataService
+from tracker.services.database.filter_index_service import FilterIndexService
 from tracker.services.database.tracker_service import TrackerService
 from tracker.use_cases import (
+    GetAnalyticsUseCase,
     GetCSVUseCase,
+    GetGraphUseCase,
     GetStatisticsUseCase,
+    GetTablePageUseCase,
     HandleFieldUseCase,
+    ParseRecordFilterUseCase,
     SplitFieldsByTypeUseCase,
+    StatisticsCache,
     ValidatePeriodValueUseCase,
 )
 
@@ -43,31 +58,55 @@ router = Router(name=__name__)
 class DataModelAction(StateModel):
     tracker: TrackerResponse
     action: str
-    period_type: Literal["years", "months", "weeks", "days", "hours", "minutes"]
+    period_type: Literal["years", "months", "weeks", "days", "hours", "minutes", "all"]
+    filter: str | None = None
 
+    @property
+    def where(self) -> RecordFilter | None:
+        """The filter of the records, checked when it was entered."""
+        if not self.filter:
+            return None
+        return parse_filter(self.filter, self.tracker.structure.data)
 
-class DataModelStrict(DataModelAction):
+
+class DataModelPeriod(DataModelAction):
     period_value: int
+
+
+class DataModelStrict(DataModelPeriod):
     selected_fields: list[str]
 
 
+class DataModelTable(DataModelPeriod):
+    table: PageCursor
+
+
 class DataModel(StateModel):
     tracker: TrackerResponse | None = None
     action: str | None = None
     period_type: str | None = None
     period_value: int | None = None
     selected_fields: list[str] | None = None
+    table: PageCursor | None = None
+    filter: str | None = None
 
 
 @router.callback_query(DataState.AWAIT_FIELDS_SELECTION, CancelCallback.filter())
+@router.callback_query(DataState.AWAIT_GRAPH_FIELD, CancelCallback.filter())
+@router.callback_query(DataState.BROWSE_TABLE, CancelCallback.filter())
 @router.callback_query(TrackerActionsCallback.filter(F.action == "get_options"))
 @router.callback_query(DataState.AWAIT_PERIOD_TYPE, BackCallback.filter())
+@router.callback_query(DataState.AWAIT_FILTER, BackCallback.filter())
 async def tracker_actions_options(
     callback: CallbackQueryWithMessage,
+    callback_data: CallbackData,
     state: FSMContext,
     t: TFunction,
     kbr_builder: KeyboardBuilder,
 ):
+    if isinstance(callback_data, TrackerActionsCallback):
+        # a filter is kept for the actions on one tracker
+        await DataModel(filter=None).save(state)
     await state.set_state(DataState.AWAIT_ACTION)
     await update_main_message(
         state=state,
@@ -80,6 +119,69 @@ async def tracker_actions_options(
     await callback.answer()
 
 
+@router.callback_query(TrackerDataActionsCallback.filter(F.action == "filter"))
+async def filter_enter(
+    callback: CallbackQueryWithMessage,
+    state: FSMContext,
+    t: TFunction,
+    kbr_builder: KeyboardBuilder,
+):
+    await state.set_state(DataState.AWAIT_FILTER)
+    await update_main_message(
+        state=state,
+        message=callback.message,
+        text=t(MsgKey.DT_ENTER_FILTER),
+        reply_markup=kbr_builder.conf(add_back_button=True).build_service_keyboard(),
+    )
+    await callback.answer()
+
+
+@router.message(DataState.AWAIT_FILTER)
+async def handle_filter(
+    message: Message,
+    state: FSMContext,
+    filter_index_service: FilterIndexService,
+    t: TFunction,
+    kbr_builder: KeyboardBuilder,
+):
+    if message.text and message.text.strip() == "-":
+        await DataModel(filter=None).save(state)
+        text = t(MsgKey.DT_FILTER_CLEARED)
+    else:
+        data = await DataModel.load(state)
+        uc = ParseRecordFilterUseCase(filter_index_service=filter_index_service)
+        _, err = await uc.execute(
+            tracker=cast(TrackerResponse, data.tracker), text=message.text
+        )
+        if err:
+            match err:
+                case (
+                    ParseRecordFilterUseCase.Error.NO_TEXT
+                    | ParseRecordFilterUseCase.Error.WRONG_SYNTAX
+                ):
+                    await message.answer(t(MsgKey.DT_FILTER_WRONG_SYNTAX))
+                case ParseRecordFilterUseCase.Error.UNKNOWN_FIELD:
+                    await message.answer(t(MsgKey.DT_FILTER_UNKNOWN_FIELD))
+                case ParseRecordFilterUseCase.Error.WRONG_VALUE:
+                    await message.answer(t(MsgKey.DT_FILTER_WRONG_VALUE))
+                case ParseRecordFilterUseCase.Error.WRONG_OPERATOR:
+                    await message.answer(t(MsgKey.DT_FILTER_WRONG_OPERATOR))
+            return
+        filter_text = cast(str, message.text).strip()
+        await DataModel(filter=filter_text).save(state)
+        text = t(MsgKey.DT_FILTER_SET, filter=html.quote(filter_text))
+
+    await state.set_state(DataState.AWAIT_ACTION)
+    await update_main_message(
+        state=state,
+        message=message,
+        text=f"{text}\n{t(MsgKey.DT_SELECT_ACTION)}",
+        reply_markup=kbr_builder.conf(
+            add_back_button=True
+        ).build_tracker_data_action_keyboard(),
+    )
+
+
 @router.callback_query(TrackerDataActionsCallback.filter())
 async def period_type_select(
     callback: CallbackQueryWithMessage,
@@ -105,8 +207,27 @@ async def period_value_select(
     callback: CallbackQueryWithMessage,
     callback_data: PeriodCallback,
     state: FSMContext,
+    data_service: DataService,
+    tracker_service: TrackerService,
     t: TFunction,
+    kbr_builder: KeyboardBuilder,
+    table_page_size: int,
 ):
+    if callback_data.period == "all":
+        # the value is not asked for, any number would do
+        await DataModel(period_type=callback_data.period, period_value=0).save(state)
+        await callback.answer()
+        await run_data_action(
+            callback.message,
+            state,
+            data_service,
+            tracker_service,
+            t,
+            kbr_builder,
+            table_page_size,
+        )
+        return
+
     period_word = t(PERIOD_TYPES[callback_data.period])
     await state.set_state(DataState.AWAIT_PERIOD_VALUE)
     await DataModel(period_type=callback_data.period).save(state)
@@ -127,6 +248,7 @@ async def handle_period_value(
     tracker_service: TrackerService,
     t: TFunction,
     kbr_builder: KeyboardBuilder,
+    table_page_size: int,
 ):
     handle_period_value_uc = ValidatePeriodValueUseCase()
     period_value, err = handle_period_value_uc.execute(text=message.text)
@@ -140,8 +262,24 @@ async def handle_period_value(
                 await message.answer(t(MsgKey.DT_WRONG_VALUE))
         return
 
-    data = await DataModelAction.load(state)
     await DataModel(period_value=period_value).save(state)
+    await run_data_action(
+        message, state, data_service, tracker_service, t, kbr_builder, table_page_size
+    )
+
+
+async def run_data_action(
+    message: Message,
+    state: FSMContext,
+    data_service: DataService,
+    tracker_service: TrackerService,
+    t: TFunction,
+    kbr_builder: KeyboardBuilder,
+    table_page_size: int,
+) -> None:
+    """Runs the selected data action once its period is known."""
+    data = await DataModelPeriod.load(state)
+    from_date = convert_date(data.period_type, data.period_value)
 
     match data.action:
         case "csv":
@@ -149,7 +287,8 @@ async def handle_period_value(
             get_csv_uc = GetCSVUseCase(data_service=data_service)
             res = await get_csv_uc.execute(
                 tracker_id=data.tracker.id,
-                from_date=convert_date(data.period_type, period_value),
+                from_date=from_date,
+                where=data.where,
             )
             if not res:
                 await message.answer(t(MsgKey.DT_NO_RECORDS))
@@ -160,13 +299,61 @@ async def handle_period_value(
             await message.answer(t(MsgKey.DT_SENDING_CSV))
             await message.answer_document(document=file)
         case "table":
-            await message.answer("TODO")
-            # TODO: add selecting fields, aggregations
-            pass
+            uc = GetTablePageUseCase(data_service=data_service)
+            page, err = await uc.execute(
+                tracker_id=data.tracker.id,
+                page_size=table_page_size,
+                from_date=from_date,
+            )
+            if err:
+                await state.clear()
+                await message.answer(t(MsgKey.DT_NO_RECORDS))
+                return
+            await state.set_state(DataState.BROWSE_TABLE)
+            await show_table_page(
+                message,
+                state,
+                data.tracker,
+                cast(Page[DataRowResult], page),
+                1,
+                t,
+                kbr_builder,
+            )
         case "graph":
-            # TODO: add selecting fields for axes, aggregations
-            await message.answer("TODO")
-            pass
+            tracker = await tracker_service.get_by_id(data.tracker.id)
+            _, categorical_fields = SplitFieldsByTypeUseCase().execute(
+                selected_fields=list(tracker.structure.data), tracker=tracker
+            )
+            if len(categorical_fields) == len(tracker.structure.data):
+                await state.clear()
+                await message.answer(t(MsgKey.DT_NO_NUMERIC_FIELDS))
+                return
+            await state.set_state(DataState.AWAIT_GRAPH_FIELD)
+            await update_main_message(
+                state=state,
+                message=message,
+                text=t(MsgKey.DT_SELECT_GRAPH_FIELD),
+                reply_markup=kbr_builder.conf(
+                    add_cancel_button=True
+                ).build_tracker_fields_keyboard(
+                    tracker, exclude_fields=set(categorical_fields)
+                ),
+            )
+        case "analytics":
+            await state.clear()
+            tracker = await tracker_service.get_by_id(data.tracker.id)
+            uc = GetAnalyticsUseCase(data_service=data_service)
+            res, err = await uc.execute(tracker=tracker, from_date=from_date)
+            if err:
+                match err:
+                    case GetAnalyticsUseCase.Error.NO_NUMERIC_FIELDS:
+                        await message.answer(t(MsgKey.DT_NO_NUMERIC_FIELDS))
+                    case GetAnalyticsUseCase.Error.NO_RECORDS:
+                        await message.answer(t(MsgKey.DT_NO_RECORDS))
+                return
+            lines = [html.quote(i.formatted) for i in res]
+            for text in split_blocks(lines, separator="\n"):
+                await message.answer(text)
         case "statistics":
             await state.set_state(DataState.AWAIT_FIELDS_SELECTION)
             tracker = await tracker_service.get_by_id(data.tracker.id)
@@ -181,10 +368,111 @@ async def handle_period_value(
             )
 
 
-@router.callback_query(DataState.AWAIT_FIELDS_SELECTION, FieldCallback.filter())
+async def show_table_page(
+    message: MaybeInaccessibleMessageUnion,
+    state: FSMContext,
+    tracker: TrackerResponse,
+    page: Page[DataRowResult],
+    number: int,
+    t: TFunction,
+    kbr_builder: KeyboardBuilder,
+):
+    await DataModel(
+        table=PageCursor(page=number, first=page.rows[0].key, last=page.rows[-1].key)
+    ).save(state)
+    title = t(MsgKey.DT_TABLE_PAGE, page=number)
+    table = format_table(
+        list(tracker.structure.data), page.rows, limit=MESSAGE_LIMIT - len(title) - 1
+    )
+    await update_main_message(
+        state=state,
+        message=message,
+        text=f"{title}\n{table}",
+        reply_markup=kbr_builder.conf(add_cancel_button=True).build_table_page_keyboard(
+            has_newer=page.has_newer, has_older=page.has_older
+        ),
+    )
+
+
+@router.callback_query(DataState.BROWSE_TABLE, TablePageCallback.filter())
+async def handle_table_page(
+    callback: CallbackQueryWithMessage,
+    callback_data: TablePageCallback,
+    state: FSMContext,
+    data_service: DataService,
+    t: TFunction,
+    kbr_builder: KeyboardBuilder,
+    table_page_size: int,
+):
+    data = await DataModelTable.load(state)
+    older = callback_data.direction == "older"
+
+    uc = GetTablePageUseCase(data_service=data_service)
+    page, err = await uc.execute(
+        tracker_id=data.tracker.id,
+        page_size=table_page_size,
+        from_date=convert_date(data.period_type, data.period_value),
+        direction=callback_data.direction,
+        key=data.table.last if older else data.table.first,
+    )
+    if err:
+        # the records were deleted in the meantime
+        await callback.answer(t(MsgKey.DT_NO_RECORDS))
+        return
+
+    number = data.table.page + 1 if older else max(data.table.page - 1, 1)
+    await show_table_page(
+        callback.message,
+        state,
+        data.tracker,
+        cast(Page[DataRowResult], page),
+        number,
+        t,
+        kbr_builder,
+    )
+    await callback.answer()
+
+
+@router.callback_query(DataState.AWAIT_GRAPH_FIELD, FieldRefFilter())
+async def handle_graph_field(
+    callback: CallbackQueryWithMessage,
+    callback_data: FieldRef,
+    state: FSMContext,
+    data_service: DataService,
+    t: TFunction,
+):
+    data = await DataModelPeriod.load(state)
+    # rendering takes a while, stop the button spinner first
+    await callback.answer()
+
+    uc = GetGraphUseCase(data_service=data_service)
+    image, err = await uc.execute(
+        tracker=data.tracker,
+        field_name=callback_data.name,
+        from_date=convert_date(data.period_type, data.period_value),
+        where=data.where,
+    )
+    if err:
+        match err:
+            case GetGraphUseCase.Error.NO_RECORDS:
+                await callback.message.answer(t(MsgKey.DT_NO_RECORDS))
+            case GetGraphUseCase.Error.NOT_NUMERIC:
+                await callback.message.answer(t(MsgKey.DT_NO_NUMERIC_FIELDS))
+        return
+
+    # the state is kept, so other fields can be plotted too
+    image = cast(bytes, image)
+    # a reply to the user, not a bulk delivery
+    with outbound_lane(Lane.INTERACTIVE):
+        await callback.message.answer_photo(
+            BufferedInputFile(image, filename="graph.png")
+        )
+
+
+@router.callback_query(DataState.AWAIT_FIELDS_SELECTION, FieldRefFilter())
 async def handle_field(
     callback: CallbackQueryWithMessage,
-    callback_data: FieldCallback,
+    callback_data: FieldRef,
     state: FSMContext,
     t: TFunction,
     kbr_builder: KeyboardBuilder,
@@ -218,6 +506,7 @@ async def handle_field_confirm(
     state: FSMContext,
     data_service: DataService,
     t: TFunction,
+    statistics_cache: StatisticsCache,
 ):
     await state.set_state(None)
     data = await DataModelStrict.load(state)
@@ -228,12 +517,13 @@ async def handle_field_confirm(
         selected_fields=selected_fields, tracker=data.tracker
     )
     # TODO: add selected fields length validation
-    uc = GetStatisticsUseCase(data_service=data_service)
+    uc = GetStatisticsUseCase(data_service=data_service, cache=statistics_cache)
     res, err = await uc.execute(
         categorical_fields=categorical_fields,
         numeric_fields=numeric_fields,
         tracker_id=data.tracker.id,
         from_date=convert_date(data.period_type, data.period_value),
+        where=data.where,
     )
     if err:
         match err:
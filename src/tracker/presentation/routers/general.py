@@ -1,9 +1,28 @@
+from functools import partial
+
 from aiogram import Router
 from aiogram.filters import Command
 from aiogram.types import Message
 from tracker.presentation.constants.text import Language, MsgKey
+from tracker.presentation.deletion import DeletionReaper
+from tracker.presentation.digests import DigestScheduler
+from tracker.presentation.reminders import ReminderWorker
 from tracker.presentation.utils import TFunction
-from tracker.services.database import UserService
+from tracker.services.database import (
+    DeletionService,
+    RetentionService,
+    ScheduleService,
+    TrackerService,
+    UserService,
+    after_commit,
+)
+from tracker.use_cases import (
+    DeleteAccountUseCase,
+    DeleteTrackerUseCase,
+    ScheduleDigestUseCase,
+    SetReminderUseCase,
+    SetRetentionUseCase,
+)
 
 router = Router(name=__name__)
 
@@ -12,7 +31,152 @@ router = Router(name=__name__)
 async def start_tracker_creation(
     message: Message, user_service: UserService, t: TFunction, lang: Language
 ) -> None:
-    user = await user_service.get(str(message.chat.id))
-    if user is None:
-        user = await user_service.create(str(message.chat.id))
+    await user_service.get_or_create(str(message.chat.id))
     await message.answer(t(MsgKey.G_WELCOME))
+
+
+@router.message(Command("digest"))
+async def schedule_digest(
+    message: Message,
+    user_service: UserService,
+    schedule_service: ScheduleService,
+    digest_scheduler: DigestScheduler,
+    t: TFunction,
+    lang: Language,
+) -> None:
+    user_id = str(message.chat.id)
+    await user_service.get_or_create(user_id)
+    uc = ScheduleDigestUseCase(schedule_service=schedule_service)
+    schedule, err = await uc.execute(user_id=user_id, text=message.text, language=lang)
+    if err:
+        match err:
+            case (
+                ScheduleDigestUseCase.Error.NO_TEXT
+                | ScheduleDigestUseCase.Error.WRONG_VALUE
+            ):
+                await message.answer(t(MsgKey.DG_USAGE))
+        return
+    if schedule is None:
+        await message.answer(t(MsgKey.DG_OFF))
+        return
+    after_commit(partial(digest_scheduler.notify, schedule))
+    await message.answer(
+        t(
+            MsgKey.DG_SCHEDULED,
+            next_run_at=schedule.next_run_at.strftime("%Y-%m-%d %H:%M"),
+        )
+    )
+
+
+@router.message(Command("remind"))
+async def set_reminder(
+    message: Message,
+    tracker_service: TrackerService,
+    schedule_service: ScheduleService,
+    reminder_worker: ReminderWorker,
+    t: TFunction,
+    lang: Language,
+) -> None:
+    uc = SetReminderUseCase(
+        tracker_service=tracker_service, schedule_service=schedule_service
+    )
+    reminder, err = await uc.execute(
+        user_id=str(message.chat.id), text=message.text, language=lang
+    )
+    if err:
+        match err:
+            case (
+                SetReminderUseCase.Error.NO_TEXT | SetReminderUseCase.Error.WRONG_VALUE
+            ):
+                await message.answer(t(MsgKey.RM_USAGE))
+            case SetReminderUseCase.Error.TRACKER_NOT_FOUND:
+                await message.answer(t(MsgKey.TR_TRACKER_NOT_FOUND))
+        return
+    if reminder is None:
+        await message.answer(t(MsgKey.RM_OFF))
+        return
+    after_commit(partial(reminder_worker.notify, reminder))
+    await message.answer(
+        t(
+            MsgKey.RM_SET,
+            next_fire_at=reminder.next_fire_at.strftime("%Y-%m-%d %H:%M"),
+        )
+    )
+
+
+@router.message(Command("retention"))
+async def set_retention(
+    message: Message,
+    tracker_service: TrackerService,
+    retention_service: RetentionService,
+    retention_min_days: int,
+    t: TFunction,
+    lang: Language,
+) -> None:
+    uc = SetRetentionUseCase(
+        tracker_service=tracker_service,
+        retention_service=retention_service,
+        min_days=retention_min_days,
+    )
+    policy, err = await uc.execute(user_id=str(message.chat.id), text=message.text)
+    if err:
+        match err:
+            case (
+                SetRetentionUseCase.Error.NO_TEXT
+                | SetRetentionUseCase.Error.WRONG_VALUE
+            ):
+                await message.answer(t(MsgKey.RT_USAGE))
+            case SetRetentionUseCase.Error.TOO_FEW_DAYS:
+                await message.answer(t(MsgKey.RT_TOO_FEW_DAYS, days=retention_min_days))
+            case SetRetentionUseCase.Error.TRACKER_NOT_FOUND:
+                await message.answer(t(MsgKey.TR_TRACKER_NOT_FOUND))
+        return
+    if policy is None:
+        await message.answer(t(MsgKey.RT_OFF))
+        return
+    await message.answer(t(MsgKey.RT_SET, days=policy.raw_days))
+
+
+@router.message(Command("delete_tracker"))
+async def delete_tracker(
+    message: Message,
+    tracker_service: TrackerService,
+    deletion_service: DeletionService,
+    deletion_reaper: DeletionReaper,
+    t: TFunction,
+    lang: Language,
+) -> None:
+    uc = DeleteTrackerUseCase(
+        tracker_service=tracker_service, deletion_service=deletion_service
+    )
+    err = await uc.execute(user_id=str(message.chat.id), text=message.text)
+    if err:
+        match err:
+            case DeleteTrackerUseCase.Error.NO_TEXT:
+                await message.answer(t(MsgKey.DL_TRACKER_USAGE))
+            case DeleteTrackerUseCase.Error.TRACKER_NOT_FOUND:
+                await message.answer(t(MsgKey.TR_TRACKER_NOT_FOUND))
+        return
+    after_commit(deletion_reaper.notify)
+    await message.answer(t(MsgKey.DL_TRACKER_DELETED))
+
+
+@router.message(Command("delete_account"))
+async def delete_account(
+    message: Message,
+    deletion_service: DeletionService,
+    deletion_reaper: DeletionReaper,
+    t: TFunction,
+    lang: Language,
+) -> None:
+    uc = DeleteAccountUseCase(deletion_service=deletion_service)
+    err = await uc.execute(user_id=str(message.chat.id), text=message.text)
+    if err:
+        match err:
+            case DeleteAccountUseCase.Error.NOT_CONFIRMED:
+                await message.answer(t(MsgKey.DL_ACCOUNT_USAGE))
+            case DeleteAccountUseCase.Error.USER_NOT_FOUND:
+                await message.answer(t(MsgKey.DL_ACCOUNT_NOT_FOUND))
+        return
+    after_commit(deletion_reaper.notify)
+    await message.answer(t(MsgKey.DL_ACCOUNT_DELETED))
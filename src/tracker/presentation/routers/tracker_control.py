@@ -1,33 +1,48 @@
 from typing import cast
 
-from aiogram import Router
+from aiogram import Router, html
 from aiogram.filters import Command, or_f
 from aiogram.fsm.context import FSMContext
-from aiogram.types import Message
+from aiogram.types import (
+    InlineQuery,
+    InlineQueryResultArticle,
+    InputTextMessageContent,
+    Message,
+)
 
+from tracker.presentation.callback_codec import (
+    EnumValueRef,
+    EnumValueRefFilter,
+    FieldRef,
+    FieldRefFilter,
+)
 from tracker.presentation.callbacks import (
     BackCallback,
     CancelCallback,
-    EnumValuesCallback,
-    FieldCallback,
     TrackerCallback,
+    TrackersPageCallback,
 )
 from tracker.presentation.constants.text import MsgKey
 from tracker.presentation.states import AddingData, DataState, TrackerControlState
 from tracker.presentation.utils import (
     CallbackQueryWithMessage,
     KeyboardBuilder,
+    PageCursor,
     TFunction,
     get_tracker_data_description_from_dto,
     get_tracker_description_from_dto,
+    split_blocks,
     update_main_message,
 )
 from tracker.presentation.utils.state import StateModel
-from tracker.schemas import TrackerResponse
-from tracker.services.database import TrackerService
+from tracker.schemas import Page, PageDirection, TrackerResponse, TrackerSummary
+from tracker.services.database import DataService, TrackerService
 from tracker.use_cases import (
+    DashboardCache,
+    GetDashboardUseCase,
     GetUserTrackersUseCase,
     HandleFieldValueUseCase,
+    SearchTrackersUseCase,
     ValidateTrackingMessageUseCase,
 )
 
@@ -52,6 +67,7 @@ class DataModel(StateModel):
     tracker: TrackerResponse | None = None
     cur_field: str | None = None
     field_values: dict[str, str] | None = None
+    trackers_page: PageCursor | None = None
 
 
 @router.message(Command("my_trackers"))
@@ -61,9 +77,22 @@ async def show_trackers(
     tracker_service: TrackerService,
     t: TFunction,
     kbr_builder: KeyboardBuilder,
+    trackers_page_size: int,
+    direction: PageDirection = "first",
 ) -> None:
+    cursor = None
+    if direction != "first":
+        cursor = (await DataModel.load(state)).trackers_page
+        if cursor is None:
+            direction = "first"
+
     show_trackers_uc = GetUserTrackersUseCase(tracker_service=tracker_service)
-    trackers, err = await show_trackers_uc.execute(user_id=str(message.chat.id))
+    page, err = await show_trackers_uc.execute(
+        user_id=str(message.chat.id),
+        page_size=trackers_page_size,
+        direction=direction,
+        key=cursor and (cursor.last if direction == "older" else cursor.first),
+    )
 
     if err:
         match err:
@@ -71,12 +100,50 @@ async def show_trackers(
                 await message.answer(text=t(MsgKey.TR_NO_TRACKERS))
         return
 
+    page = cast(Page[TrackerSummary], page)
+    number = 1
+    if cursor is not None:
+        number = cursor.page + 1 if direction == "older" else max(cursor.page - 1, 1)
+    await DataModel(
+        trackers_page=PageCursor(
+            page=number, first=page.rows[0].key, last=page.rows[-1].key
+        )
+    ).save(state)
     await update_main_message(
         state=state,
         message=message,
         text=t(MsgKey.TR_TRACKERS),
-        reply_markup=kbr_builder.build_trackers_keyboard(trackers),
+        reply_markup=kbr_builder.build_trackers_keyboard(
+            page.rows, has_newer=page.has_newer, has_older=page.has_older
+        ),
+    )
+
+
+@router.message(Command("dashboard"))
+async def show_dashboard(
+    message: Message,
+    tracker_service: TrackerService,
+    data_service: DataService,
+    t: TFunction,
+    dashboard_cache: DashboardCache,
+    dashboard_max_trackers: int,
+) -> None:
+    uc = GetDashboardUseCase(
+        tracker_service=tracker_service,
+        data_service=data_service,
+        cache=dashboard_cache,
+    )
+    res, err = await uc.execute(
+        user_id=str(message.chat.id), max_trackers=dashboard_max_trackers
     )
+    if err:
+        match err:
+            case GetDashboardUseCase.Error.NO_TRACKERS:
+                await message.answer(text=t(MsgKey.TR_NO_TRACKERS))
+        return
+    blocks = [t(MsgKey.TR_DASHBOARD), *(html.quote(i.formatted) for i in res)]
+    for text in split_blocks(blocks):
+        await message.answer(text)
 
 
 @router.callback_query(
@@ -93,6 +160,28 @@ async def show_trackers_button(
     tracker_service: TrackerService,
     t: TFunction,
     kbr_builder: KeyboardBuilder,
+    trackers_page_size: int,
+):
+    await show_trackers(
+        message=callback.message,
+        state=state,
+        tracker_service=tracker_service,
+        t=t,
+        kbr_builder=kbr_builder,
+        trackers_page_size=trackers_page_size,
+    )
+    await callback.answer()
+
+
+@router.callback_query(TrackersPageCallback.filter())
+async def show_trackers_page(
+    callback: CallbackQueryWithMessage,
+    callback_data: TrackersPageCallback,
+    state: FSMContext,
+    tracker_service: TrackerService,
+    t: TFunction,
+    kbr_builder: KeyboardBuilder,
+    trackers_page_size: int,
 ):
     await show_trackers(
         message=callback.message,
@@ -100,6 +189,8 @@ async def show_trackers_button(
         tracker_service=tracker_service,
         t=t,
         kbr_builder=kbr_builder,
+        trackers_page_size=trackers_page_size,
+        direction=callback_data.direction,
     )
     await callback.answer()
 
@@ -154,11 +245,12 @@ async def start_tracking(
 
     if err:
         await message.answer(
-            text=t(MsgKey.TR_TRACKER_NAME_NOT_FOUND, tracker_name=tracker_name)
+            text=t(MsgKey.TR_CHOOSE_TRACKER),
+            reply_markup=kbr_builder.build_tracker_search_keyboard(),
         )
         return
 
-    tracker = await tracker_service.get_by_name(tracker_name)
+    tracker = await tracker_service.get_by_name(str(message.chat.id), tracker_name)
     if not tracker:
         await message.answer(
             text=t(MsgKey.TR_TRACKER_NAME_NOT_FOUND, tracker_name=tracker_name)
@@ -180,10 +272,42 @@ async def start_tracking(
     )
 
 
-@router.callback_query(AddingData.AWAIT_NEXT_ACTION, FieldCallback.filter())
+@router.inline_query()
+async def search_trackers(
+    inline_query: InlineQuery,
+    tracker_service: TrackerService,
+    inline_results_limit: int,
+    inline_cache_time: int,
+) -> None:
+    uc = SearchTrackersUseCase(tracker_service=tracker_service)
+    trackers, _ = await uc.execute(
+        user_id=str(inline_query.from_user.id),
+        query=inline_query.query,
+        limit=inline_results_limit,
+    )
+    # a chosen tracker sends its /track command, which starts adding a record
+    results = [
+        InlineQueryResultArticle(
+            id=str(i.id),
+            title=i.name,
+            description=", ".join(i.structure.data),
+            input_message_content=InputTextMessageContent(
+                message_text=f"/track {i.name}", parse_mode=None
+            ),
+        )
+        for i in trackers or []
+    ]
+    await inline_query.answer(
+        results,  # type: ignore
+        cache_time=inline_cache_time,
+        is_personal=True,
+    )
+
+
+@router.callback_query(AddingData.AWAIT_NEXT_ACTION, FieldRefFilter())
 async def handle_field(
     callback: CallbackQueryWithMessage,
-    callback_data: FieldCallback,
+    callback_data: FieldRef,
     state: FSMContext,
     t: TFunction,
     kbr_builder: KeyboardBuilder,
@@ -201,9 +325,7 @@ async def handle_field(
 
     await state.set_state(AddingData.AWAIT_FIELD_VALUE)
     if field_type == "enum":
-        enum_values = data.tracker.structure.data[callback_data.name].get("values", [])
-        enum_values = enum_values or []
-        kbr = kbr_builder.build_enum_values_keyboard(enum_values)
+        kbr = kbr_builder.build_enum_values_keyboard(data.tracker, callback_data.name)
     else:
         kbr = None
 
@@ -270,10 +392,10 @@ async def handle_field_value(
         )
 
 
-@router.callback_query(AddingData.AWAIT_FIELD_VALUE, EnumValuesCallback.filter())
+@router.callback_query(AddingData.AWAIT_FIELD_VALUE, EnumValueRefFilter())
 async def handle_enum_value(
     callback: CallbackQueryWithMessage,
-    callback_data: EnumValuesCallback,
+    callback_data: EnumValueRef,
     state: FSMContext,
     tracker_service: TrackerService,
     t: TFunction,
@@ -326,9 +448,10 @@ async def handle_enum_value(
 async def handle_cancel(
     callback: CallbackQueryWithMessage, state: FSMContext, t: TFunction
 ):
-    await state.clear()
-    await callback.message.edit_text(
+    await update_main_message(
+        state=state,
+        message=callback.message,
         text=t(MsgKey.TR_ADDING_DATA_CANCELED),
-        reply_markup=None,
     )
+    await state.clear()
     await callback.answer()
@@ -23,3 +23,6 @@ class DataState(StatesGroup):
     AWAIT_PERIOD_TYPE = State()
     AWAIT_PERIOD_VALUE = State()
     AWAIT_FIELDS_SELECTION = State()
+    AWAIT_GRAPH_FIELD = State()
+    BROWSE_TABLE = State()
+    AWAIT_FILTER = State()
@@ -1,5 +1,5 @@
 # flake8: noqa
-from .keyboard import KeyboardBuilder
+from .keyboard import KeyboardBuilder, KeyboardCache
 from .tracker_description import (
     get_tracker_data_description,
     get_tracker_data_description_from_dto,
@@ -10,4 +10,6 @@ from .update_message import update_main_message
 from .callback_with_message import CallbackQueryWithMessage
 from .date import convert_date
 from .translations import _t, TFunction
-from .state import StateModel
+from .state import PageCursor, StateModel
+from .table import format_table
+from .text import MESSAGE_LIMIT, split_blocks
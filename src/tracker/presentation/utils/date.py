@@ -5,7 +5,10 @@ from tracker.presentation.constants import PERIOD_DELTAS
 
 
 def convert_date(
-    date_type: Literal["years", "months", "weeks", "days", "hours", "minutes"],
+    date_type: Literal["years", "months", "weeks", "days", "hours", "minutes", "all"],
     count: int,
-) -> datetime:
+) -> datetime | None:
+    """Returns the start of the period, None for all time."""
+    if date_type == "all":
+        return None
     return datetime.now(timezone.utc) - PERIOD_DELTAS[date_type](count)
@@ -1,3 +1,9 @@
+import hashlib
+import json
+from functools import partial, wraps
+from itertools import product
+from typing import Callable, Hashable, Iterable
+
 from aiogram.filters.callback_data import CallbackData
 from aiogram.types import (
     InlineKeyboardButton,
@@ -8,18 +14,20 @@ from tracker.presentation.callbacks import (
     BackCallback,
     CancelCallback,
     ConfirmCallback,
-    EnumValuesCallback,
-    FieldCallback,
     FieldTypeCallback,
     PeriodCallback,
+    TablePageCallback,
     TrackerActionsCallback,
     TrackerCallback,
     TrackerDataActionsCallback,
+    TrackersPageCallback,
 )
-from tracker.presentation.constants.text import MsgKey
-from tracker.schemas import TrackerResponse
+from tracker.core.lru import LRUCache
+from tracker.presentation.callback_codec import get_structure_ref
+from tracker.presentation.constants.text import Language, MsgKey
+from tracker.schemas import TrackerResponse, TrackerSummary
 
-from .translations import TFunction
+from .translations import TFunction, _t
 
 
 class InlineKeyboardFactory:
@@ -144,6 +152,30 @@ class InlineKeyboardFactory:
         return InlineKeyboardMarkup(inline_keyboard=self._keyboard)
 
 
+def _structure_key(tracker: TrackerResponse) -> bytes:
+    # not sorted, the order of the fields is the order of the buttons
+    structure = json.dumps(tracker.structure.data, ensure_ascii=False)
+    return hashlib.blake2b(structure.encode(), digest_size=16).digest()
+
+
+def _tracker_fields_key(
+    tracker: TrackerResponse,
+    exclude_fields: set[str] | None = None,
+    marked_fields: set[str] | None = None,
+    mark: str = "",
+) -> Hashable:
+    return (
+        _structure_key(tracker),
+        frozenset(exclude_fields or ()),
+        frozenset(marked_fields or ()),
+        mark,
+    )
+
+
+def _enum_values_key(tracker: TrackerResponse, field_name: str) -> Hashable:
+    return (_structure_key(tracker), field_name)
+
+
 class KeyboardBuilder(InlineKeyboardFactory):
 
     def __init__(
@@ -154,12 +186,16 @@ class KeyboardBuilder(InlineKeyboardFactory):
         add_cancel_button: bool = False,
         add_confirm_button: bool = False,
         extra_buttons: list[tuple[MsgKey, CallbackData]] | None = None,
+        lang: Language | None = None,
+        cache: "KeyboardCache | None" = None,
     ):
         super().__init__(t, row_width)
         self._back_btn = add_back_button
         self._cancel_btn = add_cancel_button
         self._confirm_btn = add_confirm_button
         self._extra_btns = extra_buttons or []
+        self._lang = lang
+        self._cache = cache
 
     def conf(
         self,
@@ -188,15 +224,81 @@ class KeyboardBuilder(InlineKeyboardFactory):
         self.row_buttons_tuple(*self._extra_btns)
         return super().as_markup()
 
+    def _reset(self) -> None:
+        self._keyboard = []
+        self._current_row = []
+
+    def _cache_key(self, name: str, args_key: Hashable) -> Hashable | None:
+        # extra buttons are arbitrary callbacks, such keyboards are not cached
+        if self._cache is None or self._lang is None or self._extra_btns:
+            return None
+        return (
+            name,
+            self._lang,
+            self._row_width,
+            self._back_btn,
+            self._cancel_btn,
+            self._confirm_btn,
+            args_key,
+        )
+
     @staticmethod
     def markup(func):
         def wrapper(self, *args, **kwargs):
             func(self, *args, **kwargs)
-            return self.as_markup()
+            markup = self.as_markup()
+            self._reset()
+            return markup
 
         return wrapper
 
-    @markup
+    @staticmethod
+    def cached_markup(key: Callable[..., Hashable] | None = None):
+        """Like `markup`, but reuses keyboards rendered before for the same language.
+
+        Args:
+            key (Callable[..., Hashable] | None): Builds the part of the cache key
+                from the method arguments. None marks a static keyboard, which
+                is rendered on startup and never evicted.
+        """
+
+        def decorator(func):
+            @wraps(func)
+            def wrapper(self, *args, **kwargs):
+                cache_key = self._cache_key(
+                    func.__name__, key(*args, **kwargs) if key else None
+                )
+                if cache_key is not None:
+                    cached = self._cache.get(cache_key)
+                    if cached is not None:
+                        return cached
+                func(self, *args, **kwargs)
+                markup = self.as_markup()
+                self._reset()
+                if cache_key is not None:
+                    self._cache.put(cache_key, markup, static=key is None)
+                return markup
+
+            wrapper.static_keyboard = key is None  # type: ignore
+            return wrapper
+
+        return decorator
+
+    @cached_markup()
+    def build_tracker_search_keyboard(self):
+        # opens the inline search of trackers in the current chat
+        self.buttons(
+            InlineKeyboardButton(
+                text=self._t(MsgKey.KBR_SEARCH_TRACKERS),
+                switch_inline_query_current_chat="",
+            )
+        )
+
+    @cached_markup()
+    def build_service_keyboard(self):
+        """Only the back, cancel and confirm buttons."""
+
+    @cached_markup()
     def build_field_type_keyboard(self):
         for text in ["int", "float", "enum", "string"]:
             self.button_text(
@@ -204,7 +306,7 @@ class KeyboardBuilder(InlineKeyboardFactory):
                 FieldTypeCallback(type=text),  # type: ignore
             )
 
-    @markup
+    @cached_markup()
     def build_action_keyboard(self):
         (
             self.button(
@@ -216,12 +318,40 @@ class KeyboardBuilder(InlineKeyboardFactory):
             )
         )
 
+    def page_navigation(
+        self,
+        newer: CallbackData | None = None,
+        older: CallbackData | None = None,
+    ) -> "KeyboardBuilder":
+        """Adds a row with the buttons to the newer and older pages of a list.
+
+        Args:
+            newer (CallbackData | None): Callback of the newer page, no button if None.
+            older (CallbackData | None): Callback of the older page, no button if None.
+        """
+        buttons: list[tuple[MsgKey, CallbackData]] = []
+        if newer is not None:
+            buttons.append((MsgKey.KBR_NEWER_PAGE, newer))
+        if older is not None:
+            buttons.append((MsgKey.KBR_OLDER_PAGE, older))
+        self.row_buttons_tuple(*buttons)
+        return self
+
     @markup
-    def build_trackers_keyboard(self, trackers: list[TrackerResponse]):
+    def build_trackers_keyboard(
+        self,
+        trackers: list[TrackerSummary],
+        has_newer: bool = False,
+        has_older: bool = False,
+    ):
         for i in trackers:
             self.button_text(text=i.name, callback_data=TrackerCallback(id=i.id))
+        self.page_navigation(
+            newer=TrackersPageCallback(direction="newer") if has_newer else None,
+            older=TrackersPageCallback(direction="older") if has_older else None,
+        )
 
-    @markup
+    @cached_markup(key=_tracker_fields_key)
     def build_tracker_fields_keyboard(
         self,
         tracker: TrackerResponse,
@@ -229,6 +359,7 @@ class KeyboardBuilder(InlineKeyboardFactory):
         marked_fields: set[str] | None = None,
         mark: str = "",
     ):
+        ref = get_structure_ref(tracker.structure.id, tracker.structure.data)
         for name, props in tracker.structure.data.items():
             if exclude_fields and name in exclude_fields:
                 continue
@@ -238,12 +369,13 @@ class KeyboardBuilder(InlineKeyboardFactory):
             button_text = f"{name}: {value}"
             if marked_fields and name in marked_fields:
                 button_text = mark + button_text
-            self.button_text(
-                text=button_text,
-                callback_data=FieldCallback(name=name, type=props["type"]),
+            self.buttons(
+                InlineKeyboardButton(
+                    text=button_text, callback_data=ref.pack_field(name)
+                )
             )
 
-    @markup
+    @cached_markup()
     def build_tracker_action_keyboard(self):
         (
             self.button(
@@ -252,7 +384,7 @@ class KeyboardBuilder(InlineKeyboardFactory):
             )
         )
 
-    @markup
+    @cached_markup()
     def build_tracker_data_action_keyboard(self):
         (
             self.button(
@@ -271,9 +403,17 @@ class KeyboardBuilder(InlineKeyboardFactory):
                 text=MsgKey.KBR_GET_TABLE,
                 callback_data=TrackerDataActionsCallback(action="table"),
             )
+            .button(
+                text=MsgKey.KBR_GET_ANALYTICS,
+                callback_data=TrackerDataActionsCallback(action="analytics"),
+            )
+            .button(
+                text=MsgKey.KBR_FILTER,
+                callback_data=TrackerDataActionsCallback(action="filter"),
+            )
         )
 
-    @markup
+    @cached_markup()
     def build_period_keyboard(self):
         (
             self.button(
@@ -300,9 +440,74 @@ class KeyboardBuilder(InlineKeyboardFactory):
                 text=MsgKey.KBR_DATE_MINUTES,
                 callback_data=PeriodCallback(period="minutes"),
             )
+            .button(
+                text=MsgKey.KBR_DATE_ALL,
+                callback_data=PeriodCallback(period="all"),
+            )
         )
 
-    @markup
-    def build_enum_values_keyboard(self, values: list[str]):
-        for i in values:
-            self.button_text(text=i, callback_data=EnumValuesCallback(value=i))
+    @cached_markup(key=lambda has_newer, has_older: (has_newer, has_older))
+    def build_table_page_keyboard(self, has_newer: bool, has_older: bool):
+        self.page_navigation(
+            newer=TablePageCallback(direction="newer") if has_newer else None,
+            older=TablePageCallback(direction="older") if has_older else None,
+        )
+
+    @cached_markup(key=_enum_values_key)
+    def build_enum_values_keyboard(self, tracker: TrackerResponse, field_name: str):
+        ref = get_structure_ref(tracker.structure.id, tracker.structure.data)
+        for i in tracker.structure.data[field_name].get("values") or []:
+            self.buttons(
+                InlineKeyboardButton(
+                    text=i, callback_data=ref.pack_enum_value(field_name, i)
+                )
+            )
+
+
+class KeyboardCache:
+    """Rendered keyboards shared between updates and users.
+
+    Static keyboards (the same for every user of a language) are rendered once
+    by `warm_up` and kept for good, keyboards built from a tracker structure or
+    enum values are kept in an LRU. Cached markups are shared, so they must
+    not be modified.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self._static: dict[Hashable, InlineKeyboardMarkup] = {}
+        self._lru: LRUCache[Hashable, InlineKeyboardMarkup] = LRUCache(maxsize)
+
+    def get(self, key: Hashable) -> InlineKeyboardMarkup | None:
+        markup = self._static.get(key)
+        if markup is None:
+            markup = self._lru.get(key)
+        return markup
+
+    def put(
+        self, key: Hashable, markup: InlineKeyboardMarkup, static: bool = False
+    ) -> None:
+        if static:
+            self._static[key] = markup
+        else:
+            self._lru.put(key, markup)
+
+    def builder(self, t: TFunction, lang: Language) -> KeyboardBuilder:
+        return KeyboardBuilder(t=t, lang=lang, cache=self)
+
+    def warm_up(self, languages: Iterable[Language]) -> None:
+        """Renders static keyboards with every combination of service buttons."""
+        static = [
+            name
+            for name, attr in vars(KeyboardBuilder).items()
+            if getattr(attr, "static_keyboard", False)
+        ]
+        for lang in languages:
+            t = partial(_t, lang)
+            for name in static:
+                for back, cancel, confirm in product((False, True), repeat=3):
+                    builder = self.builder(t, lang).conf(
+                        add_back_button=back,
+                        add_cancel_button=cancel,
+                        add_confirm_button=confirm,
+                    )
+                    getattr(builder, name)()
@@ -1,4 +1,6 @@
+from datetime import datetime
 from typing import Self
+from uuid import UUID
 
 from aiogram.fsm.context import FSMContext
 from pydantic import BaseModel
@@ -12,3 +14,11 @@ class StateModel(BaseModel):
     async def load(cls, state: FSMContext) -> Self:
         data = await state.get_data()
         return cls.model_validate(data)
+
+
+class PageCursor(BaseModel):
+    """Position in a keyset-paginated list, keys of the first and the last shown rows."""
+
+    page: int
+    first: tuple[datetime, UUID]
+    last: tuple[datetime, UUID]
@@ -0,0 +1,50 @@
+from aiogram import html
+from tracker.schemas import DataRowResult
+
+from .text import MESSAGE_LIMIT
+
+DATE_FORMAT = "%Y-%m-%d %H:%M"
+MAX_CELL_WIDTH = 16
+
+
+def _cell(value: object) -> str:
+    text = "" if value is None else str(value)
+    text = " ".join(text.split())
+    if len(text) > MAX_CELL_WIDTH:
+        text = text[: MAX_CELL_WIDTH - 1] + "…"
+    return text
+
+
+def _render(fields: list[str], rows: list[DataRowResult], hidden: int) -> str:
+    header = ["date", *(_cell(i) for i in fields)]
+    body = [
+        [row.date.strftime(DATE_FORMAT), *(_cell(row.value.get(i)) for i in fields)]
+        for row in rows
+    ]
+    if hidden:
+        # the fields left out, the column stays empty below the header
+        header.append(f"+{hidden}")
+        body = [[*line, ""] for line in body]
+    widths = [max(len(line[i]) for line in (header, *body)) for i in range(len(header))]
+    lines = [
+        " │ ".join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip()
+        for line in (header, *body)
+    ]
+    lines.insert(1, "─┼─".join("─" * width for width in widths))
+    return html.pre(html.quote("\n".join(lines)))
+
+
+def format_table(
+    fields: list[str], rows: list[DataRowResult], limit: int = MESSAGE_LIMIT
+) -> str:
+    """Renders records as a monospace HTML table, one row per record.
+
+    Trackers may have any number of fields, so the last columns are left out
+    until the table fits `limit` characters; a `+N` column counts them.
+    """
+    shown = len(fields)
+    table = _render(fields, rows, 0)
+    while len(table) > limit and shown:
+        shown -= 1
+        table = _render(fields[:shown], rows, len(fields) - shown)
+    return table
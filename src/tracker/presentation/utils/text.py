@@ -0,0 +1,20 @@
+# the length of a Telegram message
+MESSAGE_LIMIT = 4096
+
+
+def split_blocks(
+    blocks: list[str], separator: str = "\n\n", limit: int = MESSAGE_LIMIT
+) -> list[str]:
+    """Joins blocks of text into as few messages as fit the limit.
+
+    Blocks are kept whole, only a block longer than the limit is cut.
+    """
+    messages: list[str] = []
+    for block in blocks:
+        for start in range(0, max(len(block), 1), limit):
+            part = block[start : start + limit]
+            if messages and len(messages[-1]) + len(separator) + len(part) <= limit:
+                messages[-1] += separator + part
+            else:
+                messages.append(part)
+    return messages
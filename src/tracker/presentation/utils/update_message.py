@@ -1,5 +1,119 @@
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass, field
+from enum import StrEnum, auto
+from typing import Any
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest
 from aiogram.fsm.context import FSMContext
 from aiogram.types import InaccessibleMessage, MaybeInaccessibleMessageUnion
+from pydantic import BaseModel
+from tracker.core.lru import LRUCache
+from tracker.services.database import commit_unit_of_work
+
+
+class RenderResult(StrEnum):
+    EDITED = auto()
+    NOT_MODIFIED = auto()
+    SUPERSEDED = auto()
+    FAILED = auto()
+
+
+@dataclass
+class _ChatRenders:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    latest: object | None = None
+    waiters: int = 0
+
+
+def render_digest(text: str, reply_markup: Any = None, **kwargs) -> bytes:
+    markup = (
+        reply_markup.model_dump_json(exclude_none=True)
+        if isinstance(reply_markup, BaseModel)
+        else repr(reply_markup)
+    )
+    extra = repr(sorted(kwargs.items()))
+    return hashlib.blake2b(
+        "\0".join((text, markup, extra)).encode(), digest_size=16
+    ).digest()
+
+
+class RenderCoalescer:
+    """Merges bursts of edits of the same chat's main message.
+
+    Edits of a chat are sent one at a time and at most once per `window`
+    seconds. An edit waiting for its turn is dropped when a newer one arrives,
+    so after a burst of taps only the first and the last render are sent.
+    Edits that would not change the message are not sent at all.
+    """
+
+    def __init__(self, window: float = 0.3, max_messages: int = 10000) -> None:
+        self.window = window
+        self._chats: dict[int, _ChatRenders] = {}
+        self._last_sent_at: LRUCache[int, float] = LRUCache(max_messages)
+        self._digests: LRUCache[tuple[int, int], bytes] = LRUCache(max_messages)
+
+    def remember(self, chat_id: int, message_id: int, digest: bytes) -> None:
+        """Records what a message shows, e.g. after it was sent."""
+        self._digests.put((chat_id, message_id), digest)
+
+    async def edit(
+        self,
+        bot: Bot,
+        chat_id: int,
+        message_id: int,
+        text: str,
+        reply_markup: Any = None,
+        **kwargs,
+    ) -> RenderResult:
+        digest = render_digest(text, reply_markup, **kwargs)
+        if self._digests.get((chat_id, message_id)) == digest:
+            return RenderResult.NOT_MODIFIED
+
+        chat = self._chats.setdefault(chat_id, _ChatRenders())
+        token = object()
+        chat.latest = token
+        chat.waiters += 1
+        try:
+            async with chat.lock:
+                if chat.latest is not token:
+                    return RenderResult.SUPERSEDED
+                last_sent_at = self._last_sent_at.get(chat_id) or 0.0
+                delay = last_sent_at + self.window - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                    if chat.latest is not token:
+                        return RenderResult.SUPERSEDED
+                if self._digests.get((chat_id, message_id)) == digest:
+                    return RenderResult.NOT_MODIFIED
+                try:
+                    await bot.edit_message_text(
+                        chat_id=chat_id,
+                        message_id=message_id,
+                        text=text,
+                        reply_markup=reply_markup,
+                        **kwargs,
+                    )
+                    result = RenderResult.EDITED
+                except TelegramBadRequest as e:
+                    if "message is not modified" not in e.message:
+                        return RenderResult.FAILED
+                    result = RenderResult.NOT_MODIFIED
+                except Exception:
+                    return RenderResult.FAILED
+                finally:
+                    self._last_sent_at.put(chat_id, time.monotonic())
+                self.remember(chat_id, message_id, digest)
+                return result
+        finally:
+            chat.waiters -= 1
+            if chat.waiters == 0:
+                del self._chats[chat_id]
+
+
+main_message_renders = RenderCoalescer()
 
 
 async def update_main_message(
@@ -19,23 +133,27 @@ async def update_main_message(
             )
         return
 
+    # the edit may wait for the coalescer window, commit before that
+    await commit_unit_of_work()
     data = await state.get_data()
     main_message_id = data.get("main_message_id")
 
     if main_message_id and message.bot and not create_new:
-        try:
-            await message.bot.edit_message_text(
-                chat_id=message.chat.id,
-                message_id=main_message_id,
-                text=text,
-                reply_markup=reply_markup,
-                **kwargs,
-            )
+        result = await main_message_renders.edit(
+            message.bot,
+            chat_id=message.chat.id,
+            message_id=main_message_id,
+            text=text,
+            reply_markup=reply_markup,
+            **kwargs,
+        )
+        if result != RenderResult.FAILED:
             if main_message_id != message.message_id:
                 await message.delete()
             return
-        except Exception:
-            pass
 
     msg = await message.answer(text=text, reply_markup=reply_markup, **kwargs)
     await state.update_data(main_message_id=msg.message_id)
+    main_message_renders.remember(
+        message.chat.id, msg.message_id, render_digest(text, reply_markup, **kwargs)
+    )
@@ -8,10 +8,22 @@ from .tracker import (
     TrackerDataResponse,
     TrackerStructureCreate,
     TrackerStructureResponse,
+    TrackerSummary,
 )
+from .page import Page, PageDirection
+from .schedule import DigestSchedule, FiredReminder, Reminder
+from .retention import RetentionPolicy
 from .result import (
     AggregatedNumericData,
+    DashboardFieldData,
+    DashboardTrackerData,
     DataResult,
+    DataRowResult,
     StatisticsTrackerData,
     FieldResult,
+    FieldAnalytics,
+    FieldSeries,
+    NumericSeries,
+    ValueCount,
+    WindowAggregatedData,
 )
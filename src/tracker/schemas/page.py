@@ -0,0 +1,30 @@
+from typing import Generic, Literal, Self, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+PageDirection = Literal["first", "older", "newer"]
+
+
+class Page(BaseModel, Generic[T]):
+    """Rows of a keyset-paginated list, newest first."""
+
+    rows: list[T]
+    has_newer: bool
+    has_older: bool
+
+    @classmethod
+    def from_rows(cls, rows: list[T], page_size: int, direction: PageDirection) -> Self:
+        """Builds the page from rows fetched with a limit of `page_size + 1`.
+
+        The extra row only tells that there is a page further in the
+        direction of the fetch. Rows must be ordered newest first.
+        """
+        more = len(rows) > page_size
+        if direction == "newer":
+            # the extra row is the newest one
+            return cls(rows=rows[-page_size:], has_newer=more, has_older=True)
+        return cls(
+            rows=rows[:page_size], has_newer=direction == "older", has_older=more
+        )
@@ -1,6 +1,8 @@
 from datetime import datetime
-from typing import Any, Literal
+from typing import Any, Literal, NamedTuple
+from uuid import UUID
 
+import numpy as np
 from pydantic import BaseModel, model_validator
 
 
@@ -9,11 +11,40 @@ class DataResult(BaseModel):
     value: dict
 
 
+class DataRowResult(DataResult):
+    id: UUID
+
+    @property
+    def key(self) -> tuple[datetime, UUID]:
+        """Keyset pagination key of the record."""
+        return self.date, self.id
+
+
 class FieldResult(BaseModel):
     date: datetime
     value: Any
 
 
+class FieldSeries(NamedTuple):
+    """Values of a numeric field, oldest first.
+
+    Not a model, series are long and validating every point is too slow.
+    """
+
+    timestamps: list[float]  # UNIX timestamps in seconds
+    values: list[float]
+
+
+class NumericSeries(NamedTuple):
+    """Values of numeric fields of the same records, oldest first.
+
+    A value is NaN where a record has no value of the field.
+    """
+
+    timestamps: np.ndarray  # UNIX timestamps in seconds
+    values: dict[str, np.ndarray]
+
+
 class AggregatedNumericData(BaseModel):
     id: int
     interval_start: datetime
@@ -25,24 +56,45 @@ class AggregatedNumericData(BaseModel):
     record_count: int
 
 
+class WindowAggregatedData(BaseModel):
+    date: datetime
+    value: float
+    # aggregates of the window ending at the record, by aggregate
+    rolling: dict[str, float] = {}
+    # aggregates of the period up to the record, by aggregate
+    cumulative: dict[str, float] = {}
+
+
+class ValueCount(BaseModel):
+    value: str
+    count: int
+    # the count overestimates the value by at most this, see `TrackerValueCountOrm`
+    error: int = 0
+
+
 class StatisticsTrackerData(BaseModel):
     type: Literal["numeric", "categorical"]
     min: float | int | None = None
     max: float | int | None = None
     avg: float | int | None = None
     sum: float | int | None = None
+    # population standard deviation
+    std: float | None = None
     mode: str | None = None
+    # most frequent values, most frequent first
+    top: list[ValueCount] | None = None
     count: int
     field_name: str
 
     @model_validator(mode="after")
     def validate_at_least_one_not_none(self) -> "StatisticsTrackerData":
+        numbers = [self.min, self.max, self.avg, self.sum]
         if self.type == "categorical" and (
-            self.mode is None or any([self.min, self.max, self.avg, self.sum])
+            self.mode is None or any(i is not None for i in numbers)
         ):
             raise ValueError()
         if self.type == "numeric" and (
-            self.mode is not None or not all([self.min, self.max, self.avg, self.sum])
+            self.mode is not None or any(i is None for i in numbers)
         ):
             raise ValueError()
         return self
@@ -57,12 +109,98 @@ class StatisticsTrackerData(BaseModel):
     @property
     def formatted(self) -> str:
         if self.type == "numeric":
+            std = (
+                f"std - {self._format_float(self.std)}, "
+                if self.std is not None
+                else ""
+            )
             return (
                 f"{self.field_name}: min - {self._format_float(self.min)}, "
                 f"max - {self._format_float(self.max)}, "
                 f"avg - {self._format_float(self.avg)}, "
                 f"sum - {self._format_float(self.sum)}, "
-                f"count - {self.count}"
+                f"{std}count - {self.count}"
             )
         else:
-            return f"{self.field_name}: mode - {self.mode}, count - {self.count}"
+            top = (
+                ", top - " + ", ".join(f"{i.value} ({i.count})" for i in self.top)
+                if self.top and len(self.top) > 1
+                else ""
+            )
+            return f"{self.field_name}: mode - {self.mode}{top}, count - {self.count}"
+
+
+class FieldAnalytics(BaseModel):
+    field_name: str
+    count: int
+    last: float
+    # trailing mean and EWMA of the last `window` values
+    window: int
+    moving_average: float
+    ewma: float
+    # z-score of the last value within the period
+    zscore: float
+    # of the last day's mean to the previous day's mean, in percent
+    day_change: float | None = None
+    # consecutive days with values, the current streak ends on the last one
+    current_streak: int
+    longest_streak: int
+
+    @property
+    def formatted(self) -> str:
+        f = StatisticsTrackerData._format_float
+        change = (
+            f"day change - {self.day_change:+.1f}%, "
+            if self.day_change is not None
+            else ""
+        )
+        return (
+            f"{self.field_name}: last - {f(self.last)}, "
+            f"avg({self.window}) - {f(self.moving_average)}, "
+            f"ewma({self.window}) - {f(self.ewma)}, "
+            f"z-score - {f(self.zscore)}, "
+            f"{change}"
+            f"streak - {self.current_streak} d (max {self.longest_streak} d), "
+            f"count - {self.count}"
+        )
+
+
+class DashboardFieldData(BaseModel):
+    field_name: str
+    count: int
+    last: float | None = None
+    # mean of the last `days` days and its change to the mean of the `days`
+    # before, in percent
+    days: int
+    period_avg: float | None = None
+    trend: float | None = None
+
+    @property
+    def formatted(self) -> str:
+        f = StatisticsTrackerData._format_float
+        last = f"last - {f(self.last)}, " if self.last is not None else ""
+        period_avg = (
+            f"avg({self.days} d) - {f(self.period_avg)}, "
+            if self.period_avg is not None
+            else ""
+        )
+        trend = f"trend - {self.trend:+.1f}%, " if self.trend is not None else ""
+        return f"{self.field_name}: {last}{period_avg}{trend}count - {self.count}"
+
+
+class DashboardTrackerData(BaseModel):
+    tracker_id: UUID
+    tracker_name: str
+    last_record_at: datetime | None = None
+    fields: list[DashboardFieldData] = []
+
+    @property
+    def formatted(self) -> str:
+        last_record = (
+            f" (last record - {self.last_record_at:%Y-%m-%d %H:%M})"
+            if self.last_record_at is not None
+            else ""
+        )
+        return "\n".join(
+            [f"{self.tracker_name}{last_record}", *(i.formatted for i in self.fields)]
+        )
@@ -0,0 +1,9 @@
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class RetentionPolicy(BaseModel):
+    tracker_id: UUID
+    # records older than this many whole UTC days are archived
+    raw_days: int
@@ -0,0 +1,30 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class DigestSchedule(BaseModel):
+    user_id: str
+    period_days: int
+    next_run_at: datetime
+    language: str = "ru"
+
+    @property
+    def key(self) -> tuple[datetime, str]:
+        """Order of the schedules by their next run."""
+        return self.next_run_at, self.user_id
+
+
+class Reminder(BaseModel):
+    tracker_id: UUID
+    period_days: int
+    next_fire_at: datetime
+    language: str = "ru"
+
+
+class FiredReminder(Reminder):
+    """A claimed reminder, `next_fire_at` is already the next one."""
+
+    user_id: str
+    tracker_name: str
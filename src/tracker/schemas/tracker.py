@@ -33,6 +33,21 @@ class TrackerCreate(TrackerCreateBase):
     structure: TrackerStructureCreate
 
 
+class TrackerSummary(BaseModel):
+    """Tracker without its structure and records, for lists."""
+
+    id: UUID
+    name: str
+    last_activity_at: datetime
+    # bumped by every change of the records, see `TrackerOrm.data_version`
+    data_version: int = 0
+
+    @property
+    def key(self) -> tuple[datetime, UUID]:
+        """Keyset pagination key of the tracker."""
+        return self.last_activity_at, self.id
+
+
 class TrackerResponse(TrackerCreateBase):
     id: UUID
     user: UserResponse
@@ -2,3 +2,8 @@
 from .tracker_service import TrackerService
 from .user_service import UserService
 from .data_service import DataService
+from .schedule_service import ScheduleService
+from .retention_service import RetentionService
+from .deletion_service import DeletionService
+from .unit_of_work import UnitOfWork, after_commit, commit_unit_of_work
+from .filter_index_service import FilterIndexService
@@ -0,0 +1,229 @@
+"""Statements moving old records into `TrackerDataArchiveOrm` and
+`TrackerDataRollupOrm`, and reading them back.
+
+A batch of the oldest records of a tracker is deleted from `tracker_data`,
+appended to the archive days of the records and rolled up into the daily
+statistics of their numeric fields, all in one statement. Archived records
+keep everything, readers of whole records union them with those in
+`tracker_data`. Series and statistics of numeric fields read the rollups
+instead, which cover whole UTC days.
+
+The running statistics and the value counts of a tracker stay as they are,
+they count archived records like any other.
+"""
+
+from datetime import datetime, time, timezone
+from uuid import UUID
+
+from sqlalchemy import (
+    ColumnElement,
+    CompoundSelect,
+    DateTime,
+    Select,
+    Update,
+    Uuid,
+    bindparam,
+    cast,
+    column,
+    delete,
+    exists,
+    func,
+    select,
+    true,
+    update,
+)
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by, insert
+from tracker.models import (
+    TrackerDataArchiveOrm,
+    TrackerDataOrm,
+    TrackerDataRollupOrm,
+    TrackerOrm,
+)
+
+from .field_stats import merged_stats, numeric_values
+from .value_counts import utc_day
+
+
+def day_start(timestamp: datetime) -> datetime:
+    """Start of the UTC day of a timestamp, naive ones are taken as UTC."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    day = timestamp.astimezone(timezone.utc).date()
+    return datetime.combine(day, time(), timezone.utc)
+
+
+def archived_records(*conditions: ColumnElement[bool]) -> Select:
+    """Selects `tracker_id, id, data, created_at` of archived records.
+
+    Args:
+        conditions (ColumnElement[bool]): Conditions on
+            `TrackerDataArchiveOrm`, filter the days before the records are
+            unpacked.
+    """
+    a = TrackerDataArchiveOrm
+    record = (
+        func.jsonb_array_elements(a.records)
+        .table_valued(column("value", JSONB))
+        .alias("r")
+    )
+    return (
+        select(
+            a.tracker_id,
+            cast(record.c.value["id"].astext, Uuid).label("id"),
+            record.c.value["data"].label("data"),
+            cast(record.c.value["created_at"].astext, DateTime(timezone=True)).label(
+                "created_at"
+            ),
+        )
+        .select_from(a)
+        .join(record, true())
+        .where(*conditions)
+    )
+
+
+def all_records(
+    tracker_id: UUID | None = None,
+    from_date: datetime | None = None,
+    until: datetime | None = None,
+) -> CompoundSelect:
+    """Selects `tracker_id, id, data, created_at` of records, archived or not.
+
+    Args:
+        tracker_id (UUID | None): ID of the tracker, all trackers if None.
+        from_date (datetime | None): Start date of the records.
+        until (datetime | None): End date of the records, excluded.
+    """
+    d, a = TrackerDataOrm, TrackerDataArchiveOrm
+    raw, days = [], []
+    if tracker_id is not None:
+        raw.append(d.tracker_id == tracker_id)
+        days.append(a.tracker_id == tracker_id)
+    if from_date is not None:
+        raw.append(d.created_at >= from_date)
+        days.append(a.day >= day_start(from_date).date())
+    if until is not None:
+        raw.append(d.created_at < until)
+        days.append(a.day <= day_start(until).date())
+    archived = archived_records(*days).subquery("archived")
+    in_period = []
+    if from_date is not None:
+        in_period.append(archived.c.created_at >= from_date)
+    if until is not None:
+        in_period.append(archived.c.created_at < until)
+    return (
+        select(d.tracker_id, d.id, d.data, d.created_at)
+        .where(*raw)
+        .union_all(select(archived).where(*in_period))
+    )
+
+
+def rollup_means(
+    tracker_id: UUID,
+    fields: list[str],
+    from_date: datetime | None = None,
+) -> Select:
+    """Selects the day start as `timestamp` and the mean of every field as
+    `value_0`, `value_1`, ... of the rolled up days, None for a field without
+    values on a day.
+
+    Args:
+        tracker_id (UUID): ID of the tracker.
+        fields (list[str]): Numeric fields.
+        from_date (datetime | None): Start date, whole days including it are
+            selected.
+    """
+    r = TrackerDataRollupOrm
+    conditions = [r.tracker_id == tracker_id, r.field.in_(fields)]
+    if from_date is not None:
+        conditions.append(r.day >= day_start(from_date).date())
+    return (
+        select(
+            func.date_part("epoch", r.day).label("timestamp"),
+            *(
+                func.max(r.mean).filter(r.field == field).label(f"value_{i}")
+                for i, field in enumerate(fields)
+            ),
+        )
+        .where(*conditions)
+        .group_by(r.day)
+    )
+
+
+def _archive_records_statement() -> Update:
+    d = TrackerDataOrm
+    tracker_id = bindparam("tracker_id", type_=Uuid)
+    batch = (
+        select(d.id)
+        .where(d.tracker_id == tracker_id, d.created_at < bindparam("before"))
+        .order_by(d.created_at, d.id)
+        .limit(bindparam("limit"))
+        # concurrent jobs archive different records
+        .with_for_update(skip_locked=True)
+    )
+    moved = (
+        delete(d)
+        .where(d.id.in_(batch.scalar_subquery()))
+        .returning(d.id, d.tracker_id, d.data, d.created_at)
+        .cte("moved")
+    )
+
+    day = utc_day(moved.c.created_at)
+    record = func.jsonb_build_object(
+        "id", moved.c.id, "created_at", moved.c.created_at, "data", moved.c.data
+    )
+    days = insert(TrackerDataArchiveOrm).from_select(
+        ["tracker_id", "day", "count", "records"],
+        select(
+            moved.c.tracker_id,
+            day,
+            func.count(),
+            func.jsonb_agg(aggregate_order_by(record, moved.c.created_at)),
+        ).group_by(moved.c.tracker_id, day),
+    )
+    archived = days.on_conflict_do_update(
+        index_elements=["tracker_id", "day"],
+        set_={
+            "count": TrackerDataArchiveOrm.count + days.excluded.count,
+            # batches are archived in order, so the records stay ordered
+            "records": TrackerDataArchiveOrm.records.op("||")(days.excluded.records),
+        },
+    ).cte("archived")
+
+    v = (
+        numeric_values(moved)
+        .add_columns(utc_day(moved.c.created_at).label("day"))
+        .subquery("v")
+    )
+    count = func.count(v.c.value)
+    rollups = insert(TrackerDataRollupOrm).from_select(
+        ["tracker_id", "field", "day", "count", "mean", "m2", "sum", "min", "max"],
+        select(
+            v.c.tracker_id,
+            v.c.field,
+            v.c.day,
+            count,
+            func.avg(v.c.value),
+            func.var_pop(v.c.value) * count,
+            func.sum(v.c.value),
+            func.min(v.c.value),
+            func.max(v.c.value),
+        ).group_by(v.c.tracker_id, v.c.field, v.c.day),
+    )
+    rolled_up = rollups.on_conflict_do_update(
+        index_elements=["tracker_id", "field", "day"],
+        set_=merged_stats(TrackerDataRollupOrm, rollups.excluded),
+    ).cte("rolled_up")
+
+    return (
+        update(TrackerOrm)
+        .where(TrackerOrm.id == tracker_id, exists(select(moved.c.id)))
+        # series and statistics of the archived days change
+        .values(data_version=TrackerOrm.data_version + 1)
+        .returning(select(func.count()).select_from(moved).scalar_subquery())
+        .add_cte(moved, archived, rolled_up)
+        .execution_options(synchronize_session=False)
+    )
+
+
+# built once like the statement adding records
+ARCHIVE_RECORDS = _archive_records_statement()
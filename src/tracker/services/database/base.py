@@ -0,0 +1,63 @@
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Sequence
+
+from sqlalchemy import ColumnElement, Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from .unit_of_work import current_unit_of_work
+
+
+def keyset_seek(
+    stmt: Select,
+    key: Sequence[ColumnElement],
+    limit: int,
+    older_than: Sequence[Any] | None = None,
+    newer_than: Sequence[Any] | None = None,
+) -> Select:
+    """Limits the statement to a page next to a key, ordered by the key.
+
+    Rows are ordered by the key descending, newest first, and the page is
+    seeked by comparing the key as a row instead of skipping rows with
+    OFFSET, so with an index on the key every page costs the same. Rows newer
+    than a key are selected ascending, to get those closest to it, and must be
+    reversed by the caller.
+    """
+    if newer_than is not None:
+        return (
+            stmt.where(tuple_(*key) > tuple_(*newer_than))
+            .order_by(*(i.asc() for i in key))
+            .limit(limit)
+        )
+    if older_than is not None:
+        stmt = stmt.where(tuple_(*key) < tuple_(*older_than))
+    return stmt.order_by(*(i.desc() for i in key)).limit(limit)
+
+
+class BaseService:
+    """Base class for services, stateless so one instance can be shared."""
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self.session_factory = session_factory
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        """Yields the session of the current unit of work or a new one."""
+        uow = current_unit_of_work()
+        if uow is not None:
+            yield uow.session
+            return
+        async with self.session_factory() as session:
+            yield session
+
+    async def commit(self, session: AsyncSession) -> None:
+        """Commits the session, inside a unit of work only flushes it.
+
+        The unit of work commits once at the end. Objects are expired after
+        the flush so later reads in the same unit of work see fresh rows
+        instead of the identity map copies.
+        """
+        if current_unit_of_work() is None:
+            await session.commit()
+            return
+        await session.flush()
+        session.expire_all()
@@ -0,0 +1,46 @@
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, String, column, func, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.selectable import TableValuedAlias
+from tracker.core.field_codec import FieldCodec
+from tracker.core.lru import LRUCache
+from tracker.models import TrackerOrm, TrackerStructureOrm
+
+# structures never change, so the codec of a tracker is cached for good and
+# records are encoded and decoded without looking the structure up
+_codecs: LRUCache[UUID, FieldCodec] = LRUCache(4096)
+
+
+async def tracker_codec(session: AsyncSession, tracker_id: UUID) -> FieldCodec:
+    """Returns the codec of the records of a tracker, an empty one if the
+    tracker does not exist."""
+    codec = _codecs.get(tracker_id)
+    if codec is not None:
+        return codec
+    structure = await session.scalar(
+        select(TrackerStructureOrm.data)
+        .join(TrackerOrm, TrackerOrm.structure_id == TrackerStructureOrm.id)
+        .where(TrackerOrm.id == tracker_id)
+    )
+    if structure is None:
+        return FieldCodec({})
+    codec = FieldCodec(structure)
+    _codecs.put(tracker_id, codec)
+    return codec
+
+
+def structure_fields(name: str = "fields") -> TableValuedAlias:
+    """`jsonb_each` of `TrackerStructureOrm.data` with the columns `name` and
+    `props`, see `stored_key`."""
+    return (
+        func.jsonb_each(TrackerStructureOrm.data)
+        .table_valued(column("name", String), column("props", JSONB))
+        .render_derived(name)
+    )
+
+
+def stored_key(fields: TableValuedAlias) -> ColumnElement[str]:
+    """Key of the fields of `structure_fields` in the stored records."""
+    return func.coalesce(fields.c.props["id"].astext, fields.c.name)
@@ -1,30 +1,102 @@
-from datetime import datetime
-from typing import Literal
+from datetime import datetime, time, timedelta, timezone
+from typing import AsyncIterator, Literal
 from uuid import UUID
 
-from sqlalchemy import Integer, Numeric, cast, func, select
-from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION, array
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
-from tracker.models import TrackerDataOrm
-from tracker.schemas import AggregatedNumericData, DataResult, StatisticsTrackerData
+import numpy as np
+from sqlalchemy import (
+    ARRAY,
+    BigInteger,
+    ColumnElement,
+    Integer,
+    Numeric,
+    Update,
+    Uuid,
+    and_,
+    any_,
+    bindparam,
+    cast,
+    delete,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    text,
+    true,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION, aggregate_order_by, array
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from tracker.core.field_codec import FieldCodec
+from tracker.core.record_filter import RecordFilter
+from tracker.models import (
+    TrackerDataArchiveOrm,
+    TrackerDataOrm,
+    TrackerDataRollupOrm,
+    TrackerFieldStatsOrm,
+    TrackerOrm,
+    TrackerStructureOrm,
+    TrackerValueCountOrm,
+)
+from tracker.schemas import (
+    AggregatedNumericData,
+    DashboardFieldData,
+    DashboardTrackerData,
+    DataResult,
+    DataRowResult,
+    FieldSeries,
+    NumericSeries,
+    StatisticsTrackerData,
+    ValueCount,
+    WindowAggregatedData,
+)
 from tracker.schemas.result import FieldResult
 
+from .archive import all_records, archived_records, day_start, rollup_means
+from .base import BaseService, keyset_seek
+from .codecs import tracker_codec
+from .field_stats import (
+    declare_fields,
+    grouped_stats,
+    merge_stats,
+    numeric_values,
+    reset_stats,
+)
+from .filters import filter_condition
+from .value_counts import categorical_values, exact_counts
+from .windows import over_time
+
 AggregateType = Literal["min", "max", "avg", "sum"]
 
+_AGGREGATES = {"min": func.min, "max": func.max, "avg": func.avg, "sum": func.sum}
+
+
+def bump_data_version(*conditions: ColumnElement[bool]) -> Update:
+    """Invalidates the results cached for the data of trackers.
 
-class DataService:
+    Args:
+        conditions (ColumnElement[bool]): Conditions on `TrackerOrm`.
+    """
+    return (
+        update(TrackerOrm)
+        .where(*conditions)
+        .values(data_version=TrackerOrm.data_version + 1)
+    )
 
-    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
-        self.session_factory = session_factory
 
+class DataService(BaseService):
     async def get_field_by_name(self, tracker_id: UUID, name: str) -> list[FieldResult]:
-        async with self.session_factory() as session:
+        async with self.session() as session:
+            codec = await tracker_codec(session, tracker_id)
+            key = codec.key(name)
             stmt = (
                 select(
                     func.row_number()
                     .over(order_by=TrackerDataOrm.created_at)
                     .label("id"),
-                    TrackerDataOrm.data[name].label("value"),
+                    TrackerDataOrm.data[key].label("value"),
                     TrackerDataOrm.created_at.label("date"),
                 )
                 .where(TrackerDataOrm.tracker_id == tracker_id)
@@ -34,11 +106,106 @@ class DataService:
             return [
                 FieldResult(
                     date=row.date,
-                    value=row.value,
+                    value=codec.decode_value(name, row.value),
                 )
                 for row in res.all()
             ]
 
+    async def get_field_series(
+        self,
+        tracker_id: UUID,
+        field: str,
+        from_date: datetime | None = None,
+        where: RecordFilter | None = None,
+    ) -> FieldSeries:
+        """Returns the values of a numeric field with their timestamps.
+
+        The series is aggregated into two arrays in the database and fetched
+        as a single row, which is much cheaper than a row per point for long
+        series. Records without the field are skipped. Archived records are
+        represented by the daily means of their rollups at the start of
+        their days, unless the records are filtered by `where`: rollups
+        cannot be filtered, so archived records are read whole.
+        """
+        async with self.session() as session:
+            codec = await tracker_codec(session, tracker_id)
+            field = codec.key(field)
+            if where is None:
+                records = TrackerDataOrm.__table__
+                conditions = [records.c.tracker_id == tracker_id]
+                if from_date is not None:
+                    conditions.append(records.c.created_at >= from_date)
+            else:
+                records = all_records(tracker_id, from_date).subquery("records")
+                conditions = [filter_condition(records, tracker_id, where, codec)]
+            value = cast(records.c.data[field].astext, DOUBLE_PRECISION)
+            # date_part returns a double, extract a slower numeric
+            timestamp = func.date_part("epoch", records.c.created_at)
+            conditions.append(records.c.data[field].astext.is_not(None))
+            points = select(timestamp.label("timestamp"), value.label("value_0")).where(
+                *conditions
+            )
+            if where is None:
+                points = union_all(points, rollup_means(tracker_id, [field], from_date))
+            points = points.subquery("points")
+            order = points.c.timestamp
+            stmt = select(
+                func.array_agg(aggregate_order_by(order, order)),
+                func.array_agg(aggregate_order_by(points.c.value_0, order)),
+            )
+            timestamps, values = (await session.execute(stmt)).one()
+            return FieldSeries(timestamps or [], values or [])
+
+    async def get_numeric_series(
+        self,
+        tracker_id: UUID,
+        fields: list[str],
+        from_date: datetime | None = None,
+    ) -> NumericSeries:
+        """Returns the values of numeric fields as NumPy arrays.
+
+        Like `get_field_series` every field is aggregated into an array in
+        the database and fetched as a single row, then converted to float64
+        arrays without an object per record. The arrays of all fields share
+        the timestamps of the records, NaN where a record has no value.
+        Archived records are represented like in `get_field_series`.
+        """
+        async with self.session() as session:
+            codec = await tracker_codec(session, tracker_id)
+            keys = [codec.key(field) for field in fields]
+            conditions = [TrackerDataOrm.tracker_id == tracker_id]
+            if from_date is not None:
+                conditions.append(TrackerDataOrm.created_at >= from_date)
+            records = select(
+                func.date_part("epoch", TrackerDataOrm.created_at).label("timestamp"),
+                *(
+                    cast(TrackerDataOrm.data[key].astext, DOUBLE_PRECISION).label(
+                        f"value_{i}"
+                    )
+                    for i, key in enumerate(keys)
+                ),
+            ).where(*conditions)
+            points = union_all(
+                records, rollup_means(tracker_id, keys, from_date)
+            ).subquery("points")
+            order = points.c.timestamp
+
+            def agg(value):
+                return func.array_agg(aggregate_order_by(value, order))
+
+            stmt = select(
+                agg(order), *(agg(points.c[f"value_{i}"]) for i in range(len(fields)))
+            )
+            timestamps, *values = (await session.execute(stmt)).one()
+            return NumericSeries(
+                np.array(timestamps or [], dtype=np.float64),
+                {
+                    # None of a missing value becomes NaN
+                    field: np.array(i or [], dtype=np.float64)
+                    for field, i in zip(fields, values)
+                },
+            )
+
     async def get_sum_field(
         self,
         tracker_id: UUID,
@@ -46,7 +213,8 @@ class DataService:
         aggregates: list[AggregateType],
         interval: int,
     ) -> list[AggregatedNumericData]:
-        async with self.session_factory() as session:
+        async with self.session() as session:
+            field = (await tracker_codec(session, tracker_id)).key(field)
             field_value = cast(TrackerDataOrm.data[field].astext, Numeric).label(
                 "field_value"
             )
@@ -95,6 +263,133 @@ class DataService:
                 for row in res.all()
             ]
 
+    async def stream_window_aggregates(
+        self,
+        tracker_id: UUID,
+        field: str,
+        rolling: list[AggregateType],
+        window: timedelta,
+        cumulative: list[AggregateType] | None = None,
+        from_date: datetime | None = None,
+        max_points: int | None = None,
+    ) -> AsyncIterator[WindowAggregatedData]:
+        """Yields rolling and cumulative aggregates of a numeric field at
+        every record, oldest first.
+
+        Computed in the database with window functions over the records
+        ordered by `created_at`, the rows are streamed from a server-side
+        cursor. A rolling aggregate covers the `window` before a record, also
+        before `from_date`, a cumulative one the records of the period up to
+        it. Records with the same `created_at` are one point: the aggregates
+        at each of them cover all of them.
+
+        A rolling sum or average is the difference of running sums at the
+        record and at the start of its window, which costs the same for any
+        window. Rolling min and max are aggregated over every window, use
+        them with short windows.
+
+        Args:
+            tracker_id (UUID): ID of the tracker.
+            field (str): Numeric field.
+            rolling (list[AggregateType]): Aggregates over the window.
+            window (timedelta): Length of the rolling window.
+            cumulative (list[AggregateType] | None): Aggregates since the
+                start of the period.
+            from_date (datetime | None): Start date for data selection.
+            max_points (int | None): Number of rows to return at most, every
+                n-th row and the last one are kept if there are more.
+        """
+        cumulative = cumulative or []
+        async with self.session() as session:
+            field = (await tracker_codec(session, tracker_id)).key(field)
+        # numeric keeps the differences of running sums exact
+        value = cast(TrackerDataOrm.data[field].astext, Numeric)
+        conditions = [
+            TrackerDataOrm.tracker_id == tracker_id,
+            TrackerDataOrm.data[field].astext.is_not(None),
+        ]
+        if from_date is not None:
+            # the window of the first records reaches before the period
+            conditions.append(TrackerDataOrm.created_at >= from_date - window)
+        points = (
+            select(
+                TrackerDataOrm.id,
+                TrackerDataOrm.created_at.label("date"),
+                value.label("value"),
+            )
+            .where(*conditions)
+            .subquery("points")
+        )
+
+        # records with the same timestamp are one point, the aggregates at
+        # each of them cover all of them whatever order they are read in
+        running = {"order_by": points.c.date}
+        peers = {"partition_by": points.c.date}
+        running_sum = func.sum(points.c.value).over(**running)
+        running_count = func.count().over(**running)
+        columns = [
+            running_sum.label("running_sum"),
+            running_count.label("running_count"),
+            # the running sum and count before the timestamp
+            (running_sum - func.sum(points.c.value).over(**peers)).label("before_sum"),
+            (running_count - func.count().over(**peers)).label("before_count"),
+        ]
+        for i in cumulative:
+            aggregate = _AGGREGATES[i](points.c.value)
+            if from_date is not None:
+                aggregate = aggregate.filter(points.c.date >= from_date)
+            columns.append(aggregate.over(**running).label(f"cumulative_{i}"))
+        prefix = select(points.c.id, points.c.date, points.c.value, *columns).subquery(
+            "prefix"
+        )
+
+        # the running sum and count before the first timestamp of the window
+        window_sum = prefix.c.running_sum - over_time(
+            func.first_value(prefix.c.before_sum), prefix.c.date, window
+        )
+        window_count = prefix.c.running_count - over_time(
+            func.first_value(prefix.c.before_count), prefix.c.date, window
+        )
+        rolling_columns = {
+            "sum": window_sum,
+            "avg": window_sum / window_count,
+            "min": over_time(func.min(prefix.c.value), prefix.c.date, window),
+            "max": over_time(func.max(prefix.c.value), prefix.c.date, window),
+        }
+        windows = select(
+            prefix.c.id,
+            prefix.c.date,
+            prefix.c.value,
+            *(prefix.c[f"cumulative_{i}"] for i in cumulative),
+            *(rolling_columns[i].label(f"rolling_{i}") for i in rolling),
+        ).subquery("windows")
+        period = select(windows)
+        if from_date is not None:
+            period = period.where(windows.c.date >= from_date)
+        period = period.subquery("period")
+        numbered = select(
+            period,
+            func.row_number().over(order_by=(period.c.date, period.c.id)).label("n"),
+            func.count().over().label("total"),
+        )
+        if max_points is not None:
+            numbered = numbered.subquery("numbered")
+            step = (numbered.c.total + max_points - 1) // max_points
+            numbered = select(numbered).where(
+                or_((numbered.c.n - 1) % step == 0, numbered.c.n == numbered.c.total)
+            )
+        stmt = numbered.order_by(numbered.selected_columns.n)
+
+        async with self.session() as session:
+            rows = await session.stream(stmt.execution_options(yield_per=1000))
+            async for row in rows:
+                yield WindowAggregatedData(
+                    date=row.date,
+                    value=row.value,
+                    rolling={i: getattr(row, f"rolling_{i}") for i in rolling},
+                    cumulative={i: getattr(row, f"cumulative_{i}") for i in cumulative},
+                )
+
     async def get_field_aggregation_days(
         self,
         tracker_id: UUID,
@@ -103,7 +398,8 @@ class DataService:
         interval: str = "day",
         custom_days: int | None = None,
     ) -> list[AggregatedNumericData]:
-        async with self.session_factory() as session:
+        async with self.session() as session:
+            field = (await tracker_codec(session, tracker_id)).key(field)
             field_value = cast(TrackerDataOrm.data[field].astext, Numeric).label(
                 "field_value"
             )
@@ -159,31 +455,89 @@ class DataService:
         tracker_id: UUID,
         from_date: datetime | None = None,
         exclude_fields: list[str] | None = None,
+        where: RecordFilter | None = None,
     ) -> list[DataResult]:
+        """Returns the records of the tracker, archived ones included, oldest
+        first, only those matching `where` if given."""
         exclude_fields = exclude_fields or []
 
-        async with self.session_factory() as session:
+        async with self.session() as session:
+            codec = await tracker_codec(session, tracker_id)
+            records = all_records(tracker_id, from_date).subquery("records")
             if exclude_fields:
-                data_expr = TrackerDataOrm.data.op("-")(array(exclude_fields))
+                keys = [codec.key(field) for field in exclude_fields]
+                data_expr = records.c.data.op("-")(array(keys))
             else:
-                data_expr = TrackerDataOrm.data
+                data_expr = records.c.data
+
+            query = select(
+                records.c.created_at.label("date"),
+                data_expr.label("data"),
+            ).order_by(records.c.created_at)
+            if where is not None:
+                query = query.where(filter_condition(records, tracker_id, where, codec))
 
+            res = await session.execute(query)
+            rows = res.all()
+
+            return [
+                DataResult(date=row.date, value=codec.decode(row.data)) for row in rows
+            ]
+
+    async def get_data_page(
+        self,
+        tracker_id: UUID,
+        limit: int,
+        from_date: datetime | None = None,
+        older_than: tuple[datetime, UUID] | None = None,
+        newer_than: tuple[datetime, UUID] | None = None,
+    ) -> list[DataRowResult]:
+        """Returns up to `limit` records next to a key, newest first.
+
+        Pages are seeked by the `(created_at, id)` key through the index on
+        `(tracker_id, created_at, id)` instead of OFFSET, so every page costs
+        the same. Without a key the newest records are returned. Archived
+        records are not paged.
+
+        Args:
+            tracker_id (UUID): ID of the tracker.
+            limit (int): Number of records to return at most.
+            from_date (datetime | None): Start date for data selection.
+            older_than (tuple[datetime, UUID] | None): Key of the record to
+                return the older records of.
+            newer_than (tuple[datetime, UUID] | None): Key of the record to
+                return the newer records of, those closest to it.
+        """
+        async with self.session() as session:
+            codec = await tracker_codec(session, tracker_id)
             conditions = [TrackerDataOrm.tracker_id == tracker_id]
             if from_date is not None:
                 conditions.append(TrackerDataOrm.created_at >= from_date)
-            query = (
+            stmt = keyset_seek(
                 select(
+                    TrackerDataOrm.id,
                     TrackerDataOrm.created_at.label("date"),
-                    data_expr.label("data"),
-                )
-                .where(*conditions)
-                .order_by(TrackerDataOrm.created_at)
+                    TrackerDataOrm.data,
+                ).where(*conditions),
+                key=(TrackerDataOrm.created_at, TrackerDataOrm.id),
+                limit=limit,
+                older_than=older_than,
+                newer_than=newer_than,
             )
+            rows = (await session.execute(stmt)).all()
+            if newer_than is not None:
+                rows.reverse()
+            return [
+                DataRowResult(id=row.id, date=row.date, value=codec.decode(row.data))
+                for row in rows
+            ]
 
-            res = await session.execute(query)
-            rows = res.all()
-
-            return [DataResult(date=row.date, value=row.data) for row in rows]
+    async def get_data_version(self, tracker_id: UUID) -> int | None:
+        """Returns the data version of the tracker, None if it does not exist."""
+        async with self.session() as session:
+            return await session.scalar(
+                select(TrackerOrm.data_version).where(TrackerOrm.id == tracker_id)
+            )
 
     async def get_statistics(
         self,
@@ -191,75 +545,477 @@ class DataService:
         numeric_fields: list[str] | None,
         categorical_fields: list[str] | None,
         from_date: datetime | None = None,
+        where: RecordFilter | None = None,
     ) -> list[StatisticsTrackerData]:
-        async with self.session_factory() as session:
-            selects = []
+        """Returns the statistics of fields over the records of a period.
+
+        Numeric fields merge the statistics of the records with the rollups
+        of the archived days, only the archived records of the day of
+        `from_date` are read from the archive. Categorical fields are counted
+        from the records, archived ones included. Fields without values are
+        skipped, the rest keep the order of the fields, numeric ones first.
+
+        Args:
+            tracker_id (UUID): ID of the tracker.
+            numeric_fields (list[str] | None): Int and float fields.
+            categorical_fields (list[str] | None): Enum and string fields.
+            from_date (datetime | None): Start date for statistics filtering.
+            where (RecordFilter | None): Filter of the records, the archived
+                ones are read whole instead of the rollups then.
+        """
+        result = []
+        async with self.session() as session:
+            codec = await tracker_codec(session, tracker_id)
             if numeric_fields:
-                for field in numeric_fields:
-                    field_expr = cast(
-                        TrackerDataOrm.data[field].astext, DOUBLE_PRECISION
-                    )
-                    selects.extend(
-                        [
-                            func.min(field_expr).label(f"{field}_min"),
-                            func.max(field_expr).label(f"{field}_max"),
-                            func.avg(field_expr).label(f"{field}_avg"),
-                            func.sum(field_expr).label(f"{field}_sum"),
-                            func.count(field_expr).label(f"{field}_count"),
-                        ]
+                stats = await self._get_period_stats(
+                    session,
+                    tracker_id,
+                    [codec.key(field) for field in numeric_fields],
+                    from_date,
+                    codec,
+                    where,
+                )
+                result += [
+                    StatisticsTrackerData(
+                        field_name=field,
+                        type="numeric",
+                        min=i.min,
+                        max=i.max,
+                        avg=i.avg,
+                        sum=i.sum,
+                        std=max(i.m2 / i.count, 0.0) ** 0.5,
+                        count=i.count,
                     )
+                    for field in numeric_fields
+                    if (i := stats.get(codec.key(field))) is not None
+                ]
             if categorical_fields:
-                for field in categorical_fields:
-                    field_expr = TrackerDataOrm.data[field].astext
-                    selects.extend(
-                        [
-                            func.mode().within_group(field_expr).label(f"{field}_mode"),
-                            func.count(field_expr).label(f"{field}_count"),
-                        ]
+                records = all_records(tracker_id, from_date).subquery("records")
+                selects = []
+                for i, field in enumerate(categorical_fields):
+                    field_expr = records.c.data[codec.key(field)].astext
+                    selects += [
+                        func.mode().within_group(field_expr).label(f"mode_{i}"),
+                        func.count(field_expr).label(f"count_{i}"),
+                    ]
+                stmt = select(*selects)
+                if where is not None:
+                    stmt = stmt.where(
+                        filter_condition(records, tracker_id, where, codec)
                     )
-            conditions = [TrackerDataOrm.tracker_id == tracker_id]
-            if from_date is not None:
-                conditions.append(TrackerDataOrm.created_at >= from_date)
+                row = (await session.execute(stmt)).one()
+                result += [
+                    StatisticsTrackerData(
+                        field_name=field,
+                        type="categorical",
+                        mode=codec.decode_value(field, getattr(row, f"mode_{i}")),
+                        count=count,
+                    )
+                    for i, field in enumerate(categorical_fields)
+                    if (count := getattr(row, f"count_{i}"))
+                ]
+        return result
 
-            stmt = select(*selects).where(*conditions)
+    @staticmethod
+    async def _get_period_stats(
+        session: AsyncSession,
+        tracker_id: UUID,
+        fields: list[str],
+        from_date: datetime | None,
+        codec: FieldCodec,
+        where: RecordFilter | None = None,
+    ) -> dict[str, Row]:
+        """Statistics of numeric fields over the records and the rollups of a
+        period, merged like the running statistics. Filtered records are all
+        read whole, archived ones included, without the rollups."""
+        d, r = TrackerDataOrm, TrackerDataRollupOrm
+        records = select(d.tracker_id, d.data).where(d.tracker_id == tracker_id)
+        rollups = select(
+            r.tracker_id, r.field, r.count, r.mean, r.m2, r.sum, r.min, r.max
+        ).where(r.tracker_id == tracker_id, r.field.in_(fields))
+        if where is not None:
+            filtered = all_records(tracker_id, from_date).subquery("filtered")
+            records = select(filtered.c.tracker_id, filtered.c.data).where(
+                filter_condition(filtered, tracker_id, where, codec)
+            )
+        elif from_date is not None:
+            first_day = day_start(from_date).date()
+            records = records.where(d.created_at >= from_date)
+            # the rollup of the first day covers records before the period
+            rollups = rollups.where(r.day > first_day)
+            first = archived_records(
+                TrackerDataArchiveOrm.tracker_id == tracker_id,
+                TrackerDataArchiveOrm.day == first_day,
+            ).subquery("first")
+            records = records.union_all(
+                select(first.c.tracker_id, first.c.data).where(
+                    first.c.created_at >= from_date
+                )
+            )
+        values = numeric_values(records.subquery("records"))
+        parts = grouped_stats(values.where(values.selected_columns.field.in_(fields)))
+        if where is None:
+            parts = union_all(parts, rollups)
+        parts = parts.subquery("parts")
 
-            count_stmt = select(func.count()).where(*conditions)
-            count_res = await session.execute(count_stmt)
-            total_count = count_res.scalar_one()
-            if total_count == 0:
-                return []
+        by_field = {"partition_by": parts.c.field}
+        mean = func.sum(parts.c.sum).over(**by_field) / cast(
+            func.sum(parts.c.count).over(**by_field), DOUBLE_PRECISION
+        )
+        p = select(parts, mean.label("total_mean")).subquery("p")
+        stmt = select(
+            p.c.field,
+            # the sum of bigints is a numeric
+            cast(func.sum(p.c.count), BigInteger).label("count"),
+            func.max(p.c.total_mean).label("avg"),
+            # the parallel form of Welford's algorithm for any number of parts
+            func.sum(
+                p.c.m2
+                + p.c.count * (p.c.mean - p.c.total_mean) * (p.c.mean - p.c.total_mean)
+            ).label("m2"),
+            func.sum(p.c.sum).label("sum"),
+            func.min(p.c.min).label("min"),
+            func.max(p.c.max).label("max"),
+        ).group_by(p.c.field)
+        return {row.field: row for row in (await session.execute(stmt)).all()}
 
-            res = await session.execute(stmt)
-            row = res.one()
-            if not row:
-                return []
-            result = []
-            if numeric_fields:
-                result.extend(
-                    [
-                        StatisticsTrackerData(
-                            field_name=field,
-                            type="numeric",
-                            min=getattr(row, f"{field}_min", -1),
-                            max=getattr(row, f"{field}_max", -1),
-                            avg=getattr(row, f"{field}_avg", -1),
-                            sum=getattr(row, f"{field}_sum", -1),
-                            count=getattr(row, f"{field}_count", 0),
-                        )
-                        for field in numeric_fields
-                    ]
+    async def get_field_stats(
+        self, tracker_id: UUID, fields: list[str]
+    ) -> list[StatisticsTrackerData]:
+        """Returns the running all-time statistics of numeric fields.
+
+        Read from `tracker_field_stats` without scanning the records. Fields
+        without values are skipped, the rest keep the order of `fields`.
+        """
+        async with self.session() as session:
+            codec = await tracker_codec(session, tracker_id)
+            stmt = select(TrackerFieldStatsOrm).where(
+                TrackerFieldStatsOrm.tracker_id == tracker_id,
+                TrackerFieldStatsOrm.field.in_([codec.key(i) for i in fields]),
+                TrackerFieldStatsOrm.count > 0,
+            )
+            stats = {i.field: i for i in (await session.scalars(stmt)).all()}
+            return [
+                StatisticsTrackerData(
+                    field_name=field,
+                    type="numeric",
+                    min=i.min,
+                    max=i.max,
+                    avg=i.mean,
+                    sum=i.sum,
+                    std=max(i.m2 / i.count, 0.0) ** 0.5,
+                    count=i.count,
                 )
-            if categorical_fields:
-                result.extend(
-                    [
-                        StatisticsTrackerData(
-                            field_name=field,
-                            type="categorical",
-                            mode=getattr(row, f"{field}_mode", ""),
-                            count=getattr(row, f"{field}_count", 0),
-                        )
-                        for field in categorical_fields
-                    ]
+                for field in fields
+                if (i := stats.get(codec.key(field))) is not None
+            ]
+
+    async def get_dashboard(
+        self, tracker_ids: list[UUID], days: int = 7, now: datetime | None = None
+    ) -> list[DashboardTrackerData]:
+        """Returns the summaries of numeric fields of several trackers at once.
+
+        One statement for all trackers: the trackers are passed as a single
+        array to `tracker_id = ANY(...)`, so every number of trackers shares
+        the same compiled and prepared statement. Counts come from the running
+        statistics, the last values from the last record of each tracker and
+        the averages from the records of the last `2 * days` days only.
+
+        Args:
+            tracker_ids (list[UUID]): IDs of the trackers, the order is kept.
+            days (int): Length of the period averaged, the trend compares its
+                average to that of the period before.
+            now (datetime | None): End of the period. Defaults to now.
+
+        Returns:
+            list[DashboardTrackerData]: Summaries of the existing trackers.
+        """
+        now = now or datetime.now(timezone.utc)
+        period_start = now - timedelta(days=days)
+        ids = any_(bindparam("tracker_ids", tracker_ids, type_=ARRAY(Uuid)))
+
+        records = (
+            select(
+                TrackerDataOrm.tracker_id,
+                TrackerDataOrm.data,
+                TrackerDataOrm.created_at,
+            )
+            .where(
+                TrackerDataOrm.tracker_id == ids,
+                TrackerDataOrm.created_at >= now - timedelta(days=2 * days),
+                TrackerDataOrm.created_at <= now,
+            )
+            .subquery("records")
+        )
+        fields = func.jsonb_each_text(records.c.data).table_valued("key", "value")
+        value = cast(fields.c.value, DOUBLE_PRECISION)
+        recent = (
+            select(
+                records.c.tracker_id,
+                fields.c.key.label("field"),
+                func.avg(value)
+                .filter(records.c.created_at > period_start)
+                .label("period_avg"),
+                func.avg(value)
+                .filter(records.c.created_at <= period_start)
+                .label("previous_avg"),
+            )
+            .select_from(records)
+            .join(fields, true())
+            # only numeric fields have statistics
+            .join(
+                TrackerFieldStatsOrm,
+                and_(
+                    TrackerFieldStatsOrm.tracker_id == records.c.tracker_id,
+                    TrackerFieldStatsOrm.field == fields.c.key,
+                ),
+            )
+            .group_by(records.c.tracker_id, fields.c.key)
+            .subquery("recent")
+        )
+        last = (
+            select(TrackerDataOrm.data, TrackerDataOrm.created_at)
+            .where(TrackerDataOrm.tracker_id == TrackerOrm.id)
+            .order_by(TrackerDataOrm.created_at.desc())
+            .limit(1)
+            .lateral("last")
+        )
+        stmt = (
+            select(
+                TrackerOrm.id,
+                TrackerOrm.name,
+                TrackerStructureOrm.data.label("structure"),
+                last.c.created_at.label("last_record_at"),
+                TrackerFieldStatsOrm.field,
+                TrackerFieldStatsOrm.count,
+                cast(
+                    last.c.data[TrackerFieldStatsOrm.field].astext, DOUBLE_PRECISION
+                ).label("last"),
+                recent.c.period_avg,
+                recent.c.previous_avg,
+            )
+            .select_from(TrackerOrm)
+            .join(
+                TrackerStructureOrm, TrackerStructureOrm.id == TrackerOrm.structure_id
+            )
+            .outerjoin(last, true())
+            .outerjoin(
+                TrackerFieldStatsOrm, TrackerFieldStatsOrm.tracker_id == TrackerOrm.id
+            )
+            .outerjoin(
+                recent,
+                and_(
+                    recent.c.tracker_id == TrackerOrm.id,
+                    recent.c.field == TrackerFieldStatsOrm.field,
+                ),
+            )
+            .where(TrackerOrm.id == ids)
+            .order_by(TrackerOrm.id, TrackerFieldStatsOrm.field)
+        )
+
+        async with self.session() as session:
+            rows = (await session.execute(stmt)).all()
+        trackers: dict[UUID, DashboardTrackerData] = {}
+        for row in rows:
+            tracker = trackers.setdefault(
+                row.id,
+                DashboardTrackerData(
+                    tracker_id=row.id,
+                    tracker_name=row.name,
+                    last_record_at=row.last_record_at,
+                ),
+            )
+            if row.field is None:
+                continue
+            trend = None
+            if row.period_avg is not None and row.previous_avg:
+                trend = (
+                    (row.period_avg - row.previous_avg) / abs(row.previous_avg) * 100
+                )
+            tracker.fields.append(
+                DashboardFieldData(
+                    field_name=FieldCodec(row.structure).name(row.field),
+                    count=row.count,
+                    last=row.last,
+                    days=days,
+                    period_avg=row.period_avg,
+                    trend=trend,
+                )
+            )
+        for tracker in trackers.values():
+            # the rows are ordered by the keys of the fields
+            tracker.fields.sort(key=lambda i: i.field_name)
+        return [trackers[i] for i in tracker_ids if i in trackers]
+
+    async def rebuild_field_stats(self, tracker_id: UUID | None = None) -> int:
+        """Recomputes the running statistics from the records, archived ones
+        included.
+
+        Missing rows of numeric fields are added first. Writers of the
+        statistics wait until the rebuild is committed, so records added
+        meanwhile are merged on top of the rebuilt values.
+
+        Args:
+            tracker_id (UUID | None): Tracker to rebuild, all if None.
+
+        Returns:
+            int: Number of rebuilt field statistics.
+        """
+        async with self.session() as session:
+            await session.execute(
+                text("LOCK TABLE tracker_field_stats IN SHARE ROW EXCLUSIVE MODE")
+            )
+            records = all_records(tracker_id)
+            trackers, stats = [], []
+            if tracker_id is not None:
+                trackers.append(TrackerOrm.id == tracker_id)
+                stats.append(TrackerFieldStatsOrm.tracker_id == tracker_id)
+            await session.execute(declare_fields(*trackers))
+            await session.execute(reset_stats(*stats))
+            res = await session.execute(
+                merge_stats(grouped_stats(numeric_values(records.subquery())))
+            )
+            await session.execute(bump_data_version(*trackers))
+            await self.commit(session)
+            return res.rowcount
+
+    async def get_value_stats(
+        self,
+        tracker_id: UUID,
+        fields: list[str],
+        from_date: datetime | None = None,
+        limit: int = 3,
+    ) -> list[StatisticsTrackerData]:
+        """Returns the mode and the most frequent values of categorical fields.
+
+        Whole UTC days are summed from `tracker_value_counts`, only the records
+        of the day of `from_date` are counted from the records. Counts of
+        string fields are approximate, see `TrackerValueCountOrm`, but the
+        total count of a field is exact. Fields without values are skipped,
+        the rest keep the order of `fields`.
+
+        Args:
+            tracker_id (UUID): ID of the tracker.
+            fields (list[str]): Enum and string fields.
+            from_date (datetime | None): Start date for statistics filtering.
+            limit (int): Number of most frequent values to return per field.
+        """
+        async with self.session() as session:
+            codec = await tracker_codec(session, tracker_id)
+            keys = [codec.key(field) for field in fields]
+            c = TrackerValueCountOrm
+            days = select(c.field, c.value, c.count, c.error).where(
+                c.tracker_id == tracker_id, c.field.in_(keys)
+            )
+            counts = days
+            if from_date is not None:
+                if from_date.tzinfo is None:
+                    from_date = from_date.replace(tzinfo=timezone.utc)
+                first_day = from_date.astimezone(timezone.utc).date() + timedelta(1)
+                first_day_start = datetime.combine(first_day, time(), timezone.utc)
+                records = all_records(tracker_id, from_date, first_day_start).subquery(
+                    "records"
+                )
+                record_fields = func.jsonb_each_text(records.c.data).table_valued(
+                    "key", "value"
+                )
+                partial_day = (
+                    select(
+                        record_fields.c.key,
+                        record_fields.c.value,
+                        literal_column("1"),
+                        literal_column("0"),
+                    )
+                    .select_from(records)
+                    .join(record_fields, true())
+                    .where(
+                        record_fields.c.key.in_(keys),
+                        record_fields.c.value.is_not(None),
+                    )
                 )
+                counts = union_all(days.where(c.day >= first_day), partial_day)
+            v = counts.subquery("v")
+            summed = (
+                select(
+                    v.c.field,
+                    v.c.value,
+                    func.sum(v.c.count).label("count"),
+                    func.sum(v.c.error).label("error"),
+                )
+                .group_by(v.c.field, v.c.value)
+                .subquery("summed")
+            )
+            ranked = select(
+                summed,
+                func.sum(summed.c.count)
+                .over(partition_by=summed.c.field)
+                .label("total"),
+                func.row_number()
+                .over(
+                    partition_by=summed.c.field,
+                    order_by=(summed.c.count.desc(), summed.c.value),
+                )
+                .label("rank"),
+            ).subquery("ranked")
+            stmt = (
+                select(ranked)
+                .where(ranked.c.rank <= limit)
+                .order_by(ranked.c.field, ranked.c.rank)
+            )
+            totals: dict[str, int] = {}
+            top: dict[str, list[ValueCount]] = {}
+            for row in (await session.execute(stmt)).all():
+                field = codec.name(row.field)
+                totals[field] = int(row.total)
+                top.setdefault(field, []).append(
+                    ValueCount(
+                        value=codec.decode_value(field, row.value),
+                        count=row.count,
+                        error=row.error,
+                    )
+                )
+            return [
+                StatisticsTrackerData(
+                    field_name=field,
+                    type="categorical",
+                    mode=top[field][0].value,
+                    top=top[field],
+                    count=totals[field],
+                )
+                for field in fields
+                if field in top
+            ]
+
+    async def rebuild_value_counts(self, tracker_id: UUID | None = None) -> int:
+        """Recounts the daily values of categorical fields from the records,
+        archived ones included.
+
+        Writers of the counts wait until the rebuild is committed, so records
+        added meanwhile are counted on top of the rebuilt values.
 
-            return result
+        Args:
+            tracker_id (UUID | None): Tracker to rebuild, all if None.
+
+        Returns:
+            int: Number of stored value counts.
+        """
+        async with self.session() as session:
+            await session.execute(
+                text("LOCK TABLE tracker_value_counts IN SHARE ROW EXCLUSIVE MODE")
+            )
+            records = all_records(tracker_id)
+            stale = delete(TrackerValueCountOrm)
+            trackers = []
+            if tracker_id is not None:
+                stale = stale.where(TrackerValueCountOrm.tracker_id == tracker_id)
+                trackers.append(TrackerOrm.id == tracker_id)
+            await session.execute(stale)
+            res = await session.execute(
+                insert(TrackerValueCountOrm).from_select(
+                    ["tracker_id", "field", "day", "value", "count", "error"],
+                    exact_counts(categorical_values(records.subquery())),
+                )
+            )
+            await session.execute(bump_data_version(*trackers))
+            await self.commit(session)
+            return res.rowcount
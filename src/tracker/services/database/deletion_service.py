@@ -0,0 +1,207 @@
+from typing import Callable
+from uuid import UUID
+
+from sqlalchemy import (
+    Delete,
+    Select,
+    Uuid,
+    bindparam,
+    delete,
+    exists,
+    func,
+    inspect,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from tracker.models import (
+    DigestScheduleOrm,
+    ReminderOrm,
+    TrackerDataArchiveOrm,
+    TrackerDataOrm,
+    TrackerDataRollupOrm,
+    TrackerOrm,
+    TrackerRetentionOrm,
+    TrackerStructureOrm,
+    TrackerValueCountOrm,
+    UserOrm,
+)
+
+from .base import BaseService
+
+
+def _purge_statement(
+    model: type, batch_limit: Callable[[Select], Select] | None = None
+) -> Delete:
+    """Deletes a batch of the rows of a deleted tracker from a table keyed by
+    `tracker_id` first."""
+    key = inspect(model).primary_key
+    batch = select(*key).where(model.tracker_id == bindparam("tracker_id", type_=Uuid))
+    if batch_limit is None:
+        # rows locked by a concurrent job are left to the next batch
+        batch = batch.limit(bindparam("limit")).with_for_update(skip_locked=True)
+    else:
+        batch = batch_limit(batch)
+    return (
+        delete(model)
+        .where(tuple_(*key).in_(batch))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _archived_days_limit(batch: Select) -> Select:
+    # a day holds many records, the days of a batch hold at most `limit`
+    # records but at least one day is deleted
+    a = TrackerDataArchiveOrm
+    days = batch.add_columns(
+        (func.sum(a.count).over(order_by=a.day) - a.count).label("before")
+    ).subquery("days")
+    return select(days.c.tracker_id, days.c.day).where(
+        days.c.before < bindparam("limit")
+    )
+
+
+# the largest tables first, the remaining rows go with the tracker
+_PURGE_STATEMENTS = (
+    _purge_statement(TrackerDataOrm),
+    _purge_statement(TrackerDataArchiveOrm, _archived_days_limit),
+    _purge_statement(TrackerDataRollupOrm),
+    _purge_statement(TrackerValueCountOrm),
+)
+
+
+class DeletionService(BaseService):
+    """Deletes trackers and users in two steps.
+
+    Deleted trackers and users are marked and hidden at once, without
+    touching their records. The deletion reaper then removes the records in
+    short transactions of bounded batches, and the trackers and users once
+    nothing of them is left, so deleting a large history never holds locks
+    for long or bloats a single transaction.
+    """
+
+    async def delete_tracker(self, tracker_id: UUID) -> bool:
+        """Marks the tracker deleted and drops its reminder and retention
+        policy, False if it was deleted already."""
+        async with self.session() as session:
+            stmt = (
+                update(TrackerOrm)
+                .where(TrackerOrm.id == tracker_id, TrackerOrm.deleted_at.is_(None))
+                .values(deleted_at=func.now())
+                .returning(TrackerOrm.id)
+            )
+            deleted = (await session.execute(stmt)).scalar_one_or_none()
+            if deleted is not None:
+                await self._drop_schedules(session, [tracker_id])
+            await self.commit(session)
+            return deleted is not None
+
+    async def delete_user(self, user_id: str) -> bool:
+        """Marks the user and all its trackers deleted and drops their
+        schedules, False if the user does not exist or was deleted already."""
+        async with self.session() as session:
+            stmt = (
+                update(UserOrm)
+                .where(UserOrm.id == user_id, UserOrm.deleted_at.is_(None))
+                .values(deleted_at=func.now())
+                .returning(UserOrm.id)
+            )
+            if (await session.execute(stmt)).scalar_one_or_none() is None:
+                return False
+            stmt = (
+                update(TrackerOrm)
+                .where(TrackerOrm.user_id == user_id, TrackerOrm.deleted_at.is_(None))
+                .values(deleted_at=func.now())
+                .returning(TrackerOrm.id)
+            )
+            tracker_ids = list((await session.execute(stmt)).scalars())
+            await self._drop_schedules(session, tracker_ids)
+            await session.execute(
+                delete(DigestScheduleOrm).where(DigestScheduleOrm.user_id == user_id)
+            )
+            await self.commit(session)
+            return True
+
+    @staticmethod
+    async def _drop_schedules(session: AsyncSession, tracker_ids: list[UUID]) -> None:
+        for model in (ReminderOrm, TrackerRetentionOrm):
+            await session.execute(
+                delete(model).where(model.tracker_id.in_(tracker_ids))
+            )
+
+    async def get_deleted_trackers(self, limit: int) -> list[UUID]:
+        """Returns up to `limit` deleted trackers, the earliest deleted first."""
+        async with self.session() as session:
+            stmt = (
+                select(TrackerOrm.id)
+                .where(TrackerOrm.deleted_at.is_not(None))
+                .order_by(TrackerOrm.deleted_at, TrackerOrm.id)
+                .limit(limit)
+            )
+            return list((await session.scalars(stmt)).all())
+
+    async def purge_records(self, tracker_id: UUID, limit: int) -> int:
+        """Deletes a batch of up to `limit` rows of a deleted tracker.
+
+        Records go first, then the archived days, the daily rollups and the
+        value counts, a batch deletes from one table only. Archived days are
+        batched by their records, a day with more than `limit` records is
+        deleted alone.
+
+        Args:
+            tracker_id (UUID): ID of a deleted tracker.
+            limit (int): Number of rows to delete at most.
+
+        Returns:
+            int: Number of deleted rows, 0 once only the tracker is left.
+        """
+        async with self.session() as session:
+            for stmt in _PURGE_STATEMENTS:
+                res = await session.execute(
+                    stmt, {"tracker_id": tracker_id, "limit": limit}
+                )
+                if res.rowcount:
+                    await self.commit(session)
+                    return res.rowcount
+            return 0
+
+    async def purge_tracker(self, tracker_id: UUID) -> bool:
+        """Deletes a deleted tracker with its structure and the rest of its
+        rows, which `purge_records` should have reduced to a few.
+
+        Returns:
+            bool: Whether the tracker was deleted.
+        """
+        async with self.session() as session:
+            stmt = (
+                delete(TrackerOrm)
+                .where(TrackerOrm.id == tracker_id, TrackerOrm.deleted_at.is_not(None))
+                .returning(TrackerOrm.structure_id)
+            )
+            structure_id = (await session.execute(stmt)).scalar_one_or_none()
+            if structure_id is None:
+                return False
+            await session.execute(
+                delete(TrackerStructureOrm).where(
+                    TrackerStructureOrm.id == structure_id,
+                    ~exists().where(TrackerOrm.structure_id == structure_id),
+                )
+            )
+            await self.commit(session)
+            return True
+
+    async def purge_users(self) -> int:
+        """Deletes the deleted users without trackers left.
+
+        Returns:
+            int: Number of deleted users.
+        """
+        async with self.session() as session:
+            stmt = delete(UserOrm).where(
+                UserOrm.deleted_at.is_not(None),
+                ~exists().where(TrackerOrm.user_id == UserOrm.id),
+            )
+            res = await session.execute(stmt)
+            await self.commit(session)
+            return res.rowcount
@@ -0,0 +1,174 @@
+"""Statements maintaining `TrackerFieldStatsOrm`, the running statistics of
+numeric fields.
+
+Every numeric field of a tracker has a row from the tracker's creation on.
+Statistics are merged into it as partial aggregates (count, mean, m2, sum, min,
+max) with the parallel form of Welford's algorithm, so a single record and a
+whole rebuilt tracker go through the same statement. It is a plain UPDATE and
+not an upsert because SQLAlchemy does not cache the compiled form of
+PostgreSQL's ON CONFLICT, which would be compiled again for every record.
+"""
+
+from typing import Any
+
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    FromClause,
+    Select,
+    Update,
+    and_,
+    cast,
+    func,
+    literal_column,
+    select,
+    true,
+    update,
+)
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION, Insert, insert
+from tracker.core.dynamic_json.types import FieldType
+from tracker.models import TrackerFieldStatsOrm, TrackerOrm, TrackerStructureOrm
+
+from .codecs import stored_key, structure_fields
+
+NUMERIC_TYPES = ("int", "float")
+
+
+def numeric_fields(structure: FieldType) -> list[str]:
+    """Keys of the numeric fields in the stored records."""
+    return [
+        i.get("id", name) for name, i in structure.items() if i["type"] in NUMERIC_TYPES
+    ]
+
+
+def declare_fields(*conditions: ColumnElement[bool]) -> Insert:
+    """Adds the missing rows of the numeric fields of trackers.
+
+    Args:
+        conditions (ColumnElement[bool]): Conditions on `TrackerOrm`.
+    """
+    fields = structure_fields()
+    trackers = (
+        select(TrackerOrm.id, stored_key(fields))
+        .join(TrackerStructureOrm, TrackerStructureOrm.id == TrackerOrm.structure_id)
+        .join(fields, true())
+        .where(fields.c.props["type"].astext.in_(NUMERIC_TYPES), *conditions)
+    )
+    return (
+        insert(TrackerFieldStatsOrm)
+        .from_select(["tracker_id", "field"], trackers)
+        .on_conflict_do_nothing()
+    )
+
+
+def reset_stats(*conditions: ColumnElement[bool]) -> Update:
+    """Resets the statistics to those of no values.
+
+    Args:
+        conditions (ColumnElement[bool]): Conditions on `TrackerFieldStatsOrm`.
+    """
+    empty: dict[str, Any] = {
+        "count": 0,
+        "mean": 0,
+        "m2": 0,
+        "sum": 0,
+        "min": None,
+        "max": None,
+    }
+    return update(TrackerFieldStatsOrm).where(*conditions).values(**empty)
+
+
+def numeric_values(records: FromClause) -> Select:
+    """Selects `tracker_id, field, value` of the numeric fields of records.
+
+    Numeric fields are those with a statistics row, other fields are never
+    cast to a number.
+
+    Args:
+        records (FromClause): Rows with `tracker_id` and `data` columns.
+    """
+    fields = func.jsonb_each_text(records.c.data).table_valued("key", "value")
+    return (
+        select(
+            records.c.tracker_id,
+            fields.c.key.label("field"),
+            cast(fields.c.value, DOUBLE_PRECISION).label("value"),
+        )
+        .select_from(records)
+        .join(fields, true())
+        .join(
+            TrackerFieldStatsOrm,
+            and_(
+                TrackerFieldStatsOrm.tracker_id == records.c.tracker_id,
+                TrackerFieldStatsOrm.field == fields.c.key,
+            ),
+        )
+        .where(fields.c.value.is_not(None))
+    )
+
+
+def single_value_stats(values: Select) -> Select:
+    """Statistics of every value on its own."""
+    v = values.subquery("v")
+    return select(
+        v.c.tracker_id,
+        v.c.field,
+        literal_column("1", BigInteger).label("count"),
+        v.c.value.label("mean"),
+        literal_column("0.0", DOUBLE_PRECISION).label("m2"),
+        v.c.value.label("sum"),
+        v.c.value.label("min"),
+        v.c.value.label("max"),
+    )
+
+
+def grouped_stats(values: Select) -> Select:
+    """Statistics of the values grouped by tracker and field."""
+    v = values.subquery("v")
+    count = func.count(v.c.value)
+    return select(
+        v.c.tracker_id,
+        v.c.field,
+        count.label("count"),
+        func.avg(v.c.value).label("mean"),
+        (func.var_pop(v.c.value) * count).label("m2"),
+        func.sum(v.c.value).label("sum"),
+        func.min(v.c.value).label("min"),
+        func.max(v.c.value).label("max"),
+    ).group_by(v.c.tracker_id, v.c.field)
+
+
+def merge_stats(stats: Select) -> Update:
+    """Merges partial statistics into the stored ones.
+
+    Args:
+        stats (Select): Rows shaped like `TrackerFieldStatsOrm`, at most one
+            per tracker and field.
+    """
+    new, old = stats.subquery("new"), TrackerFieldStatsOrm
+    return (
+        update(old)
+        .where(old.tracker_id == new.c.tracker_id, old.field == new.c.field)
+        .values(**merged_stats(old, new.c))
+    )
+
+
+def merged_stats(old: Any, new: Any) -> dict[str, ColumnElement]:
+    """Values of the statistics `old` merged with `new`.
+
+    Args:
+        old (Any): Columns `count, mean, m2, sum, min, max` of the stored
+            statistics.
+        new (Any): The same columns of the statistics merged into them.
+    """
+    count = cast(old.count + new.count, DOUBLE_PRECISION)
+    delta = new.mean - old.mean
+    return {
+        "count": old.count + new.count,
+        "mean": old.mean + delta * new.count / count,
+        "m2": old.m2 + new.m2 + delta * delta * old.count * new.count / count,
+        "sum": old.sum + new.sum,
+        # least and greatest ignore NULL, the min and max of no values
+        "min": func.least(old.min, new.min),
+        "max": func.greatest(old.max, new.max),
+    }
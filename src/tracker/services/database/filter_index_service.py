@@ -0,0 +1,217 @@
+import hashlib
+import re
+from uuid import UUID
+
+from sqlalchemy import column, select, text, tuple_, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import JSONB
+from tracker.core.record_filter import NUMERIC_TYPES, RecordFilter, conditions
+from tracker.models import TrackerFilterUsageOrm, TrackerOrm
+
+from .base import BaseService
+from .codecs import tracker_codec
+from .filters import field_value
+
+INDEX_PREFIX = "ix_filter_"
+
+
+def index_name(tracker_id: UUID, field: str) -> str:
+    """Name of the filter index of a field of a tracker, by its key."""
+    # keys are short ids, names of fields from before the ids are hashed
+    if not re.fullmatch(r"[0-9a-z]{1,8}", field):
+        field = hashlib.md5(field.encode()).hexdigest()[:8]
+    return f"{INDEX_PREFIX}{tracker_id.hex}_{field}"
+
+
+class FilterIndexService(BaseService):
+    """Counts the filters of records by field and indexes the fields filtered
+    often.
+
+    An index covers one field of one tracker: a partial expression index on
+    `tracker_data` with the value of the field as filters compare it, see
+    `filters.field_value`, and the predicate `tracker_id = '...'`. Only the
+    records of that tracker are indexed, so an index is small. It is not free
+    to other trackers though: every insert into `tracker_data` evaluates the
+    predicates of all partial indexes and the planner considers all of them
+    for every query. So only the `max_indexes` most filtered fields keep an
+    index, the least filtered ones lose theirs first. Indexes are created
+    and dropped concurrently, without blocking writes.
+    """
+
+    @staticmethod
+    def _most_used(min_uses: int, max_indexes: int):
+        u = TrackerFilterUsageOrm
+        return (
+            select(u.tracker_id, u.field, u.uses, u.indexed)
+            .join(TrackerOrm, TrackerOrm.id == u.tracker_id)
+            .where(u.uses >= min_uses, TrackerOrm.deleted_at.is_(None))
+            .order_by(u.uses.desc(), u.tracker_id, u.field)
+            .limit(max_indexes)
+            .subquery()
+        )
+
+    async def note_usage(self, tracker_id: UUID, node: RecordFilter) -> None:
+        """Counts a filter of the records of the tracker for each of its
+        fields."""
+        async with self.session() as session:
+            codec = await tracker_codec(session, tracker_id)
+            fields = sorted({codec.key(i.field) for i in conditions(node)})
+            stmt = postgresql.insert(TrackerFilterUsageOrm).values(
+                [{"tracker_id": tracker_id, "field": i} for i in fields]
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[
+                    TrackerFilterUsageOrm.tracker_id,
+                    TrackerFilterUsageOrm.field,
+                ],
+                set_={"uses": TrackerFilterUsageOrm.uses + 1},
+            )
+            await session.execute(stmt)
+            await self.commit(session)
+
+    async def get_unindexed_fields(
+        self, min_uses: int, limit: int, max_indexes: int
+    ) -> list[tuple[UUID, str]]:
+        """Returns up to `limit` fields of trackers filtered at least
+        `min_uses` times without an index, the most filtered first. Only
+        the `max_indexes` most filtered fields are considered.
+
+        Returns:
+            list[tuple[UUID, str]]: IDs of the trackers and keys of the fields.
+        """
+        async with self.session() as session:
+            most_used = self._most_used(min_uses, max_indexes)
+            stmt = (
+                select(most_used.c.tracker_id, most_used.c.field)
+                .where(most_used.c.indexed.is_(False))
+                .order_by(
+                    most_used.c.uses.desc(), most_used.c.tracker_id, most_used.c.field
+                )
+                .limit(limit)
+            )
+            return [(i.tracker_id, i.field) for i in (await session.execute(stmt))]
+
+    async def drop_least_used_indexes(self, min_uses: int, max_indexes: int) -> int:
+        """Drops the indexes of the fields that are no longer among the
+        `max_indexes` most filtered ones, the least filtered first.
+
+        Returns:
+            int: Number of dropped indexes.
+        """
+        async with self.session() as session:
+            u = TrackerFilterUsageOrm
+            most_used = self._most_used(min_uses, max_indexes)
+            stmt = (
+                select(u.tracker_id, u.field)
+                .join(TrackerOrm, TrackerOrm.id == u.tracker_id)
+                .where(
+                    u.indexed.is_(True),
+                    TrackerOrm.deleted_at.is_(None),
+                    tuple_(u.tracker_id, u.field).not_in(
+                        select(most_used.c.tracker_id, most_used.c.field)
+                    ),
+                )
+                .order_by(u.uses, u.tracker_id, u.field)
+            )
+            fields = [(i.tracker_id, i.field) for i in await session.execute(stmt)]
+        for tracker_id, field in fields:
+            await self._execute_concurrently(
+                f"DROP INDEX CONCURRENTLY IF EXISTS {index_name(tracker_id, field)}"
+            )
+            async with self.session() as session:
+                await session.execute(
+                    update(TrackerFilterUsageOrm)
+                    .where(
+                        TrackerFilterUsageOrm.tracker_id == tracker_id,
+                        TrackerFilterUsageOrm.field == field,
+                    )
+                    .values(indexed=False)
+                )
+                await self.commit(session)
+        return len(fields)
+
+    async def create_index(self, tracker_id: UUID, field: str) -> str | None:
+        """Creates the filter index of a field of a tracker.
+
+        Args:
+            tracker_id (UUID): ID of the tracker.
+            field (str): Key of the field in the records.
+
+        Returns:
+            str | None: Name of the index, None if the tracker or the field
+                does not exist.
+        """
+        async with self.session() as session:
+            codec = await tracker_codec(session, tracker_id)
+        props = codec.structure.get(codec.name(field))
+        if props is None:
+            return None
+        value = field_value(
+            column("data", JSONB), field, numeric=props["type"] in NUMERIC_TYPES
+        ).compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+        name = index_name(tracker_id, field)
+        try:
+            await self._execute_concurrently(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON tracker_data (({value})) WHERE tracker_id = '{tracker_id}'"
+            )
+        except Exception:
+            # a failed concurrent build leaves an invalid index behind
+            await self._execute_concurrently(
+                f"DROP INDEX CONCURRENTLY IF EXISTS {name}"
+            )
+            raise
+        async with self.session() as session:
+            await session.execute(
+                update(TrackerFilterUsageOrm)
+                .where(
+                    TrackerFilterUsageOrm.tracker_id == tracker_id,
+                    TrackerFilterUsageOrm.field == field,
+                )
+                .values(indexed=True)
+            )
+            await self.commit(session)
+        return name
+
+    async def get_indexes(self) -> list[str]:
+        """Returns the names of the existing filter indexes."""
+        async with self.session() as session:
+            stmt = text(
+                "SELECT indexname FROM pg_indexes WHERE tablename = 'tracker_data' "
+                "AND starts_with(indexname, :prefix) ORDER BY indexname"
+            )
+            return list((await session.scalars(stmt, {"prefix": INDEX_PREFIX})).all())
+
+    async def drop_orphaned_indexes(self) -> int:
+        """Drops the filter indexes of deleted trackers.
+
+        Returns:
+            int: Number of dropped indexes.
+        """
+        indexes = {
+            name: UUID(name[len(INDEX_PREFIX) :].split("_")[0])
+            for name in await self.get_indexes()
+        }
+        if not indexes:
+            return 0
+        async with self.session() as session:
+            stmt = select(TrackerOrm.id).where(
+                TrackerOrm.id.in_(set(indexes.values())),
+                TrackerOrm.deleted_at.is_(None),
+            )
+            alive = set((await session.scalars(stmt)).all())
+        orphaned = [name for name, i in indexes.items() if i not in alive]
+        for name in orphaned:
+            await self._execute_concurrently(
+                f"DROP INDEX CONCURRENTLY IF EXISTS {name}"
+            )
+        return len(orphaned)
+
+    async def _execute_concurrently(self, statement: str) -> None:
+        # concurrent index builds cannot run in a transaction, nor in the
+        # unit of work of the caller
+        async with self.session_factory() as session:
+            conn = await session.connection(
+                execution_options={"isolation_level": "AUTOCOMMIT"}
+            )
+            await conn.execute(text(statement))
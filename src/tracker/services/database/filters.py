@@ -0,0 +1,82 @@
+"""Compiles record filters, see `tracker.core.record_filter`, to SQL.
+
+A condition compares the text of a field, `data ->> 'key'`, cast to double
+precision for numeric fields. The key and the tracker are rendered as
+literals, so a condition matches the expression and the predicate of the
+partial index `FilterIndexService` creates for the field of a tracker even
+under a generic plan of a prepared statement.
+"""
+
+import operator
+from typing import Callable
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, FromClause, String, Uuid, and_, cast, literal, or_
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION
+from tracker.core.field_codec import FieldCodec
+from tracker.core.record_filter import (
+    NUMERIC_TYPES,
+    AllOf,
+    AnyOf,
+    Condition,
+    RecordFilter,
+)
+
+_OPERATORS: dict[str, Callable[[ColumnElement, object], ColumnElement[bool]]] = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def field_value(data: ColumnElement, key: str, numeric: bool) -> ColumnElement:
+    """Value of a field in `data` as filters compare it and indexes keep it."""
+    value = data.op("->>")(literal(key, String, literal_execute=True))
+    return cast(value, DOUBLE_PRECISION) if numeric else value
+
+
+def filter_condition(
+    records: FromClause,
+    tracker_id: UUID,
+    node: RecordFilter,
+    codec: FieldCodec,
+) -> ColumnElement[bool]:
+    """Condition on the records of a tracker matching the filter.
+
+    Args:
+        records (FromClause): Records with `tracker_id` and `data`
+            columns.
+        tracker_id (UUID): ID of the tracker.
+        node (RecordFilter): Filter checked against the structure of the
+            tracker.
+        codec (FieldCodec): Codec of the records of the tracker.
+    """
+    return and_(
+        records.c.tracker_id == literal(tracker_id, Uuid, literal_execute=True),
+        _compile(records.c.data, node, codec),
+    )
+
+
+def _compile(
+    data: ColumnElement, node: RecordFilter, codec: FieldCodec
+) -> ColumnElement[bool]:
+    if isinstance(node, AllOf):
+        return and_(*(_compile(data, i, codec) for i in node.items))
+    if isinstance(node, AnyOf):
+        return or_(*(_compile(data, i, codec) for i in node.items))
+    return _compile_condition(data, node, codec)
+
+
+def _compile_condition(
+    data: ColumnElement, condition: Condition, codec: FieldCodec
+) -> ColumnElement[bool]:
+    key = codec.key(condition.field)
+    compare = _OPERATORS[condition.op]
+    if codec.structure[condition.field]["type"] in NUMERIC_TYPES:
+        return compare(field_value(data, key, numeric=True), condition.value)
+    # enum values are stored as codes, compared as text like strings
+    stored = codec.encode({condition.field: condition.value})[key]
+    return compare(field_value(data, key, numeric=False), str(stored))
@@ -0,0 +1,82 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql
+from tracker.models import TrackerRetentionOrm
+from tracker.schemas import RetentionPolicy
+
+from .archive import ARCHIVE_RECORDS
+from .base import BaseService
+
+
+class RetentionService(BaseService):
+    async def set_policy(self, policy: RetentionPolicy) -> RetentionPolicy:
+        """Creates or replaces the retention policy of the tracker."""
+        async with self.session() as session:
+            stmt = postgresql.insert(TrackerRetentionOrm).values(**policy.model_dump())
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[TrackerRetentionOrm.tracker_id],
+                set_={"raw_days": stmt.excluded.raw_days},
+            )
+            await session.execute(stmt)
+            await self.commit(session)
+            return policy
+
+    async def delete_policy(self, tracker_id: UUID) -> bool:
+        """Deletes the retention policy of the tracker, False if there was none.
+
+        Archived records stay archived.
+        """
+        async with self.session() as session:
+            stmt = (
+                delete(TrackerRetentionOrm)
+                .where(TrackerRetentionOrm.tracker_id == tracker_id)
+                .returning(TrackerRetentionOrm.tracker_id)
+            )
+            deleted = (await session.execute(stmt)).scalar_one_or_none()
+            await self.commit(session)
+            return deleted is not None
+
+    async def get_policy(self, tracker_id: UUID) -> RetentionPolicy | None:
+        async with self.session() as session:
+            res = await session.get(TrackerRetentionOrm, tracker_id)
+            if res is None:
+                return None
+            return RetentionPolicy.model_validate(res, from_attributes=True)
+
+    async def get_policies(self) -> list[RetentionPolicy]:
+        async with self.session() as session:
+            stmt = select(TrackerRetentionOrm).order_by(TrackerRetentionOrm.tracker_id)
+            return [
+                RetentionPolicy.model_validate(i, from_attributes=True)
+                for i in (await session.scalars(stmt)).all()
+            ]
+
+    async def archive_records(
+        self, tracker_id: UUID, before: datetime, limit: int
+    ) -> int:
+        """Moves up to `limit` of the oldest records of the tracker created
+        before `before` into the archive and the daily rollups.
+
+        The batch is deleted, archived and rolled up by one statement through
+        the index on `(tracker_id, created_at, id)`, records locked by a
+        concurrent job are skipped.
+
+        Args:
+            tracker_id (UUID): ID of the tracker.
+            before (datetime): Records created before it are archived.
+            limit (int): Number of records to archive at most.
+
+        Returns:
+            int: Number of archived records, less than `limit` once all
+                records before `before` are archived.
+        """
+        async with self.session() as session:
+            res = await session.execute(
+                ARCHIVE_RECORDS,
+                {"tracker_id": tracker_id, "before": before, "limit": limit},
+            )
+            archived = res.scalar_one_or_none()
+            await self.commit(session)
+            return archived or 0
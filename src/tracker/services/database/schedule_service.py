@@ -0,0 +1,228 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import (
+    ARRAY,
+    ColumnElement,
+    Integer,
+    String,
+    any_,
+    bindparam,
+    cast,
+    delete,
+    func,
+    select,
+    update,
+)
+from sqlalchemy.dialects import postgresql
+from tracker.models import DigestScheduleOrm, ReminderOrm, TrackerOrm
+from tracker.schemas import DigestSchedule, FiredReminder, Reminder
+
+from .base import BaseService
+
+_DAY = 86400
+
+
+def _next_run(
+    run_at: ColumnElement[datetime],
+    period_days: ColumnElement[int],
+    now: ColumnElement[datetime],
+) -> ColumnElement[datetime]:
+    """The first run of a schedule after `now`, runs missed before it are
+    skipped."""
+    elapsed = func.extract("epoch", now - run_at)
+    # the constants take the type of the column, so they are divided stepwise
+    runs = func.floor(elapsed / _DAY / period_days) + 1
+    return run_at + func.make_interval(0, 0, 0, cast(runs * period_days, Integer))
+
+
+class ScheduleService(BaseService):
+    async def set_digest(self, schedule: DigestSchedule) -> DigestSchedule:
+        """Creates or replaces the digest schedule of the user."""
+        async with self.session() as session:
+            values = schedule.model_dump()
+            stmt = postgresql.insert(DigestScheduleOrm).values(**values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[DigestScheduleOrm.user_id],
+                set_={
+                    "period_days": stmt.excluded.period_days,
+                    "next_run_at": stmt.excluded.next_run_at,
+                    "language": stmt.excluded.language,
+                },
+            )
+            await session.execute(stmt)
+            await self.commit(session)
+            return schedule
+
+    async def delete_digest(self, user_id: str) -> bool:
+        """Deletes the digest schedule of the user, False if there was none."""
+        async with self.session() as session:
+            stmt = (
+                delete(DigestScheduleOrm)
+                .where(DigestScheduleOrm.user_id == user_id)
+                .returning(DigestScheduleOrm.user_id)
+            )
+            deleted = (await session.execute(stmt)).scalar_one_or_none()
+            await self.commit(session)
+            return deleted is not None
+
+    async def get_digest(self, user_id: str) -> DigestSchedule | None:
+        async with self.session() as session:
+            res = await session.get(DigestScheduleOrm, user_id)
+            if res is None:
+                return None
+            return DigestSchedule.model_validate(res, from_attributes=True)
+
+    async def get_due_digests(
+        self, until: datetime, limit: int
+    ) -> list[DigestSchedule]:
+        """Returns up to `limit` schedules with a run before `until`, the
+        soonest first.
+
+        A range scan of the `next_run_at` index, the cost depends on the
+        number of returned schedules and not on that of all schedules.
+        """
+        async with self.session() as session:
+            stmt = (
+                select(DigestScheduleOrm)
+                .where(DigestScheduleOrm.next_run_at <= until)
+                .order_by(DigestScheduleOrm.next_run_at, DigestScheduleOrm.user_id)
+                .limit(limit)
+            )
+            return [
+                DigestSchedule.model_validate(i, from_attributes=True)
+                for i in (await session.scalars(stmt)).all()
+            ]
+
+    async def claim_due_digests(
+        self, user_ids: list[str], now: datetime
+    ) -> list[DigestSchedule]:
+        """Moves the schedules of the users that are due at `now` to their
+        next run after it.
+
+        Runs missed while the bot was down are skipped. A schedule is claimed
+        once however many senders try, changed or deleted schedules are not
+        claimed.
+
+        Args:
+            user_ids (list[str]): Users whose schedules were due when loaded.
+            now (datetime): Current time.
+
+        Returns:
+            list[DigestSchedule]: The claimed schedules with their next run.
+        """
+        s = DigestScheduleOrm
+        now_param = bindparam("now", now)
+        async with self.session() as session:
+            stmt = (
+                update(s)
+                .where(
+                    s.user_id
+                    == any_(bindparam("user_ids", user_ids, type_=ARRAY(String))),
+                    s.next_run_at <= now_param,
+                )
+                .values(next_run_at=_next_run(s.next_run_at, s.period_days, now_param))
+                .returning(s)
+            )
+            claimed = [
+                DigestSchedule.model_validate(i, from_attributes=True)
+                for i in (await session.scalars(stmt)).all()
+            ]
+            await self.commit(session)
+            return claimed
+
+    async def set_reminder(self, reminder: Reminder) -> Reminder:
+        """Creates or replaces the reminder of the tracker."""
+        async with self.session() as session:
+            stmt = postgresql.insert(ReminderOrm).values(**reminder.model_dump())
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ReminderOrm.tracker_id],
+                set_={
+                    "period_days": stmt.excluded.period_days,
+                    "next_fire_at": stmt.excluded.next_fire_at,
+                    "language": stmt.excluded.language,
+                },
+            )
+            await session.execute(stmt)
+            await self.commit(session)
+            return reminder
+
+    async def delete_reminder(self, tracker_id: UUID) -> bool:
+        """Deletes the reminder of the tracker, False if there was none."""
+        async with self.session() as session:
+            stmt = (
+                delete(ReminderOrm)
+                .where(ReminderOrm.tracker_id == tracker_id)
+                .returning(ReminderOrm.tracker_id)
+            )
+            deleted = (await session.execute(stmt)).scalar_one_or_none()
+            await self.commit(session)
+            return deleted is not None
+
+    async def get_reminder(self, tracker_id: UUID) -> Reminder | None:
+        async with self.session() as session:
+            res = await session.get(ReminderOrm, tracker_id)
+            if res is None:
+                return None
+            return Reminder.model_validate(res, from_attributes=True)
+
+    async def get_next_fire_at(self) -> datetime | None:
+        """Returns when the soonest reminder fires, None if there are none.
+
+        The first entry of the `next_fire_at` index.
+        """
+        async with self.session() as session:
+            stmt = select(func.min(ReminderOrm.next_fire_at))
+            return (await session.execute(stmt)).scalar_one()
+
+    async def claim_due_reminders(
+        self, now: datetime, limit: int
+    ) -> list[FiredReminder]:
+        """Claims up to `limit` reminders due at `now`, the soonest first, and
+        moves them to their next fire after it.
+
+        The due reminders are locked with `FOR UPDATE SKIP LOCKED`, so
+        concurrent workers claim disjoint batches instead of waiting for each
+        other, and a reminder is claimed once. Fires missed while no worker
+        ran are skipped.
+
+        Args:
+            now (datetime): Current time.
+            limit (int): Number of reminders to claim at most.
+
+        Returns:
+            list[FiredReminder]: The claimed reminders with their next fire,
+                the user and the name of the tracker.
+        """
+        r = ReminderOrm
+        now_param = bindparam("now", now)
+        due = (
+            select(r.tracker_id)
+            .where(r.next_fire_at <= now_param)
+            .order_by(r.next_fire_at, r.tracker_id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .cte("due")
+        )
+        async with self.session() as session:
+            stmt = (
+                update(r)
+                .where(r.tracker_id == due.c.tracker_id, TrackerOrm.id == r.tracker_id)
+                .values(
+                    next_fire_at=_next_run(r.next_fire_at, r.period_days, now_param)
+                )
+                .returning(
+                    r.tracker_id,
+                    r.period_days,
+                    r.next_fire_at,
+                    r.language,
+                    TrackerOrm.user_id,
+                    TrackerOrm.name.label("tracker_name"),
+                )
+            )
+            claimed = [
+                FiredReminder.model_validate(i, from_attributes=True)
+                for i in (await session.execute(stmt)).all()
+            ]
+            await self.commit(session)
+            return claimed
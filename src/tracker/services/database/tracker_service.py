@@ -1,56 +1,232 @@
-from uuid import UUID
+from datetime import datetime
+from uuid import UUID, uuid4
 
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import (
+    ARRAY,
+    String,
+    Update,
+    any_,
+    bindparam,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import joinedload, noload
+from tracker.core.field_codec import assign_field_ids
 from tracker.exceptions import NotFoundException
-from tracker.models import TrackerDataOrm, TrackerOrm, TrackerStructureOrm
+from tracker.models import (
+    TrackerDataOrm,
+    TrackerFieldStatsOrm,
+    TrackerOrm,
+    TrackerStructureOrm,
+    UserOrm,
+)
 from tracker.schemas import (
     TrackerCreate,
     TrackerDataCreate,
     TrackerDataResponse,
     TrackerResponse,
+    TrackerStructureResponse,
+    TrackerSummary,
+    UserResponse,
+)
+
+from .base import BaseService, keyset_seek
+from .codecs import tracker_codec
+from .field_stats import (
+    merge_stats,
+    numeric_fields,
+    numeric_values,
+    single_value_stats,
+)
+from .value_counts import CATEGORICAL_TYPES, categorical_values, count_values
+
+# a looked up tracker comes with its structure and user, but neither with its
+# records nor with the other trackers of the user, which the relationships
+# would load eagerly
+_LOOKUP_OPTIONS = (
+    noload(TrackerOrm.data),
+    joinedload(TrackerOrm.user).noload(UserOrm.trackers),
 )
 
 
-class TrackerService:
+def _add_data_statement() -> Update:
+    new_data = (
+        insert(TrackerDataOrm)
+        .values(
+            # not named after columns, those would be set by the updates too,
+            # and the id is not left to its default, which is only generated
+            # for the last INSERT of a statement
+            id=bindparam("record_id"),
+            tracker_id=bindparam("record_tracker_id"),
+            data=bindparam("record_data"),
+        )
+        .returning(
+            TrackerDataOrm.id,
+            TrackerDataOrm.tracker_id,
+            TrackerDataOrm.data,
+            TrackerDataOrm.created_at,
+        )
+        .cte("new_data")
+    )
+    field_stats = merge_stats(single_value_stats(numeric_values(new_data)))
+    value_counts = count_values(categorical_values(new_data))
+    return (
+        update(TrackerOrm)
+        .where(TrackerOrm.id == new_data.c.tracker_id)
+        .values(
+            last_activity_at=new_data.c.created_at,
+            data_version=TrackerOrm.data_version + 1,
+        )
+        .returning(new_data.c.id, new_data.c.created_at)
+        .add_cte(field_stats.cte("field_stats"), value_counts.cte("value_counts"))
+        .execution_options(synchronize_session=False)
+    )
+
+
+# built once, constructing the statement takes longer than running it
+_ADD_DATA = _add_data_statement()
+
+# taken before `_ADD_DATA`, see `value_counts`
+_LOCK_TRACKER = (
+    select(TrackerOrm.id)
+    .where(TrackerOrm.id == bindparam("tracker_id"))
+    .with_for_update()
+)
 
-    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
-        self.session_factory = session_factory
 
+class TrackerService(BaseService):
     async def create(self, tracker: TrackerCreate) -> TrackerResponse:
-        async with self.session_factory() as session:
-            new_structure = TrackerStructureOrm(data=tracker.structure.data)
-            session.add(new_structure)
-            await session.flush()
-            new_tracker = TrackerOrm(
-                structure_id=new_structure.id,
-                user_id=tracker.user_id,
+        """Creates the tracker with its structure, and the user if it does not exist.
+
+        Everything is written by a single statement, including the empty
+        running statistics of the numeric fields. The fields of the structure
+        get the ids their values are stored under, see `FieldCodec`. The
+        response is built from the input and the returned server defaults.
+        """
+        structure = assign_field_ids(tracker.structure.data)
+        async with self.session() as session:
+            structure_id, tracker_id = uuid4(), uuid4()
+            new_user = (
+                postgresql.insert(UserOrm)
+                .values(id=tracker.user_id)
+                .on_conflict_do_update(
+                    index_elements=[UserOrm.id],
+                    # a deleted user starts over
+                    set_={"deleted_at": None},
+                    where=UserOrm.deleted_at.is_not(None),
+                )
+                .cte("new_user")
+            )
+            new_structure = (
+                insert(TrackerStructureOrm)
+                .values(id=structure_id, data=structure)
+                .returning(TrackerStructureOrm.id)
+                .cte("new_structure")
+            )
+            stmt = (
+                insert(TrackerOrm)
+                .from_select(
+                    ["id", "name", "user_id", "structure_id"],
+                    select(
+                        literal(tracker_id),
+                        literal(tracker.name),
+                        literal(tracker.user_id),
+                        new_structure.c.id,
+                    ),
+                )
+                .add_cte(new_user)
+                .returning(TrackerOrm.created_at)
+            )
+            if fields := numeric_fields(structure):
+                new_stats = (
+                    insert(TrackerFieldStatsOrm)
+                    .values([{"tracker_id": tracker_id, "field": i} for i in fields])
+                    .cte("new_stats")
+                )
+                stmt = stmt.add_cte(new_stats)
+            res = await session.execute(stmt)
+            created_at = res.scalar_one()
+            await self.commit(session)
+            return TrackerResponse(
+                id=tracker_id,
                 name=tracker.name,
+                user_id=tracker.user_id,
+                user=UserResponse(id=tracker.user_id),
+                created_at=created_at,
+                structure_id=structure_id,
+                structure=TrackerStructureResponse(id=structure_id, data=structure),
+                data=[],
+            )
+
+    async def get_by_name(self, user_id: str, name: str) -> TrackerResponse:
+        """Returns the tracker of the user by its name regardless of case,
+        without its records, `data` is empty."""
+        async with self.session() as session:
+            stmt = (
+                select(TrackerOrm)
+                .where(
+                    TrackerOrm.user_id == user_id,
+                    func.lower(TrackerOrm.name) == name.lower(),
+                    TrackerOrm.deleted_at.is_(None),
+                )
+                .options(*_LOOKUP_OPTIONS)
             )
-            session.add(new_tracker)
-            await session.commit()
-            await session.refresh(new_tracker)
-            return TrackerResponse.model_validate(new_tracker, from_attributes=True)
-
-    async def get_by_name(self, name: str) -> TrackerResponse:
-        async with self.session_factory() as session:
-            stmt = select(TrackerOrm).filter_by(name=name)
             res = await session.execute(stmt)
             result = res.scalar_one_or_none()
             if result is None:
                 raise NotFoundException(f"Tracker with name {name} not found")
             return TrackerResponse.model_validate(result, from_attributes=True)
 
+    async def search_by_name(
+        self, user_id: str, query: str, limit: int
+    ) -> list[TrackerResponse]:
+        """Returns the trackers of the user whose names contain the query
+        regardless of case, without their records.
+
+        Names starting with the query come first, then those containing it
+        earlier, then the most recently active. An empty query matches all
+        trackers of the user.
+        """
+        async with self.session() as session:
+            name = func.lower(TrackerOrm.name)
+            position = func.strpos(name, query.lower())
+            stmt = (
+                select(TrackerOrm)
+                .where(
+                    TrackerOrm.user_id == user_id,
+                    TrackerOrm.deleted_at.is_(None),
+                    position > 0,
+                )
+                .order_by(position, TrackerOrm.last_activity_at.desc(), name)
+                .limit(limit)
+                .options(*_LOOKUP_OPTIONS)
+            )
+            res = await session.scalars(stmt)
+            return [
+                TrackerResponse.model_validate(i, from_attributes=True)
+                for i in res.all()
+            ]
+
     async def get_by_id(self, tracker_id: UUID) -> TrackerResponse:
-        async with self.session_factory() as session:
-            res = await session.get(TrackerOrm, tracker_id)
-            if res is None:
+        """Returns the tracker without its records, `data` is empty."""
+        async with self.session() as session:
+            res = await session.get(TrackerOrm, tracker_id, options=_LOOKUP_OPTIONS)
+            if res is None or res.deleted_at is not None:
                 raise NotFoundException(f"Tracker with id {tracker_id} not found")
             return TrackerResponse.model_validate(res, from_attributes=True)
 
     async def get_by_user_id(self, user_id: str) -> list[TrackerResponse]:
-        async with self.session_factory() as session:
-            stmt = select(TrackerOrm).filter_by(user_id=user_id)
+        """Returns all trackers of the user without their records."""
+        async with self.session() as session:
+            stmt = (
+                select(TrackerOrm)
+                .filter_by(user_id=user_id, deleted_at=None)
+                .options(*_LOOKUP_OPTIONS)
+            )
             res = await session.execute(stmt)
             result = res.scalars().all()
             if result is None:
@@ -59,10 +235,132 @@ class TrackerService:
                 TrackerResponse.model_validate(i, from_attributes=True) for i in result
             ]
 
+    async def get_summaries_by_user_id(
+        self,
+        user_id: str,
+        limit: int,
+        older_than: tuple[datetime, UUID] | None = None,
+        newer_than: tuple[datetime, UUID] | None = None,
+    ) -> list[TrackerSummary]:
+        """Returns up to `limit` trackers of the user, most recently active first.
+
+        Only the columns of the list are selected, no relationships are loaded.
+        Pages are seeked by the `(last_activity_at, id)` key, see `keyset_seek`.
+
+        Args:
+            user_id (str): User ID.
+            limit (int): Number of trackers to return at most.
+            older_than (tuple[datetime, UUID] | None): Key of the tracker to
+                return the less recently active trackers of.
+            newer_than (tuple[datetime, UUID] | None): Key of the tracker to
+                return the more recently active trackers of.
+        """
+        async with self.session() as session:
+            stmt = keyset_seek(
+                select(
+                    TrackerOrm.id,
+                    TrackerOrm.name,
+                    TrackerOrm.last_activity_at,
+                    TrackerOrm.data_version,
+                ).where(TrackerOrm.user_id == user_id, TrackerOrm.deleted_at.is_(None)),
+                key=(TrackerOrm.last_activity_at, TrackerOrm.id),
+                limit=limit,
+                older_than=older_than,
+                newer_than=newer_than,
+            )
+            rows = (await session.execute(stmt)).all()
+            if newer_than is not None:
+                rows.reverse()
+            return [
+                TrackerSummary(
+                    id=row.id,
+                    name=row.name,
+                    last_activity_at=row.last_activity_at,
+                    data_version=row.data_version,
+                )
+                for row in rows
+            ]
+
+    async def get_summaries_by_user_ids(
+        self, user_ids: list[str], limit: int
+    ) -> dict[str, list[TrackerSummary]]:
+        """Returns up to `limit` trackers of each of the users, most recently
+        active first, in one statement.
+
+        Args:
+            user_ids (list[str]): User IDs.
+            limit (int): Number of trackers of a user to return at most.
+
+        Returns:
+            dict[str, list[TrackerSummary]]: Trackers by user, users without
+                trackers are missing.
+        """
+        rank = func.row_number().over(
+            partition_by=TrackerOrm.user_id,
+            order_by=(TrackerOrm.last_activity_at.desc(), TrackerOrm.id.desc()),
+        )
+        ranked = (
+            select(
+                TrackerOrm.user_id,
+                TrackerOrm.id,
+                TrackerOrm.name,
+                TrackerOrm.last_activity_at,
+                TrackerOrm.data_version,
+                rank.label("rank"),
+            )
+            .where(
+                TrackerOrm.user_id
+                == any_(bindparam("user_ids", user_ids, type_=ARRAY(String))),
+                TrackerOrm.deleted_at.is_(None),
+            )
+            .subquery("ranked")
+        )
+        stmt = (
+            select(ranked)
+            .where(ranked.c.rank <= limit)
+            .order_by(ranked.c.user_id, ranked.c.rank)
+        )
+        async with self.session() as session:
+            rows = (await session.execute(stmt)).all()
+        trackers: dict[str, list[TrackerSummary]] = {}
+        for row in rows:
+            trackers.setdefault(row.user_id, []).append(
+                TrackerSummary(
+                    id=row.id,
+                    name=row.name,
+                    last_activity_at=row.last_activity_at,
+                    data_version=row.data_version,
+                )
+            )
+        return trackers
+
     async def add_data(self, data: TrackerDataCreate) -> TrackerDataResponse:
-        async with self.session_factory() as session:
-            new_data = TrackerDataOrm(tracker_id=data.tracker_id, data=data.data)
-            session.add(new_data)
-            await session.commit()
-            await session.refresh(new_data)
-            return TrackerDataResponse.model_validate(new_data, from_attributes=True)
+        """Adds the record, marks the tracker active, bumps its data version
+        and merges the record's numeric fields into their running statistics,
+        all in one statement. The record is encoded by the cached codec of the
+        tracker.
+
+        Records of a tracker with categorical fields are added one at a time,
+        the tracker is locked first so the values counted by concurrent
+        writers are seen, see `value_counts`.
+        """
+        async with self.session() as session:
+            codec = await tracker_codec(session, data.tracker_id)
+            if any(i["type"] in CATEGORICAL_TYPES for i in codec.structure.values()):
+                await session.execute(_LOCK_TRACKER, {"tracker_id": data.tracker_id})
+            res = await session.execute(
+                _ADD_DATA,
+                {
+                    "record_id": uuid4(),
+                    "record_tracker_id": data.tracker_id,
+                    "record_data": codec.encode(data.data),
+                },
+            )
+            row = res.one()
+            await self.commit(session)
+            return TrackerDataResponse(
+                id=row.id,
+                tracker_id=data.tracker_id,
+                data=data.data,
+                created_at=row.created_at,
+            )
@@ -0,0 +1,102 @@
+from contextvars import ContextVar, Token
+from types import TracebackType
+from typing import Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+_current: ContextVar["UnitOfWork | None"] = ContextVar(
+    "current_unit_of_work", default=None
+)
+
+
+def current_unit_of_work() -> "UnitOfWork | None":
+    return _current.get()
+
+
+async def commit_unit_of_work() -> None:
+    """Commits the current unit of work early, if there is one."""
+    uow = _current.get()
+    if uow is not None:
+        await uow.commit()
+
+
+def after_commit(callback: Callable[[], None]) -> None:
+    """Calls `callback` once the current unit of work is committed.
+
+    Outside a unit of work the changes are already committed, so the
+    callback is called at once.
+    """
+    uow = _current.get()
+    if uow is None:
+        callback()
+    else:
+        uow.after_commit(callback)
+
+
+class UnitOfWork:
+    """Shares one session between all services used inside the block.
+
+    The session is opened on first use, so blocks that never touch the
+    database do not check out a connection. Changes are committed when
+    the block exits and rolled back if it raises. `commit` ends the
+    transaction early and returns the connection to the pool, e.g. before
+    a slow reply; services used after it get a new session.
+
+    Example:
+        async with UnitOfWork(sessionmaker):
+            user = await user_service.create(user_id)
+            tracker = await tracker_service.create(tracker_create)
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self.session_factory = session_factory
+        self._session: AsyncSession | None = None
+        self._token: Token["UnitOfWork | None"] | None = None
+        self._callbacks: list[Callable[[], None]] = []
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self.session_factory()
+        return self._session
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Calls `callback` after the next commit, it is dropped on rollback."""
+        self._callbacks.append(callback)
+
+    async def commit(self) -> None:
+        """Commits the changes made so far and closes the session."""
+        if self._session is not None:
+            session, self._session = self._session, None
+            try:
+                await session.commit()
+            finally:
+                await session.close()
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    async def __aenter__(self) -> "UnitOfWork":
+        self._token = _current.set(self)
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if self._token is not None:
+            _current.reset(self._token)
+            self._token = None
+        if exc_type is None:
+            await self.commit()
+            return
+        self._callbacks.clear()
+        if self._session is None:
+            return
+        session, self._session = self._session, None
+        try:
+            await session.rollback()
+        finally:
+            await session.close()
@@ -1,24 +1,42 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql
 from tracker.models import UserOrm
 from tracker.schemas import UserResponse
 
+from .base import BaseService
 
-class UserService:
-
-    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
-        self.session_factory = session_factory
 
+class UserService(BaseService):
     async def create(self, user_id: str) -> UserResponse:
-        async with self.session_factory() as session:
-            new_user = UserOrm(user_id=user_id)
-            session.add(new_user)
-            await session.commit()
-            await session.refresh(new_user)
-            return UserResponse.model_validate(new_user, from_attributes=True)
+        async with self.session() as session:
+            stmt = insert(UserOrm).values(id=user_id).returning(UserOrm.id)
+            res = await session.execute(stmt)
+            user = UserResponse(id=res.scalar_one())
+            await self.commit(session)
+            return user
+
+    async def get_or_create(self, user_id: str) -> UserResponse:
+        """Creates the user if it does not exist, in one statement without a lookup.
+
+        A deleted user starts over without the deleted trackers.
+        """
+        async with self.session() as session:
+            stmt = (
+                postgresql.insert(UserOrm)
+                .values(id=user_id)
+                .on_conflict_do_update(
+                    index_elements=[UserOrm.id],
+                    set_={"deleted_at": None},
+                    where=UserOrm.deleted_at.is_not(None),
+                )
+            )
+            await session.execute(stmt)
+            await self.commit(session)
+            return UserResponse(id=user_id)
 
     async def get(self, user_id: str) -> UserResponse | None:
-        async with self.session_factory() as session:
+        async with self.session() as session:
             result = await session.get(UserOrm, user_id)
-            if result is None:
+            if result is None or result.deleted_at is not None:
                 return None
             return UserResponse.model_validate(result, from_attributes=True)
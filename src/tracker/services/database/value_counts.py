@@ -0,0 +1,199 @@
+"""Statements maintaining `TrackerValueCountOrm`, daily counts of the values
+of categorical fields.
+
+Enum fields are counted exactly, there are few values. String fields are free
+text, so each day keeps at most `VALUE_SKETCH_SIZE` values with the
+Space-Saving algorithm: a new value on a full day replaces the least counted
+one and inherits its count as `error`. The counts of a day still sum up to the
+number of records, and a count overestimates its value by at most `error`.
+
+Counting is an UPDATE of the existing values and an INSERT of the others
+instead of an upsert, like in `field_stats` SQLAlchemy would compile ON
+CONFLICT again for every record. A statement sees the counts as of its start,
+so two concurrent writers would both insert a new value of a day, or both
+evict from a full day. Writers lock the tracker row before the statement,
+see `TrackerService.add_data`, which serializes them per tracker: the second
+one counts on top of the committed counts of the first.
+"""
+
+from sqlalchemy import (
+    ColumnElement,
+    Date,
+    FromClause,
+    Insert,
+    Select,
+    and_,
+    case,
+    cast,
+    delete,
+    exists,
+    func,
+    insert,
+    or_,
+    select,
+    true,
+    update,
+)
+from sqlalchemy.orm import aliased
+from tracker.models import TrackerOrm, TrackerStructureOrm, TrackerValueCountOrm
+
+from .codecs import stored_key, structure_fields
+
+CATEGORICAL_TYPES = ("enum", "string")
+VALUE_SKETCH_SIZE = 32
+
+
+def utc_day(timestamp) -> ColumnElement:
+    return cast(func.timezone("UTC", timestamp), Date)
+
+
+def categorical_values(records: FromClause) -> Select:
+    """Selects `tracker_id, field, type, day, value` of the categorical
+    fields of records.
+
+    Args:
+        records (FromClause): Rows with `tracker_id`, `data` and `created_at`
+            columns.
+    """
+    fields = func.jsonb_each_text(records.c.data).table_valued("key", "value")
+    structure = structure_fields("structure")
+    field_type = structure.c.props["type"].astext
+    return (
+        select(
+            records.c.tracker_id,
+            fields.c.key.label("field"),
+            field_type.label("type"),
+            utc_day(records.c.created_at).label("day"),
+            fields.c.value.label("value"),
+        )
+        .select_from(records)
+        .join(TrackerOrm, TrackerOrm.id == records.c.tracker_id)
+        .join(TrackerStructureOrm, TrackerStructureOrm.id == TrackerOrm.structure_id)
+        .join(fields, true())
+        # records are keyed by the ids of the fields
+        .join(structure, stored_key(structure) == fields.c.key)
+        .where(field_type.in_(CATEGORICAL_TYPES), fields.c.value.is_not(None))
+    )
+
+
+def count_values(values: Select) -> Insert:
+    """Counts one occurrence of every value, evicting from full string days.
+
+    Args:
+        values (Select): Rows of `categorical_values`, at most one per field.
+    """
+    v = values.cte("v")
+    c = TrackerValueCountOrm
+
+    def same_day(counts) -> ColumnElement[bool]:
+        return and_(
+            counts.tracker_id == v.c.tracker_id,
+            counts.field == v.c.field,
+            counts.day == v.c.day,
+        )
+
+    seen, size = aliased(c), aliased(c)
+    # the least counted value of a full string day without the new value
+    victim = (
+        select(c.tracker_id, c.field, c.day, c.value, c.count)
+        .distinct(c.tracker_id, c.field)
+        .join(v, same_day(c))
+        .where(
+            v.c.type == "string",
+            ~exists().where(same_day(seen), seen.value == v.c.value),
+            select(func.count()).where(same_day(size)).scalar_subquery()
+            >= VALUE_SKETCH_SIZE,
+        )
+        .order_by(c.tracker_id, c.field, c.count, c.value)
+        .cte("victim")
+    )
+    evicted = (
+        delete(c)
+        .where(
+            c.tracker_id == victim.c.tracker_id,
+            c.field == victim.c.field,
+            c.day == victim.c.day,
+            c.value == victim.c.value,
+        )
+        .returning(c.tracker_id, c.field, c.count)
+        .cte("evicted")
+    )
+    counted = (
+        update(c)
+        .where(same_day(c), c.value == v.c.value)
+        .values(count=c.count + 1)
+        .returning(c.tracker_id, c.field)
+        .cte("counted")
+    )
+    error = func.coalesce(evicted.c.count, 0)
+    return insert(c).from_select(
+        ["tracker_id", "field", "day", "value", "count", "error"],
+        select(
+            v.c.tracker_id,
+            v.c.field,
+            v.c.day,
+            v.c.value,
+            error + 1,
+            error,
+        )
+        .select_from(v)
+        .outerjoin(
+            evicted,
+            and_(
+                evicted.c.tracker_id == v.c.tracker_id,
+                evicted.c.field == v.c.field,
+            ),
+        )
+        .where(
+            ~exists().where(
+                counted.c.tracker_id == v.c.tracker_id,
+                counted.c.field == v.c.field,
+            )
+        ),
+    )
+
+
+def exact_counts(values: Select) -> Select:
+    """Selects rows shaped like `TrackerValueCountOrm` of values counted at once.
+
+    Every string day keeps its `VALUE_SKETCH_SIZE` most counted values and the
+    least counted of them takes the count of the dropped ones as `error`, the
+    bounds Space-Saving would give.
+
+    Args:
+        values (Select): Rows of `categorical_values`.
+    """
+    v = values.subquery("v")
+    day = (v.c.tracker_id, v.c.field, v.c.day)
+    counted = (
+        select(*day, v.c.type, v.c.value, func.count().label("count"))
+        .group_by(*day, v.c.type, v.c.value)
+        .subquery("counted")
+    )
+    day = (counted.c.tracker_id, counted.c.field, counted.c.day)
+    ranked = select(
+        counted,
+        func.row_number()
+        .over(partition_by=day, order_by=(counted.c.count.desc(), counted.c.value))
+        .label("rank"),
+    ).subquery("ranked")
+    day = (ranked.c.tracker_id, ranked.c.field, ranked.c.day)
+    dropped = func.sum(
+        case((ranked.c.rank > VALUE_SKETCH_SIZE, ranked.c.count), else_=0)
+    ).over(partition_by=day)
+    trimmed = select(ranked, dropped.label("dropped")).subquery("trimmed")
+    error = case(
+        (
+            and_(trimmed.c.type == "string", trimmed.c.rank == VALUE_SKETCH_SIZE),
+            trimmed.c.dropped,
+        ),
+        else_=0,
+    )
+    return select(
+        trimmed.c.tracker_id,
+        trimmed.c.field,
+        trimmed.c.day,
+        trimmed.c.value,
+        (trimmed.c.count + error).label("count"),
+        error.label("error"),
+    ).where(or_(trimmed.c.type != "string", trimmed.c.rank <= VALUE_SKETCH_SIZE))
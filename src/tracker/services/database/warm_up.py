@@ -0,0 +1,63 @@
+import asyncio
+from contextlib import suppress
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from tracker.exceptions import NotFoundException
+
+from .data_service import DataService
+from .tracker_service import TrackerService
+from .user_service import UserService
+
+_MISSING_ID = UUID(int=0)
+
+
+async def run_hot_queries(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    """Runs the read queries used on every update with arguments that match nothing.
+
+    Statements are prepared per connection, so running them through the services
+    leaves the exact SQL of the hot paths in the connection's statement cache.
+    """
+    user_service = UserService(session_factory)
+    tracker_service = TrackerService(session_factory)
+    data_service = DataService(session_factory)
+
+    await user_service.get("")
+    await tracker_service.get_by_user_id("")
+    with suppress(NotFoundException):
+        await tracker_service.get_by_id(_MISSING_ID)
+    with suppress(NotFoundException):
+        await tracker_service.get_by_name("", "")
+    await data_service.get_all_data(_MISSING_ID)
+
+
+async def warm_up_pool(engine: AsyncEngine, connections: int) -> None:
+    """Opens pool connections in advance and prepares the hot statements on each.
+
+    Args:
+        engine (AsyncEngine): Engine whose pool is warmed up.
+        connections (int): Number of connections to open, should not exceed the pool size.
+    """
+    if connections <= 0:
+        return
+    # every task holds its connection until all are opened, otherwise
+    # a released connection would be reused and fewer would be opened
+    barrier = asyncio.Barrier(connections)
+
+    async def warm_up_connection() -> None:
+        async with engine.connect() as conn:
+            try:
+                await run_hot_queries(
+                    async_sessionmaker(
+                        bind=conn,
+                        class_=AsyncSession,
+                        expire_on_commit=False,
+                        autoflush=False,
+                    )
+                )
+            except BaseException:
+                await barrier.abort()
+                raise
+            await barrier.wait()
+
+    await asyncio.gather(*(warm_up_connection() for _ in range(connections)))
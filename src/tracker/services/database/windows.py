@@ -0,0 +1,66 @@
+"""Window frames over time ranges.
+
+SQLAlchemy renders only integer offsets of `RANGE` frames, this construct
+renders `RANGE BETWEEN <interval> PRECEDING AND CURRENT ROW`, so a window
+covers a period of time before every row instead of a number of rows.
+"""
+
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import ColumnElement, Interval, cast, literal
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.visitors import InternalTraversal
+
+
+class TimeRangeOver(ColumnElement[Any]):
+    """`element OVER (ORDER BY order_by RANGE BETWEEN ... AND CURRENT ROW)`."""
+
+    __visit_name__ = "time_range_over"
+    inherit_cache = True
+    _traverse_internals = [
+        ("element", InternalTraversal.dp_clauseelement),
+        ("order_by", InternalTraversal.dp_clauseelement),
+        ("preceding", InternalTraversal.dp_clauseelement),
+    ]
+
+    def __init__(
+        self,
+        element: ColumnElement[Any],
+        order_by: ColumnElement[Any],
+        preceding: timedelta,
+    ) -> None:
+        self.element = element
+        self.order_by = order_by
+        # the type of a bound frame offset is not inferred
+        self.preceding = cast(literal(preceding, Interval), Interval)
+        self.type = element.type
+
+
+@compiles(TimeRangeOver)
+def _compile_time_range_over(
+    element: TimeRangeOver, compiler: SQLCompiler, **kw: Any
+) -> str:
+    return (
+        f"{compiler.process(element.element, **kw)} OVER ("
+        f"ORDER BY {compiler.process(element.order_by, **kw)} "
+        f"RANGE BETWEEN {compiler.process(element.preceding, **kw)} PRECEDING "
+        "AND CURRENT ROW)"
+    )
+
+
+def over_time(
+    element: ColumnElement[Any],
+    order_by: ColumnElement[Any],
+    preceding: timedelta,
+) -> TimeRangeOver:
+    """Evaluates a window function over the rows of the `preceding` period up
+    to the current row.
+
+    Args:
+        element (ColumnElement): Window or aggregate function.
+        order_by (ColumnElement): Timestamp the rows are ordered by.
+        preceding (timedelta): Length of the window.
+    """
+    return TimeRangeOver(element, order_by, preceding)
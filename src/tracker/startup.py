@@ -0,0 +1,58 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, ParamSpec, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+P = ParamSpec("P")
+
+
+class StartupPipeline:
+    """Times startup steps so independent ones can run concurrently."""
+
+    def __init__(self) -> None:
+        self.timings: dict[str, float] = {}
+        self._started = time.perf_counter()
+
+    async def step(self, name: str, awaitable: Awaitable[T]) -> T:
+        """Awaits a step and records how long it took.
+
+        Args:
+            name (str): Name of the step in the timing breakdown.
+            awaitable (Awaitable[T]): The step itself.
+
+        Returns:
+            T: Result of the step.
+        """
+        started = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.timings[name] = time.perf_counter() - started
+
+    async def step_in_thread(
+        self, name: str, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs
+    ) -> T:
+        """Runs a blocking step (e.g. a heavy import) in a thread."""
+        return await self.step(name, asyncio.to_thread(func, *args, **kwargs))
+
+    def step_sync(
+        self, name: str, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs
+    ) -> T:
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.timings[name] = time.perf_counter() - started
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self._started
+
+    def log(self) -> None:
+        breakdown = ", ".join(
+            f"{name} {duration * 1000:.0f}ms" for name, duration in self.timings.items()
+        )
+        logger.info("Startup finished in %.0fms: %s", self.total * 1000, breakdown)
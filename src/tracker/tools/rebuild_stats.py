@@ -0,0 +1,57 @@
+"""Rebuilds the statistics of numeric fields and the value counts from the records.
+
+Usage:
+    python -m tracker.tools.rebuild_stats [--tracker-id UUID] --db-url postgresql+asyncpg://...
+
+The statistics are kept up to date by every added record, a rebuild is only
+needed to repair them, e.g. after records were changed by hand.
+"""
+
+import argparse
+import asyncio
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+async def rebuild_stats(
+    tracker_id: UUID | None = None, db_url: str | None = None
+) -> tuple[int, int]:
+    """Rebuilds the statistics and value counts of one tracker or of all of them.
+
+    Args:
+        tracker_id (UUID | None): Tracker to rebuild, all if None.
+        db_url (str | None): Database to run against. Defaults to the configured one.
+
+    Returns:
+        tuple[int, int]: Number of rebuilt field statistics and of stored
+            value counts.
+    """
+    from tracker.database import create_sessionmaker, get_engine
+    from tracker.services.database import DataService
+
+    engine: AsyncEngine = get_engine(db_url)
+    try:
+        data_service = DataService(create_sessionmaker(engine))
+        return (
+            await data_service.rebuild_field_stats(tracker_id),
+            await data_service.rebuild_value_counts(tracker_id),
+        )
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tracker-id", type=UUID, default=None, help="defaults to all")
+    parser.add_argument("--db-url", default=None, help="defaults to configured DB")
+    args = parser.parse_args()
+
+    stats, counts = asyncio.run(
+        rebuild_stats(tracker_id=args.tracker_id, db_url=args.db_url)
+    )
+    print(f"rebuilt field statistics: {stats}, value counts: {counts}")
+
+
+if __name__ == "__main__":
+    main()
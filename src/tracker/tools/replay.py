@@ -0,0 +1,300 @@
+"""Replays a recorded update log against a fresh dispatcher.
+
+Usage:
+    python -m tracker.tools.replay updates.jsonl.gz --speed 10 --db-url postgresql+asyncpg://...
+
+Telegram API calls are answered locally, so only the bot's own processing and
+the database are measured.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from itertools import count
+from typing import Any, AsyncGenerator, Union, get_args, get_origin
+
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import Message, Update, User
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from tracker.tools.update_log import RecordedUpdate, read_update_log
+
+REPLAY_BOT_TOKEN = "42:replay"
+
+
+class ReplaySession(BaseSession):
+    """Aiogram session that answers every API call locally."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: Counter[str] = Counter()
+        self._message_ids = count(1)
+
+    async def close(self) -> None:
+        pass
+
+    async def stream_content(  # type: ignore
+        self, url: str, *args: Any, **kwargs: Any
+    ) -> AsyncGenerator[bytes, None]:
+        yield b""
+
+    def _fake_result(self, bot: Bot, method: TelegramMethod[Any]) -> Any:
+        returning = method.__returning__
+        options = (
+            get_args(returning) if get_origin(returning) is Union else (returning,)
+        )
+        if Message in options:
+            chat_id = getattr(method, "chat_id", None) or 0
+            return Message.model_validate(
+                {
+                    "message_id": getattr(method, "message_id", None)
+                    or next(self._message_ids),
+                    "date": datetime.now(timezone.utc),
+                    "chat": {"id": chat_id, "type": "private"},
+                    "text": getattr(method, "text", None),
+                },
+                context={"bot": bot},
+            )
+        if User in options:
+            return User(id=bot.id, is_bot=True, first_name="replay")
+        if get_origin(returning) is list:
+            return []
+        return True
+
+    async def make_request(
+        self,
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+        timeout: int | None = None,
+    ) -> TelegramType:
+        self.calls[type(method).__name__] += 1
+        return self._fake_result(bot, method)
+
+
+@dataclass
+class DatabaseLoad:
+    statements: int = 0
+    statement_time: float = 0.0
+    checkouts: int = 0
+    server: dict[str, int] = field(default_factory=dict)
+
+
+def instrument_engine(engine: AsyncEngine) -> DatabaseLoad:
+    load = DatabaseLoad()
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("replay_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["replay_started"].pop()
+        load.statements += 1
+        load.statement_time += time.perf_counter() - started
+
+    @event.listens_for(sync_engine, "checkout")
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        load.checkouts += 1
+
+    return load
+
+
+_SERVER_COUNTERS = (
+    "xact_commit",
+    "xact_rollback",
+    "blks_read",
+    "blks_hit",
+    "tup_returned",
+    "tup_fetched",
+    "tup_inserted",
+    "tup_updated",
+    "tup_deleted",
+)
+
+
+async def read_server_counters(engine: AsyncEngine) -> dict[str, int]:
+    async with engine.connect() as conn:
+        res = await conn.execute(
+            text(
+                f"SELECT {', '.join(_SERVER_COUNTERS)} FROM pg_stat_database "
+                "WHERE datname = current_database()"
+            )
+        )
+        row = res.one()
+        return dict(zip(_SERVER_COUNTERS, row))
+
+
+def _chat_key(update: Update) -> int | None:
+    if update.message:
+        return update.message.chat.id
+    if update.callback_query:
+        return update.callback_query.from_user.id
+    return None
+
+
+@dataclass
+class ReplayReport:
+    updates: int
+    errors: int
+    wall_time: float
+    latencies: list[float]
+    db: DatabaseLoad
+    api_calls: Counter[str]
+
+    def _percentile(self, q: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def format(self) -> str:
+        lines = [
+            f"updates: {self.updates} (errors: {self.errors})",
+            f"wall time: {self.wall_time:.2f}s, "
+            f"throughput: {self.updates / self.wall_time if self.wall_time else 0:.1f} upd/s",
+        ]
+        if self.latencies:
+            lines.append(
+                "latency ms: "
+                f"mean {statistics.fmean(self.latencies) * 1000:.2f}, "
+                f"p50 {self._percentile(0.5) * 1000:.2f}, "
+                f"p95 {self._percentile(0.95) * 1000:.2f}, "
+                f"p99 {self._percentile(0.99) * 1000:.2f}, "
+                f"max {max(self.latencies) * 1000:.2f}"
+            )
+        per_update = self.updates or 1
+        lines.append(
+            f"db: {self.db.statements} statements "
+            f"({self.db.statements / per_update:.2f}/update, "
+            f"{self.db.statement_time * 1000:.1f}ms total), "
+            f"{self.db.checkouts} pool checkouts "
+            f"({self.db.checkouts / per_update:.2f}/update)"
+        )
+        if self.db.server:
+            lines.append(
+                "db server: " + ", ".join(f"{k} {v}" for k, v in self.db.server.items())
+            )
+        lines.append(
+            "api calls: "
+            + ", ".join(f"{k} {v}" for k, v in self.api_calls.most_common())
+        )
+        return "\n".join(lines)
+
+
+async def replay(
+    records: list[RecordedUpdate],
+    db_url: str | None = None,
+    speed: float | None = 1.0,
+    concurrency: int = 100,
+) -> ReplayReport:
+    """Feeds recorded updates into a fresh dispatcher.
+
+    Args:
+        records (list[RecordedUpdate]): Recorded updates in arrival order.
+        db_url (str | None): Database to run against. Defaults to the configured one.
+        speed (float | None): Replay speed multiplier, None replays as fast as possible.
+        concurrency (int): Maximum number of updates processed at the same time.
+
+    Returns:
+        ReplayReport: Latency, database and API call statistics.
+    """
+    from tracker.database import get_sessionmaker
+    from tracker.main import create_dispatcher
+
+    sessionmaker = await get_sessionmaker(db_url)
+    engine: AsyncEngine = sessionmaker.kw["bind"]
+    load = instrument_engine(engine)
+    server_before = await read_server_counters(engine)
+
+    session = ReplaySession()
+    bot = Bot(token=REPLAY_BOT_TOKEN, session=session)
+    dp = create_dispatcher(sessionmaker, record_updates=False)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    # updates of one chat are processed in order, like a user would send them
+    chat_locks: dict[int | None, asyncio.Lock] = {}
+    latencies: list[float] = []
+    errors = 0
+
+    async def feed(record: RecordedUpdate) -> None:
+        nonlocal errors
+        lock = chat_locks.setdefault(_chat_key(record.update), asyncio.Lock())
+        async with lock, semaphore:
+            started = time.perf_counter()
+            try:
+                await dp.feed_update(bot, record.update)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    tasks = []
+    first_ts = records[0].timestamp if records else 0.0
+    started = time.perf_counter()
+    for record in records:
+        if speed:
+            delay = (record.timestamp - first_ts) / speed
+            wait = delay - (time.perf_counter() - started)
+            if wait > 0:
+                await asyncio.sleep(wait)
+        tasks.append(asyncio.create_task(feed(record)))
+    await asyncio.gather(*tasks)
+    wall_time = time.perf_counter() - started
+
+    server_after = await read_server_counters(engine)
+    load.server = {k: server_after[k] - server_before[k] for k in _SERVER_COUNTERS}
+    await engine.dispose()
+
+    return ReplayReport(
+        updates=len(records),
+        errors=errors,
+        wall_time=wall_time,
+        latencies=latencies,
+        db=load,
+        api_calls=session.calls,
+    )
+
+
+def _parse_speed(value: str) -> float | None:
+    if value == "max":
+        return None
+    speed = float(value.rstrip("x"))
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be positive")
+    return speed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("log", help="path to a recorded .jsonl.gz update log")
+    parser.add_argument(
+        "--speed",
+        type=_parse_speed,
+        default=1.0,
+        help="replay speed: 1x, 10x, ... or 'max' (default: 1x)",
+    )
+    parser.add_argument("--db-url", default=None, help="defaults to configured DB")
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    records = list(read_update_log(args.log))
+    report = asyncio.run(
+        replay(
+            records,
+            db_url=args.db_url,
+            speed=args.speed,
+            concurrency=args.concurrency,
+        )
+    )
+    print(report.format())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+import gzip
+import hashlib
+import json
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+from aiogram.filters.callback_data import CallbackData
+from aiogram.types import Update
+from tracker.core.dynamic_json.types import FieldType
+from tracker.presentation import callbacks
+from tracker.presentation.callback_codec import StructureRef
+
+_COMMAND_RE = re.compile(r"^/\w+(@\w+)?")
+_WORD_RE = re.compile(r"[^\W\d_]+")
+_LETTERS = "abcdefghijklmnop"
+
+# objects that identify a person or a chat
+_IDENTITY_KEYS = {"from", "chat", "user", "sender_chat", "forward_from"}
+_NAME_KEYS = {"first_name", "last_name", "username", "title"}
+_TEXT_KEYS = {"text", "caption", "query"}
+_CALLBACK_KEYS = {"data", "callback_data"}
+
+
+def _callback_classes() -> dict[str, list[type[CallbackData]]]:
+    result: dict[str, list[type[CallbackData]]] = {}
+    for obj in vars(callbacks).values():
+        if (
+            isinstance(obj, type)
+            and issubclass(obj, CallbackData)
+            and obj is not CallbackData
+        ):
+            result.setdefault(obj.__prefix__, []).append(obj)
+    return result
+
+
+class UpdateAnonymizer:
+    """Replaces user ids and free text in updates with salted pseudonyms.
+
+    The mapping is deterministic for a given salt, so the same tracker or field
+    name gets the same pseudonym in messages and in callback data, and a replayed
+    log still walks through the same handlers. Bot commands, digits and
+    punctuation are kept, pseudonyms keep the length and the case of the original
+    words.
+    """
+
+    def __init__(self, salt: str) -> None:
+        self._key = hashlib.blake2b(salt.encode()).digest()[:32]
+        self._callback_classes = _callback_classes()
+
+    def _digest(self, value: str, size: int) -> bytes:
+        return hashlib.blake2b(
+            value.encode(), key=self._key, digest_size=min(max(size, 1), 64)
+        ).digest()
+
+    def anonymize_id(self, value: int) -> int:
+        hashed = int.from_bytes(self._digest(str(value), 6)) or 1
+        return -hashed if value < 0 else hashed
+
+    def _pseudonym(self, match: re.Match[str]) -> str:
+        word = match.group(0)
+        # hashed as written, names that differ in case stay different fields
+        digest = self._digest(word, len(word))
+        letters = (_LETTERS[b % len(_LETTERS)] for b in digest)
+        return "".join(i.upper() if c.isupper() else i for i, c in zip(letters, word))
+
+    def anonymize_text(self, text: str) -> str:
+        command = _COMMAND_RE.match(text)
+        prefix = command.group(0) if command else ""
+        return prefix + _WORD_RE.sub(self._pseudonym, text[len(prefix) :])
+
+    def anonymize_callback_data(self, data: str) -> str:
+        prefix = data.split(":", maxsplit=1)[0]
+        for cls in self._callback_classes.get(prefix, []):
+            try:
+                callback = cls.unpack(data)
+            except (TypeError, ValueError):
+                continue
+            values = {
+                name: (
+                    self.anonymize_text(value)
+                    if field.annotation is str and isinstance(value, str)
+                    else value
+                )
+                for name, field in cls.model_fields.items()
+                if (value := getattr(callback, name)) is not None
+            }
+            return cls(**values).pack()
+        return data
+
+    def anonymize_structure(self, structure: FieldType) -> FieldType:
+        result: FieldType = {}
+        for name, props in structure.items():
+            props = dict(props)
+            if "values" in props:
+                props["values"] = [self.anonymize_text(i) for i in props["values"]]  # type: ignore
+            result[self.anonymize_text(name)] = props  # type: ignore
+        return result
+
+    def anonymize_structure_callback(self, data: str, structure: FieldType) -> str:
+        """Packs compact callback data again for the anonymized structure.
+
+        Compact callbacks refer to fields by indices and a tag of the structure,
+        both change when the names are replaced, so without this the recorded
+        callbacks would not match the trackers created during replay.
+        """
+        ref = StructureRef(structure)
+        anonymized = StructureRef(self.anonymize_structure(structure))
+        if (name := ref.resolve_field(data)) is not None:
+            return anonymized.pack_field(self.anonymize_text(name))
+        if (resolved := ref.resolve_enum_value(data)) is not None:
+            name, value = resolved
+            return anonymized.pack_enum_value(
+                self.anonymize_text(name), self.anonymize_text(value)
+            )
+        return data
+
+    def anonymize(self, update: Update) -> dict[str, Any]:
+        raw = update.model_dump(mode="json", exclude_none=True, by_alias=True)
+        return self._anonymize(raw)
+
+    def _anonymize(self, obj: Any, identity: bool = False) -> Any:
+        if isinstance(obj, list):
+            return [self._anonymize(i, identity) for i in obj]
+        if not isinstance(obj, dict):
+            return obj
+        result = {}
+        for k, v in obj.items():
+            if isinstance(v, (dict, list)):
+                result[k] = self._anonymize(v, identity=k in _IDENTITY_KEYS)
+            elif identity and k == "id" and isinstance(v, int):
+                result[k] = self.anonymize_id(v)
+            elif isinstance(v, str) and (k in _NAME_KEYS or k in _TEXT_KEYS):
+                result[k] = self.anonymize_text(v)
+            elif isinstance(v, str) and k in _CALLBACK_KEYS:
+                result[k] = self.anonymize_callback_data(v)
+            else:
+                result[k] = v
+        return result
+
+
+@dataclass
+class RecordedUpdate:
+    timestamp: float
+    update: Update
+
+
+class UpdateLogWriter:
+    """Appends updates to a gzip-compressed JSONL file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = gzip.open(path, "at", encoding="utf-8")
+
+    def write(self, update: dict[str, Any], timestamp: float | None = None) -> None:
+        record = {
+            "ts": time.time() if timestamp is None else timestamp,
+            "update": update,
+        }
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def read_update_log(path: str) -> Iterator[RecordedUpdate]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            yield RecordedUpdate(
+                timestamp=record["ts"],
+                update=Update.model_validate(record["update"]),
+            )
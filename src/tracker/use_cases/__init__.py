@@ -2,3 +2,8 @@
 from .create_tracker import *
 from .tracker_data import *
 from .tracker_control import *
+from .statistics_cache import *
+from .digest import *
+from .reminder import *
+from .retention import *
+from .deletion import *
@@ -7,7 +7,7 @@ from tracker.schemas import (
     TrackerResponse,
     TrackerStructureCreate,
 )
-from tracker.services.database import TrackerService, UserService
+from tracker.services.database import TrackerService
 
 __all__ = [
     "CreateTrackerDraftUseCase",
@@ -123,20 +123,16 @@ class FinishTrackerCreation:
     class Error(StrEnum):
         AT_LEAST_ONE_FIELD_REQUIRED = auto()
 
-    def __init__(
-        self, tracker_service: TrackerService, user_service: UserService
-    ) -> None:
+    def __init__(self, tracker_service: TrackerService) -> None:
         self.tracker_service = tracker_service
-        self.user_service = user_service
 
     async def execute(
         self, tracker: TrackerCreate
     ) -> tuple[TrackerResponse | None, Error | None]:
-        """Validates the tracker structure and creates the tracker.
+        """Validates the tracker structure and creates the tracker (and the user if needed).
 
         Args:
             tracker (TrackerCreate): The tracker DTO.
-            user_id (str): The ID of the user creating the tracker.
 
         Returns:
             tuple[TrackerResponse | None, Error | None]:\
@@ -146,10 +142,6 @@ class FinishTrackerCreation:
         if len(tracker.structure.data) == 0:
             return None, self.Error.AT_LEAST_ONE_FIELD_REQUIRED
 
-        user = await self.user_service.get(tracker.user_id)
-        if user is None:
-            user = await self.user_service.create(tracker.user_id)
-
         DynamicJson.from_fields(fields=tracker.structure.data)
         created_tracker = await self.tracker_service.create(tracker=tracker)
         return created_tracker, None
@@ -0,0 +1,76 @@
+from enum import StrEnum, auto
+
+from tracker.exceptions import NotFoundException
+from tracker.services.database import DeletionService, TrackerService
+
+__all__ = ["DeleteTrackerUseCase", "DeleteAccountUseCase"]
+
+CONFIRMATION = "confirm"
+
+
+class DeleteTrackerUseCase:
+    """Deletes a tracker from a `/delete_tracker` message."""
+
+    class Error(StrEnum):
+        NO_TEXT = auto()
+        TRACKER_NOT_FOUND = auto()
+
+    def __init__(
+        self, tracker_service: TrackerService, deletion_service: DeletionService
+    ) -> None:
+        self.tracker_service = tracker_service
+        self.deletion_service = deletion_service
+
+    async def execute(self, user_id: str, text: str | None) -> Error | None:
+        """Deletes a tracker from a `/delete_tracker <tracker name>` message.
+
+        The tracker is hidden at once, its records are removed in the
+        background.
+
+        Args:
+            user_id (str): User ID, the owner of the tracker.
+            text (str | None): The user's input.
+
+        Returns:
+            Error | None: An error code (or None if successful).
+        """
+        parts = (text or "").split(maxsplit=1)[1:]
+        if not parts:
+            return self.Error.NO_TEXT
+        try:
+            tracker = await self.tracker_service.get_by_name(user_id, parts[0].strip())
+        except NotFoundException:
+            return self.Error.TRACKER_NOT_FOUND
+        if not await self.deletion_service.delete_tracker(tracker.id):
+            # deleted concurrently
+            return self.Error.TRACKER_NOT_FOUND
+        return None
+
+
+class DeleteAccountUseCase:
+    """Deletes the user with all trackers from a `/delete_account` message."""
+
+    class Error(StrEnum):
+        NOT_CONFIRMED = auto()
+        USER_NOT_FOUND = auto()
+
+    def __init__(self, deletion_service: DeletionService) -> None:
+        self.deletion_service = deletion_service
+
+    async def execute(self, user_id: str, text: str | None) -> Error | None:
+        """Deletes the user with all trackers from a
+        `/delete_account confirm` message.
+
+        Args:
+            user_id (str): User ID.
+            text (str | None): The user's input.
+
+        Returns:
+            Error | None: An error code (or None if successful).
+        """
+        parts = (text or "").split(maxsplit=1)[1:]
+        if not parts or parts[0].strip() != CONFIRMATION:
+            return self.Error.NOT_CONFIRMED
+        if not await self.deletion_service.delete_user(user_id):
+            return self.Error.USER_NOT_FOUND
+        return None
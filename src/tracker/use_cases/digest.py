@@ -0,0 +1,134 @@
+from datetime import datetime, time, timedelta, timezone
+from enum import StrEnum, auto
+from itertools import groupby
+
+from tracker.schemas import DashboardTrackerData, DigestSchedule
+from tracker.services.database import DataService, ScheduleService, TrackerService
+
+__all__ = ["CollectDigestsUseCase", "ScheduleDigestUseCase"]
+
+DIGEST_PERIODS = {"daily": 1, "weekly": 7}
+DEFAULT_DIGEST_TIME = time(9, 0)
+
+
+class ScheduleDigestUseCase:
+    """Sets or removes the digest schedule of a user from a `/digest` message."""
+
+    class Error(StrEnum):
+        NO_TEXT = auto()
+        WRONG_VALUE = auto()
+
+    def __init__(self, schedule_service: ScheduleService) -> None:
+        self.schedule_service = schedule_service
+
+    async def execute(
+        self,
+        user_id: str,
+        text: str | None,
+        language: str,
+        now: datetime | None = None,
+    ) -> tuple[DigestSchedule | None, Error | None]:
+        """Sets or removes the digest schedule of a user from a `/digest` message.
+
+        The message is `/digest daily|weekly [HH:MM]` with the time in UTC,
+        09:00 by default, or `/digest off`.
+
+        Args:
+            user_id (str): User ID.
+            text (str | None): The user's input.
+            language (str): Language of the digests.
+            now (datetime | None, optional): Current time. Defaults to now.
+
+        Returns:
+            tuple[DigestSchedule | None, Error | None]:\
+                The schedule (None if removed or if an error occurred)\
+                and an error code (or None if successful).
+        """
+        parts = (text or "").split()[1:]
+        if not parts:
+            return None, self.Error.NO_TEXT
+        if parts[0] == "off" and len(parts) == 1:
+            await self.schedule_service.delete_digest(user_id)
+            return None, None
+        period_days = DIGEST_PERIODS.get(parts[0])
+        if period_days is None or len(parts) > 2:
+            return None, self.Error.WRONG_VALUE
+        at = DEFAULT_DIGEST_TIME
+        if len(parts) == 2:
+            try:
+                at = time.fromisoformat(parts[1])
+            except ValueError:
+                return None, self.Error.WRONG_VALUE
+        schedule = DigestSchedule(
+            user_id=user_id,
+            period_days=period_days,
+            next_run_at=self.next_run(at, now or datetime.now(timezone.utc)),
+            language=language,
+        )
+        return await self.schedule_service.set_digest(schedule), None
+
+    @staticmethod
+    def next_run(at: time, now: datetime) -> datetime:
+        """The first time of day `at` in UTC after `now`."""
+        run = datetime.combine(now.astimezone(timezone.utc).date(), at, timezone.utc)
+        return run if run > now else run + timedelta(days=1)
+
+
+class CollectDigestsUseCase:
+    """Claim the due digests of users and summarize their trackers."""
+
+    def __init__(
+        self,
+        schedule_service: ScheduleService,
+        tracker_service: TrackerService,
+        data_service: DataService,
+    ) -> None:
+        self.schedule_service = schedule_service
+        self.tracker_service = tracker_service
+        self.data_service = data_service
+
+    async def execute(
+        self, user_ids: list[str], now: datetime, max_trackers: int
+    ) -> list[tuple[DigestSchedule, list[DashboardTrackerData]]]:
+        """Claim the due digests of users and summarize their trackers.
+
+        The trackers of all users are read by one query, and the summaries
+        of all trackers by one query per period length.
+
+        Args:
+            user_ids (list[str]): Users whose digests are due.
+            now (datetime): Current time, the end of the summarized periods.
+            max_trackers (int): Number of trackers of a user to summarize at most.
+
+        Returns:
+            list[tuple[DigestSchedule, list[DashboardTrackerData]]]:
+                The claimed schedules of users with trackers and the
+                summaries of their trackers over the period of the schedule.
+        """
+        claimed = await self.schedule_service.claim_due_digests(user_ids, now)
+        if not claimed:
+            return []
+        trackers = await self.tracker_service.get_summaries_by_user_ids(
+            [i.user_id for i in claimed], limit=max_trackers
+        )
+        claimed = sorted(
+            (i for i in claimed if i.user_id in trackers),
+            key=lambda i: i.period_days,
+        )
+        res = []
+        for days, schedules in groupby(claimed, key=lambda i: i.period_days):
+            schedules = list(schedules)
+            summaries = await self.data_service.get_dashboard(
+                tracker_ids=[j.id for i in schedules for j in trackers[i.user_id]],
+                days=days,
+                now=now,
+            )
+            by_id = {i.tracker_id: i for i in summaries}
+            res += [
+                (
+                    i,
+                    [by_id[j.id] for j in trackers[i.user_id] if j.id in by_id],
+                )
+                for i in schedules
+            ]
+        return res
@@ -0,0 +1,85 @@
+from datetime import datetime, time, timezone
+from enum import StrEnum, auto
+
+from tracker.exceptions import NotFoundException
+from tracker.schemas import Reminder
+from tracker.services.database import ScheduleService, TrackerService
+
+from .digest import ScheduleDigestUseCase
+
+__all__ = ["SetReminderUseCase"]
+
+REMINDER_PERIODS = {"daily": 1, "weekly": 7}
+
+
+class SetReminderUseCase:
+    """Sets or removes the reminder of a tracker from a `/remind` message."""
+
+    class Error(StrEnum):
+        NO_TEXT = auto()
+        WRONG_VALUE = auto()
+        TRACKER_NOT_FOUND = auto()
+
+    def __init__(
+        self, tracker_service: TrackerService, schedule_service: ScheduleService
+    ) -> None:
+        self.tracker_service = tracker_service
+        self.schedule_service = schedule_service
+
+    async def execute(
+        self,
+        user_id: str,
+        text: str | None,
+        language: str,
+        now: datetime | None = None,
+    ) -> tuple[Reminder | None, Error | None]:
+        """Sets or removes the reminder of a tracker from a `/remind` message.
+
+        The message is `/remind <tracker name> HH:MM [daily|weekly]` with the
+        time in UTC, daily by default, or `/remind <tracker name> off`.
+
+        Args:
+            user_id (str): User ID, the owner of the tracker.
+            text (str | None): The user's input.
+            language (str): Language of the reminders.
+            now (datetime | None, optional): Current time. Defaults to now.
+
+        Returns:
+            tuple[Reminder | None, Error | None]:\
+                The reminder (None if removed or if an error occurred)\
+                and an error code (or None if successful).
+        """
+        parts = (text or "").split(maxsplit=1)[1:]
+        if not parts or len(words := parts[0].rsplit(maxsplit=1)) < 2:
+            return None, self.Error.NO_TEXT
+        rest, value = words
+        period_days = 1
+        if value in REMINDER_PERIODS:
+            period_days = REMINDER_PERIODS[value]
+            if len(words := rest.rsplit(maxsplit=1)) < 2:
+                return None, self.Error.WRONG_VALUE
+            rest, value = words
+        at = None
+        if value != "off" or period_days != 1:
+            try:
+                at = time.fromisoformat(value)
+            except ValueError:
+                return None, self.Error.WRONG_VALUE
+
+        try:
+            tracker = await self.tracker_service.get_by_name(user_id, rest)
+        except NotFoundException:
+            return None, self.Error.TRACKER_NOT_FOUND
+
+        if at is None:
+            await self.schedule_service.delete_reminder(tracker.id)
+            return None, None
+        reminder = Reminder(
+            tracker_id=tracker.id,
+            period_days=period_days,
+            next_fire_at=ScheduleDigestUseCase.next_run(
+                at, now or datetime.now(timezone.utc)
+            ),
+            language=language,
+        )
+        return await self.schedule_service.set_reminder(reminder), None
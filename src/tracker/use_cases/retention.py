@@ -0,0 +1,71 @@
+from enum import StrEnum, auto
+
+from tracker.exceptions import NotFoundException
+from tracker.schemas import RetentionPolicy
+from tracker.services.database import RetentionService, TrackerService
+
+__all__ = ["SetRetentionUseCase"]
+
+
+class SetRetentionUseCase:
+    """Sets or removes the retention policy of a tracker from a `/retention`
+    message."""
+
+    class Error(StrEnum):
+        NO_TEXT = auto()
+        WRONG_VALUE = auto()
+        TOO_FEW_DAYS = auto()
+        TRACKER_NOT_FOUND = auto()
+
+    def __init__(
+        self,
+        tracker_service: TrackerService,
+        retention_service: RetentionService,
+        min_days: int = 30,
+    ) -> None:
+        self.tracker_service = tracker_service
+        self.retention_service = retention_service
+        # periods of the dashboard and the digests read raw records only
+        self.min_days = min_days
+
+    async def execute(
+        self, user_id: str, text: str | None
+    ) -> tuple[RetentionPolicy | None, Error | None]:
+        """Sets or removes the retention policy of a tracker from a
+        `/retention` message.
+
+        The message is `/retention <tracker name> <days>` to keep the records
+        of the last days raw and archive older ones, or
+        `/retention <tracker name> off`.
+
+        Args:
+            user_id (str): User ID, the owner of the tracker.
+            text (str | None): The user's input.
+
+        Returns:
+            tuple[RetentionPolicy | None, Error | None]:\
+                The policy (None if removed or if an error occurred)\
+                and an error code (or None if successful).
+        """
+        parts = (text or "").split(maxsplit=1)[1:]
+        if not parts or len(words := parts[0].rsplit(maxsplit=1)) < 2:
+            return None, self.Error.NO_TEXT
+        name, value = words
+        raw_days = None
+        if value != "off":
+            if not value.isdigit():
+                return None, self.Error.WRONG_VALUE
+            raw_days = int(value)
+            if raw_days < self.min_days:
+                return None, self.Error.TOO_FEW_DAYS
+
+        try:
+            tracker = await self.tracker_service.get_by_name(user_id, name)
+        except NotFoundException:
+            return None, self.Error.TRACKER_NOT_FOUND
+
+        if raw_days is None:
+            await self.retention_service.delete_policy(tracker.id)
+            return None, None
+        policy = RetentionPolicy(tracker_id=tracker.id, raw_days=raw_days)
+        return await self.retention_service.set_policy(policy), None
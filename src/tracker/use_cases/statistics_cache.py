@@ -0,0 +1,114 @@
+import time
+from datetime import datetime
+from typing import Callable, Hashable
+from uuid import UUID
+
+from tracker.core.lru import LRUCache
+from tracker.core.record_filter import RecordFilter
+from tracker.schemas import TrackerSummary
+from tracker.schemas.result import DashboardTrackerData, StatisticsTrackerData
+
+__all__ = ["DashboardCache", "StatisticsCache"]
+
+
+class StatisticsCache:
+    """LRU cache of statistics results.
+
+    Results are keyed by the data version of the tracker, which is bumped by
+    every added record, so a cached result is never stale and results of old
+    versions are evicted as least recently used. Periods like "the last 7
+    days" start at another microsecond on every request, their start is
+    rounded down to `granularity` seconds to make repeated requests hit.
+    """
+
+    def __init__(self, maxsize: int = 256, granularity: int = 60) -> None:
+        self.granularity = granularity
+        self._results: LRUCache[Hashable, list[StatisticsTrackerData]] = LRUCache(
+            maxsize
+        )
+
+    @property
+    def hits(self) -> int:
+        return self._results.hits
+
+    @property
+    def misses(self) -> int:
+        return self._results.misses
+
+    def round_date(self, from_date: datetime | None) -> datetime | None:
+        """Rounds the start of a period down to the granularity."""
+        if from_date is None or self.granularity <= 1:
+            return from_date
+        timestamp = from_date.timestamp()
+        return datetime.fromtimestamp(
+            timestamp - timestamp % self.granularity, tz=from_date.tzinfo
+        )
+
+    @staticmethod
+    def key(
+        tracker_id: UUID,
+        data_version: int,
+        numeric_fields: list[str],
+        categorical_fields: list[str],
+        from_date: datetime | None,
+        where: RecordFilter | None = None,
+    ) -> Hashable:
+        return (
+            tracker_id,
+            data_version,
+            tuple(numeric_fields),
+            tuple(categorical_fields),
+            from_date,
+            where,
+        )
+
+    def get(self, key: Hashable) -> list[StatisticsTrackerData] | None:
+        return self._results.get(key)
+
+    def put(self, key: Hashable, stats: list[StatisticsTrackerData]) -> None:
+        self._results.put(key, stats)
+
+
+class DashboardCache:
+    """LRU cache of the dashboards of users, one per user.
+
+    A dashboard is reused while the user's trackers and their data versions
+    stay the same, but for at most `ttl` seconds: its averages are taken over
+    the last days, which move on without any new record.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        ttl: float = 300,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._results: LRUCache[
+            str, tuple[Hashable, float, list[DashboardTrackerData]]
+        ] = LRUCache(maxsize)
+
+    @staticmethod
+    def versions(trackers: list[TrackerSummary]) -> Hashable:
+        return tuple((i.id, i.data_version) for i in trackers)
+
+    def get(
+        self, user_id: str, versions: Hashable
+    ) -> list[DashboardTrackerData] | None:
+        entry = self._results.get(user_id)
+        if entry is not None:
+            cached_versions, created_at, dashboard = entry
+            if cached_versions == versions and self.clock() - created_at < self.ttl:
+                self.hits += 1
+                return dashboard
+            self._results.pop(user_id)
+        self.misses += 1
+        return None
+
+    def put(
+        self, user_id: str, versions: Hashable, dashboard: list[DashboardTrackerData]
+    ) -> None:
+        self._results.put(user_id, (versions, self.clock(), dashboard))
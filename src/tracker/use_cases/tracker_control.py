@@ -1,12 +1,24 @@
+from datetime import datetime
 from enum import StrEnum, auto
+from uuid import UUID
 
 from tracker.core.dynamic_json import DynamicJson
-from tracker.schemas import TrackerResponse
+from tracker.schemas import (
+    DashboardTrackerData,
+    Page,
+    PageDirection,
+    TrackerResponse,
+    TrackerSummary,
+)
 from tracker.schemas.tracker import TrackerDataCreate
-from tracker.services.database import TrackerService
+from tracker.services.database import DataService, TrackerService
+
+from .statistics_cache import DashboardCache
 
 __all__ = [
+    "GetDashboardUseCase",
     "GetUserTrackersUseCase",
+    "SearchTrackersUseCase",
     "ValidateTrackingMessageUseCase",
     "HandleFieldValueUseCase",
 ]
@@ -21,23 +33,129 @@ class GetUserTrackersUseCase:
     def __init__(self, tracker_service: TrackerService) -> None:
         self.tracker_service = tracker_service
 
-    async def execute(self, user_id: str) -> tuple[list[TrackerResponse], Error | None]:
-        """Return the list of trackers.
+    async def execute(
+        self,
+        user_id: str,
+        page_size: int,
+        direction: PageDirection = "first",
+        key: tuple[datetime, UUID] | None = None,
+    ) -> tuple[Page[TrackerSummary] | None, Error | None]:
+        """Return a page of the list of trackers, most recently active first.
 
         Args:
             user_id (str): User ID.
+            page_size (int): Number of trackers on a page.
+            direction (PageDirection, optional): The page to get relative to
+                the current one. Defaults to "first".
+            key (tuple[datetime, UUID] | None, optional): Key of the last tracker of
+                the current page for "older", of the first one for "newer".
 
         Returns:
-            tuple[list[TrackerResponse], Error | None]:\
-                The list of user's trackers (empty if an error occurred)\
+            tuple[Page[TrackerSummary] | None, Error | None]:\
+                The page of user's trackers (None if an error occurred)\
                 and an error code (or None if successful).
         """
-        trackers = await self.tracker_service.get_by_user_id(user_id=user_id)
+        trackers = await self.tracker_service.get_summaries_by_user_id(
+            user_id=user_id,
+            limit=page_size + 1,
+            older_than=key if direction == "older" else None,
+            newer_than=key if direction == "newer" else None,
+        )
         if not trackers:
-            return [], self.Error.NO_TRACKERS
+            return None, self.Error.NO_TRACKERS
+        return Page.from_rows(trackers, page_size, direction), None
+
+
+class SearchTrackersUseCase:
+    """Searches the trackers of a user by name."""
+
+    class Error(StrEnum):
+        NO_TRACKERS = auto()
+
+    MAX_QUERY_LENGTH = 64
+
+    def __init__(self, tracker_service: TrackerService) -> None:
+        self.tracker_service = tracker_service
+
+    async def execute(
+        self, user_id: str, query: str, limit: int
+    ) -> tuple[list[TrackerResponse] | None, Error | None]:
+        """Search the trackers of a user whose names contain the query.
+
+        Args:
+            user_id (str): User ID.
+            query (str): Part of the name, empty for the most recently active
+                trackers.
+            limit (int): Maximum number of trackers.
+
+        Returns:
+            tuple[list[TrackerResponse] | None, Error | None]:\
+                The found trackers, best matches first (None if an error occurred)\
+                and an error code (or None if successful).
+        """
+        trackers = await self.tracker_service.search_by_name(
+            user_id=user_id,
+            query=query.strip()[: self.MAX_QUERY_LENGTH],
+            limit=limit,
+        )
+        if not trackers:
+            return None, self.Error.NO_TRACKERS
         return trackers, None
 
 
+class GetDashboardUseCase:
+    """Summarize all trackers of a user."""
+
+    class Error(StrEnum):
+        NO_TRACKERS = auto()
+
+    def __init__(
+        self,
+        tracker_service: TrackerService,
+        data_service: DataService,
+        cache: DashboardCache | None = None,
+    ) -> None:
+        self.tracker_service = tracker_service
+        self.data_service = data_service
+        self.cache = cache
+
+    async def execute(
+        self, user_id: str, max_trackers: int, days: int = 7
+    ) -> tuple[list[DashboardTrackerData], Error | None]:
+        """Summarize the most recently active trackers of a user.
+
+        The summaries of all trackers are computed by one query. With a
+        cache, they are reused until a record is added to one of the trackers
+        or the cache entry expires.
+
+        Args:
+            user_id (str): User ID.
+            max_trackers (int): Number of trackers to summarize at most.
+            days (int, optional): Length of the averaged period. Defaults to 7.
+
+        Returns:
+            tuple[list[DashboardTrackerData], Error | None]:
+                Summaries of the trackers, most recently active first (empty if an error occurred)
+                and an error code (or None if successful).
+        """
+        trackers = await self.tracker_service.get_summaries_by_user_id(
+            user_id=user_id, limit=max_trackers
+        )
+        if not trackers:
+            return [], self.Error.NO_TRACKERS
+        versions = DashboardCache.versions(trackers)
+        if self.cache is not None:
+            dashboard = self.cache.get(user_id, versions)
+            if dashboard is not None:
+                return dashboard, None
+        dashboard = await self.data_service.get_dashboard(
+            tracker_ids=[i.id for i in trackers], days=days
+        )
+        if self.cache is not None:
+            self.cache.put(user_id, versions, dashboard)
+        return dashboard, None
+
+
 class ValidateTrackingMessageUseCase:
     """Validates the user message for starting tracking."""
 
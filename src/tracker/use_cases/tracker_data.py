@@ -4,13 +4,35 @@ from enum import StrEnum, auto
 from io import BytesIO, TextIOWrapper
 from uuid import UUID
 
+import numpy as np
+from tracker.core import analytics
+from tracker.core.charts import ChartRenderer, chart_renderer
+from tracker.core.record_filter import (
+    FilterOperatorException,
+    FilterSyntaxException,
+    FilterValueException,
+    RecordFilter,
+    UnknownFieldException,
+    parse_filter,
+)
+from tracker.schemas import DataRowResult, FieldAnalytics, Page, PageDirection
 from tracker.schemas.result import StatisticsTrackerData
 from tracker.schemas.tracker import TrackerResponse
-from tracker.services.database import DataService
+from tracker.services.database import (
+    DataService,
+    FilterIndexService,
+    commit_unit_of_work,
+)
+
+from .statistics_cache import StatisticsCache
 
 __all__ = [
+    "GetAnalyticsUseCase",
     "GetCSVUseCase",
+    "GetGraphUseCase",
     "GetStatisticsUseCase",
+    "GetTablePageUseCase",
+    "ParseRecordFilterUseCase",
     "ValidatePeriodValueUseCase",
     "HandleFieldUseCase",
     "SplitFieldsByTypeUseCase",
@@ -26,6 +48,7 @@ class GetCSVUseCase:
         tracker_id: UUID,
         from_date: datetime | None = None,
         exclude_fields: list[str] | None = None,
+        where: RecordFilter | None = None,
     ) -> BytesIO | None:
         """Returns a BytesIO object containing a CSV file.
 
@@ -34,6 +57,7 @@ class GetCSVUseCase:
             from_date (datetime | None): Start date for data selection. If None, no start data filter is applied.
             exclude_fields (list[str] | None): List of data fields to exclude. \
                 If None or empty, all available fields are included.
+            where (RecordFilter | None): Filter of the records. If None, all records are included.
 
         Returns:
             BytesIO: BytesIO object containing a CSV file.
@@ -42,6 +66,7 @@ class GetCSVUseCase:
             tracker_id=tracker_id,
             from_date=from_date,
             exclude_fields=exclude_fields,
+            where=where,
         )
         if len(res) == 0:
             return None
@@ -59,14 +84,187 @@ class GetCSVUseCase:
         return csv_buffer
 
 
+class GetGraphUseCase:
+    """Plot a numeric field of a tracker."""
+
+    class Error(StrEnum):
+        NOT_NUMERIC = auto()
+        NO_RECORDS = auto()
+
+    def __init__(
+        self, data_service: DataService, renderer: ChartRenderer = chart_renderer
+    ) -> None:
+        self.data_service = data_service
+        self.renderer = renderer
+
+    async def execute(
+        self,
+        tracker: TrackerResponse,
+        field_name: str,
+        from_date: datetime | None = None,
+        where: RecordFilter | None = None,
+    ) -> tuple[bytes | None, Error | None]:
+        """Plot a numeric field of a tracker.
+
+        Args:
+            tracker (TrackerResponse): Tracker DTO with structure.
+            field_name (str): Name of the field to plot.
+            from_date (datetime | None, optional): Start date for data selection. Defaults to None.
+            where (RecordFilter | None, optional): Filter of the records. Defaults to None.
+
+        Returns:
+            tuple[bytes | None, Error | None]:
+                PNG image of the chart (None if an error occurred)
+                and an error code (or None if successful).
+        """
+        field = tracker.structure.data.get(field_name)
+        if field is None or field["type"] not in ("int", "float"):
+            return None, self.Error.NOT_NUMERIC
+        series = await self.data_service.get_field_series(
+            tracker_id=tracker.id, field=field_name, from_date=from_date, where=where
+        )
+        if not series.values:
+            return None, self.Error.NO_RECORDS
+        # the series is read, the connection is not held while rendering
+        await commit_unit_of_work()
+        image = await self.renderer.render(
+            np.asarray(series.timestamps, dtype=np.float64),
+            np.asarray(series.values, dtype=np.float64),
+            title=f"{tracker.name}: {field_name}",
+        )
+        return image, None
+
+
+class GetAnalyticsUseCase:
+    """Analyze the numeric fields of a tracker."""
+
+    class Error(StrEnum):
+        NO_NUMERIC_FIELDS = auto()
+        NO_RECORDS = auto()
+
+    def __init__(self, data_service: DataService) -> None:
+        self.data_service = data_service
+
+    async def execute(
+        self,
+        tracker: TrackerResponse,
+        from_date: datetime | None = None,
+        window: int = 7,
+    ) -> tuple[list[FieldAnalytics], Error | None]:
+        """Analyze the numeric fields of a tracker.
+
+        Args:
+            tracker (TrackerResponse): Tracker DTO with structure.
+            from_date (datetime | None, optional): Start date for data selection. Defaults to None.
+            window (int, optional): Number of the last values the moving
+                averages are taken over. Defaults to 7.
+
+        Returns:
+            tuple[list[FieldAnalytics], Error | None]:
+                Analytics of every numeric field with values (empty if an error occurred)
+                and an error code (or None if successful).
+        """
+        fields = [
+            name
+            for name, i in tracker.structure.data.items()
+            if i["type"] in ("int", "float")
+        ]
+        if not fields:
+            return [], self.Error.NO_NUMERIC_FIELDS
+        series = await self.data_service.get_numeric_series(
+            tracker_id=tracker.id, fields=fields, from_date=from_date
+        )
+        res = []
+        for field in fields:
+            x, y = analytics.dropna(series.timestamps, series.values[field])
+            if not len(y):
+                continue
+            res.append(self._analyze(field, x, y, window))
+        if not res:
+            return [], self.Error.NO_RECORDS
+        return res, None
+
+    @staticmethod
+    def _analyze(
+        field: str, x: np.ndarray, y: np.ndarray, window: int
+    ) -> FieldAnalytics:
+        _, daily = analytics.resample(x, y, analytics.DAY)
+        day_change = analytics.pct_change(daily)[-1] if len(daily) > 1 else np.nan
+        current_streak, longest_streak = analytics.day_streaks(x)
+        return FieldAnalytics(
+            field_name=field,
+            count=len(y),
+            last=y[-1],
+            window=window,
+            moving_average=analytics.moving_average(y[-window:], window)[-1],
+            ewma=analytics.ewma(y, 2 / (window + 1))[-1],
+            zscore=analytics.zscore(y)[-1],
+            day_change=None if np.isnan(day_change) else day_change,
+            current_streak=current_streak,
+            longest_streak=longest_streak,
+        )
+
+
+class GetTablePageUseCase:
+    """Get a page of tracker records for the table view."""
+
+    class Error(StrEnum):
+        NO_RECORDS = auto()
+
+    def __init__(self, data_service: DataService) -> None:
+        self.data_service = data_service
+
+    async def execute(
+        self,
+        tracker_id: UUID,
+        page_size: int,
+        from_date: datetime | None = None,
+        direction: PageDirection = "first",
+        key: tuple[datetime, UUID] | None = None,
+    ) -> tuple[Page[DataRowResult] | None, Error | None]:
+        """Get a page of tracker records for the table view.
+
+        Pages are ordered newest first.
+
+        Args:
+            tracker_id (UUID): Tracker ID.
+            page_size (int): Number of records on a page.
+            from_date (datetime | None, optional): Start date for data selection. Defaults to None.
+            direction (PageDirection, optional): The page to get
+                relative to the current one. Defaults to "first".
+            key (tuple[datetime, UUID] | None, optional): Key of the last record of
+                the current page for "older", of the first one for "newer".
+
+        Returns:
+            tuple[Page[DataRowResult] | None, Error | None]:
+                The page (None if an error occurred)
+                and an error code (or None if successful).
+        """
+        older_than = key if direction == "older" else None
+        newer_than = key if direction == "newer" else None
+        rows = await self.data_service.get_data_page(
+            tracker_id=tracker_id,
+            limit=page_size + 1,
+            from_date=from_date,
+            older_than=older_than,
+            newer_than=newer_than,
+        )
+        if not rows:
+            return None, self.Error.NO_RECORDS
+        return Page.from_rows(rows, page_size, direction), None
+
+
 class GetStatisticsUseCase:
     """Get statistics for a tracker with selected fields."""
 
     class Error(StrEnum):
         NO_FIELDS = auto()
 
-    def __init__(self, data_service: DataService) -> None:
+    def __init__(
+        self, data_service: DataService, cache: StatisticsCache | None = None
+    ) -> None:
         self.data_service = data_service
+        self.cache = cache
 
     async def execute(
         self,
@@ -74,14 +272,22 @@ class GetStatisticsUseCase:
         numeric_fields: list[str],
         categorical_fields: list[str],
         from_date: datetime | None = None,
+        where: RecordFilter | None = None,
     ) -> tuple[list[StatisticsTrackerData], Error | None]:
         """Get statistics for a tracker with selected fields.
 
+        All-time statistics of numeric fields are read from the running
+        statistics, only bounded periods scan records. Categorical fields are
+        summed from the daily value counts. Filtered records are always
+        scanned. With a cache, `from_date` is rounded down to its granularity
+        and results are reused until a record is added to the tracker.
+
         Args:
             tracker_id (UUID): Tracker ID.
             numeric_fields (list[str]): List of numeric fields (int or float).
             categorical_fields (list[str]): List of categorical fields (string or enum).
             from_date (datetime | None, optional): Start date for statistics filtering. Defaults to None.
+            where (RecordFilter | None, optional): Filter of the records. Defaults to None.
 
         Returns:
             tuple[list[StatisticsTrackerData], Error | None]:
@@ -90,14 +296,64 @@ class GetStatisticsUseCase:
         """
         if not numeric_fields and not categorical_fields:
             return [], self.Error.NO_FIELDS
-        stats = await self.data_service.get_statistics(
-            tracker_id=tracker_id,
-            numeric_fields=numeric_fields,
-            categorical_fields=categorical_fields,
-            from_date=from_date,
+        if self.cache is None:
+            return (
+                await self._get_statistics(
+                    tracker_id, numeric_fields, categorical_fields, from_date, where
+                ),
+                None,
+            )
+
+        from_date = self.cache.round_date(from_date)
+        version = await self.data_service.get_data_version(tracker_id)
+        if version is None:
+            return [], None
+        key = self.cache.key(
+            tracker_id, version, numeric_fields, categorical_fields, from_date, where
         )
+        stats = self.cache.get(key)
+        if stats is None:
+            stats = await self._get_statistics(
+                tracker_id, numeric_fields, categorical_fields, from_date, where
+            )
+            self.cache.put(key, stats)
         return stats, None
 
+    async def _get_statistics(
+        self,
+        tracker_id: UUID,
+        numeric_fields: list[str],
+        categorical_fields: list[str],
+        from_date: datetime | None,
+        where: RecordFilter | None,
+    ) -> list[StatisticsTrackerData]:
+        if where is not None:
+            # the running statistics and the value counts cover all records
+            return await self.data_service.get_statistics(
+                tracker_id=tracker_id,
+                numeric_fields=numeric_fields,
+                categorical_fields=categorical_fields,
+                from_date=from_date,
+                where=where,
+            )
+        stats = []
+        if numeric_fields and from_date is None:
+            stats = await self.data_service.get_field_stats(
+                tracker_id=tracker_id, fields=numeric_fields
+            )
+        elif numeric_fields:
+            stats = await self.data_service.get_statistics(
+                tracker_id=tracker_id,
+                numeric_fields=numeric_fields,
+                categorical_fields=None,
+                from_date=from_date,
+            )
+        if categorical_fields:
+            stats += await self.data_service.get_value_stats(
+                tracker_id=tracker_id, fields=categorical_fields, from_date=from_date
+            )
+        return stats
+
 
 class ValidatePeriodValueUseCase:
     """Validates user input and extracts int value."""
@@ -128,6 +384,52 @@ class ValidatePeriodValueUseCase:
         return period_value, None
 
 
+class ParseRecordFilterUseCase:
+    """Parses a filter of the records of a tracker entered by the user."""
+
+    class Error(StrEnum):
+        NO_TEXT = auto()
+        WRONG_SYNTAX = auto()
+        UNKNOWN_FIELD = auto()
+        WRONG_VALUE = auto()
+        WRONG_OPERATOR = auto()
+
+    def __init__(self, filter_index_service: FilterIndexService) -> None:
+        self.filter_index_service = filter_index_service
+
+    async def execute(
+        self, tracker: TrackerResponse, text: str | None
+    ) -> tuple[RecordFilter | None, Error | None]:
+        """Parses a filter of the records of a tracker entered by the user.
+
+        Parsed filters are counted by field, the fields filtered often get
+        indexes.
+
+        Args:
+            tracker (TrackerResponse): Tracker DTO with structure.
+            text (str | None): The entered text or None.
+
+        Returns:
+            tuple[RecordFilter | None, Error | None]:
+                The filter (None if an error occurred)
+                and an error code (or None if successful).
+        """
+        if not text or not (text := text.strip()):
+            return None, self.Error.NO_TEXT
+        try:
+            where = parse_filter(text, tracker.structure.data)
+        except FilterSyntaxException:
+            return None, self.Error.WRONG_SYNTAX
+        except UnknownFieldException:
+            return None, self.Error.UNKNOWN_FIELD
+        except FilterValueException:
+            return None, self.Error.WRONG_VALUE
+        except FilterOperatorException:
+            return None, self.Error.WRONG_OPERATOR
+        await self.filter_index_service.note_usage(tracker.id, where)
+        return where, None
+
+
 class HandleFieldUseCase:
     """Adds or removes a field from the selected fields list and generates a response text."""
 
@@ -264,7 +264,7 @@ async def test_valid_process_next_action_add_field(
 
 
 async def test_valid_process_next_action_finish(
-    state: FSMContext, mocker: MockerFixture, user_service, tracker_service, t_
+    state: FSMContext, mocker: MockerFixture, tracker_service, t_
 ):
     message = create_message("tracker_name")
     callback = create_callback(message)
@@ -304,7 +304,6 @@ async def test_valid_process_next_action_finish(
         callback,
         state,
         tracker_service=tracker_service,
-        user_service=user_service,
         t=t_,
     )
     data = await state.get_data()
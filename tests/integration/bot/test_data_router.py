@@ -0,0 +1,58 @@
+from typing import Callable
+from unittest.mock import AsyncMock, patch
+
+from aiogram.fsm.context import FSMContext
+
+from tests.integration.bot.utils import create_message
+from tracker.presentation.routers.data import DataModel, run_data_action
+from tracker.presentation.utils.keyboard import KeyboardBuilder
+from tracker.presentation.utils.text import MESSAGE_LIMIT
+from tracker.schemas import TrackerResponse
+from tracker.schemas.result import FieldAnalytics
+
+
+def analytics(field_name: str) -> FieldAnalytics:
+    return FieldAnalytics(
+        field_name=field_name,
+        count=10,
+        last=1.0,
+        window=7,
+        moving_average=1.0,
+        ewma=1.0,
+        zscore=0.0,
+        day_change=5.0,
+        current_streak=3,
+        longest_streak=5,
+    )
+
+
+async def test_valid_analytics_escaped_and_split(
+    tracker_service,
+    sample_tracker_response: TrackerResponse,
+    state: FSMContext,
+    t_: Callable[..., str],
+    kbr_builder: KeyboardBuilder,
+):
+    message = create_message(None)
+    tracker_service.get_by_id = AsyncMock(return_value=sample_tracker_response)
+    await DataModel(
+        tracker=sample_tracker_response,
+        action="analytics",
+        period_type="all",
+        period_value=0,
+    ).save(state)
+    res = [analytics("mood<3 & more")] + [analytics(f"f{i}" * 10) for i in range(40)]
+
+    with patch(
+        "tracker.presentation.routers.data.GetAnalyticsUseCase.execute",
+        AsyncMock(return_value=(res, None)),
+    ):
+        await run_data_action(
+            message, state, AsyncMock(), tracker_service, t_, kbr_builder, 10
+        )
+
+    texts = [i.args[0] for i in message.answer.await_args_list]
+    assert len(texts) > 1
+    assert all(len(i) <= MESSAGE_LIMIT for i in texts)
+    assert texts[0].startswith("mood&lt;3 &amp; more: last")
+    assert sum(i.count("\n") + 1 for i in texts) == len(res)
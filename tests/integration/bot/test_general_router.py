@@ -0,0 +1,73 @@
+from typing import Callable
+from unittest.mock import AsyncMock, MagicMock
+
+from tests.integration.bot.utils import create_message
+from tracker.presentation.deletion import DeletionReaper
+from tracker.presentation.digests import DigestScheduler
+from tracker.presentation.reminders import ReminderWorker
+from tracker.presentation.routers.general import (
+    delete_account,
+    schedule_digest,
+    set_reminder,
+)
+from tracker.schemas import TrackerResponse
+from tracker.services.database import (
+    DeletionService,
+    ScheduleService,
+    UnitOfWork,
+)
+
+
+async def test_valid_delete_account_notifies_after_commit(t_: Callable[..., str], lang):
+    message = create_message("/delete_account confirm")
+    deletion_service = AsyncMock(spec=DeletionService)
+    deletion_service.delete_user = AsyncMock(return_value=True)
+    deletion_reaper = MagicMock(spec=DeletionReaper)
+
+    async with UnitOfWork(MagicMock()):
+        await delete_account(message, deletion_service, deletion_reaper, t_, lang)
+        # the reaper would not see the uncommitted deletion yet
+        deletion_reaper.notify.assert_not_called()
+
+    deletion_reaper.notify.assert_called_once()
+    deletion_service.delete_user.assert_awaited_once_with("0")
+
+
+async def test_valid_set_reminder_notifies_after_commit(
+    tracker_service,
+    sample_tracker_response: TrackerResponse,
+    t_: Callable[..., str],
+    lang,
+):
+    message = create_message(f"/remind {sample_tracker_response.name} 09:00")
+    tracker_service.get_by_name = AsyncMock(return_value=sample_tracker_response)
+    schedule_service = AsyncMock(spec=ScheduleService)
+    schedule_service.set_reminder.side_effect = lambda reminder: reminder
+    reminder_worker = MagicMock(spec=ReminderWorker)
+
+    async with UnitOfWork(MagicMock()):
+        await set_reminder(
+            message, tracker_service, schedule_service, reminder_worker, t_, lang
+        )
+        reminder_worker.notify.assert_not_called()
+
+    reminder = schedule_service.set_reminder.call_args.args[0]
+    reminder_worker.notify.assert_called_once_with(reminder)
+
+
+async def test_valid_schedule_digest_notifies_after_commit(
+    user_service, t_: Callable[..., str], lang
+):
+    message = create_message("/digest daily 09:00")
+    schedule_service = AsyncMock(spec=ScheduleService)
+    schedule_service.set_digest.side_effect = lambda schedule: schedule
+    digest_scheduler = MagicMock(spec=DigestScheduler)
+
+    async with UnitOfWork(MagicMock()):
+        await schedule_digest(
+            message, user_service, schedule_service, digest_scheduler, t_, lang
+        )
+        digest_scheduler.notify.assert_not_called()
+
+    schedule = schedule_service.set_digest.call_args.args[0]
+    digest_scheduler.notify.assert_called_once_with(schedule)
@@ -1,23 +1,29 @@
+from datetime import datetime, timezone
 from typing import Callable
 from unittest.mock import AsyncMock
 from uuid import uuid4
 
 import pytest
+from aiogram import types
 from aiogram.fsm.context import FSMContext
 
 from tests.integration.bot.utils import create_callback, create_message
-from tracker.presentation.callbacks import FieldCallback, TrackerCallback
+from tracker.presentation.callback_codec import FieldRef
+from tracker.presentation.callbacks import TrackerCallback
+from tracker.presentation.constants.text import MsgKey
 from tracker.presentation.routers.tracker_control import (
     DataModel,
     describe_tracker,
+    handle_cancel,
     handle_field,
     handle_field_value,
+    search_trackers,
     show_trackers,
     start_tracking,
 )
 from tracker.presentation.states import AddingData
 from tracker.presentation.utils.keyboard import KeyboardBuilder
-from tracker.schemas import TrackerResponse
+from tracker.schemas import TrackerResponse, TrackerSummary
 from tracker.schemas.tracker import (
     TrackerDataCreate,
 )
@@ -31,16 +37,24 @@ async def test_valid_show_trackers(
     kbr_builder: KeyboardBuilder,
 ):
     message = create_message("/my_trackers")
-    tracker1 = sample_tracker_response.model_copy()
-    tracker1.id = uuid4()
-    tracker1.name = "new_name"
-    tracker_service.get_by_user_id = AsyncMock(
-        return_value=[sample_tracker_response, tracker1]
+    now = datetime.now(timezone.utc)
+    tracker_service.get_summaries_by_user_id = AsyncMock(
+        return_value=[
+            TrackerSummary(
+                id=sample_tracker_response.id,
+                name=sample_tracker_response.name,
+                last_activity_at=now,
+            ),
+            TrackerSummary(id=uuid4(), name="new_name", last_activity_at=now),
+        ]
     )
 
-    await show_trackers(message, state, tracker_service, t_, kbr_builder)
+    await show_trackers(message, state, tracker_service, t_, kbr_builder, 1)
     assert "Трекеры:" in message.answer.call_args.kwargs["text"]
     assert "reply_markup" in message.answer.call_args.kwargs
+    cursor = (await DataModel.load(state)).trackers_page
+    assert cursor is not None and cursor.page == 1
+    assert cursor.first == (now, sample_tracker_response.id)
 
 
 async def test_empty_show_trackers(
@@ -50,9 +64,9 @@ async def test_empty_show_trackers(
     kbr_builder: KeyboardBuilder,
 ):
     message = create_message("/my_trackers")
-    tracker_service.get_by_user_id = AsyncMock(return_value=[])
+    tracker_service.get_summaries_by_user_id = AsyncMock(return_value=[])
 
-    await show_trackers(message, state, tracker_service, t_, kbr_builder)
+    await show_trackers(message, state, tracker_service, t_, kbr_builder, 8)
 
     assert "У вас пока нет трекеров" in message.answer.call_args.kwargs["text"]
     assert "reply_markup" not in message.answer.call_args.kwargs
@@ -118,7 +132,7 @@ async def test_valid_start_tracking(
     await start_tracking(message, state, tracker_service, t_, kbr_builder)
 
     assert await state.get_state() == AddingData.AWAIT_NEXT_ACTION
-    tracker_service.get_by_name.assert_awaited_with(sample_tracker_response.name)
+    tracker_service.get_by_name.assert_awaited_with("0", sample_tracker_response.name)
     assert "reply_markup" in message.answer.call_args.kwargs
 
 
@@ -134,7 +148,7 @@ async def test_not_exists_start_tracking(
     await start_tracking(message, state, tracker_service, t_, kbr_builder)
 
     assert await state.get_state() is None
-    tracker_service.get_by_name.assert_awaited_with("not_exists")
+    tracker_service.get_by_name.assert_awaited_with("0", "not_exists")
     assert "Трекер 'not_exists' не найден" in message.answer.call_args.kwargs["text"]
 
 
@@ -161,7 +175,7 @@ async def test_valid_handle_field(
 
     message = create_message("")
     callback = create_callback(message)
-    callback_data = FieldCallback(name="int_name", type="int")
+    callback_data = FieldRef(name="int_name", type="int")
 
     await handle_field(callback, callback_data, state, t_, kbr_builder)
 
@@ -253,3 +267,58 @@ async def test_valid_finish_handle_field_value(
             data={"another_name": "1", "field_name": message.text},
         )
     )
+
+
+async def test_valid_handle_cancel(state: FSMContext, t_: Callable[..., str]):
+    message = create_message(None)
+    message.message_id = 12345
+    callback = create_callback(message)
+    await state.set_state(AddingData.AWAIT_NEXT_ACTION)
+    await state.update_data(main_message_id=12345)
+
+    await handle_cancel(callback, state, t_)
+
+    # edited through the coalescer, which remembers what the message shows
+    kwargs = message.bot.edit_message_text.await_args.kwargs
+    assert kwargs["message_id"] == 12345
+    assert kwargs["text"] == t_(MsgKey.TR_ADDING_DATA_CANCELED)
+    assert await state.get_state() is None
+    callback.answer.assert_awaited_once()
+
+
+async def test_valid_search_trackers(
+    tracker_service, sample_tracker_response: TrackerResponse
+):
+    inline_query = AsyncMock(spec=types.InlineQuery)
+    inline_query.from_user = types.User(id=7, is_bot=False, first_name="user")
+    inline_query.answer = AsyncMock()
+    inline_query.query = "na"
+    tracker_service.search_by_name = AsyncMock(return_value=[sample_tracker_response])
+
+    await search_trackers(
+        inline_query, tracker_service, inline_results_limit=20, inline_cache_time=5
+    )
+
+    tracker_service.search_by_name.assert_awaited_once_with(
+        user_id="7", query="na", limit=20
+    )
+    (results,) = inline_query.answer.call_args.args
+    assert [i.title for i in results] == [sample_tracker_response.name]
+    assert results[0].input_message_content.message_text == (
+        f"/track {sample_tracker_response.name}"
+    )
+    assert inline_query.answer.call_args.kwargs["is_personal"]
+
+
+async def test_empty_search_trackers(tracker_service):
+    inline_query = AsyncMock(spec=types.InlineQuery)
+    inline_query.from_user = types.User(id=7, is_bot=False, first_name="user")
+    inline_query.answer = AsyncMock()
+    inline_query.query = ""
+    tracker_service.search_by_name = AsyncMock(return_value=[])
+
+    await search_trackers(
+        inline_query, tracker_service, inline_results_limit=20, inline_cache_time=5
+    )
+
+    assert inline_query.answer.call_args.args == ([],)
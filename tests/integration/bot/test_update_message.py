@@ -0,0 +1,66 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.fsm.context import FSMContext
+
+from tests.integration.bot.utils import create_message
+from tracker.presentation.utils.update_message import (
+    RenderCoalescer,
+    RenderResult,
+    update_main_message,
+)
+
+
+async def test_valid_skip_identical_render():
+    bot = AsyncMock()
+    coalescer = RenderCoalescer(window=0)
+
+    first = await coalescer.edit(bot, chat_id=1, message_id=1, text="text")
+    second = await coalescer.edit(bot, chat_id=1, message_id=1, text="text")
+
+    assert first == RenderResult.EDITED
+    assert second == RenderResult.NOT_MODIFIED
+    bot.edit_message_text.assert_awaited_once()
+
+
+async def test_valid_coalesce_burst():
+    bot = AsyncMock()
+    coalescer = RenderCoalescer(window=0.05)
+
+    res = await asyncio.gather(
+        *(coalescer.edit(bot, chat_id=1, message_id=1, text=str(i)) for i in range(5))
+    )
+
+    assert res[0] == RenderResult.EDITED
+    assert res[1:4] == [RenderResult.SUPERSEDED] * 3
+    assert res[4] == RenderResult.EDITED
+    assert [i.kwargs["text"] for i in bot.edit_message_text.await_args_list] == [
+        "0",
+        "4",
+    ]
+
+
+async def test_not_modified_is_not_resent(state: FSMContext):
+    message = create_message("text")
+    message.bot.edit_message_text.side_effect = TelegramBadRequest(
+        method=MagicMock(), message="Bad Request: message is not modified"
+    )
+    await state.update_data(main_message_id=100)
+
+    await update_main_message(state, message, text="not modified")
+
+    message.answer.assert_not_awaited()
+    message.delete.assert_awaited_once()
+
+
+async def test_edit_error_sends_new_message(state: FSMContext):
+    message = create_message("text")
+    message.bot.edit_message_text.side_effect = TelegramBadRequest(
+        method=MagicMock(), message="Bad Request: message to edit not found"
+    )
+    await state.update_data(main_message_id=101)
+
+    await update_main_message(state, message, text="not found")
+
+    message.answer.assert_awaited_once()
@@ -9,7 +9,15 @@ from tracker.schemas import (
     UserResponse,
 )
 from tracker.schemas.tracker import TrackerCreate
-from tracker.services.database import DataService, TrackerService, UserService
+from tracker.services.database import (
+    DataService,
+    DeletionService,
+    FilterIndexService,
+    RetentionService,
+    ScheduleService,
+    TrackerService,
+    UserService,
+)
 
 
 @pytest.fixture
@@ -57,6 +65,26 @@ def data_service(async_session_factory):
     return DataService(async_session_factory)
 
 
+@pytest.fixture
+def schedule_service(async_session_factory):
+    return ScheduleService(async_session_factory)
+
+
+@pytest.fixture
+def retention_service(async_session_factory):
+    return RetentionService(async_session_factory)
+
+
+@pytest.fixture
+def deletion_service(async_session_factory):
+    return DeletionService(async_session_factory)
+
+
+@pytest.fixture
+def filter_index_service(async_session_factory):
+    return FilterIndexService(async_session_factory)
+
+
 @pytest.fixture
 async def sample_user_created(
     sample_user_create: UserCreate, user_service: UserService
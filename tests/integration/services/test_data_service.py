@@ -1,14 +1,20 @@
+import asyncio
 import string
 from datetime import datetime, timedelta, timezone
+from uuid import uuid4
 
-from sqlalchemy import update
+import numpy as np
+import pytest
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.ext.asyncio.session import async_sessionmaker
-from tracker.models import TrackerDataOrm
+from tracker.models import TrackerDataOrm, TrackerFieldStatsOrm, TrackerValueCountOrm
 from tracker.schemas import (
+    TrackerCreate,
     TrackerDataCreate,
     TrackerResponse,
 )
 from tracker.services.database import DataService, TrackerService
+from tracker.services.database.value_counts import VALUE_SKETCH_SIZE
 
 
 def generate_tracker_data(structure: dict, num: int):
@@ -60,6 +66,67 @@ async def test_valid_get_field(
     assert len(res) == len(data)
 
 
+async def test_valid_get_field_series(
+    sample_tracker_created: TrackerResponse,
+    tracker_service: TrackerService,
+    data_service: DataService,
+):
+    data = [i for i in generate_tracker_data(sample_tracker_created.structure.data, 10)]
+    inserted = await insert_data(data, tracker_service, sample_tracker_created)
+
+    res = await data_service.get_field_series(
+        tracker_id=sample_tracker_created.id, field="float_name"
+    )
+    assert res.values == [float(i["float_name"]) for i in data]
+    assert res.timestamps == sorted(res.timestamps)
+    assert res.timestamps[0] == inserted[0].created_at.timestamp()
+
+    res = await data_service.get_field_series(
+        tracker_id=sample_tracker_created.id,
+        field="float_name",
+        from_date=datetime.now(timezone.utc) + timedelta(days=1),
+    )
+    assert res.values == []
+
+
+async def test_valid_get_data_page(
+    sample_tracker_created: TrackerResponse,
+    tracker_service: TrackerService,
+    data_service: DataService,
+    async_session_factory: async_sessionmaker,
+):
+    data = [i for i in generate_tracker_data(sample_tracker_created.structure.data, 7)]
+    inserted = await insert_data(data, tracker_service, sample_tracker_created)
+    # two records share a timestamp, the id breaks the tie
+    async with async_session_factory() as session:
+        stmt = (
+            update(TrackerDataOrm)
+            .filter_by(id=inserted[4].id)
+            .values(created_at=inserted[3].created_at)
+        )
+        await session.execute(stmt)
+        await session.commit()
+    tracker_id = sample_tracker_created.id
+
+    newest = await data_service.get_data_page(tracker_id=tracker_id, limit=3)
+    older = await data_service.get_data_page(
+        tracker_id=tracker_id, limit=3, older_than=newest[-1].key
+    )
+    oldest = await data_service.get_data_page(
+        tracker_id=tracker_id, limit=3, older_than=older[-1].key
+    )
+    back = await data_service.get_data_page(
+        tracker_id=tracker_id, limit=3, newer_than=oldest[0].key
+    )
+
+    pages = [newest, older, oldest]
+    assert [len(i) for i in pages] == [3, 3, 1]
+    keys = [row.key for page in pages for row in page]
+    assert keys == sorted(keys, reverse=True)
+    assert {row.id for page in pages for row in page} == {i.id for i in inserted}
+    assert [row.id for row in back] == [row.id for row in older]
+
+
 async def test_valid_get_sum_fields_days(
     sample_tracker_created: TrackerResponse,
     tracker_service: TrackerService,
@@ -168,3 +235,330 @@ async def test_valid_get_statistics_all_fields(
             assert field.sum
         if field.type == "categorical":
             assert field.mode
+
+
+async def test_valid_field_stats(
+    sample_tracker_created: TrackerResponse,
+    tracker_service: TrackerService,
+    data_service: DataService,
+    async_session_factory: async_sessionmaker,
+):
+    data = [i for i in generate_tracker_data(sample_tracker_created.structure.data, 20)]
+    # values typed in by users are stored as text
+    data[0]["int_name"] = str(data[0]["int_name"])
+    await insert_data(data, tracker_service, sample_tracker_created)
+    fields = ["int_name", "float_name"]
+
+    scanned = await data_service.get_statistics(
+        sample_tracker_created.id, numeric_fields=fields, categorical_fields=None
+    )
+    running = await data_service.get_field_stats(sample_tracker_created.id, fields)
+
+    assert [i.field_name for i in running] == fields
+    for expected, actual in zip(scanned, running):
+        assert actual.count == expected.count == 20
+        for attr in ("min", "max", "avg", "sum", "std"):
+            assert getattr(actual, attr) == pytest.approx(getattr(expected, attr))
+
+    async with async_session_factory() as session:
+        await session.execute(
+            update(TrackerFieldStatsOrm).values(count=1, mean=0, m2=0, sum=0)
+        )
+        await session.commit()
+    assert await data_service.rebuild_field_stats(sample_tracker_created.id) == 2
+    rebuilt = await data_service.get_field_stats(sample_tracker_created.id, fields)
+    for expected, actual in zip(running, rebuilt):
+        assert actual.count == expected.count
+        for attr in ("min", "max", "avg", "sum", "std"):
+            assert getattr(actual, attr) == pytest.approx(getattr(expected, attr))
+
+
+async def test_valid_value_stats(
+    sample_tracker_created: TrackerResponse,
+    tracker_service: TrackerService,
+    data_service: DataService,
+    async_session_factory: async_sessionmaker,
+):
+    data = [i for i in generate_tracker_data(sample_tracker_created.structure.data, 50)]
+    enums = ["val1"] * 25 + ["val2"] * 15 + ["val3"] * 10
+    # more distinct strings than a day keeps
+    strings = ["a"] * 10 + [f"s{i}" for i in range(40)]
+    for record, enum, string_value in zip(data, enums, strings):
+        record["enum_name"], record["string_name"] = enum, string_value
+    await insert_data(data, tracker_service, sample_tracker_created)
+    fields = ["enum_name", "string_name"]
+    string_key = sample_tracker_created.structure.data["string_name"]["id"]
+
+    async def stored_strings() -> int:
+        async with async_session_factory() as session:
+            return await session.scalar(
+                select(func.count()).where(TrackerValueCountOrm.field == string_key)
+            )
+
+    enum, string_stats = await data_service.get_value_stats(
+        sample_tracker_created.id, fields, limit=2
+    )
+    assert enum.mode == "val1" and enum.count == 50
+    assert [(i.value, i.count, i.error) for i in enum.top] == [
+        ("val1", 25, 0),
+        ("val2", 15, 0),
+    ]
+    assert string_stats.mode == "a" and string_stats.count == 50
+    top = string_stats.top[0]
+    assert top.count - top.error <= 10 <= top.count
+    assert await stored_strings() == VALUE_SKETCH_SIZE
+
+    # the records of the first day of a period are counted exactly
+    _, string_stats = await data_service.get_value_stats(
+        sample_tracker_created.id,
+        fields,
+        from_date=datetime.now(timezone.utc) - timedelta(minutes=1),
+    )
+    assert string_stats.count == 50
+    assert (string_stats.top[0].value, string_stats.top[0].count) == ("a", 10)
+    assert not await data_service.get_value_stats(
+        sample_tracker_created.id,
+        fields,
+        from_date=datetime.now(timezone.utc) + timedelta(days=2),
+    )
+
+    async with async_session_factory() as session:
+        await session.execute(delete(TrackerValueCountOrm))
+        await session.commit()
+    rebuilt = await data_service.rebuild_value_counts(sample_tracker_created.id)
+    assert rebuilt == 3 + VALUE_SKETCH_SIZE
+    enum, string_stats = await data_service.get_value_stats(
+        sample_tracker_created.id, fields
+    )
+    assert (enum.mode, enum.count) == ("val1", 50)
+    assert (string_stats.top[0].value, string_stats.top[0].count) == ("a", 10)
+    assert string_stats.count == 50
+
+
+async def test_valid_concurrent_value_counts(
+    sample_tracker_created: TrackerResponse,
+    tracker_service: TrackerService,
+    data_service: DataService,
+    async_session_factory: async_sessionmaker,
+):
+    def record(string_value: str) -> TrackerDataCreate:
+        return TrackerDataCreate(
+            tracker_id=sample_tracker_created.id,
+            data={
+                "int_name": 1,
+                "float_name": 1.0,
+                "enum_name": "val1",
+                "string_name": string_value,
+            },
+        )
+
+    # both writers bring new values of the day
+    await asyncio.gather(*(tracker_service.add_data(record("a")) for _ in range(2)))
+    enum, string_stats = await data_service.get_value_stats(
+        sample_tracker_created.id, ["enum_name", "string_name"]
+    )
+    assert (enum.mode, enum.count) == ("val1", 2)
+    assert (string_stats.mode, string_stats.count) == ("a", 2)
+
+    # concurrent evictions keep the day within the sketch
+    await insert_data(
+        [record(f"s{i}").data for i in range(VALUE_SKETCH_SIZE - 1)],
+        tracker_service,
+        sample_tracker_created,
+    )
+    await asyncio.gather(
+        *(tracker_service.add_data(record(f"new{i}")) for i in range(4))
+    )
+    string_key = sample_tracker_created.structure.data["string_name"]["id"]
+    async with async_session_factory() as session:
+        stored = await session.scalar(
+            select(func.count()).where(TrackerValueCountOrm.field == string_key)
+        )
+        total = await session.scalar(
+            select(func.sum(TrackerValueCountOrm.count)).where(
+                TrackerValueCountOrm.field == string_key
+            )
+        )
+    assert stored == VALUE_SKETCH_SIZE
+    assert total == 2 + VALUE_SKETCH_SIZE - 1 + 4
+
+
+async def test_valid_data_version(
+    sample_tracker_created: TrackerResponse,
+    tracker_service: TrackerService,
+    data_service: DataService,
+):
+    tracker_id = sample_tracker_created.id
+    assert await data_service.get_data_version(tracker_id) == 0
+
+    data = [i for i in generate_tracker_data(sample_tracker_created.structure.data, 2)]
+    await insert_data(data, tracker_service, sample_tracker_created)
+    assert await data_service.get_data_version(tracker_id) == 2
+
+    await data_service.rebuild_field_stats(tracker_id)
+    await data_service.rebuild_value_counts(tracker_id)
+    assert await data_service.get_data_version(tracker_id) == 4
+    assert await data_service.get_data_version(uuid4()) is None
+
+
+async def test_valid_get_numeric_series(
+    sample_tracker_created: TrackerResponse,
+    tracker_service: TrackerService,
+    data_service: DataService,
+):
+    data = [i for i in generate_tracker_data(sample_tracker_created.structure.data, 5)]
+    del data[1]["float_name"]
+    data[2]["int_name"] = str(data[2]["int_name"])
+    inserted = await insert_data(data, tracker_service, sample_tracker_created)
+
+    res = await data_service.get_numeric_series(
+        sample_tracker_created.id, ["int_name", "float_name"]
+    )
+
+    assert res.timestamps.dtype == np.float64
+    assert res.timestamps.tolist() == [i.created_at.timestamp() for i in inserted]
+    assert res.values["int_name"].tolist() == [float(i["int_name"]) for i in data]
+    assert np.isnan(res.values["float_name"][1])
+    assert np.count_nonzero(np.isnan(res.values["float_name"])) == 1
+
+    empty = await data_service.get_numeric_series(
+        sample_tracker_created.id,
+        ["int_name"],
+        from_date=datetime.now(timezone.utc) + timedelta(days=1),
+    )
+    assert len(empty.timestamps) == len(empty.values["int_name"]) == 0
+
+
+async def test_valid_stream_window_aggregates(
+    sample_tracker_created: TrackerResponse,
+    tracker_service: TrackerService,
+    data_service: DataService,
+    async_session_factory: async_sessionmaker,
+):
+    data = [{"int_name": i} for i in range(1, 11)]
+    inserted = await insert_data(data, tracker_service, sample_tracker_created)
+    # one record a day, the newest today
+    now = datetime.now(timezone.utc)
+    async with async_session_factory() as session:
+        for days, record in enumerate(reversed(inserted)):
+            await session.execute(
+                update(TrackerDataOrm)
+                .where(TrackerDataOrm.id == record.id)
+                .values(created_at=now - timedelta(days=days))
+            )
+        await session.commit()
+
+    async def collect(**kwargs):
+        return [
+            i
+            async for i in data_service.stream_window_aggregates(
+                sample_tracker_created.id, "int_name", **kwargs
+            )
+        ]
+
+    res = await collect(
+        rolling=["avg", "sum"], window=timedelta(days=2), cumulative=["sum"]
+    )
+    assert [i.value for i in res] == list(range(1, 11))
+    # the window covers the record and those of the 2 days before
+    assert [i.rolling["sum"] for i in res] == [1, 3] + [3 * i for i in range(2, 10)]
+    assert res[-1].rolling["avg"] == 9
+    assert [i.cumulative["sum"] for i in res] == [i * (i + 1) / 2 for i in range(1, 11)]
+
+    res = await collect(
+        rolling=["max"],
+        window=timedelta(days=2),
+        cumulative=["sum", "min"],
+        from_date=now - timedelta(days=3, hours=12),
+    )
+    assert [i.value for i in res] == [7, 8, 9, 10]
+    # the window reaches before the period, the cumulative aggregates do not
+    assert res[0].rolling["max"] == 7
+    assert [i.cumulative["sum"] for i in res] == [7, 15, 24, 34]
+    assert res[0].cumulative["min"] == 7
+
+    res = await collect(rolling=["avg"], window=timedelta(days=1), max_points=4)
+    assert [i.value for i in res] == [1, 4, 7, 10]
+
+
+async def test_valid_stream_window_aggregates_tied_dates(
+    sample_tracker_created: TrackerResponse,
+    tracker_service: TrackerService,
+    data_service: DataService,
+    async_session_factory: async_sessionmaker,
+):
+    data = [{"int_name": i} for i in (2, 1, 5, 3, 4)]
+    inserted = await insert_data(data, tracker_service, sample_tracker_created)
+    # e.g. records added in one transaction share now()
+    now = datetime.now(timezone.utc)
+    async with async_session_factory() as session:
+        await session.execute(
+            update(TrackerDataOrm)
+            .where(TrackerDataOrm.id.in_([i.id for i in inserted]))
+            .values(created_at=now - timedelta(days=1))
+        )
+        await session.commit()
+    await tracker_service.add_data(
+        TrackerDataCreate(tracker_id=sample_tracker_created.id, data={"int_name": 6})
+    )
+
+    res = [
+        i
+        async for i in data_service.stream_window_aggregates(
+            sample_tracker_created.id,
+            "int_name",
+            rolling=["sum", "avg", "min", "max"],
+            window=timedelta(days=2),
+            cumulative=["sum", "min"],
+        )
+    ]
+
+    # the tied records are one point, each covers all of them
+    assert sorted(i.value for i in res[:5]) == [1, 2, 3, 4, 5]
+    for i in res[:5]:
+        assert i.rolling == {"sum": 15, "avg": 3, "min": 1, "max": 5}
+        assert i.cumulative == {"sum": 15, "min": 1}
+    assert res[5].rolling == {"sum": 21, "avg": 3.5, "min": 1, "max": 6}
+    assert res[5].cumulative == {"sum": 21, "min": 1}
+
+
+async def test_valid_get_dashboard(
+    sample_tracker_created: TrackerResponse,
+    sample_tracker_create: TrackerCreate,
+    tracker_service: TrackerService,
+    data_service: DataService,
+    async_session_factory: async_sessionmaker,
+):
+    other = await tracker_service.create(
+        sample_tracker_create.model_copy(update={"name": "other"})
+    )
+    data = [{"int_name": i} for i in (10, 20, 30, 50)]
+    inserted = await insert_data(data, tracker_service, sample_tracker_created)
+    now = datetime.now(timezone.utc)
+    async with async_session_factory() as session:
+        for days, record in zip((9, 8, 2, 1), inserted):
+            await session.execute(
+                update(TrackerDataOrm)
+                .where(TrackerDataOrm.id == record.id)
+                .values(created_at=now - timedelta(days=days))
+            )
+        await session.commit()
+
+    res = await data_service.get_dashboard(
+        [other.id, uuid4(), sample_tracker_created.id], days=7, now=now
+    )
+
+    assert [i.tracker_id for i in res] == [other.id, sample_tracker_created.id]
+    assert res[0].last_record_at is None
+    assert {i.field_name for i in res[0].fields} == {"int_name", "float_name"}
+    assert all(i.count == 0 and i.last is None for i in res[0].fields)
+    fields = {i.field_name: i for i in res[1].fields}
+    assert fields.keys() == {"int_name", "float_name"}
+    assert res[1].last_record_at == now - timedelta(days=1)
+    assert fields["int_name"].count == 4
+    assert fields["int_name"].last == 50
+    assert fields["int_name"].period_avg == 40
+    # the average of the 7 days before is 15
+    assert fields["int_name"].trend == pytest.approx(25 / 15 * 100)
+    assert fields["float_name"].period_avg is None
+    assert fields["float_name"].trend is None
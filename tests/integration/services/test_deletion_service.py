@@ -0,0 +1,175 @@
+from datetime import datetime, time, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio.session import async_sessionmaker
+from tracker.exceptions import NotFoundException
+from tracker.models import (
+    TrackerDataArchiveOrm,
+    TrackerDataOrm,
+    TrackerOrm,
+    TrackerStructureOrm,
+    TrackerValueCountOrm,
+    UserOrm,
+)
+from tracker.schemas import (
+    DigestSchedule,
+    Reminder,
+    RetentionPolicy,
+    TrackerCreate,
+    TrackerResponse,
+)
+from tracker.services.database import (
+    DeletionService,
+    RetentionService,
+    ScheduleService,
+    TrackerService,
+    UserService,
+)
+
+from tests.integration.services.test_data_service import (
+    generate_tracker_data,
+    insert_data,
+)
+
+NOW = datetime.now(timezone.utc)
+
+
+async def count_rows(session_factory: async_sessionmaker, model) -> int:
+    async with session_factory() as session:
+        return await session.scalar(select(func.count()).select_from(model))
+
+
+async def test_valid_delete_tracker(
+    sample_tracker_create: TrackerCreate,
+    sample_tracker_created: TrackerResponse,
+    tracker_service: TrackerService,
+    schedule_service: ScheduleService,
+    retention_service: RetentionService,
+    deletion_service: DeletionService,
+):
+    tracker = sample_tracker_created
+    await schedule_service.set_reminder(
+        Reminder(tracker_id=tracker.id, period_days=1, next_fire_at=NOW)
+    )
+    await retention_service.set_policy(
+        RetentionPolicy(tracker_id=tracker.id, raw_days=30)
+    )
+
+    assert await deletion_service.delete_tracker(tracker.id)
+    assert not await deletion_service.delete_tracker(tracker.id)
+
+    # hidden at once
+    with pytest.raises(NotFoundException):
+        await tracker_service.get_by_name(tracker.user_id, tracker.name)
+    with pytest.raises(NotFoundException):
+        await tracker_service.get_by_id(tracker.id)
+    assert await tracker_service.get_by_user_id(tracker.user_id) == []
+    assert await tracker_service.get_summaries_by_user_id(tracker.user_id, 10) == []
+    assert await tracker_service.get_summaries_by_user_ids([tracker.user_id], 10) == {}
+    assert await schedule_service.get_reminder(tracker.id) is None
+    assert await retention_service.get_policy(tracker.id) is None
+    assert await deletion_service.get_deleted_trackers(limit=10) == [tracker.id]
+
+    # the name is free again
+    created = await tracker_service.create(sample_tracker_create)
+    assert (await tracker_service.get_by_name(tracker.user_id, tracker.name)).id == (
+        created.id
+    )
+
+
+async def test_valid_purge_tracker(
+    sample_tracker_created: TrackerResponse,
+    tracker_service: TrackerService,
+    retention_service: RetentionService,
+    deletion_service: DeletionService,
+    async_session_factory: async_sessionmaker,
+):
+    tracker = sample_tracker_created
+    data = [i for i in generate_tracker_data(tracker.structure.data, 12)]
+    inserted = await insert_data(data, tracker_service, tracker)
+    # half of the records archived over three days
+    day = datetime.combine(NOW.date(), time(), timezone.utc) - timedelta(days=10)
+    async with async_session_factory() as session:
+        for i, record in enumerate(inserted[:6]):
+            await session.execute(
+                update(TrackerDataOrm)
+                .filter_by(id=record.id)
+                .values(created_at=day + timedelta(days=i // 2, hours=i % 2))
+            )
+        await session.commit()
+    await retention_service.archive_records(tracker.id, NOW - timedelta(days=1), 100)
+    assert await count_rows(async_session_factory, TrackerDataArchiveOrm) == 3
+    value_counts = await count_rows(async_session_factory, TrackerValueCountOrm)
+
+    assert await deletion_service.delete_tracker(tracker.id)
+    deleted = []
+    while count := await deletion_service.purge_records(tracker.id, limit=4):
+        deleted.append(count)
+    # records first, then the archived days batched by their two records
+    assert deleted[:4] == [4, 2, 2, 1]
+    assert await count_rows(async_session_factory, TrackerDataOrm) == 0
+    assert await count_rows(async_session_factory, TrackerDataArchiveOrm) == 0
+    assert await count_rows(async_session_factory, TrackerValueCountOrm) == 0
+    assert sum(deleted[4:]) >= value_counts
+
+    assert await deletion_service.purge_tracker(tracker.id)
+    assert not await deletion_service.purge_tracker(tracker.id)
+    assert await count_rows(async_session_factory, TrackerOrm) == 0
+    assert await count_rows(async_session_factory, TrackerStructureOrm) == 0
+    # the user has not been deleted
+    assert await deletion_service.purge_users() == 0
+
+
+async def test_valid_delete_user(
+    sample_tracker_create: TrackerCreate,
+    sample_tracker_created: TrackerResponse,
+    tracker_service: TrackerService,
+    user_service: UserService,
+    schedule_service: ScheduleService,
+    deletion_service: DeletionService,
+    async_session_factory: async_sessionmaker,
+):
+    user_id = sample_tracker_created.user_id
+    other = await tracker_service.create(
+        sample_tracker_create.model_copy(update={"name": "other"})
+    )
+    await schedule_service.set_digest(
+        DigestSchedule(user_id=user_id, period_days=1, next_run_at=NOW)
+    )
+
+    assert await deletion_service.delete_user(user_id)
+    assert not await deletion_service.delete_user(user_id)
+    assert not await deletion_service.delete_user("missing")
+
+    assert await user_service.get(user_id) is None
+    assert await tracker_service.get_by_user_id(user_id) == []
+    assert await schedule_service.get_digest(user_id) is None
+    assert set(await deletion_service.get_deleted_trackers(limit=10)) == {
+        sample_tracker_created.id,
+        other.id,
+    }
+    # users go once their trackers are removed
+    assert await deletion_service.purge_users() == 0
+    for tracker_id in await deletion_service.get_deleted_trackers(limit=10):
+        assert await deletion_service.purge_tracker(tracker_id)
+    assert await deletion_service.purge_users() == 1
+    assert await count_rows(async_session_factory, UserOrm) == 0
+
+
+async def test_valid_restart_deleted_user(
+    sample_tracker_created: TrackerResponse,
+    user_service: UserService,
+    tracker_service: TrackerService,
+    deletion_service: DeletionService,
+):
+    user_id = sample_tracker_created.user_id
+    await deletion_service.delete_user(user_id)
+
+    await user_service.get_or_create(user_id)
+
+    assert await user_service.get(user_id) is not None
+    # the deleted trackers stay deleted
+    assert await tracker_service.get_by_user_id(user_id) == []
+    assert await deletion_service.purge_tracker(sample_tracker_created.id)
+    assert await deletion_service.purge_users() == 0
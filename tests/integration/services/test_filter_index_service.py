@@ -0,0 +1,185 @@
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+from tracker.core.record_filter import parse_filter
+from tracker.models import TrackerDataOrm, TrackerFilterUsageOrm
+from tracker.schemas import TrackerDataCreate, TrackerResponse
+from tracker.services.database import (
+    DataService,
+    DeletionService,
+    FilterIndexService,
+    TrackerService,
+)
+from tracker.services.database.codecs import tracker_codec
+from tracker.services.database.filter_index_service import index_name
+from tracker.services.database.filters import filter_condition
+
+RECORDS = [
+    {"int_name": 1, "float_name": 7.5, "enum_name": "val1", "string_name": "a"},
+    {"int_name": 2, "float_name": 5.0, "enum_name": "val2", "string_name": "b"},
+    {"int_name": 3, "float_name": 4.5, "enum_name": "val2", "string_name": "a"},
+    {"int_name": 4, "float_name": 8.0, "enum_name": "val3", "string_name": "c"},
+]
+
+
+async def insert_records(tracker_service: TrackerService, tracker: TrackerResponse):
+    for i in RECORDS:
+        await tracker_service.add_data(TrackerDataCreate(tracker_id=tracker.id, data=i))
+
+
+async def test_valid_filtered_data(
+    sample_tracker_created: TrackerResponse,
+    tracker_service: TrackerService,
+    data_service: DataService,
+):
+    await insert_records(tracker_service, sample_tracker_created)
+    where = parse_filter(
+        "enum_name = val2 or (string_name = a and float_name >= 7)",
+        sample_tracker_created.structure.data,
+    )
+
+    data = await data_service.get_all_data(sample_tracker_created.id, where=where)
+    series = await data_service.get_field_series(
+        sample_tracker_created.id, "int_name", where=where
+    )
+    stats = await data_service.get_statistics(
+        sample_tracker_created.id,
+        numeric_fields=["float_name"],
+        categorical_fields=["enum_name"],
+        where=where,
+    )
+
+    assert [i.value["int_name"] for i in data] == [1, 2, 3]
+    assert data[1].value["enum_name"] == "val2"
+    assert series.values == [1.0, 2.0, 3.0]
+    numeric, categorical = stats
+    assert (numeric.count, numeric.min, numeric.max) == (3, 4.5, 7.5)
+    assert (categorical.count, categorical.mode) == (3, "val2")
+
+
+async def test_valid_create_index(
+    sample_tracker_created: TrackerResponse,
+    tracker_service: TrackerService,
+    data_service: DataService,
+    filter_index_service: FilterIndexService,
+    async_session_factory,
+):
+    await insert_records(tracker_service, sample_tracker_created)
+    tracker_id = sample_tracker_created.id
+    where = parse_filter(
+        "float_name < 6 and enum_name = val2", sample_tracker_created.structure.data
+    )
+    for _ in range(3):
+        await filter_index_service.note_usage(tracker_id, where)
+    await filter_index_service.note_usage(
+        tracker_id,
+        parse_filter("float_name > 1", sample_tracker_created.structure.data),
+    )
+
+    fields = await filter_index_service.get_unindexed_fields(
+        min_uses=3, limit=10, max_indexes=10
+    )
+    float_key = sample_tracker_created.structure.data["float_name"]["id"]
+    enum_key = sample_tracker_created.structure.data["enum_name"]["id"]
+    # the most filtered first
+    assert fields == [(tracker_id, float_key), (tracker_id, enum_key)]
+
+    names = [await filter_index_service.create_index(*i) for i in fields]
+
+    assert names == [
+        index_name(tracker_id, float_key),
+        index_name(tracker_id, enum_key),
+    ]
+    assert await filter_index_service.get_indexes() == sorted(names)
+    assert (
+        await filter_index_service.get_unindexed_fields(
+            min_uses=1, limit=10, max_indexes=10
+        )
+        == []
+    )
+    async with async_session_factory() as session:
+        usage = (await session.scalars(select(TrackerFilterUsageOrm))).all()
+        assert {(i.field, i.uses, i.indexed) for i in usage} == {
+            (float_key, 4, True),
+            (enum_key, 3, True),
+        }
+        # filtered queries match the expressions and the predicate of the indexes
+        records = TrackerDataOrm.__table__
+        codec = await tracker_codec(session, tracker_id)
+        sql = (
+            select(records.c.id)
+            .where(filter_condition(records, tracker_id, where, codec))
+            .compile(
+                dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+            )
+        )
+        await session.execute(text("SET enable_seqscan = off"))
+        plan = "\n".join((await session.scalars(text(f"EXPLAIN {sql}"))).all())
+        assert any(i in plan for i in names)
+
+
+async def test_valid_drop_orphaned_indexes(
+    sample_tracker_created: TrackerResponse,
+    tracker_service: TrackerService,
+    filter_index_service: FilterIndexService,
+    deletion_service: DeletionService,
+):
+    tracker_id = sample_tracker_created.id
+    await filter_index_service.note_usage(
+        tracker_id, parse_filter("int_name = 1", sample_tracker_created.structure.data)
+    )
+    (field,) = await filter_index_service.get_unindexed_fields(
+        min_uses=1, limit=10, max_indexes=10
+    )
+    await filter_index_service.create_index(*field)
+
+    assert await filter_index_service.drop_orphaned_indexes() == 0
+    assert len(await filter_index_service.get_indexes()) == 1
+
+    await deletion_service.delete_tracker(tracker_id)
+
+    assert (
+        await filter_index_service.get_unindexed_fields(
+            min_uses=1, limit=10, max_indexes=10
+        )
+        == []
+    )
+    assert await filter_index_service.drop_orphaned_indexes() == 1
+    assert await filter_index_service.get_indexes() == []
+
+
+async def test_valid_drop_least_used_indexes(
+    sample_tracker_created: TrackerResponse,
+    filter_index_service: FilterIndexService,
+    async_session_factory,
+):
+    tracker_id = sample_tracker_created.id
+    structure = sample_tracker_created.structure.data
+    for _ in range(3):
+        await filter_index_service.note_usage(
+            tracker_id, parse_filter("float_name > 1", structure)
+        )
+    await filter_index_service.note_usage(
+        tracker_id, parse_filter("enum_name = val1", structure)
+    )
+    for i in await filter_index_service.get_unindexed_fields(1, 10, max_indexes=2):
+        await filter_index_service.create_index(*i)
+    float_key = structure["float_name"]["id"]
+    enum_key = structure["enum_name"]["id"]
+
+    # the cap is lowered, the least filtered field loses its index
+    assert await filter_index_service.get_unindexed_fields(1, 10, max_indexes=1) == []
+    assert await filter_index_service.drop_least_used_indexes(1, max_indexes=2) == 0
+    assert await filter_index_service.drop_least_used_indexes(1, max_indexes=1) == 1
+    assert await filter_index_service.get_indexes() == [
+        index_name(tracker_id, float_key)
+    ]
+    async with async_session_factory() as session:
+        usage = (await session.scalars(select(TrackerFilterUsageOrm))).all()
+        assert {(i.field, i.indexed) for i in usage} == {
+            (float_key, True),
+            (enum_key, False),
+        }
+    # and gets it back once it is among the most filtered again
+    assert await filter_index_service.get_unindexed_fields(1, 10, max_indexes=2) == [
+        (tracker_id, enum_key)
+    ]
@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio.session import async_sessionmaker
+from tracker.models import (
+    TrackerDataArchiveOrm,
+    TrackerDataOrm,
+    TrackerFieldStatsOrm,
+    TrackerValueCountOrm,
+)
+from tracker.schemas import RetentionPolicy, TrackerResponse
+from tracker.services.database import DataService, RetentionService, TrackerService
+from tracker.services.database.archive import day_start
+
+from tests.integration.services.test_data_service import (
+    generate_tracker_data,
+    insert_data,
+)
+
+NUMERIC = ["int_name", "float_name"]
+CATEGORICAL = ["enum_name", "string_name"]
+
+
+async def test_valid_set_policy(
+    sample_tracker_created: TrackerResponse, retention_service: RetentionService
+):
+    policy = RetentionPolicy(tracker_id=sample_tracker_created.id, raw_days=365)
+    await retention_service.set_policy(policy)
+    await retention_service.set_policy(policy.model_copy(update={"raw_days": 30}))
+
+    assert await retention_service.get_policies() == [
+        policy.model_copy(update={"raw_days": 30})
+    ]
+    assert await retention_service.delete_policy(sample_tracker_created.id)
+    assert not await retention_service.delete_policy(sample_tracker_created.id)
+    assert await retention_service.get_policy(sample_tracker_created.id) is None
+
+
+async def test_valid_archive_records(
+    sample_tracker_created: TrackerResponse,
+    tracker_service: TrackerService,
+    data_service: DataService,
+    retention_service: RetentionService,
+    async_session_factory: async_sessionmaker,
+):
+    tracker_id = sample_tracker_created.id
+    data = [i for i in generate_tracker_data(sample_tracker_created.structure.data, 30)]
+    for record, i in zip(data, range(30)):
+        record["string_name"] = "a" if i % 3 else f"s{i}"
+    inserted = await insert_data(data, tracker_service, sample_tracker_created)
+    now = datetime.now(timezone.utc)
+    # three records a day over the last ten days
+    created = [now - timedelta(days=10 - i // 3, hours=2 - i % 3) for i in range(30)]
+    async with async_session_factory() as session:
+        for record, created_at in zip(inserted, created):
+            await session.execute(
+                update(TrackerDataOrm)
+                .filter_by(id=record.id)
+                .values(created_at=created_at)
+            )
+        await session.commit()
+    before = day_start(now - timedelta(days=5))
+    # in the middle of an archived day
+    from_date = now - timedelta(days=7, hours=1, minutes=30)
+
+    async def snapshot():
+        return [
+            await data_service.get_all_data(tracker_id),
+            await data_service.get_statistics(tracker_id, NUMERIC, CATEGORICAL),
+            await data_service.get_statistics(
+                tracker_id, NUMERIC, CATEGORICAL, from_date=from_date
+            ),
+            await data_service.get_value_stats(
+                tracker_id, CATEGORICAL, from_date=from_date
+            ),
+        ]
+
+    expected = await snapshot()
+    version = await data_service.get_data_version(tracker_id)
+    old = sum(i < before for i in created)
+
+    archived = [
+        await retention_service.archive_records(tracker_id, before, limit=4)
+        for _ in range(old // 4 + 1)
+    ]
+    assert sum(archived) == old and archived[-1] < 4
+    assert await retention_service.archive_records(tracker_id, before, 4) == 0
+    assert await data_service.get_data_version(tracker_id) == version + len(archived)
+
+    async with async_session_factory() as session:
+        raw = await session.scalar(select(func.count()).select_from(TrackerDataOrm))
+        days = (await session.scalars(select(TrackerDataArchiveOrm))).all()
+    assert raw == len(inserted) - old
+    assert sum(i.count for i in days) == sum(len(i.records) for i in days) == old
+
+    all_data, stats, period_stats, value_stats = await snapshot()
+    assert all_data == expected[0]
+    for expected_stats, actual_stats in zip(expected[1:3], (stats, period_stats)):
+        assert [i.field_name for i in actual_stats] == [
+            i.field_name for i in expected_stats
+        ]
+        for e, a in zip(expected_stats, actual_stats):
+            assert (a.count, a.mode) == (e.count, e.mode)
+            for attr in ("min", "max", "avg", "sum", "std"):
+                assert getattr(a, attr) == pytest.approx(getattr(e, attr))
+    assert value_stats == expected[3]
+
+    # archived days are daily means
+    series = await data_service.get_field_series(tracker_id, "float_name")
+    assert len(series.values) == len(inserted) - old + len(days)
+    assert series.timestamps == sorted(series.timestamps)
+    assert series.timestamps[0] == day_start(created[0]).timestamp()
+    first_day = [
+        i.data["float_name"]
+        for i, created_at in zip(inserted, created)
+        if day_start(created_at) == day_start(created[0])
+    ]
+    assert series.values[0] == pytest.approx(sum(first_day) / len(first_day))
+
+    # the running statistics and the value counts are rebuilt from the archive
+    running = await data_service.get_field_stats(tracker_id, NUMERIC)
+    counts = await data_service.get_value_stats(tracker_id, CATEGORICAL)
+    async with async_session_factory() as session:
+        await session.execute(delete(TrackerFieldStatsOrm))
+        await session.execute(delete(TrackerValueCountOrm))
+        await session.commit()
+    await data_service.rebuild_field_stats(tracker_id)
+    await data_service.rebuild_value_counts(tracker_id)
+    for e, a in zip(running, await data_service.get_field_stats(tracker_id, NUMERIC)):
+        assert a.count == e.count == len(inserted)
+        for attr in ("min", "max", "avg", "sum", "std"):
+            assert getattr(a, attr) == pytest.approx(getattr(e, attr))
+    assert await data_service.get_value_stats(tracker_id, CATEGORICAL) == counts
@@ -0,0 +1,177 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from tracker.schemas import (
+    DigestSchedule,
+    Reminder,
+    TrackerCreate,
+    TrackerResponse,
+    UserResponse,
+)
+from tracker.services.database import ScheduleService, TrackerService, UserService
+
+
+async def test_valid_set_digest(
+    sample_user_created: UserResponse, schedule_service: ScheduleService
+):
+    now = datetime.now(timezone.utc)
+    schedule = DigestSchedule(
+        user_id=sample_user_created.id, period_days=1, next_run_at=now
+    )
+
+    await schedule_service.set_digest(schedule)
+    assert await schedule_service.get_digest(sample_user_created.id) == schedule
+
+    moved = schedule.model_copy(
+        update={"period_days": 7, "next_run_at": now + timedelta(hours=1)}
+    )
+    await schedule_service.set_digest(moved)
+    assert await schedule_service.get_digest(sample_user_created.id) == moved
+
+    assert await schedule_service.delete_digest(sample_user_created.id)
+    assert not await schedule_service.delete_digest(sample_user_created.id)
+    assert await schedule_service.get_digest(sample_user_created.id) is None
+
+
+async def test_valid_get_due_digests(
+    user_service: UserService, schedule_service: ScheduleService
+):
+    now = datetime.now(timezone.utc)
+    for i, minutes in enumerate([30, -5, 10, 10, 5]):
+        await user_service.create(f"user{i}")
+        await schedule_service.set_digest(
+            DigestSchedule(
+                user_id=f"user{i}",
+                period_days=1,
+                next_run_at=now + timedelta(minutes=minutes),
+            )
+        )
+
+    res = await schedule_service.get_due_digests(
+        until=now + timedelta(minutes=10), limit=3
+    )
+    assert [i.user_id for i in res] == ["user1", "user4", "user2"]
+
+    res = await schedule_service.get_due_digests(
+        until=now + timedelta(minutes=10), limit=10
+    )
+    assert [i.user_id for i in res] == ["user1", "user4", "user2", "user3"]
+
+
+async def test_valid_claim_due_digests(
+    user_service: UserService, schedule_service: ScheduleService
+):
+    now = datetime.now(timezone.utc)
+    runs = {
+        # missed for 3 days
+        "daily": (1, now - timedelta(days=3, minutes=1)),
+        "weekly": (7, now),
+        "later": (1, now + timedelta(minutes=1)),
+    }
+    for user_id, (period_days, next_run_at) in runs.items():
+        await user_service.create(user_id)
+        await schedule_service.set_digest(
+            DigestSchedule(
+                user_id=user_id, period_days=period_days, next_run_at=next_run_at
+            )
+        )
+
+    claimed = await schedule_service.claim_due_digests(list(runs), now)
+    again = await schedule_service.claim_due_digests(list(runs), now)
+
+    next_runs = {i.user_id: i.next_run_at for i in claimed}
+    assert next_runs == {
+        "daily": now + timedelta(days=1, minutes=-1),
+        "weekly": now + timedelta(days=7),
+    }
+    assert again == []
+    later = await schedule_service.get_digest("later")
+    assert later is not None and later.next_run_at == runs["later"][1]
+
+
+async def test_valid_set_reminder(
+    sample_tracker_created: TrackerResponse, schedule_service: ScheduleService
+):
+    now = datetime.now(timezone.utc)
+    reminder = Reminder(
+        tracker_id=sample_tracker_created.id, period_days=1, next_fire_at=now
+    )
+
+    await schedule_service.set_reminder(reminder)
+    assert await schedule_service.get_reminder(sample_tracker_created.id) == reminder
+    assert await schedule_service.get_next_fire_at() == now
+
+    moved = reminder.model_copy(update={"next_fire_at": now + timedelta(hours=1)})
+    await schedule_service.set_reminder(moved)
+    assert await schedule_service.get_reminder(sample_tracker_created.id) == moved
+
+    assert await schedule_service.delete_reminder(sample_tracker_created.id)
+    assert not await schedule_service.delete_reminder(sample_tracker_created.id)
+    assert await schedule_service.get_next_fire_at() is None
+
+
+async def test_valid_claim_due_reminders(
+    sample_tracker_create: TrackerCreate,
+    sample_user_created: UserResponse,
+    tracker_service: TrackerService,
+    schedule_service: ScheduleService,
+):
+    now = datetime.now(timezone.utc)
+    fires = {
+        # missed for 3 days
+        "daily": (1, now - timedelta(days=3, minutes=1)),
+        "weekly": (7, now),
+        "later": (1, now + timedelta(minutes=1)),
+    }
+    for name, (period_days, next_fire_at) in fires.items():
+        sample_tracker_create.name = name
+        tracker = await tracker_service.create(sample_tracker_create)
+        await schedule_service.set_reminder(
+            Reminder(
+                tracker_id=tracker.id,
+                period_days=period_days,
+                next_fire_at=next_fire_at,
+            )
+        )
+
+    claimed = await schedule_service.claim_due_reminders(now, limit=10)
+    again = await schedule_service.claim_due_reminders(now, limit=10)
+
+    next_fires = {i.tracker_name: i.next_fire_at for i in claimed}
+    assert next_fires == {
+        "daily": now + timedelta(days=1, minutes=-1),
+        "weekly": now + timedelta(days=7),
+    }
+    assert {i.user_id for i in claimed} == {sample_user_created.id}
+    assert again == []
+    assert await schedule_service.get_next_fire_at() == fires["later"][1]
+
+
+async def test_concurrent_claim_due_reminders(
+    sample_tracker_create: TrackerCreate,
+    sample_user_created: UserResponse,
+    tracker_service: TrackerService,
+    schedule_service: ScheduleService,
+):
+    now = datetime.now(timezone.utc)
+    for i in range(20):
+        sample_tracker_create.name = f"tracker {i}"
+        tracker = await tracker_service.create(sample_tracker_create)
+        await schedule_service.set_reminder(
+            Reminder(
+                tracker_id=tracker.id,
+                period_days=1,
+                next_fire_at=now - timedelta(minutes=i),
+            )
+        )
+
+    batches = await asyncio.gather(
+        *(schedule_service.claim_due_reminders(now, limit=3) for _ in range(10))
+    )
+
+    # locked reminders are skipped, those left are claimed by the next claim
+    batches.append(await schedule_service.claim_due_reminders(now, limit=20))
+
+    claimed = [i.tracker_name for batch in batches for i in batch]
+    # every reminder is claimed by exactly one of the workers
+    assert sorted(claimed) == sorted(f"tracker {i}" for i in range(20))
@@ -1,10 +1,16 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from tracker.exceptions import NotFoundException
+from tracker.models import TrackerDataOrm
 from tracker.schemas import (
     TrackerCreate,
     TrackerDataCreate,
     TrackerResponse,
     UserResponse,
 )
-from tracker.services.database import TrackerService
+from tracker.services.database import DataService, TrackerService, UserService
 
 
 async def test_valid_create(
@@ -17,12 +23,78 @@ async def test_valid_create(
     assert len(res.data) == 0
 
 
+async def test_valid_create_provisions_user(
+    sample_tracker_create: TrackerCreate,
+    tracker_service: TrackerService,
+    user_service: UserService,
+):
+    res = await tracker_service.create(tracker=sample_tracker_create)
+
+    assert await user_service.get(sample_tracker_create.user_id) == res.user
+    assert await tracker_service.get_by_id(res.id) == res
+
+
 async def test_vald_get_by_name(
     sample_tracker_created: TrackerResponse,
     tracker_service: TrackerService,
 ):
-    res = await tracker_service.get_by_name(sample_tracker_created.name)
+    res = await tracker_service.get_by_name(
+        sample_tracker_created.user_id, sample_tracker_created.name.upper()
+    )
     assert res == sample_tracker_created
+    # names are looked up among the trackers of the user
+    with pytest.raises(NotFoundException):
+        await tracker_service.get_by_name("other", sample_tracker_created.name)
+
+
+async def test_valid_names_per_user(
+    sample_tracker_create: TrackerCreate,
+    sample_tracker_created: TrackerResponse,
+    tracker_service: TrackerService,
+):
+    # another user may have a tracker with the same name
+    other = await tracker_service.create(
+        sample_tracker_create.model_copy(update={"user_id": "other"})
+    )
+
+    assert other.name == sample_tracker_created.name
+    assert (await tracker_service.get_by_name("other", other.name)).id == other.id
+    with pytest.raises(IntegrityError):
+        await tracker_service.create(
+            sample_tracker_create.model_copy(
+                update={"name": sample_tracker_created.name.upper()}
+            )
+        )
+
+
+async def test_valid_search_by_name(
+    sample_tracker_create: TrackerCreate,
+    sample_tracker_data_create: TrackerDataCreate,
+    sample_user_created: UserResponse,
+    tracker_service: TrackerService,
+):
+    trackers = {}
+    for name in ["Weight", "body weight", "sleep", "Weightlifting"]:
+        sample_tracker_create.name = name
+        trackers[name] = await tracker_service.create(sample_tracker_create)
+    await tracker_service.create(
+        sample_tracker_create.model_copy(update={"user_id": "other", "name": "weight"})
+    )
+    # the most recently active of the names starting with the query comes first
+    sample_tracker_data_create.tracker_id = trackers["Weightlifting"].id
+    await tracker_service.add_data(sample_tracker_data_create)
+
+    async def search(query: str, limit: int = 10) -> list[str]:
+        res = await tracker_service.search_by_name(
+            sample_user_created.id, query, limit=limit
+        )
+        return [i.name for i in res]
+
+    assert await search("WEI") == ["Weightlifting", "Weight", "body weight"]
+    assert await search("wei", limit=1) == ["Weightlifting"]
+    assert await search("lee") == ["sleep"]
+    assert await search("run") == []
+    assert len(await search("")) == 4
 
 
 async def test_vald_get_by_id(
@@ -47,7 +119,118 @@ async def test_valid_add_data(
     sample_tracker_data_create: TrackerDataCreate,
     sample_tracker_created: TrackerResponse,
     tracker_service: TrackerService,
+    data_service: DataService,
 ):
     sample_tracker_data_create.tracker_id = sample_tracker_created.id
     res = await tracker_service.add_data(sample_tracker_data_create)
     assert res.data == sample_tracker_data_create.data
+    records = await data_service.get_all_data(sample_tracker_created.id)
+    assert [(i.date, i.value) for i in records] == [(res.created_at, res.data)]
+    summaries = await tracker_service.get_summaries_by_user_id(
+        sample_tracker_created.user_id, limit=1
+    )
+    assert summaries[0].last_activity_at == res.created_at
+
+
+async def test_valid_add_data_by_field_ids(
+    sample_tracker_data_create: TrackerDataCreate,
+    sample_tracker_created: TrackerResponse,
+    tracker_service: TrackerService,
+    data_service: DataService,
+    async_session_factory: async_sessionmaker,
+):
+    structure = sample_tracker_created.structure.data
+    sample_tracker_data_create.tracker_id = sample_tracker_created.id
+    sample_tracker_data_create.data["enum_name"] = "val2"
+    await tracker_service.add_data(sample_tracker_data_create)
+
+    async with async_session_factory() as session:
+        stored = await session.scalar(select(TrackerDataOrm.data))
+    assert set(stored) == {props["id"] for props in structure.values()}
+    assert stored[structure["enum_name"]["id"]] == 1
+    records = await data_service.get_all_data(sample_tracker_created.id)
+    assert records[0].value == sample_tracker_data_create.data
+
+
+async def test_lookup_without_records(
+    sample_tracker_data_create: TrackerDataCreate,
+    sample_tracker_created: TrackerResponse,
+    tracker_service: TrackerService,
+):
+    sample_tracker_data_create.tracker_id = sample_tracker_created.id
+    await tracker_service.add_data(sample_tracker_data_create)
+
+    by_id = await tracker_service.get_by_id(sample_tracker_created.id)
+    by_name = await tracker_service.get_by_name(
+        sample_tracker_created.user_id, sample_tracker_created.name
+    )
+
+    assert by_id.data == by_name.data == []
+    assert by_id.structure == sample_tracker_created.structure
+    assert by_name.user.id == sample_tracker_created.user_id
+
+
+async def test_valid_get_summaries_by_user_id(
+    sample_tracker_create: TrackerCreate,
+    sample_tracker_data_create: TrackerDataCreate,
+    sample_user_created: UserResponse,
+    tracker_service: TrackerService,
+):
+    trackers = []
+    for i in range(5):
+        sample_tracker_create.name = f"tracker {i}"
+        trackers.append(await tracker_service.create(sample_tracker_create))
+    # the first tracker becomes the most recently active one
+    sample_tracker_data_create.tracker_id = trackers[0].id
+    await tracker_service.add_data(sample_tracker_data_create)
+
+    first = await tracker_service.get_summaries_by_user_id(
+        sample_user_created.id, limit=2
+    )
+    second = await tracker_service.get_summaries_by_user_id(
+        sample_user_created.id, limit=2, older_than=first[-1].key
+    )
+    third = await tracker_service.get_summaries_by_user_id(
+        sample_user_created.id, limit=2, older_than=second[-1].key
+    )
+    back = await tracker_service.get_summaries_by_user_id(
+        sample_user_created.id, limit=2, newer_than=second[0].key
+    )
+
+    assert first[0].id == trackers[0].id
+    summaries = first + second + third
+    assert len(summaries) == 5
+    assert {i.id for i in summaries} == {i.id for i in trackers}
+    keys = [i.key for i in summaries]
+    assert keys == sorted(keys, reverse=True)
+    assert back == first
+
+
+async def test_valid_get_summaries_by_user_ids(
+    sample_tracker_create: TrackerCreate,
+    sample_tracker_data_create: TrackerDataCreate,
+    sample_user_created: UserResponse,
+    tracker_service: TrackerService,
+    user_service: UserService,
+):
+    other = await user_service.create("other")
+    await user_service.create("no trackers")
+    trackers = []
+    for i in range(3):
+        sample_tracker_create.name = f"tracker {i}"
+        trackers.append(await tracker_service.create(sample_tracker_create))
+    sample_tracker_create.name = "other tracker"
+    sample_tracker_create.user_id = other.id
+    other_tracker = await tracker_service.create(sample_tracker_create)
+    sample_tracker_data_create.tracker_id = trackers[1].id
+    await tracker_service.add_data(sample_tracker_data_create)
+
+    res = await tracker_service.get_summaries_by_user_ids(
+        [sample_user_created.id, other.id, "no trackers"], limit=2
+    )
+
+    assert res.keys() == {sample_user_created.id, other.id}
+    assert [i.id for i in res[other.id]] == [other_tracker.id]
+    assert len(res[sample_user_created.id]) == 2
+    assert res[sample_user_created.id][0].id == trackers[1].id
+    assert res[sample_user_created.id][0].data_version == 1
@@ -0,0 +1,124 @@
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from tracker.models import UserOrm
+from tracker.schemas import (
+    TrackerCreate,
+    TrackerDataCreate,
+    TrackerResponse,
+    UserCreate,
+)
+from tracker.services.database import (
+    DataService,
+    TrackerService,
+    UnitOfWork,
+    UserService,
+    after_commit,
+    commit_unit_of_work,
+)
+
+
+async def is_user_committed(
+    async_session_factory: async_sessionmaker, user_id: str
+) -> bool:
+    async with async_session_factory() as session:
+        return await session.get(UserOrm, user_id) is not None
+
+
+async def test_valid_commit_on_exit(
+    sample_user_create: UserCreate,
+    sample_tracker_create: TrackerCreate,
+    user_service: UserService,
+    tracker_service: TrackerService,
+    async_session_factory: async_sessionmaker,
+):
+    async with UnitOfWork(async_session_factory):
+        await user_service.create(sample_user_create.id)
+        tracker = await tracker_service.create(sample_tracker_create)
+        assert not await is_user_committed(async_session_factory, sample_user_create.id)
+
+    assert await is_user_committed(async_session_factory, sample_user_create.id)
+    res = await tracker_service.get_by_id(tracker.id)
+    assert res.user_id == sample_user_create.id
+
+
+async def test_rollback_on_error(
+    sample_user_create: UserCreate,
+    user_service: UserService,
+    async_session_factory: async_sessionmaker,
+):
+    with pytest.raises(ValueError):
+        async with UnitOfWork(async_session_factory):
+            await user_service.create(sample_user_create.id)
+            raise ValueError
+
+    assert not await is_user_committed(async_session_factory, sample_user_create.id)
+
+
+async def test_valid_read_after_write(
+    sample_tracker_created: TrackerResponse,
+    sample_tracker_data_create: TrackerDataCreate,
+    tracker_service: TrackerService,
+    data_service: DataService,
+    async_session_factory: async_sessionmaker,
+):
+    sample_tracker_data_create.tracker_id = sample_tracker_created.id
+
+    async with UnitOfWork(async_session_factory):
+        await data_service.get_all_data(sample_tracker_created.id)
+        await tracker_service.add_data(sample_tracker_data_create)
+        res = await data_service.get_all_data(sample_tracker_created.id)
+
+    assert len(res) == 1
+
+
+async def test_session_not_opened_when_unused(
+    async_session_factory: async_sessionmaker,
+):
+    async with UnitOfWork(async_session_factory) as uow:
+        pass
+
+    assert uow._session is None
+
+
+async def test_valid_early_commit(
+    sample_user_create: UserCreate,
+    sample_tracker_create: TrackerCreate,
+    user_service: UserService,
+    tracker_service: TrackerService,
+    async_session_factory: async_sessionmaker,
+):
+    committed = []
+
+    async with UnitOfWork(async_session_factory) as uow:
+        await user_service.create(sample_user_create.id)
+        after_commit(lambda: committed.append(True))
+        await commit_unit_of_work()
+
+        assert await is_user_committed(async_session_factory, sample_user_create.id)
+        assert committed == [True]
+        assert uow._session is None
+        # later calls get a new session, committed on exit
+        tracker = await tracker_service.create(sample_tracker_create)
+
+    res = await tracker_service.get_by_id(tracker.id)
+    assert res.user_id == sample_user_create.id
+    assert committed == [True]
+
+
+async def test_after_commit_dropped_on_rollback(
+    sample_user_create: UserCreate,
+    user_service: UserService,
+    async_session_factory: async_sessionmaker,
+):
+    committed = []
+
+    with pytest.raises(ValueError):
+        async with UnitOfWork(async_session_factory):
+            await user_service.create(sample_user_create.id)
+            after_commit(lambda: committed.append(True))
+            raise ValueError
+
+    assert committed == []
+    # outside a unit of work the callback is called at once
+    after_commit(lambda: committed.append(True))
+    assert committed == [True]
@@ -11,3 +11,13 @@ async def test_valid_get(sample_user_created: UserResponse, user_service: UserSe
     res = await user_service.get(sample_user_created.id)
     assert res is not None
     assert res.id == sample_user_created.id
+
+
+async def test_valid_get_or_create(
+    sample_user_create: UserCreate, user_service: UserService
+):
+    created = await user_service.get_or_create(sample_user_create.id)
+    existing = await user_service.get_or_create(sample_user_create.id)
+
+    assert created == existing
+    assert await user_service.get(sample_user_create.id) == created
@@ -0,0 +1,16 @@
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from tracker.services.database.warm_up import run_hot_queries, warm_up_pool
+
+
+async def test_valid_warm_up_pool(async_session_factory: async_sessionmaker):
+    engine: AsyncEngine = async_session_factory.kw["bind"]
+    await engine.dispose()
+
+    await warm_up_pool(engine, 3)
+
+    assert engine.pool.checkedin() == 3  # type: ignore
+    assert engine.pool.checkedout() == 0  # type: ignore
+
+
+async def test_valid_run_hot_queries(async_session_factory: async_sessionmaker):
+    await run_hot_queries(async_session_factory)
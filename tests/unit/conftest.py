@@ -2,7 +2,15 @@ import inspect
 from unittest.mock import AsyncMock, create_autospec
 
 import pytest
-from tracker.services.database import DataService, TrackerService, UserService
+from tracker.services.database import (
+    DataService,
+    DeletionService,
+    FilterIndexService,
+    RetentionService,
+    ScheduleService,
+    TrackerService,
+    UserService,
+)
 
 
 @pytest.fixture
@@ -30,3 +38,23 @@ def user_service_mock(service_mock_factory):
 @pytest.fixture
 def tracker_service_mock(service_mock_factory):
     return service_mock_factory(TrackerService)
+
+
+@pytest.fixture
+def schedule_service_mock(service_mock_factory):
+    return service_mock_factory(ScheduleService)
+
+
+@pytest.fixture
+def retention_service_mock(service_mock_factory):
+    return service_mock_factory(RetentionService)
+
+
+@pytest.fixture
+def deletion_service_mock(service_mock_factory):
+    return service_mock_factory(DeletionService)
+
+
+@pytest.fixture
+def filter_index_service_mock(service_mock_factory):
+    return service_mock_factory(FilterIndexService)
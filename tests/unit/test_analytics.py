@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from tracker.core.analytics import (
+    DAY,
+    day_streaks,
+    dropna,
+    ewma,
+    moving_average,
+    pct_change,
+    resample,
+    runs,
+    zscore,
+)
+
+
+def test_valid_dropna():
+    x, y = dropna(np.arange(3.0), np.array([1.0, np.nan, 3.0]))
+
+    assert x.tolist() == [0, 2]
+    assert y.tolist() == [1, 3]
+
+
+def test_valid_moving_average():
+    res = moving_average(np.arange(6, dtype=np.float64), 3)
+
+    assert res.tolist() == [0, 0.5, 1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("alpha", [0.5, 0.01, 1e-6])
+def test_valid_ewma(alpha: float):
+    y = np.random.default_rng(0).normal(size=20_000)
+    expected, s = np.empty_like(y), y[0]
+    for i, value in enumerate(y):
+        s = alpha * value + (1 - alpha) * s
+        expected[i] = s
+
+    assert ewma(y, alpha) == pytest.approx(expected)
+
+
+def test_valid_resample():
+    x = np.array([0, 10, DAY, DAY + 1, 3 * DAY], dtype=np.float64)
+    y = np.arange(5, dtype=np.float64)
+
+    starts, means = resample(x, y, DAY)
+    _, last = resample(x, y, DAY, how="last")
+
+    assert starts.tolist() == [0, DAY, 3 * DAY]
+    assert means.tolist() == [0.5, 2.5, 4]
+    assert last.tolist() == [1, 3, 4]
+
+
+def test_valid_pct_change():
+    res = pct_change(np.array([1.0, 2.0, 0.0, 4.0]))
+
+    assert np.isnan(res[0]) and np.isnan(res[3])
+    assert res[1:3].tolist() == [100, -100]
+
+
+def test_valid_runs_and_day_streaks():
+    assert runs(np.array([1, 1, 0, 1, 1, 1], dtype=bool)).tolist() == [1, 2, 0, 1, 2, 3]
+
+    days = np.array([0, 1, 2, 2, 5, 6], dtype=np.float64) * DAY + 100
+    assert day_streaks(days) == (2, 3)
+    assert day_streaks(np.array([])) == (0, 0)
+
+
+def test_valid_zscore():
+    assert zscore(np.array([1.0, 3.0])).tolist() == [-1, 1]
+    assert zscore(np.array([2.0, 2.0])).tolist() == [0, 0]
@@ -0,0 +1,52 @@
+import asyncio
+from unittest.mock import patch
+
+from tracker.presentation.background import BackgroundJob
+
+
+class CountingJob(BackgroundJob):
+    counters = ("ticks",)
+
+    def __init__(self, delays: list[float | None | Exception]) -> None:
+        super().__init__(interval=0.01, retry_delay=0)
+        self.delays = delays
+        self.ticks = 0
+        self.done = asyncio.Event()
+
+    async def tick(self) -> float | None:
+        self.ticks += 1
+        if not self.delays:
+            self.done.set()
+            return 3600
+        delay = self.delays.pop(0)
+        if isinstance(delay, Exception):
+            raise delay
+        return delay
+
+
+async def test_valid_background_job():
+    # a failed tick is retried, None waits for the interval
+    job = CountingJob([RuntimeError("connection lost"), None, 0])
+
+    await job.start(None)  # type: ignore
+    await asyncio.wait_for(job.done.wait(), 1)
+    with patch("tracker.presentation.background.logger") as logger:
+        await job.close()
+
+    assert job.ticks == 4
+    assert job._task is None
+    logger.info.assert_called_once_with("%s: %s", "CountingJob", "ticks 4")
+
+
+async def test_notify_background_job():
+    job = CountingJob([])
+
+    await job.start(None)  # type: ignore
+    await asyncio.wait_for(job.done.wait(), 1)
+    job.done.clear()
+    # wakes the job up long before the returned delay
+    job.notify()
+    await asyncio.wait_for(job.done.wait(), 1)
+    await job.close()
+
+    assert job.ticks == 2
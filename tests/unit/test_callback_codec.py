@@ -0,0 +1,83 @@
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import CallbackQuery, User
+from tracker.presentation.callback_codec import (
+    EnumValueRefFilter,
+    FieldRefFilter,
+    StructureRef,
+    structure_tag,
+)
+from tracker.schemas import TrackerResponse
+
+STRUCTURE = {
+    "weight": {"type": "float"},
+    "mood " * 20: {"type": "enum", "values": ["good", "bad", "очень " * 20]},
+}
+
+
+def create_callback(data: str) -> CallbackQuery:
+    return CallbackQuery(
+        id="1",
+        chat_instance="1",
+        data=data,
+        from_user=User(id=0, is_bot=False, first_name="test"),
+    )
+
+
+def test_valid_field_roundtrip():
+    ref = StructureRef(STRUCTURE)  # type: ignore
+
+    for name in STRUCTURE:
+        data = ref.pack_field(name)
+        res = ref.unpack_field(data)
+
+        assert len(data.encode()) <= 64
+        assert res is not None
+        assert res.name == name
+        assert res.type == STRUCTURE[name]["type"]
+
+
+def test_valid_enum_value_roundtrip():
+    ref = StructureRef(STRUCTURE)  # type: ignore
+    field = "mood " * 20
+
+    for value in STRUCTURE[field]["values"]:
+        data = ref.pack_enum_value(field, value)
+        res = ref.unpack_enum_value(data)
+
+        assert len(data.encode()) <= 64
+        assert res is not None
+        assert res.value == value
+
+
+def test_structure_tag_ignores_key_order():
+    reordered = dict(reversed(list(STRUCTURE.items())))
+
+    assert structure_tag(reordered) == structure_tag(STRUCTURE)  # type: ignore
+
+
+def test_invalid_other_structure():
+    data = StructureRef(STRUCTURE).pack_field("weight")  # type: ignore
+    other = StructureRef({"weight": {"type": "int"}})
+
+    assert other.unpack_field(data) is None
+    assert other.unpack_enum_value(data) is None
+    assert other.unpack_field("f:???") is None
+
+
+async def test_valid_filters(sample_tracker_response: TrackerResponse):
+    state = FSMContext(
+        storage=MemoryStorage(), key=StorageKey(bot_id=0, chat_id=0, user_id=0)
+    )
+    await state.update_data(tracker=sample_tracker_response.model_dump())
+    ref = StructureRef(sample_tracker_response.structure.data)
+
+    field = await FieldRefFilter()(create_callback(ref.pack_field("int_name")), state)
+    value = await EnumValueRefFilter()(
+        create_callback(ref.pack_enum_value("enum_name", "val2")), state
+    )
+
+    assert isinstance(field, dict) and field["callback_data"].name == "int_name"
+    assert isinstance(value, dict) and value["callback_data"].value == "val2"
+    assert not await FieldRefFilter()(create_callback("field:int"), state)
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from tracker.core.charts import ChartRenderer, lttb, render_line_chart
+
+
+def test_valid_lttb():
+    x = np.arange(10_000, dtype=np.float64)
+    y = np.sin(x / 100)
+    y[5_000] = 10  # a spike must survive downsampling
+
+    dx, dy = lttb(x, y, 100)
+
+    assert len(dx) == len(dy) == 100
+    assert dx[0] == x[0] and dx[-1] == x[-1]
+    assert np.all(np.diff(dx) > 0)
+    assert 10 in dy
+
+
+@pytest.mark.parametrize("threshold", [2, 5, 10])
+def test_short_series_lttb(threshold: int):
+    x = np.arange(5, dtype=np.float64)
+
+    dx, dy = lttb(x, x, threshold)
+
+    assert dx is x and dy is x
+
+
+def test_valid_render_line_chart():
+    timestamps = 1.7e9 + np.arange(5_000, dtype=np.float64) * 60
+    values = np.random.default_rng(0).normal(size=5_000)
+
+    image = render_line_chart(timestamps, values, "tracker: value", max_points=500)
+
+    assert image.startswith(b"\x89PNG")
+
+
+async def test_valid_chart_renderer():
+    renderer = ChartRenderer(max_workers=1)
+    try:
+        image = await renderer.render(
+            np.array([1.7e9, 1.7e9 + 60]), np.array([1.0, 2.0]), "title"
+        )
+    finally:
+        renderer.close()
+
+    assert image.startswith(b"\x89PNG")
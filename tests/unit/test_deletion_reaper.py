@@ -0,0 +1,43 @@
+from unittest.mock import patch
+from uuid import uuid4
+
+from tracker.presentation.deletion import DeletionReaper
+
+
+async def test_valid_deletion_reaper(deletion_service_mock):
+    big, small = uuid4(), uuid4()
+    # rows left of the deleted trackers
+    rows = {big: 25, small: 3}
+
+    async def get_deleted_trackers(limit):
+        return [i for i in (big, small) if i in rows][:limit]
+
+    async def purge_records(tracker_id, limit):
+        count = min(rows[tracker_id], limit)
+        rows[tracker_id] -= count
+        return count
+
+    async def purge_tracker(tracker_id):
+        assert rows.pop(tracker_id) == 0
+        return True
+
+    deletion_service_mock.get_deleted_trackers.side_effect = get_deleted_trackers
+    deletion_service_mock.purge_records.side_effect = purge_records
+    deletion_service_mock.purge_tracker.side_effect = purge_tracker
+    deletion_service_mock.purge_users.return_value = 1
+    reaper = DeletionReaper(deletion_service_mock, batch_size=10, pause=0.5)
+
+    with patch("tracker.presentation.deletion.asyncio.sleep") as sleep:
+        await reaper.tick()
+
+    assert rows == {}
+    assert [i.args[0] for i in deletion_service_mock.purge_records.await_args_list] == [
+        big
+    ] * 4 + [small] * 2
+    # a pause after every batch
+    assert [i.args for i in sleep.await_args_list] == [(0.5,)] * 4
+    assert (reaper.deleted_rows, reaper.deleted_trackers, reaper.deleted_users) == (
+        28,
+        2,
+        1,
+    )
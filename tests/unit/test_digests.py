@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from aiogram.exceptions import TelegramForbiddenError
+from aiogram.methods import SendMessage
+from tracker.presentation.digests import DigestScheduler
+from tracker.presentation.outbound import Lane, _lane
+from tracker.schemas import DashboardTrackerData, DigestSchedule
+from tracker.use_cases import CollectDigestsUseCase
+
+NOW = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def schedule(user_id: str, minutes: float) -> DigestSchedule:
+    return DigestSchedule(
+        user_id=user_id,
+        period_days=1,
+        next_run_at=NOW + timedelta(minutes=minutes),
+        language="en",
+    )
+
+
+def make_scheduler(schedule_service_mock, schedules, batch_size=10):
+    now = [NOW]
+    # the schedules stored in the database
+    stored = {i.user_id: i for i in schedules}
+
+    async def get_due_digests(until, limit):
+        due = sorted(
+            (i for i in stored.values() if i.next_run_at <= until), key=lambda i: i.key
+        )
+        return due[:limit]
+
+    async def collect(user_ids, now, max_trackers):
+        claimed = [
+            stored.pop(i)
+            for i in user_ids
+            if i in stored and stored[i].next_run_at <= now
+        ]
+        return [
+            (i, [DashboardTrackerData(tracker_id=uuid4(), tracker_name=i.user_id)])
+            for i in claimed
+        ]
+
+    schedule_service_mock.get_due_digests.side_effect = get_due_digests
+    collect_mock = AsyncMock(spec=CollectDigestsUseCase)
+    collect_mock.execute.side_effect = collect
+    lanes = []
+    bot = MagicMock()
+    bot.send_message = AsyncMock(side_effect=lambda **kwargs: lanes.append(_lane.get()))
+    scheduler = DigestScheduler(
+        schedule_service_mock,
+        collect_mock,
+        lookahead=600,
+        batch_size=batch_size,
+        clock=lambda: now[0],
+        bot=bot,
+    )
+    return scheduler, now, bot, lanes, stored
+
+
+async def test_valid_digest_scheduler(schedule_service_mock):
+    scheduler, now, bot, lanes, stored = make_scheduler(
+        schedule_service_mock,
+        [schedule("due", 0), schedule("soon", 5), schedule("later", 60)],
+    )
+
+    delay = await scheduler.tick()
+
+    assert [i.kwargs["chat_id"] for i in bot.send_message.await_args_list] == ["due"]
+    assert "Daily digest:" in bot.send_message.await_args.kwargs["text"]
+    assert lanes == [Lane.BULK]
+    # sleeps until the next loaded schedule
+    assert delay == 300
+    # "later" is beyond the lookahead
+    schedule_service_mock.get_due_digests.assert_awaited_once_with(
+        until=NOW + timedelta(minutes=10), limit=10
+    )
+
+    # a schedule set meanwhile within the loaded period
+    stored["new"] = schedule("new", 1)
+    scheduler.notify(stored["new"])
+    now[0] += timedelta(minutes=1)
+    assert await scheduler.tick() == 240
+
+    now[0] += timedelta(minutes=4)
+    await scheduler.tick()
+    now[0] += timedelta(minutes=55)
+    await scheduler.tick()
+
+    sent = [i.kwargs["chat_id"] for i in bot.send_message.await_args_list]
+    assert sent == ["due", "new", "soon", "later"]
+    assert scheduler.sent == 4
+    # loaded again only after the loaded period ran out
+    assert schedule_service_mock.get_due_digests.await_count == 2
+
+
+async def test_full_batch_digest_scheduler(schedule_service_mock):
+    scheduler, now, bot, _, _ = make_scheduler(
+        schedule_service_mock, [schedule(f"user{i}", 0) for i in range(5)], batch_size=2
+    )
+
+    delays = [await scheduler.tick() for _ in range(3)]
+
+    assert delays[:2] == [0, 0]
+    assert bot.send_message.await_count == 5
+
+
+async def test_failed_send_digest_scheduler(schedule_service_mock):
+    scheduler, _, bot, _, _ = make_scheduler(
+        schedule_service_mock, [schedule("blocked", 0), schedule("user", 0)]
+    )
+    method = SendMessage(chat_id=0, text="")
+    bot.send_message.side_effect = lambda chat_id, text: (
+        (_ for _ in ()).throw(TelegramForbiddenError(method=method, message=""))
+        if chat_id == "blocked"
+        else None
+    )
+
+    await scheduler.tick()
+
+    assert (scheduler.sent, scheduler.failed) == (1, 1)
@@ -0,0 +1,66 @@
+from tracker.core.field_codec import FieldCodec, assign_field_ids, field_id
+
+STRUCTURE = {
+    "weight in kilograms": {"type": "float"},
+    "mood": {"type": "enum", "values": ["bad", "ok", "good"]},
+    "note": {"type": "string"},
+}
+
+
+def test_valid_field_id():
+    assert [field_id(i) for i in (0, 9, 10, 35, 36, 1295, 1296)] == [
+        "0",
+        "9",
+        "a",
+        "z",
+        "10",
+        "zz",
+        "100",
+    ]
+
+
+def test_valid_assign_field_ids():
+    structure = assign_field_ids(STRUCTURE)  # type: ignore
+
+    assert list(structure) == list(STRUCTURE)
+    assert [i["id"] for i in structure.values()] == ["0", "1", "2"]
+    assert structure["mood"]["values"] == ["bad", "ok", "good"]
+    assert "id" not in STRUCTURE["mood"]
+
+
+def test_valid_roundtrip():
+    codec = FieldCodec(assign_field_ids(STRUCTURE))  # type: ignore
+    record = {"note": "hi", "weight in kilograms": 72.5, "mood": "good"}
+
+    encoded = codec.encode(record)
+
+    assert encoded == {"2": "hi", "0": 72.5, "1": 2}
+    # fields come back in the order of the structure
+    assert list(codec.decode(encoded).items()) == [
+        ("weight in kilograms", 72.5),
+        ("mood", "good"),
+        ("note", "hi"),
+    ]
+    assert codec.key("mood") == "1" and codec.name("1") == "mood"
+
+
+def test_valid_decode_value():
+    codec = FieldCodec(assign_field_ids(STRUCTURE))  # type: ignore
+
+    # codes read as text from the database
+    assert codec.decode_value("mood", "0") == "bad"
+    assert codec.decode_value("mood", 1) == "ok"
+    assert codec.decode_value("mood", "good") == "good"
+    assert codec.decode_value("mood", 7) == 7
+    assert codec.decode_value("mood", None) is None
+    assert codec.decode_value("note", "0") == "0"
+
+
+def test_valid_structure_without_ids():
+    codec = FieldCodec(STRUCTURE)  # type: ignore
+    record = {"weight in kilograms": 72.5, "mood": "good"}
+
+    assert codec.encode(record) == record
+    assert codec.decode(record) == record
+    assert codec.key("mood") == "mood"
+    assert codec.decode_value("mood", "0") == "0"
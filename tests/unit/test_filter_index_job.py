@@ -0,0 +1,53 @@
+from uuid import uuid4
+
+from tracker.presentation.filter_indexes import FilterIndexJob
+
+
+async def test_valid_filter_index_job(filter_index_service_mock):
+    fields = [(uuid4(), "0"), (uuid4(), "1"), (uuid4(), "2")]
+
+    async def create_index(tracker_id, field):
+        if field == "1":
+            raise RuntimeError("deadlock detected")
+        # the tracker was deleted in the meantime
+        return None if field == "2" else f"ix_filter_{field}"
+
+    filter_index_service_mock.drop_orphaned_indexes.return_value = 2
+    filter_index_service_mock.drop_least_used_indexes.return_value = 1
+    filter_index_service_mock.get_indexes.return_value = ["ix_filter_x"] * 6
+    filter_index_service_mock.get_unindexed_fields.return_value = fields
+    filter_index_service_mock.create_index.side_effect = create_index
+    job = FilterIndexJob(
+        filter_index_service_mock, min_uses=5, batch_size=3, max_indexes=10
+    )
+
+    # a failed field does not stop the others
+    await job.tick()
+    filter_index_service_mock.drop_least_used_indexes.assert_awaited_once_with(
+        min_uses=5, max_indexes=10
+    )
+    filter_index_service_mock.get_unindexed_fields.assert_awaited_once_with(
+        min_uses=5, limit=3, max_indexes=10
+    )
+    assert [i.args for i in filter_index_service_mock.create_index.await_args_list] == (
+        fields
+    )
+    assert (job.created, job.dropped) == (1, 3)
+
+
+async def test_valid_filter_index_job_cap(filter_index_service_mock):
+    filter_index_service_mock.drop_orphaned_indexes.return_value = 0
+    filter_index_service_mock.drop_least_used_indexes.return_value = 0
+    filter_index_service_mock.get_unindexed_fields.return_value = []
+    job = FilterIndexJob(filter_index_service_mock, batch_size=3, max_indexes=10)
+
+    # only the free places are filled
+    filter_index_service_mock.get_indexes.return_value = ["ix_filter_x"] * 9
+    await job.tick()
+    kwargs = filter_index_service_mock.get_unindexed_fields.await_args.kwargs
+    assert kwargs["limit"] == 1
+
+    filter_index_service_mock.get_indexes.return_value = ["ix_filter_x"] * 10
+    await job.tick()
+    filter_index_service_mock.get_unindexed_fields.assert_awaited_once()
+    assert job.created == 0
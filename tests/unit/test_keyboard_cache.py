@@ -0,0 +1,70 @@
+from tracker.core.lru import LRUCache
+from tracker.presentation.callbacks import BackCallback
+from tracker.presentation.constants.text import MsgKey
+from tracker.presentation.utils import KeyboardBuilder, KeyboardCache, _t
+from tracker.schemas import TrackerResponse
+
+
+def t_ru(key, **kwargs):
+    return _t(lang="ru", key=key, **kwargs)
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache: LRUCache[str, int] = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert "a" in cache and "c" in cache
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+
+def test_static_keyboard_is_built_on_warm_up():
+    cache = KeyboardCache()
+    cache.warm_up(["ru"])
+
+    builder = KeyboardBuilder(t=t_ru, lang="ru", cache=cache)
+    res = builder.conf(add_back_button=True).build_period_keyboard()
+
+    assert res is builder.conf(add_back_button=True).build_period_keyboard()
+    assert (
+        res
+        == KeyboardBuilder(t=t_ru).conf(add_back_button=True).build_period_keyboard()
+    )
+    assert res is not builder.conf(add_cancel_button=True).build_period_keyboard()
+
+
+def test_fields_keyboard_is_cached_by_structure(
+    sample_tracker_response: TrackerResponse,
+):
+    cache = KeyboardCache()
+    first = KeyboardBuilder(
+        t=t_ru, lang="ru", cache=cache
+    ).build_tracker_fields_keyboard(sample_tracker_response)
+    copy = sample_tracker_response.model_copy(deep=True)
+
+    builder = KeyboardBuilder(t=t_ru, lang="ru", cache=cache)
+    assert builder.build_tracker_fields_keyboard(copy) is first
+    excluded = builder.build_tracker_fields_keyboard(copy, exclude_fields={"int_name"})
+    assert excluded is not first
+    assert "int_name: int" not in {
+        button.text for row in excluded.inline_keyboard for button in row
+    }
+
+
+def test_extra_buttons_are_not_cached():
+    cache = KeyboardCache()
+    builder = KeyboardBuilder(t=t_ru, lang="ru", cache=cache)
+
+    res = builder.conf(
+        extra_buttons=[(MsgKey.BACK, BackCallback())]
+    ).build_period_keyboard()
+
+    assert (
+        res
+        is not builder.conf(
+            extra_buttons=[(MsgKey.BACK, BackCallback())]
+        ).build_period_keyboard()
+    )
@@ -0,0 +1,99 @@
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import GetUpdates, SendDocument, SendMessage
+from tracker.presentation.outbound import (
+    CommitBeforeRequest,
+    Lane,
+    OutboundScheduler,
+    outbound_lane,
+)
+from tracker.services.database import UnitOfWork
+
+
+class FakeSession:
+    def __init__(self, fail_times: int = 0):
+        self.calls: list[str] = []
+        self.fail_times = fail_times
+
+    async def __call__(self, bot, method):
+        if self.fail_times:
+            self.fail_times -= 1
+            raise TelegramRetryAfter(method=method, message="", retry_after=0)
+        self.calls.append(getattr(method, "text", None) or type(method).__name__)
+        return MagicMock()
+
+
+def send(chat_id: int, text: str) -> SendMessage:
+    return SendMessage(chat_id=chat_id, text=text)
+
+
+async def test_valid_interactive_before_bulk():
+    scheduler = OutboundScheduler(global_rate=1000, chat_burst=100)
+    scheduler._global.tokens = 0
+    session = FakeSession()
+
+    async def send_bulk(i: int):
+        with outbound_lane(Lane.BULK):
+            await scheduler(session, None, send(i, f"bulk {i}"))  # type: ignore
+
+    tasks = [asyncio.create_task(send_bulk(i)) for i in range(3)]
+    await asyncio.sleep(0)
+    await scheduler(session, None, send(10, "interactive"))  # type: ignore
+    await asyncio.gather(*tasks)
+
+    assert session.calls[0] == "interactive"
+    assert scheduler.metrics().max_queued == 4
+
+
+async def test_valid_per_chat_limit():
+    scheduler = OutboundScheduler(chat_rate=20, chat_burst=1)
+    session = FakeSession()
+
+    started = time.monotonic()
+    await scheduler(session, None, send(1, "first"))  # type: ignore
+    await scheduler(session, None, send(2, "other chat"))  # type: ignore
+    assert time.monotonic() - started < 0.04
+    await scheduler(session, None, send(1, "second"))  # type: ignore
+
+    assert time.monotonic() - started >= 0.04
+
+
+async def test_valid_retry_after():
+    scheduler = OutboundScheduler()
+    session = FakeSession(fail_times=2)
+
+    await scheduler(session, None, send(1, "text"))  # type: ignore
+
+    assert session.calls == ["text"]
+    assert scheduler.metrics().retries == 2
+
+
+async def test_not_limited_methods_pass_through():
+    scheduler = OutboundScheduler(global_rate=1)
+    scheduler._global.tokens = 0
+    session = FakeSession()
+
+    await asyncio.wait_for(scheduler(session, None, GetUpdates()), 0.5)  # type: ignore
+
+    assert session.calls == ["GetUpdates"]
+    assert scheduler.metrics().sent == 0
+
+
+def test_document_is_bulk():
+    scheduler = OutboundScheduler()
+
+    assert scheduler._lane(SendDocument(chat_id=1, document="id")) == Lane.BULK
+    assert scheduler._lane(send(1, "text")) == Lane.INTERACTIVE
+
+
+async def test_valid_commit_before_request():
+    session = FakeSession()
+
+    async with UnitOfWork(MagicMock()) as uow:
+        uow.after_commit(lambda: session.calls.append("commit"))
+        await CommitBeforeRequest()(session, None, send(1, "reply"))  # type: ignore
+
+    assert session.calls == ["commit", "reply"]
@@ -0,0 +1,98 @@
+import pytest
+from tracker.core.record_filter import (
+    MAX_CONDITIONS,
+    AllOf,
+    AnyOf,
+    Condition,
+    FilterOperatorException,
+    FilterSyntaxException,
+    FilterValueException,
+    UnknownFieldException,
+    conditions,
+    parse_filter,
+)
+
+STRUCTURE = {
+    "sleep": {"type": "float"},
+    "steps": {"type": "int"},
+    "mood": {"type": "enum", "values": ["bad", "ok", "good"]},
+    "note": {"type": "string"},
+    "hours of work": {"type": "int"},
+}
+
+
+def test_valid_parse_filter():
+    node = parse_filter("mood = bad and (sleep < 6 or steps >= 10000)", STRUCTURE)  # type: ignore
+
+    assert node == AllOf(
+        (
+            Condition("mood", "=", "bad"),
+            AnyOf((Condition("sleep", "<", 6.0), Condition("steps", ">=", 10000.0))),
+        )
+    )
+    assert [i.field for i in conditions(node)] == ["mood", "sleep", "steps"]
+
+
+def test_valid_parse_filter_precedence():
+    node = parse_filter("sleep > 8 или mood = ok и steps != 0", STRUCTURE)  # type: ignore
+
+    # AND binds tighter than OR
+    assert node == AnyOf(
+        (
+            Condition("sleep", ">", 8.0),
+            AllOf((Condition("mood", "=", "ok"), Condition("steps", "!=", 0.0))),
+        )
+    )
+
+
+def test_valid_parse_filter_phrases():
+    node = parse_filter(
+        "hours of work<=7,5 AND note = 'tea and (cake)'", STRUCTURE  # type: ignore
+    )
+
+    assert node == AllOf(
+        (
+            Condition("hours of work", "<=", 7.5),
+            Condition("note", "=", "tea and (cake)"),
+        )
+    )
+    same = parse_filter(
+        "hours of work <= 7.5 and note = 'tea and (cake)'", STRUCTURE  # type: ignore
+    )
+    # filters are hashable, so they are parts of cache keys
+    assert hash(node) == hash(same)
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["", "mood", "mood =", "= bad", "mood = bad and", "(mood = bad", "mood = bad)"],
+)
+def test_invalid_parse_filter_syntax(text):
+    with pytest.raises(FilterSyntaxException):
+        parse_filter(text, STRUCTURE)  # type: ignore
+
+
+def test_invalid_parse_filter_too_many_conditions():
+    text = " or ".join(["steps = 1"] * (MAX_CONDITIONS + 1))
+
+    with pytest.raises(FilterSyntaxException):
+        parse_filter(text, STRUCTURE)  # type: ignore
+
+
+def test_invalid_parse_filter_unknown_field():
+    with pytest.raises(UnknownFieldException) as e:
+        parse_filter("weight > 70", STRUCTURE)  # type: ignore
+
+    assert e.value.field == "weight"
+
+
+@pytest.mark.parametrize("text", ["sleep = long", "mood = awful"])
+def test_invalid_parse_filter_value(text):
+    with pytest.raises(FilterValueException):
+        parse_filter(text, STRUCTURE)  # type: ignore
+
+
+@pytest.mark.parametrize("text", ["mood > bad", "note <= abc"])
+def test_invalid_parse_filter_operator(text):
+    with pytest.raises(FilterOperatorException):
+        parse_filter(text, STRUCTURE)  # type: ignore
@@ -0,0 +1,129 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from aiogram.exceptions import TelegramForbiddenError
+from aiogram.methods import SendMessage
+from tracker.presentation.outbound import Lane, _lane
+from tracker.presentation.reminders import ReminderWorker
+from tracker.schemas import FiredReminder, Reminder
+
+NOW = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def reminder(name: str, minutes: float) -> FiredReminder:
+    return FiredReminder(
+        tracker_id=uuid4(),
+        period_days=1,
+        next_fire_at=NOW + timedelta(minutes=minutes),
+        language="en",
+        user_id=f"user of {name}",
+        tracker_name=name,
+    )
+
+
+def make_worker(schedule_service_mock, reminders, batch_size=10):
+    now = [NOW]
+    # the reminders stored in the database
+    stored = {i.tracker_name: i for i in reminders}
+
+    async def claim_due_reminders(now, limit):
+        due = sorted(
+            (i for i in stored.values() if i.next_fire_at <= now),
+            key=lambda i: i.next_fire_at,
+        )[:limit]
+        for i in due:
+            stored[i.tracker_name] = i.model_copy(
+                update={"next_fire_at": i.next_fire_at + timedelta(days=1)}
+            )
+        return due
+
+    async def get_next_fire_at():
+        return min((i.next_fire_at for i in stored.values()), default=None)
+
+    schedule_service_mock.claim_due_reminders.side_effect = claim_due_reminders
+    schedule_service_mock.get_next_fire_at.side_effect = get_next_fire_at
+    lanes = []
+    bot = MagicMock()
+    bot.send_message = AsyncMock(side_effect=lambda **kwargs: lanes.append(_lane.get()))
+    worker = ReminderWorker(
+        schedule_service_mock,
+        batch_size=batch_size,
+        poll_interval=600,
+        clock=lambda: now[0],
+        bot=bot,
+    )
+    return worker, now, bot, lanes
+
+
+async def test_valid_reminder_worker(schedule_service_mock):
+    worker, now, bot, lanes = make_worker(
+        schedule_service_mock,
+        [reminder("due", 0), reminder("soon", 5), reminder("later", 60)],
+    )
+
+    delay = await worker.tick()
+
+    assert [i.kwargs["chat_id"] for i in bot.send_message.await_args_list] == [
+        "user of due"
+    ]
+    assert "/track due" in bot.send_message.await_args.kwargs["text"]
+    assert lanes == [Lane.BULK]
+    # sleeps until the soonest reminder
+    assert delay == 300
+
+    now[0] += timedelta(minutes=5)
+    # polls for reminders set through other processes
+    assert await worker.tick() == 600
+
+    now[0] += timedelta(minutes=55)
+    await worker.tick()
+    sent = [i.kwargs["chat_id"] for i in bot.send_message.await_args_list]
+    assert sent == ["user of due", "user of soon", "user of later"]
+    assert worker.sent == 3
+
+
+async def test_notify_reminder_worker(schedule_service_mock):
+    worker, _, _, _ = make_worker(schedule_service_mock, [reminder("later", 60)])
+    await worker.tick()
+
+    worker.notify(Reminder(tracker_id=uuid4(), period_days=1, next_fire_at=NOW))
+    assert worker._wake.is_set()
+
+    worker._wake.clear()
+    worker.notify(
+        Reminder(
+            tracker_id=uuid4(),
+            period_days=1,
+            next_fire_at=NOW + timedelta(minutes=90),
+        )
+    )
+    assert not worker._wake.is_set()
+
+
+async def test_full_batch_reminder_worker(schedule_service_mock):
+    worker, _, bot, _ = make_worker(
+        schedule_service_mock, [reminder(f"tracker{i}", 0) for i in range(5)], 2
+    )
+
+    await worker.tick()
+
+    # claimed until a batch is not full
+    assert schedule_service_mock.claim_due_reminders.await_count == 3
+    assert bot.send_message.await_count == 5
+
+
+async def test_failed_send_reminder_worker(schedule_service_mock):
+    worker, _, bot, _ = make_worker(
+        schedule_service_mock, [reminder("blocked", 0), reminder("tracker", 0)]
+    )
+    method = SendMessage(chat_id=0, text="")
+    bot.send_message.side_effect = lambda chat_id, text: (
+        (_ for _ in ()).throw(TelegramForbiddenError(method=method, message=""))
+        if chat_id == "user of blocked"
+        else None
+    )
+
+    await worker.tick()
+
+    assert (worker.sent, worker.failed) == (1, 1)
@@ -0,0 +1,38 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from tracker.presentation.retention import RetentionJob
+from tracker.schemas import RetentionPolicy
+
+NOW = datetime(2026, 1, 10, 12, 0, tzinfo=timezone.utc)
+
+
+async def test_valid_retention_job(retention_service_mock):
+    policies = [
+        RetentionPolicy(tracker_id=uuid4(), raw_days=30),
+        RetentionPolicy(tracker_id=uuid4(), raw_days=365),
+    ]
+    # records left to archive per tracker
+    left = {policies[0].tracker_id: 25, policies[1].tracker_id: 0}
+
+    async def archive_records(tracker_id, before, limit):
+        count = min(left[tracker_id], limit)
+        left[tracker_id] -= count
+        return count
+
+    retention_service_mock.get_policies.return_value = policies
+    retention_service_mock.archive_records.side_effect = archive_records
+    job = RetentionJob(retention_service_mock, batch_size=10, clock=lambda: NOW)
+
+    await job.tick()
+    assert job.archived == 25
+    calls = retention_service_mock.archive_records.await_args_list
+    # in batches until one is not full
+    assert [i.args for i in calls] == [
+        (policies[0].tracker_id, datetime(2025, 12, 11, tzinfo=timezone.utc)),
+    ] * 3 + [(policies[1].tracker_id, datetime(2025, 1, 10, tzinfo=timezone.utc))]
+    assert {i.kwargs["limit"] for i in calls} == {10}
+
+    # nothing is left
+    await job.tick()
+    assert job.archived == 25
@@ -0,0 +1,28 @@
+import asyncio
+import time
+
+import pytest
+from tracker.startup import StartupPipeline
+
+
+async def test_steps_run_concurrently():
+    pipeline = StartupPipeline()
+
+    res = await asyncio.gather(
+        pipeline.step("first", asyncio.sleep(0.05, result=1)),
+        pipeline.step("second", asyncio.sleep(0.05, result=2)),
+        pipeline.step_in_thread("thread", time.sleep, 0.05),
+    )
+
+    assert res == [1, 2, None]
+    assert set(pipeline.timings) == {"first", "second", "thread"}
+    assert pipeline.total < 0.15
+
+
+def test_step_sync_records_failed_step():
+    pipeline = StartupPipeline()
+
+    with pytest.raises(ValueError):
+        pipeline.step_sync("fail", int, "x")
+
+    assert "fail" in pipeline.timings
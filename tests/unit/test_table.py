@@ -0,0 +1,48 @@
+from datetime import datetime
+from uuid import uuid4
+
+from tracker.presentation.utils import MESSAGE_LIMIT, format_table
+from tracker.schemas import DataRowResult
+
+
+def test_valid_format_table():
+    rows = [
+        DataRowResult(
+            id=uuid4(),
+            date=datetime(2025, 1, 2, 3, 4),
+            value={"weight": "70.5", "note": "<b>a very long note indeed</b>"},
+        ),
+        DataRowResult(id=uuid4(), date=datetime(2025, 1, 1), value={"weight": "7"}),
+    ]
+
+    text = format_table(["weight", "note"], rows)
+
+    assert text.startswith("<pre>") and text.endswith("</pre>")
+    lines = text.removeprefix("<pre>").removesuffix("</pre>").split("\n")
+    assert len(lines) == 4
+    assert lines[0].split(" │ ")[0].strip() == "date"
+    assert "2025-01-02 03:04" in lines[2]
+    assert "&lt;b&gt;a very long …" in lines[2]
+    assert "<b>" not in text
+
+
+def test_valid_format_table_wide():
+    fields = [f"string field {i}" for i in range(18)]
+    rows = [
+        DataRowResult(
+            id=uuid4(),
+            date=datetime(2025, 1, i + 1),
+            value={name: "&" * 20 for name in fields},
+        )
+        for i in range(10)
+    ]
+
+    text = format_table(fields, rows)
+
+    # the last columns are left out and counted
+    assert len(text) <= MESSAGE_LIMIT
+    header = text.removeprefix("<pre>").split("\n")[0].split(" │ ")
+    shown = len(header) - 2
+    assert 0 < shown < len(fields)
+    assert header[-1].strip() == f"+{len(fields) - shown}"
+    assert len(format_table(fields, rows, limit=1000)) <= 1000
@@ -0,0 +1,12 @@
+from tracker.presentation.utils import split_blocks
+
+
+def test_valid_split_blocks():
+    blocks = ["a" * 5, "b" * 3, "c" * 12]
+
+    assert split_blocks(blocks, separator="\n", limit=10) == [
+        "aaaaa\nbbb",
+        "c" * 10,
+        "cc",
+    ]
+    assert split_blocks(["a", "b"]) == ["a\n\nb"]
@@ -0,0 +1,120 @@
+from aiogram.types import Update
+from tracker.presentation.callback_codec import StructureRef
+from tracker.presentation.callbacks import TrackerDataActionsCallback
+from tracker.tools.update_log import (
+    UpdateAnonymizer,
+    UpdateLogWriter,
+    read_update_log,
+)
+
+
+def create_message_update(text: str, user_id: int = 123456) -> Update:
+    return Update.model_validate(
+        {
+            "update_id": 1,
+            "message": {
+                "message_id": 1,
+                "date": 1700000000,
+                "chat": {"id": user_id, "type": "private", "first_name": "Ivan"},
+                "from": {
+                    "id": user_id,
+                    "is_bot": False,
+                    "first_name": "Ivan",
+                    "username": "ivan_petrov",
+                },
+                "text": text,
+            },
+        }
+    )
+
+
+def create_callback_update(data: str, user_id: int = 123456) -> Update:
+    return Update.model_validate(
+        {
+            "update_id": 2,
+            "callback_query": {
+                "id": "1",
+                "chat_instance": "1",
+                "data": data,
+                "from": {"id": user_id, "is_bot": False, "first_name": "Ivan"},
+            },
+        }
+    )
+
+
+def test_anonymize_message():
+    anonymizer = UpdateAnonymizer("salt")
+    res = anonymizer.anonymize(create_message_update("/track Вес утром 72.5"))
+
+    message = res["message"]
+    assert message["chat"]["id"] != 123456
+    assert message["chat"]["id"] == message["from"]["id"]
+    assert "Ivan" not in str(res) and "ivan_petrov" not in str(res)
+    assert message["text"].startswith("/track ")
+    assert "Вес" not in message["text"]
+    assert message["text"].endswith(" 72.5")
+    assert len(message["text"]) == len("/track Вес утром 72.5")
+
+
+def test_anonymize_is_deterministic():
+    update = create_message_update("weight")
+
+    first = UpdateAnonymizer("salt").anonymize(update)
+    second = UpdateAnonymizer("salt").anonymize(update)
+    other_salt = UpdateAnonymizer("other").anonymize(update)
+
+    assert first == second
+    assert first["message"]["text"] != other_salt["message"]["text"]
+
+
+def test_anonymize_callback_data_keeps_literals():
+    anonymizer = UpdateAnonymizer("salt")
+    data = TrackerDataActionsCallback(action="csv").pack()
+
+    assert anonymizer.anonymize_callback_data(data) == data
+
+
+def test_anonymize_structure_callback():
+    anonymizer = UpdateAnonymizer("salt")
+    structure = {"mood": {"type": "enum", "values": ["good", "bad"]}}
+    data = StructureRef(structure).pack_enum_value("mood", "bad")  # type: ignore
+
+    res = anonymizer.anonymize_structure_callback(data, structure)  # type: ignore
+
+    # the tracker created during replay has the anonymized structure
+    replayed = StructureRef(anonymizer.anonymize_structure(structure))  # type: ignore
+    value = replayed.unpack_enum_value(res)
+    assert value is not None
+    assert value.value == anonymizer.anonymize_text("bad")
+
+
+def test_anonymize_structure_keeps_case_distinct_fields():
+    anonymizer = UpdateAnonymizer("salt")
+    structure = {
+        "Sleep": {"type": "int"},
+        "sleep": {"type": "int"},
+        "A": {"type": "int"},
+        "a": {"type": "int"},
+    }
+    data = StructureRef(structure).pack_field("sleep")  # type: ignore
+
+    anonymized = anonymizer.anonymize_structure(structure)  # type: ignore
+    res = anonymizer.anonymize_structure_callback(data, structure)  # type: ignore
+
+    assert len(anonymized) == len(structure)
+    replayed = StructureRef(anonymized)
+    assert replayed.resolve_field(res) == anonymizer.anonymize_text("sleep")
+
+
+def test_update_log_roundtrip(tmp_path):
+    path = str(tmp_path / "updates.jsonl.gz")
+    anonymizer = UpdateAnonymizer("salt")
+    writer = UpdateLogWriter(path)
+    writer.write(anonymizer.anonymize(create_message_update("/start")), 10.0)
+    writer.write(anonymizer.anonymize(create_message_update("text")), 11.5)
+    writer.close()
+
+    records = list(read_update_log(path))
+
+    assert [i.timestamp for i in records] == [10.0, 11.5]
+    assert records[0].update.message and records[0].update.message.text == "/start"
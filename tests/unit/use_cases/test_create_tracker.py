@@ -5,7 +5,6 @@ from tracker.schemas import (
     TrackerCreate,
     TrackerResponse,
     TrackerStructureCreate,
-    UserResponse,
 )
 from tracker.use_cases import (
     CreateTrackerDraftUseCase,
@@ -247,62 +246,29 @@ def test_invalid_already_exists_process_field_name(
     assert err == ProcessFieldNameUseCase.Error.ALREADY_EXISTS
 
 
-async def test_valid_user_exists_finish_tracker_creation(
+async def test_valid_finish_tracker_creation(
     sample_tracker_create: TrackerCreate,
     sample_tracker_response: TrackerResponse,
-    sample_user_response: UserResponse,
     tracker_service_mock,
-    user_service_mock,
 ):
-    user_service_mock.get.return_value = sample_user_response
     tracker_service_mock.create.return_value = sample_tracker_response
 
-    uc = FinishTrackerCreation(
-        tracker_service=tracker_service_mock, user_service=user_service_mock
-    )
+    uc = FinishTrackerCreation(tracker_service=tracker_service_mock)
     res, err = await uc.execute(tracker=sample_tracker_create)
 
     assert err is None
     assert res == sample_tracker_response
-    user_service_mock.get.assert_awaited_once()
-    tracker_service_mock.create.assert_awaited_once()
-
-
-async def test_valid_user_not_exists_finish_tracker_creation(
-    sample_tracker_create: TrackerCreate,
-    sample_tracker_response: TrackerResponse,
-    sample_user_response: UserResponse,
-    tracker_service_mock,
-    user_service_mock,
-):
-    user_id = sample_tracker_create.user_id
-    user_service_mock.get.return_value = None
-    user_service_mock.create.return_value = sample_user_response
-    tracker_service_mock.create.return_value = sample_tracker_response
-
-    uc = FinishTrackerCreation(
-        tracker_service=tracker_service_mock, user_service=user_service_mock
-    )
-    res, err = await uc.execute(tracker=sample_tracker_create)
-
-    assert err is None
-    assert res == sample_tracker_response
-    user_service_mock.get.assert_awaited_once_with(user_id)
-    user_service_mock.create.assert_awaited_once_with(user_id)
-    tracker_service_mock.create.assert_awaited_once()
+    tracker_service_mock.create.assert_awaited_once_with(tracker=sample_tracker_create)
 
 
 async def test_invalid_no_fields_finish_tracker_creation(
     sample_tracker_create: TrackerCreate,
     tracker_service_mock,
-    user_service_mock,
 ):
     tracker = sample_tracker_create.model_copy()
     tracker.structure.data = {}
 
-    uc = FinishTrackerCreation(
-        tracker_service=tracker_service_mock, user_service=user_service_mock
-    )
+    uc = FinishTrackerCreation(tracker_service=tracker_service_mock)
     _, err = await uc.execute(tracker=sample_tracker_create)
 
     assert err is not None
@@ -0,0 +1,89 @@
+import pytest
+from tracker.exceptions import NotFoundException
+from tracker.schemas import TrackerResponse
+from tracker.use_cases import DeleteAccountUseCase, DeleteTrackerUseCase
+
+
+async def test_valid_delete_tracker(
+    tracker_service_mock,
+    deletion_service_mock,
+    sample_tracker_response: TrackerResponse,
+):
+    tracker_service_mock.get_by_name.return_value = sample_tracker_response
+    deletion_service_mock.delete_tracker.return_value = True
+
+    uc = DeleteTrackerUseCase(
+        tracker_service=tracker_service_mock, deletion_service=deletion_service_mock
+    )
+    err = await uc.execute(
+        user_id=sample_tracker_response.user_id, text="/delete_tracker my tracker"
+    )
+
+    assert err is None
+    tracker_service_mock.get_by_name.assert_awaited_once_with(
+        sample_tracker_response.user_id, "my tracker"
+    )
+    deletion_service_mock.delete_tracker.assert_awaited_once_with(
+        sample_tracker_response.id
+    )
+
+
+@pytest.mark.parametrize("reason", ["missing", "deleted"])
+async def test_tracker_not_found_delete_tracker(
+    tracker_service_mock,
+    deletion_service_mock,
+    sample_tracker_response: TrackerResponse,
+    reason: str,
+):
+    user_id = sample_tracker_response.user_id
+    tracker_service_mock.get_by_name.return_value = sample_tracker_response
+    deletion_service_mock.delete_tracker.return_value = False
+    if reason == "missing":
+        # trackers of other users are not found either
+        tracker_service_mock.get_by_name.side_effect = NotFoundException("")
+
+    uc = DeleteTrackerUseCase(
+        tracker_service=tracker_service_mock, deletion_service=deletion_service_mock
+    )
+    err = await uc.execute(user_id=user_id, text="/delete_tracker name")
+
+    assert err == DeleteTrackerUseCase.Error.TRACKER_NOT_FOUND
+    if reason != "deleted":
+        deletion_service_mock.delete_tracker.assert_not_awaited()
+
+
+@pytest.mark.parametrize("text", [None, "/delete_tracker", "/delete_tracker  "])
+async def test_no_text_delete_tracker(
+    tracker_service_mock, deletion_service_mock, text: str | None
+):
+    uc = DeleteTrackerUseCase(
+        tracker_service=tracker_service_mock, deletion_service=deletion_service_mock
+    )
+
+    assert await uc.execute(user_id="user_id", text=text) == (
+        DeleteTrackerUseCase.Error.NO_TEXT
+    )
+    tracker_service_mock.get_by_name.assert_not_awaited()
+
+
+@pytest.mark.parametrize(
+    "text, deleted, expected_err",
+    [
+        ("/delete_account confirm", True, None),
+        ("/delete_account confirm", False, DeleteAccountUseCase.Error.USER_NOT_FOUND),
+        ("/delete_account", True, DeleteAccountUseCase.Error.NOT_CONFIRMED),
+        ("/delete_account yes", True, DeleteAccountUseCase.Error.NOT_CONFIRMED),
+    ],
+)
+async def test_delete_account(
+    deletion_service_mock, text: str, deleted: bool, expected_err
+):
+    deletion_service_mock.delete_user.return_value = deleted
+
+    uc = DeleteAccountUseCase(deletion_service=deletion_service_mock)
+
+    assert await uc.execute(user_id="user_id", text=text) == expected_err
+    if expected_err == DeleteAccountUseCase.Error.NOT_CONFIRMED:
+        deletion_service_mock.delete_user.assert_not_awaited()
+    else:
+        deletion_service_mock.delete_user.assert_awaited_once_with("user_id")
@@ -0,0 +1,124 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from tracker.schemas import DashboardTrackerData, DigestSchedule, TrackerSummary
+from tracker.use_cases import CollectDigestsUseCase, ScheduleDigestUseCase
+
+NOW = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "text, period_days, next_run_at",
+    [
+        ("/digest daily", 1, datetime(2026, 1, 2, 9, 0, tzinfo=timezone.utc)),
+        ("/digest daily 18:30", 1, datetime(2026, 1, 1, 18, 30, tzinfo=timezone.utc)),
+        ("/digest weekly 12:00", 7, datetime(2026, 1, 2, 12, 0, tzinfo=timezone.utc)),
+    ],
+)
+async def test_valid_schedule_digest(
+    schedule_service_mock, text: str, period_days: int, next_run_at: datetime
+):
+    schedule_service_mock.set_digest.side_effect = lambda schedule: schedule
+
+    uc = ScheduleDigestUseCase(schedule_service=schedule_service_mock)
+    schedule, err = await uc.execute(
+        user_id="user_id", text=text, language="en", now=NOW
+    )
+
+    assert not err
+    assert schedule == DigestSchedule(
+        user_id="user_id",
+        period_days=period_days,
+        next_run_at=next_run_at,
+        language="en",
+    )
+
+
+async def test_off_schedule_digest(schedule_service_mock):
+    uc = ScheduleDigestUseCase(schedule_service=schedule_service_mock)
+    schedule, err = await uc.execute(
+        user_id="user_id", text="/digest off", language="en"
+    )
+
+    assert not err and schedule is None
+    schedule_service_mock.delete_digest.assert_awaited_once_with("user_id")
+
+
+@pytest.mark.parametrize(
+    "text, expected_err",
+    [
+        (None, ScheduleDigestUseCase.Error.NO_TEXT),
+        ("/digest", ScheduleDigestUseCase.Error.NO_TEXT),
+        ("/digest monthly", ScheduleDigestUseCase.Error.WRONG_VALUE),
+        ("/digest daily 25:00", ScheduleDigestUseCase.Error.WRONG_VALUE),
+        ("/digest daily 9:00 extra", ScheduleDigestUseCase.Error.WRONG_VALUE),
+    ],
+)
+async def test_wrong_schedule_digest(
+    schedule_service_mock, text: str | None, expected_err
+):
+    uc = ScheduleDigestUseCase(schedule_service=schedule_service_mock)
+    schedule, err = await uc.execute(user_id="user_id", text=text, language="en")
+
+    assert err == expected_err
+    assert schedule is None
+    schedule_service_mock.set_digest.assert_not_awaited()
+
+
+async def test_valid_collect_digests(
+    schedule_service_mock, tracker_service_mock, data_service_mock
+):
+    schedules = [
+        DigestSchedule(user_id=user_id, period_days=days, next_run_at=NOW)
+        for user_id, days in [("daily", 1), ("weekly", 7), ("no trackers", 1)]
+    ]
+    schedule_service_mock.claim_due_digests.return_value = schedules
+    trackers = {
+        user_id: [
+            TrackerSummary(id=uuid4(), name=f"{user_id} {i}", last_activity_at=NOW)
+            for i in range(2)
+        ]
+        for user_id in ("daily", "weekly")
+    }
+    tracker_service_mock.get_summaries_by_user_ids.return_value = trackers
+    data_service_mock.get_dashboard.side_effect = lambda tracker_ids, days, now: [
+        DashboardTrackerData(tracker_id=i, tracker_name=str(days))
+        for i in reversed(tracker_ids)
+    ]
+
+    uc = CollectDigestsUseCase(
+        schedule_service=schedule_service_mock,
+        tracker_service=tracker_service_mock,
+        data_service=data_service_mock,
+    )
+    res = await uc.execute(
+        user_ids=["daily", "weekly", "no trackers"], now=NOW, max_trackers=5
+    )
+
+    assert [schedule.user_id for schedule, _ in res] == ["daily", "weekly"]
+    for schedule, summaries in res:
+        assert [i.tracker_id for i in summaries] == [
+            i.id for i in trackers[schedule.user_id]
+        ]
+        assert {i.tracker_name for i in summaries} == {str(schedule.period_days)}
+    # one query for all trackers of the users with the same period
+    assert data_service_mock.get_dashboard.await_count == 2
+    tracker_service_mock.get_summaries_by_user_ids.assert_awaited_once_with(
+        ["daily", "weekly", "no trackers"], limit=5
+    )
+
+
+async def test_none_claimed_collect_digests(
+    schedule_service_mock, tracker_service_mock, data_service_mock
+):
+    schedule_service_mock.claim_due_digests.return_value = []
+
+    uc = CollectDigestsUseCase(
+        schedule_service=schedule_service_mock,
+        tracker_service=tracker_service_mock,
+        data_service=data_service_mock,
+    )
+
+    assert await uc.execute(user_ids=["user_id"], now=NOW, max_trackers=5) == []
+    tracker_service_mock.get_summaries_by_user_ids.assert_not_awaited()
@@ -0,0 +1,119 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from tracker.exceptions import NotFoundException
+from tracker.schemas import Reminder, TrackerResponse
+from tracker.use_cases import SetReminderUseCase
+
+NOW = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "text, period_days, next_fire_at",
+    [
+        ("/remind name 21:00", 1, datetime(2026, 1, 1, 21, 0, tzinfo=timezone.utc)),
+        ("/remind name 09:30", 1, datetime(2026, 1, 2, 9, 30, tzinfo=timezone.utc)),
+        (
+            "/remind name 12:00 weekly",
+            7,
+            datetime(2026, 1, 2, 12, 0, tzinfo=timezone.utc),
+        ),
+    ],
+)
+async def test_valid_set_reminder(
+    tracker_service_mock,
+    schedule_service_mock,
+    sample_tracker_response: TrackerResponse,
+    text: str,
+    period_days: int,
+    next_fire_at: datetime,
+):
+    tracker_service_mock.get_by_name.return_value = sample_tracker_response
+    schedule_service_mock.set_reminder.side_effect = lambda reminder: reminder
+
+    uc = SetReminderUseCase(
+        tracker_service=tracker_service_mock, schedule_service=schedule_service_mock
+    )
+    reminder, err = await uc.execute(
+        user_id=sample_tracker_response.user_id, text=text, language="en", now=NOW
+    )
+
+    assert not err
+    tracker_service_mock.get_by_name.assert_awaited_once_with(
+        sample_tracker_response.user_id, "name"
+    )
+    assert reminder == Reminder(
+        tracker_id=sample_tracker_response.id,
+        period_days=period_days,
+        next_fire_at=next_fire_at,
+        language="en",
+    )
+
+
+async def test_off_set_reminder(
+    tracker_service_mock, schedule_service_mock, sample_tracker_response
+):
+    tracker_service_mock.get_by_name.return_value = sample_tracker_response
+
+    uc = SetReminderUseCase(
+        tracker_service=tracker_service_mock, schedule_service=schedule_service_mock
+    )
+    reminder, err = await uc.execute(
+        user_id=sample_tracker_response.user_id,
+        text="/remind my tracker off",
+        language="en",
+    )
+
+    assert not err and reminder is None
+    # names may contain spaces
+    tracker_service_mock.get_by_name.assert_awaited_once_with(
+        sample_tracker_response.user_id, "my tracker"
+    )
+    schedule_service_mock.delete_reminder.assert_awaited_once_with(
+        sample_tracker_response.id
+    )
+
+
+@pytest.mark.parametrize(
+    "text, expected_err",
+    [
+        (None, SetReminderUseCase.Error.NO_TEXT),
+        ("/remind", SetReminderUseCase.Error.NO_TEXT),
+        ("/remind 21:00", SetReminderUseCase.Error.NO_TEXT),
+        ("/remind name", SetReminderUseCase.Error.NO_TEXT),
+        ("/remind name 25:00", SetReminderUseCase.Error.WRONG_VALUE),
+        ("/remind name weekly", SetReminderUseCase.Error.WRONG_VALUE),
+        ("/remind name off weekly", SetReminderUseCase.Error.WRONG_VALUE),
+    ],
+)
+async def test_wrong_set_reminder(
+    tracker_service_mock, schedule_service_mock, text: str | None, expected_err
+):
+    uc = SetReminderUseCase(
+        tracker_service=tracker_service_mock, schedule_service=schedule_service_mock
+    )
+    reminder, err = await uc.execute(user_id="user_id", text=text, language="en")
+
+    assert reminder is None and err == expected_err
+    schedule_service_mock.set_reminder.assert_not_awaited()
+    schedule_service_mock.delete_reminder.assert_not_awaited()
+
+
+async def test_tracker_not_found_set_reminder(
+    tracker_service_mock, schedule_service_mock
+):
+    # trackers of other users are not found either
+    tracker_service_mock.get_by_name.side_effect = NotFoundException("")
+    user_id = str(uuid4())
+
+    uc = SetReminderUseCase(
+        tracker_service=tracker_service_mock, schedule_service=schedule_service_mock
+    )
+    reminder, err = await uc.execute(
+        user_id=user_id, text="/remind name 21:00", language="en"
+    )
+
+    assert reminder is None and err == SetReminderUseCase.Error.TRACKER_NOT_FOUND
+    tracker_service_mock.get_by_name.assert_awaited_once_with(user_id, "name")
+    schedule_service_mock.set_reminder.assert_not_awaited()
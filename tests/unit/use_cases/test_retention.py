@@ -0,0 +1,94 @@
+from uuid import uuid4
+
+import pytest
+from tracker.exceptions import NotFoundException
+from tracker.schemas import RetentionPolicy, TrackerResponse
+from tracker.use_cases import SetRetentionUseCase
+
+
+async def test_valid_set_retention(
+    tracker_service_mock,
+    retention_service_mock,
+    sample_tracker_response: TrackerResponse,
+):
+    tracker_service_mock.get_by_name.return_value = sample_tracker_response
+    retention_service_mock.set_policy.side_effect = lambda policy: policy
+
+    uc = SetRetentionUseCase(
+        tracker_service=tracker_service_mock, retention_service=retention_service_mock
+    )
+    policy, err = await uc.execute(
+        user_id=sample_tracker_response.user_id, text="/retention my tracker 365"
+    )
+
+    assert not err
+    # names may contain spaces
+    tracker_service_mock.get_by_name.assert_awaited_once_with(
+        sample_tracker_response.user_id, "my tracker"
+    )
+    assert policy == RetentionPolicy(
+        tracker_id=sample_tracker_response.id, raw_days=365
+    )
+
+
+async def test_off_set_retention(
+    tracker_service_mock,
+    retention_service_mock,
+    sample_tracker_response: TrackerResponse,
+):
+    tracker_service_mock.get_by_name.return_value = sample_tracker_response
+
+    uc = SetRetentionUseCase(
+        tracker_service=tracker_service_mock, retention_service=retention_service_mock
+    )
+    policy, err = await uc.execute(
+        user_id=sample_tracker_response.user_id, text="/retention name off"
+    )
+
+    assert not err and policy is None
+    retention_service_mock.delete_policy.assert_awaited_once_with(
+        sample_tracker_response.id
+    )
+
+
+@pytest.mark.parametrize(
+    "text, expected_err",
+    [
+        (None, SetRetentionUseCase.Error.NO_TEXT),
+        ("/retention", SetRetentionUseCase.Error.NO_TEXT),
+        ("/retention 365", SetRetentionUseCase.Error.NO_TEXT),
+        ("/retention name year", SetRetentionUseCase.Error.WRONG_VALUE),
+        ("/retention name -5", SetRetentionUseCase.Error.WRONG_VALUE),
+        ("/retention name 29", SetRetentionUseCase.Error.TOO_FEW_DAYS),
+    ],
+)
+async def test_wrong_set_retention(
+    tracker_service_mock, retention_service_mock, text: str | None, expected_err
+):
+    uc = SetRetentionUseCase(
+        tracker_service=tracker_service_mock,
+        retention_service=retention_service_mock,
+        min_days=30,
+    )
+    policy, err = await uc.execute(user_id="user_id", text=text)
+
+    assert policy is None and err == expected_err
+    retention_service_mock.set_policy.assert_not_awaited()
+    retention_service_mock.delete_policy.assert_not_awaited()
+
+
+async def test_tracker_not_found_set_retention(
+    tracker_service_mock, retention_service_mock
+):
+    # trackers of other users are not found either
+    tracker_service_mock.get_by_name.side_effect = NotFoundException("")
+    user_id = str(uuid4())
+
+    uc = SetRetentionUseCase(
+        tracker_service=tracker_service_mock, retention_service=retention_service_mock
+    )
+    policy, err = await uc.execute(user_id=user_id, text="/retention name 90")
+
+    assert policy is None and err == SetRetentionUseCase.Error.TRACKER_NOT_FOUND
+    tracker_service_mock.get_by_name.assert_awaited_once_with(user_id, "name")
+    retention_service_mock.set_policy.assert_not_awaited()
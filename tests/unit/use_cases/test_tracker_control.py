@@ -1,41 +1,128 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
 import pytest
 
-from tracker.schemas.tracker import TrackerResponse
+from tracker.schemas import DashboardTrackerData
+from tracker.schemas.tracker import TrackerResponse, TrackerSummary
 from tracker.use_cases import (
+    DashboardCache,
+    GetDashboardUseCase,
     GetUserTrackersUseCase,
     HandleFieldValueUseCase,
+    SearchTrackersUseCase,
     ValidateTrackingMessageUseCase,
 )
 
 
-async def test_valid_get_user_trackers(
-    sample_tracker_response: TrackerResponse, tracker_service_mock
-):
-    user_id = "user_id"
-    tracker_service_mock.get_by_user_id.return_value = [
-        sample_tracker_response,
-        sample_tracker_response,
+def make_summaries(count: int) -> list[TrackerSummary]:
+    now = datetime.now(timezone.utc)
+    return [
+        TrackerSummary(
+            id=uuid4(), name=f"tracker{i}", last_activity_at=now - timedelta(hours=i)
+        )
+        for i in range(count)
     ]
 
+
+async def test_valid_get_user_trackers(tracker_service_mock):
+    user_id = "user_id"
+    summaries = make_summaries(3)
+    tracker_service_mock.get_summaries_by_user_id.return_value = summaries
+
     uc = GetUserTrackersUseCase(tracker_service=tracker_service_mock)
-    res, err = await uc.execute(user_id=user_id)
+    page, err = await uc.execute(user_id=user_id, page_size=2)
 
     assert not err
-    assert res is not None
-    assert len(res) == 2
-    assert res[0] == sample_tracker_response and res[1] == sample_tracker_response
-    tracker_service_mock.get_by_user_id.assert_awaited_once()
+    assert page is not None
+    assert page.rows == summaries[:2]
+    assert page.has_older and not page.has_newer
+    tracker_service_mock.get_summaries_by_user_id.assert_awaited_once_with(
+        user_id=user_id, limit=3, older_than=None, newer_than=None
+    )
+
+
+async def test_valid_get_user_trackers_newer(tracker_service_mock):
+    user_id = "user_id"
+    summaries = make_summaries(3)
+    key = summaries[2].key
+    tracker_service_mock.get_summaries_by_user_id.return_value = summaries[:2]
+
+    uc = GetUserTrackersUseCase(tracker_service=tracker_service_mock)
+    page, err = await uc.execute(
+        user_id=user_id, page_size=2, direction="newer", key=key
+    )
+
+    assert not err
+    assert page is not None
+    assert page.rows == summaries[:2]
+    assert page.has_older and not page.has_newer
+    tracker_service_mock.get_summaries_by_user_id.assert_awaited_once_with(
+        user_id=user_id, limit=3, older_than=None, newer_than=key
+    )
 
 
 async def test_no_trackers_get_user_trackers(tracker_service_mock):
     user_id = "user_id"
-    tracker_service_mock.get_by_user_id.return_value = []
+    tracker_service_mock.get_summaries_by_user_id.return_value = []
 
     uc = GetUserTrackersUseCase(tracker_service=tracker_service_mock)
-    _, err = await uc.execute(user_id=user_id)
+    _, err = await uc.execute(user_id=user_id, page_size=2)
 
     assert err == GetUserTrackersUseCase.Error.NO_TRACKERS
-    tracker_service_mock.get_by_user_id.assert_awaited_once()
+    tracker_service_mock.get_summaries_by_user_id.assert_awaited_once()
+
+
+async def test_cached_get_dashboard(tracker_service_mock, data_service_mock):
+    summaries = make_summaries(2)
+    tracker_service_mock.get_summaries_by_user_id.return_value = summaries
+    data_service_mock.get_dashboard.return_value = [
+        DashboardTrackerData(tracker_id=i.id, tracker_name=i.name) for i in summaries
+    ]
+    now = 0.0
+    cache = DashboardCache(ttl=300, clock=lambda: now)
+    uc = GetDashboardUseCase(
+        tracker_service=tracker_service_mock,
+        data_service=data_service_mock,
+        cache=cache,
+    )
+
+    first, err = await uc.execute(user_id="user_id", max_trackers=20)
+    repeated, _ = await uc.execute(user_id="user_id", max_trackers=20)
+
+    assert not err
+    assert [i.tracker_id for i in first] == [i.id for i in summaries]
+    assert repeated is first
+    tracker_service_mock.get_summaries_by_user_id.assert_awaited_with(
+        user_id="user_id", limit=20
+    )
+    data_service_mock.get_dashboard.assert_awaited_once_with(
+        tracker_ids=[i.id for i in summaries], days=7
+    )
+
+    # a new record bumps the data version of its tracker
+    summaries[1].data_version += 1
+    await uc.execute(user_id="user_id", max_trackers=20)
+    assert data_service_mock.get_dashboard.await_count == 2
+
+    # the period moves on
+    now = 300.0
+    await uc.execute(user_id="user_id", max_trackers=20)
+    assert data_service_mock.get_dashboard.await_count == 3
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+async def test_no_trackers_get_dashboard(tracker_service_mock, data_service_mock):
+    tracker_service_mock.get_summaries_by_user_id.return_value = []
+
+    uc = GetDashboardUseCase(
+        tracker_service=tracker_service_mock, data_service=data_service_mock
+    )
+    res, err = await uc.execute(user_id="user_id", max_trackers=20)
+
+    assert err == GetDashboardUseCase.Error.NO_TRACKERS
+    assert res == []
+    data_service_mock.get_dashboard.assert_not_awaited()
 
 
 @pytest.mark.parametrize(
@@ -144,3 +231,30 @@ async def test_no_text_handle_field_value(
 
     assert err == HandleFieldValueUseCase.Error.NO_TEXT
     tracker_service_mock.add_data.assert_not_awaited()
+
+
+async def test_valid_search_trackers(
+    tracker_service_mock, sample_tracker_response: TrackerResponse
+):
+    tracker_service_mock.search_by_name.return_value = [sample_tracker_response]
+
+    uc = SearchTrackersUseCase(tracker_service=tracker_service_mock)
+    trackers, err = await uc.execute(user_id="user_id", query=" wei ", limit=20)
+
+    assert err is None
+    assert trackers == [sample_tracker_response]
+    tracker_service_mock.search_by_name.assert_awaited_once_with(
+        user_id="user_id", query="wei", limit=20
+    )
+
+
+async def test_no_trackers_search_trackers(tracker_service_mock):
+    tracker_service_mock.search_by_name.return_value = []
+
+    uc = SearchTrackersUseCase(tracker_service=tracker_service_mock)
+    trackers, err = await uc.execute(user_id="user_id", query="x" * 300, limit=20)
+
+    assert trackers is None
+    assert err == SearchTrackersUseCase.Error.NO_TRACKERS
+    query = tracker_service_mock.search_by_name.await_args.kwargs["query"]
+    assert len(query) == SearchTrackersUseCase.MAX_QUERY_LENGTH
@@ -1,14 +1,30 @@
 import csv
-from datetime import datetime
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, create_autospec
 from uuid import uuid4
 
+import numpy as np
 import pytest
-from tracker.schemas import DataResult, StatisticsTrackerData, TrackerResponse
+from tracker.core.charts import ChartRenderer
+from tracker.core.record_filter import AllOf, Condition
+from tracker.schemas import (
+    DataResult,
+    DataRowResult,
+    FieldSeries,
+    NumericSeries,
+    StatisticsTrackerData,
+    TrackerResponse,
+)
 from tracker.use_cases import (
+    GetAnalyticsUseCase,
     GetCSVUseCase,
+    GetGraphUseCase,
     GetStatisticsUseCase,
+    GetTablePageUseCase,
     HandleFieldUseCase,
+    ParseRecordFilterUseCase,
     SplitFieldsByTypeUseCase,
+    StatisticsCache,
     ValidatePeriodValueUseCase,
 )
 
@@ -60,28 +76,149 @@ async def test_empty_get_csv(data_service_mock):
     assert res is None
 
 
+@pytest.fixture
+def chart_renderer_mock():
+    mock = create_autospec(ChartRenderer, instance=True)
+    mock.render = AsyncMock(return_value=b"png")
+    return mock
+
+
+async def test_valid_get_graph(
+    data_service_mock, chart_renderer_mock, sample_tracker_response: TrackerResponse
+):
+    data_service_mock.get_field_series.return_value = FieldSeries([1.0, 2.0], [3, 4])
+
+    uc = GetGraphUseCase(data_service=data_service_mock, renderer=chart_renderer_mock)
+    res, err = await uc.execute(tracker=sample_tracker_response, field_name="int_name")
+
+    assert err is None
+    assert res == b"png"
+    timestamps, values = chart_renderer_mock.render.await_args.args
+    assert values.tolist() == [3.0, 4.0]
+
+
+async def test_not_numeric_get_graph(
+    data_service_mock, chart_renderer_mock, sample_tracker_response: TrackerResponse
+):
+    uc = GetGraphUseCase(data_service=data_service_mock, renderer=chart_renderer_mock)
+    res, err = await uc.execute(tracker=sample_tracker_response, field_name="enum_name")
+
+    assert res is None
+    assert err == GetGraphUseCase.Error.NOT_NUMERIC
+    data_service_mock.get_field_series.assert_not_awaited()
+
+
+async def test_empty_get_graph(
+    data_service_mock, chart_renderer_mock, sample_tracker_response: TrackerResponse
+):
+    data_service_mock.get_field_series.return_value = FieldSeries([], [])
+
+    uc = GetGraphUseCase(data_service=data_service_mock, renderer=chart_renderer_mock)
+    res, err = await uc.execute(tracker=sample_tracker_response, field_name="int_name")
+
+    assert res is None
+    assert err == GetGraphUseCase.Error.NO_RECORDS
+    chart_renderer_mock.render.assert_not_awaited()
+
+
+def make_rows(num: int) -> list[DataRowResult]:
+    return [
+        DataRowResult(id=uuid4(), date=datetime.now(), value={"int": i})
+        for i in range(num)
+    ]
+
+
+async def test_valid_first_get_table_page(data_service_mock):
+    rows = make_rows(4)
+    data_service_mock.get_data_page.return_value = rows
+
+    uc = GetTablePageUseCase(data_service=data_service_mock)
+    page, err = await uc.execute(tracker_id=uuid4(), page_size=3)
+
+    assert err is None and page
+    assert page.rows == rows[:3]
+    assert not page.has_newer
+    assert page.has_older
+    assert data_service_mock.get_data_page.await_args.kwargs["limit"] == 4
+
+
+async def test_valid_newer_get_table_page(data_service_mock):
+    rows = make_rows(4)
+    data_service_mock.get_data_page.return_value = rows
+    key = (datetime.now(), uuid4())
+
+    uc = GetTablePageUseCase(data_service=data_service_mock)
+    page, err = await uc.execute(
+        tracker_id=uuid4(), page_size=3, direction="newer", key=key
+    )
+
+    assert err is None and page
+    # the closest records to the key are the oldest ones
+    assert page.rows == rows[1:]
+    assert page.has_newer
+    assert page.has_older
+    assert data_service_mock.get_data_page.await_args.kwargs["newer_than"] == key
+
+
+async def test_last_older_get_table_page(data_service_mock):
+    rows = make_rows(2)
+    data_service_mock.get_data_page.return_value = rows
+
+    uc = GetTablePageUseCase(data_service=data_service_mock)
+    page, err = await uc.execute(
+        tracker_id=uuid4(), page_size=3, direction="older", key=rows[0].key
+    )
+
+    assert err is None and page
+    assert page.rows == rows
+    assert page.has_newer
+    assert not page.has_older
+
+
+async def test_empty_get_table_page(data_service_mock):
+    data_service_mock.get_data_page.return_value = []
+
+    uc = GetTablePageUseCase(data_service=data_service_mock)
+    page, err = await uc.execute(tracker_id=uuid4(), page_size=3)
+
+    assert page is None
+    assert err == GetTablePageUseCase.Error.NO_RECORDS
+
+
 async def test_valid_get_statistics(data_service_mock):
     data_service_mock.get_statistics.return_value = [
         StatisticsTrackerData(
             type="numeric", min=1, max=1, avg=1, sum=1, count=1, field_name="int"
         ),
+    ]
+    data_service_mock.get_value_stats.return_value = [
         StatisticsTrackerData(type="categorical", mode="1", count=1, field_name="name"),
     ]
+    tracker_id, from_date = uuid4(), datetime.now()
 
     uc = GetStatisticsUseCase(data_service=data_service_mock)
     res, err = await uc.execute(
-        tracker_id=uuid4(),
+        tracker_id=tracker_id,
         numeric_fields=["int"],
         categorical_fields=["name"],
-        from_date=datetime.now(),
+        from_date=from_date,
     )
     assert err is None
-    assert len(res) == 2
-    data_service_mock.get_statistics.assert_awaited_once()
+    assert [i.field_name for i in res] == ["int", "name"]
+    data_service_mock.get_statistics.assert_awaited_once_with(
+        tracker_id=tracker_id,
+        numeric_fields=["int"],
+        categorical_fields=None,
+        from_date=from_date,
+    )
+    data_service_mock.get_value_stats.assert_awaited_once_with(
+        tracker_id=tracker_id, fields=["name"], from_date=from_date
+    )
 
 
 async def test_empty_get_statistics(data_service_mock):
     data_service_mock.get_statistics.return_value = []
+    data_service_mock.get_value_stats.return_value = []
 
     uc = GetStatisticsUseCase(data_service=data_service_mock)
     res, err = await uc.execute(
@@ -217,3 +354,208 @@ def test_empty_split_fields_by_type(
 
     assert len(numeric) == 0
     assert len(categorical) == 0
+
+
+async def test_all_time_get_statistics(data_service_mock):
+    data_service_mock.get_field_stats.return_value = [
+        StatisticsTrackerData(
+            type="numeric", min=0, max=2, avg=1, sum=2, std=1, count=2, field_name="int"
+        ),
+    ]
+    data_service_mock.get_value_stats.return_value = [
+        StatisticsTrackerData(type="categorical", mode="1", count=2, field_name="name"),
+    ]
+    tracker_id = uuid4()
+
+    uc = GetStatisticsUseCase(data_service=data_service_mock)
+    res, err = await uc.execute(
+        tracker_id=tracker_id,
+        numeric_fields=["int"],
+        categorical_fields=["name"],
+    )
+
+    assert err is None
+    assert [i.field_name for i in res] == ["int", "name"]
+    data_service_mock.get_field_stats.assert_awaited_once_with(
+        tracker_id=tracker_id, fields=["int"]
+    )
+    data_service_mock.get_value_stats.assert_awaited_once_with(
+        tracker_id=tracker_id, fields=["name"], from_date=None
+    )
+    data_service_mock.get_statistics.assert_not_awaited()
+
+
+async def test_all_time_numeric_get_statistics(data_service_mock):
+    data_service_mock.get_field_stats.return_value = []
+
+    uc = GetStatisticsUseCase(data_service=data_service_mock)
+    res, err = await uc.execute(
+        tracker_id=uuid4(), numeric_fields=["int"], categorical_fields=[]
+    )
+
+    assert err is None
+    assert res == []
+    data_service_mock.get_statistics.assert_not_awaited()
+
+
+async def test_cached_get_statistics(data_service_mock):
+    data_service_mock.get_data_version.return_value = 1
+    data_service_mock.get_statistics.return_value = [
+        StatisticsTrackerData(
+            type="numeric", min=1, max=1, avg=1, sum=1, count=1, field_name="int"
+        ),
+    ]
+    tracker_id = uuid4()
+    uc = GetStatisticsUseCase(
+        data_service=data_service_mock, cache=StatisticsCache(granularity=60)
+    )
+
+    async def execute(second: int):
+        return await uc.execute(
+            tracker_id=tracker_id,
+            numeric_fields=["int"],
+            categorical_fields=[],
+            from_date=datetime(2026, 1, 1, 12, 0, second, 123, tzinfo=timezone.utc),
+        )
+
+    first, _ = await execute(10)
+    repeated, _ = await execute(50)
+
+    assert repeated is first
+    data_service_mock.get_statistics.assert_awaited_once_with(
+        tracker_id=tracker_id,
+        numeric_fields=["int"],
+        categorical_fields=None,
+        from_date=datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc),
+    )
+
+    # a new record bumps the version
+    data_service_mock.get_data_version.return_value = 2
+    await execute(50)
+    assert data_service_mock.get_statistics.await_count == 2
+
+
+async def test_deleted_tracker_cached_get_statistics(data_service_mock):
+    data_service_mock.get_data_version.return_value = None
+
+    uc = GetStatisticsUseCase(data_service=data_service_mock, cache=StatisticsCache())
+    res, err = await uc.execute(
+        tracker_id=uuid4(), numeric_fields=["int"], categorical_fields=[]
+    )
+
+    assert err is None
+    assert res == []
+    data_service_mock.get_field_stats.assert_not_awaited()
+
+
+async def test_valid_get_analytics(data_service_mock, sample_tracker_response):
+    day = 86400.0
+    data_service_mock.get_numeric_series.return_value = NumericSeries(
+        timestamps=np.array([0, 1, day, 2 * day, 2 * day + 1]),
+        values={
+            "int_name": np.array([1, 3, 4, 6, 8], dtype=np.float64),
+            "float_name": np.full(5, np.nan),
+        },
+    )
+
+    uc = GetAnalyticsUseCase(data_service=data_service_mock)
+    res, err = await uc.execute(tracker=sample_tracker_response, window=2)
+
+    assert err is None
+    # a field without values is skipped
+    assert len(res) == 1
+    field = res[0]
+    assert field.field_name == "int_name"
+    assert field.count == 5 and field.last == 8
+    assert field.moving_average == 7
+    assert field.day_change == pytest.approx(75)  # 4 to the mean 7
+    assert (field.current_streak, field.longest_streak) == (3, 3)
+    assert field.zscore > 1
+    assert "int_name" in field.formatted
+
+
+async def test_no_records_get_analytics(data_service_mock, sample_tracker_response):
+    data_service_mock.get_numeric_series.return_value = NumericSeries(
+        timestamps=np.array([]),
+        values={"int_name": np.array([]), "float_name": np.array([])},
+    )
+
+    uc = GetAnalyticsUseCase(data_service=data_service_mock)
+    res, err = await uc.execute(tracker=sample_tracker_response)
+
+    assert res == []
+    assert err == GetAnalyticsUseCase.Error.NO_RECORDS
+
+
+async def test_filtered_get_statistics(data_service_mock):
+    data_service_mock.get_data_version.return_value = 1
+    data_service_mock.get_statistics.return_value = [
+        StatisticsTrackerData(
+            type="numeric", min=1, max=1, avg=1, sum=1, count=1, field_name="int"
+        ),
+    ]
+    tracker_id = uuid4()
+    where = Condition("enum", "=", "val1")
+    uc = GetStatisticsUseCase(data_service=data_service_mock, cache=StatisticsCache())
+
+    res, err = await uc.execute(
+        tracker_id=tracker_id,
+        numeric_fields=["int"],
+        categorical_fields=[],
+        where=where,
+    )
+    unfiltered, _ = await uc.execute(
+        tracker_id=tracker_id, numeric_fields=["int"], categorical_fields=[]
+    )
+
+    assert err is None
+    assert [i.field_name for i in res] == ["int"]
+    # the running statistics cover all records, filtered ones are scanned
+    data_service_mock.get_statistics.assert_awaited_once_with(
+        tracker_id=tracker_id,
+        numeric_fields=["int"],
+        categorical_fields=[],
+        from_date=None,
+        where=where,
+    )
+    data_service_mock.get_field_stats.assert_awaited_once()
+    assert unfiltered is not res
+
+
+async def test_valid_parse_record_filter(
+    sample_tracker_response: TrackerResponse, filter_index_service_mock
+):
+    uc = ParseRecordFilterUseCase(filter_index_service=filter_index_service_mock)
+    where, err = await uc.execute(
+        tracker=sample_tracker_response, text=" enum_name = val2 and int_name > 3 "
+    )
+
+    assert err is None
+    assert where == AllOf(
+        (Condition("enum_name", "=", "val2"), Condition("int_name", ">", 3.0))
+    )
+    filter_index_service_mock.note_usage.assert_awaited_once_with(
+        sample_tracker_response.id, where
+    )
+
+
+@pytest.mark.parametrize(
+    "text,error",
+    [
+        (None, ParseRecordFilterUseCase.Error.NO_TEXT),
+        ("  ", ParseRecordFilterUseCase.Error.NO_TEXT),
+        ("int_name >", ParseRecordFilterUseCase.Error.WRONG_SYNTAX),
+        ("weight = 1", ParseRecordFilterUseCase.Error.UNKNOWN_FIELD),
+        ("enum_name = val4", ParseRecordFilterUseCase.Error.WRONG_VALUE),
+        ("string_name < abc", ParseRecordFilterUseCase.Error.WRONG_OPERATOR),
+    ],
+)
+async def test_invalid_parse_record_filter(
+    sample_tracker_response: TrackerResponse, filter_index_service_mock, text, error
+):
+    uc = ParseRecordFilterUseCase(filter_index_service=filter_index_service_mock)
+    where, err = await uc.execute(tracker=sample_tracker_response, text=text)
+
+    assert where is None
+    assert err == error
+    filter_index_service_mock.note_usage.assert_not_awaited()